@@ -0,0 +1,248 @@
+"""
+BENCHMARK.PY - Benchmarks de la capa de datos
+Genera un juego de datos sintético (datos_sinteticos) y mide tiempo, filas/s
+y pico de memoria de lectura, escritura, recálculo de costes, sincronización
+de referencias y alertas. Compara con la línea base guardada para detectar
+regresiones.
+
+Uso: python benchmark.py [pequena|media|grande] [--guardar-base] [--datos carpeta]
+                         [--repeticiones N] [--sin-memoria]
+"""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+RUTA_BASES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+
+# Variación sobre la línea base a partir de la que se marca regresión/mejora
+TOLERANCIA = 0.25
+
+REPETICIONES = 3
+
+# ============================================================================
+# CASOS
+# ============================================================================
+
+def definir_casos(datos):
+    """
+    Casos a medir sobre los datos ya guardados (config apuntando a ellos)
+
+    Args:
+        datos: dict de datos_sinteticos.generar_datos (para contar filas)
+
+    Returns:
+        Lista de dicts con 'nombre', 'filas' y 'funcion' (sin argumentos)
+    """
+    import config
+    import utils
+    import sincronizacion
+    import reglas_alertas
+
+    crm = datos["CLIENTES.xlsx"]
+    ops = datos["OPERACIONES_ESCANDALLOS.xlsx"]
+    n_carta = len(ops["CARTA_CLIENTES"])
+    n_esc = len(ops["ESCANDALLOS"])
+
+    def _escribir_carta():
+        df = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+        return utils.escribir_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES", df)
+
+    def _agregar_interaccion():
+        return utils.agregar_fila(config.ARCHIVO_CRM, "INTERACCIONES", {
+            'ID': utils.generar_id(), 'ID Cliente': 1, 'Tipo': "Llamada",
+            'Descripción': "Benchmark", 'Fecha': datetime.now(),
+        })
+
+    def _recalcular_costes():
+        df_esc = utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+        return utils.recalcular_costes_platos(df_esc)
+
+    def _evaluar_alertas():
+        reglas_alertas.reiniciar_estado()
+        return reglas_alertas.evaluar_todas()
+
+    return [
+        {"nombre": "leer_excel CARTA_CLIENTES", "filas": n_carta,
+         "funcion": lambda: utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")},
+        {"nombre": "leer_excel ESCANDALLOS", "filas": n_esc,
+         "funcion": lambda: utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")},
+        {"nombre": "leer_excel_forzado INTERACCIONES", "filas": len(crm["INTERACCIONES"]),
+         "funcion": lambda: utils.leer_excel_forzado(config.ARCHIVO_CRM, "INTERACCIONES")},
+        {"nombre": "escribir_excel CARTA_CLIENTES", "filas": n_carta, "funcion": _escribir_carta},
+        {"nombre": "agregar_fila INTERACCIONES", "filas": len(crm["INTERACCIONES"]), "funcion": _agregar_interaccion},
+        {"nombre": "recalcular_costes_platos", "filas": n_esc + n_carta, "funcion": _recalcular_costes},
+        {"nombre": "sincronizar_referencias",
+         "filas": len(crm["INTERACCIONES"]) + n_carta + len(ops["PRECIOS_POR_CLIENTE"]) + n_esc,
+         "funcion": sincronizacion.sincronizar_referencias},
+        {"nombre": "reglas_alertas.evaluar_todas",
+         "filas": len(crm["CLIENTES_ACTIVOS"]) + n_carta + len(ops["LINEAS_COMPRA"]) + len(datos["CAMBIOS_REGISTRO.csv"]),
+         "funcion": _evaluar_alertas},
+        {"nombre": "detectar_alertas_precios", "filas": len(ops["LINEAS_COMPRA"]),
+         "funcion": utils.detectar_alertas_precios},
+        {"nombre": "detectar_alertas_margenes", "filas": n_carta,
+         "funcion": utils.detectar_alertas_margenes},
+    ]
+
+# ============================================================================
+# MEDICIÓN
+# ============================================================================
+
+def medir(funcion, repeticiones=REPETICIONES, memoria=True):
+    """
+    Mediana de 'repeticiones' ejecuciones y pico de memoria
+
+    La memoria se mide en una ejecución aparte con tracemalloc (que ralentiza
+    el código Python) para no contaminar los tiempos.
+
+    Returns:
+        (segundos, pico en MB o None si memoria=False)
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    if not memoria:
+        return statistics.median(tiempos), None
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return statistics.median(tiempos), pico / 1024 ** 2
+
+
+def ejecutar_benchmarks(casos, repeticiones=REPETICIONES, memoria=True):
+    """
+    Mide todos los casos
+
+    Returns:
+        DataFrame con 'Caso', 'Filas', 'Segundos', 'Filas/s' y 'Pico MB'
+    """
+    import utils
+
+    filas = []
+    for caso in casos:
+        utils.iniciar_ejecucion(caso["nombre"])
+        segundos, pico = medir(caso["funcion"], repeticiones, memoria)
+        filas.append({
+            "Caso": caso["nombre"],
+            "Filas": caso["filas"],
+            "Segundos": round(segundos, 4),
+            "Filas/s": round(caso["filas"] / segundos) if segundos > 0 else None,
+            "Pico MB": round(pico, 1) if pico is not None else None,
+        })
+        print(f"[BATCH] {caso['nombre']}: {segundos:.3f}s" + (f" · {pico:.1f} MB" if pico is not None else ""))
+    return pd.DataFrame(filas)
+
+# ============================================================================
+# LÍNEA BASE
+# ============================================================================
+
+def ruta_base(escala):
+    return os.path.join(RUTA_BASES, f"base_{escala}.json")
+
+
+def guardar_base(resultados, escala):
+    """Guarda los resultados como línea base de la escala"""
+    os.makedirs(RUTA_BASES, exist_ok=True)
+    contenido = {
+        "escala": escala,
+        "fecha": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "maquina": platform.node(),
+        "resultados": resultados.to_dict("records"),
+    }
+    with open(ruta_base(escala), "w", encoding="utf-8") as f:
+        json.dump(contenido, f, ensure_ascii=False, indent=2)
+    return ruta_base(escala)
+
+
+def comparar_con_base(resultados, escala, tolerancia=TOLERANCIA):
+    """
+    Añade a los resultados la línea base y su variación
+
+    Returns:
+        DataFrame con 'Base s', 'Δ Tiempo %', 'Base MB', 'Δ Memoria %' y
+        'Estado' (OK / Regresión / Mejora / Sin base)
+    """
+    resultados = resultados.copy()
+    if not os.path.exists(ruta_base(escala)):
+        resultados["Estado"] = "Sin base"
+        return resultados
+
+    with open(ruta_base(escala), encoding="utf-8") as f:
+        base = pd.DataFrame(json.load(f)["resultados"]).set_index("Caso")
+
+    resultados["Base s"] = resultados["Caso"].map(base["Segundos"])
+    resultados["Δ Tiempo %"] = ((resultados["Segundos"] / resultados["Base s"] - 1) * 100).round(1)
+    resultados["Base MB"] = resultados["Caso"].map(base["Pico MB"])
+    resultados["Δ Memoria %"] = ((pd.to_numeric(resultados["Pico MB"], errors="coerce") / resultados["Base MB"] - 1) * 100).round(1)
+
+    peor = resultados[["Δ Tiempo %", "Δ Memoria %"]].max(axis=1)
+    mejor = resultados[["Δ Tiempo %", "Δ Memoria %"]].min(axis=1)
+    resultados["Estado"] = "OK"
+    resultados.loc[mejor < -tolerancia * 100, "Estado"] = "Mejora"
+    resultados.loc[peor > tolerancia * 100, "Estado"] = "Regresión"
+    resultados.loc[resultados["Base s"].isna(), "Estado"] = "Sin base"
+    return resultados
+
+
+if __name__ == "__main__":
+    import sys
+
+    argumentos = sys.argv[1:]
+    opciones_con_valor = {"--datos", "--repeticiones"}
+    posicionales = [a for i, a in enumerate(argumentos)
+                    if not a.startswith("--") and (i == 0 or argumentos[i - 1] not in opciones_con_valor)]
+    escala = posicionales[0] if posicionales else "pequena"
+    carpeta = argumentos[argumentos.index("--datos") + 1] if "--datos" in argumentos else None
+    repeticiones = int(argumentos[argumentos.index("--repeticiones") + 1]) if "--repeticiones" in argumentos else REPETICIONES
+    memoria = "--sin-memoria" not in argumentos
+
+    # Las rutas de config se redirigen antes de importar el resto de módulos
+    import datos_sinteticos
+    if escala not in datos_sinteticos.ESCALAS:
+        print(f"Escala desconocida '{escala}'. Opciones: {', '.join(datos_sinteticos.ESCALAS)}")
+        sys.exit(1)
+
+    carpeta, datos = datos_sinteticos.generar(escala, carpeta)
+    datos_sinteticos.apuntar_config(carpeta)
+
+    print("=" * 70)
+    print(f"⏱️ BENCHMARK CAPA DE DATOS - escala '{escala}' ({datetime.now():%d/%m/%Y %H:%M})")
+    print("=" * 70)
+
+    resultados = comparar_con_base(ejecutar_benchmarks(definir_casos(datos), repeticiones, memoria), escala)
+    print(resultados.to_string(index=False))
+
+    import utils
+    print("\n📊 Lecturas/escrituras registradas (utils.resumen_mediciones):")
+    print(utils.resumen_mediciones(por=["Operación", "Hoja"])[
+        ["Operación", "Hoja", "Llamadas", "Tiempo Total (s)", "MB Leídos", "MB Escritos"]].to_string(index=False))
+
+    if "--guardar-base" in argumentos:
+        print(f"\n✅ Línea base guardada en {guardar_base(resultados[['Caso', 'Filas', 'Segundos', 'Filas/s', 'Pico MB']], escala)}")
+
+    if (resultados["Estado"] == "Regresión").any():
+        print(f"\n❌ Regresiones de más del {TOLERANCIA:.0%} frente a la línea base")
+        sys.exit(1)
@@ -0,0 +1,288 @@
+"""
+BUSCADOR.PY - Búsqueda global (leads, clientes, contactos, platos, ingredientes)
+Índice invertido en memoria de trigramas sin acentos: tolera errores de
+tecleo, encuentra nombres parciales y trozos de teléfono. Cada hoja es un
+segmento que se reconstruye por separado cuando cambia.
+"""
+
+import os
+import time
+import unicodedata
+
+import numpy as np
+import pandas as pd
+import config
+import utils
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# Hojas indexadas: campos de texto, campos de teléfono y cómo mostrar el resultado
+FUENTES_BUSQUEDA = [
+    {"hoja": "LEADS", "id": "ID", "archivo": "ARCHIVO_CRM", "tipo": "Lead", "icono": "🎯",
+     "titulo": "Nombre Comercial", "subtitulo": ["Persona Contacto", "Estado Lead"],
+     "campos": ["Nombre Comercial", "Persona Contacto", "Email", "CIF", "Dirección"],
+     "telefonos": ["Teléfono"]},
+    {"hoja": "CLIENTES_ACTIVOS", "id": "ID", "archivo": "ARCHIVO_CRM", "tipo": "Cliente", "icono": "👥",
+     "titulo": "Nombre Comercial", "subtitulo": ["Tipo Local", "Ciudad"],
+     "campos": ["Nombre Comercial", "Email", "CIF", "Dirección", "Ciudad"],
+     "telefonos": ["Teléfono"]},
+    {"hoja": "CONTACTOS", "id": "ID", "archivo": "ARCHIVO_CRM", "tipo": "Contacto", "icono": "📇",
+     "titulo": "Nombre Contacto", "subtitulo": ["Nombre Cliente", "Cargo"],
+     "campos": ["Nombre Contacto", "Nombre Cliente", "Cargo", "Email"],
+     "telefonos": ["Teléfono", "WhatsApp"]},
+    {"hoja": "CARTA_CLIENTES", "id": "ID Plato", "archivo": "ARCHIVO_OPERACIONES", "tipo": "Plato", "icono": "🍴",
+     "titulo": "Nombre Plato", "subtitulo": ["Nombre Cliente", "Categoría"],
+     "campos": ["Nombre Plato", "Nombre Cliente", "Categoría"],
+     "telefonos": []},
+    {"hoja": "INGREDIENTES_MAESTRO", "id": "ID Ingrediente", "archivo": "ARCHIVO_OPERACIONES", "tipo": "Ingrediente", "icono": "🥕",
+     "titulo": "Nombre", "subtitulo": ["Categoría", "Marca"],
+     "campos": ["Nombre", "Categoría", "Marca"],
+     "telefonos": []},
+]
+
+HOJAS_BUSQUEDA = {fuente["hoja"] for fuente in FUENTES_BUSQUEDA}
+
+# Tamaño de los n-gramas
+N_GRAMA = 3
+
+# Fracción mínima de trigramas de la consulta que debe tener un resultado
+UMBRAL_SIMILITUD = 0.5
+
+# Dígitos mínimos para buscar como teléfono
+MIN_DIGITOS_TELEFONO = 3
+
+MAX_RESULTADOS = 10
+
+# Segmentos del índice por hoja y hojas pendientes de reconstruir
+_segmentos = {}
+_pendientes = set()
+_archivos_avisados = set()
+_mtimes = {}
+
+# ============================================================================
+# NORMALIZACIÓN Y N-GRAMAS
+# ============================================================================
+
+def normalizar_texto(texto):
+    """Minúsculas, sin acentos y solo letras/dígitos ('Café Pepé' → 'cafe pepe')"""
+    texto = unicodedata.normalize("NFKD", str(texto).lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join("".join(c if c.isalnum() else " " for c in texto).split())
+
+
+def normalizar_serie(serie):
+    """normalizar_texto vectorizado (mismo resultado, para columnas enteras)"""
+    texto = serie.fillna("").astype(str).str.lower().str.normalize("NFKD")
+    texto = texto.str.encode("ascii", "ignore").str.decode("ascii")
+    return texto.str.replace(r"[^0-9a-z]+", " ", regex=True).str.strip()
+
+
+def _gramas_palabra(palabra, prefijo=False):
+    """
+    Trigramas de una palabra con bordes (' pep', 'epe', 'pe ')
+
+    prefijo=True no añade el borde final: la consulta 'pep' encuentra 'pepe'.
+    """
+    marcada = " " + palabra + ("" if prefijo else " ")
+    return {marcada[i:i + N_GRAMA] for i in range(max(len(marcada) - N_GRAMA + 1, 0))}
+
+
+def _gramas_telefono(digitos):
+    """Trigramas de los dígitos de un teléfono (cualquier trozo lo encuentra)"""
+    return {"#" + digitos[i:i + N_GRAMA] for i in range(max(len(digitos) - N_GRAMA + 1, 0))}
+
+# ============================================================================
+# CONSTRUCCIÓN DEL ÍNDICE
+# ============================================================================
+
+def _columna_texto(df, columna):
+    if columna in df.columns:
+        return df[columna].fillna("").astype(str)
+    return pd.Series("", index=df.index)
+
+
+def construir_segmento(fuente, df):
+    """
+    Índice invertido de una hoja
+
+    Returns:
+        Dict con 'postings' (trigrama → array de filas), 'docs' (DataFrame
+        con tipo, icono, título, subtítulo, ID y texto normalizado) y 'hoja'
+    """
+    df = df.reset_index(drop=True)
+    texto = pd.Series("", index=df.index)
+    for campo in fuente["campos"]:
+        texto = texto + " " + normalizar_serie(_columna_texto(df, campo))
+    texto = texto.str.split().str.join(" ")
+
+    telefonos = pd.Series("", index=df.index)
+    for campo in fuente["telefonos"]:
+        if campo in df.columns:
+            digitos = utils.clave_id(df[campo].fillna("")).str.replace(r"\D", "", regex=True)
+            telefonos = telefonos + " " + digitos
+    telefonos = telefonos.str.split()
+
+    # Trigrama → filas (cada fila una vez por trigrama). Los trigramas se
+    # calculan una vez por palabra distinta, no por fila
+    cache = {}
+    postings = {}
+    for fila, (palabras, numeros) in enumerate(zip(texto.tolist(), telefonos.tolist())):
+        gramas = set()
+        for palabra in set(palabras.split()):
+            if palabra not in cache:
+                cache[palabra] = _gramas_palabra(palabra)
+            gramas |= cache[palabra]
+        for numero in numeros:
+            gramas |= _gramas_telefono(numero)
+        for grama in gramas:
+            postings.setdefault(grama, []).append(fila)
+
+    subtitulo = pd.Series("", index=df.index)
+    for campo in fuente["subtitulo"]:
+        valor = _columna_texto(df, campo)
+        subtitulo = subtitulo + np.where((subtitulo != "") & (valor != ""), " · ", "") + valor
+
+    docs = pd.DataFrame({
+        "Tipo": fuente["tipo"],
+        "Icono": fuente["icono"],
+        "Título": _columna_texto(df, fuente["titulo"]).to_numpy(),
+        "Subtítulo": subtitulo.to_numpy(),
+        "ID": utils.clave_id(_columna_texto(df, fuente["id"])).to_numpy(),
+        "Hoja": fuente["hoja"],
+        "Texto": (texto + " " + telefonos.str.join(" ")).to_numpy(),
+    })
+    return {
+        "hoja": fuente["hoja"],
+        "postings": {g: np.asarray(filas, dtype=np.int32) for g, filas in postings.items()},
+        "docs": docs,
+    }
+
+
+def _archivo(fuente):
+    return getattr(config, fuente["archivo"])
+
+
+def notificar_escritura(hoja, archivo=None):
+    """Marca una hoja para reconstruir su segmento en la próxima búsqueda"""
+    if archivo:
+        _archivos_avisados.add(archivo)
+    if hoja in HOJAS_BUSQUEDA:
+        _pendientes.add(hoja)
+
+
+def actualizar_indice(forzar=False):
+    """
+    Reconstruye los segmentos desactualizados
+
+    Una hoja se reconstruye si se ha notificado su escritura o si su Excel
+    ha cambiado en disco sin aviso (edición externa: se reconstruyen todas
+    las hojas de ese archivo).
+
+    Returns:
+        Lista de hojas reconstruidas
+    """
+    archivos = {_archivo(f) for f in FUENTES_BUSQUEDA}
+    mtimes = {a: os.path.getmtime(a) if os.path.exists(a) else None for a in archivos}
+
+    reconstruir = set(HOJAS_BUSQUEDA) if forzar else set(_pendientes)
+    for fuente in FUENTES_BUSQUEDA:
+        archivo = _archivo(fuente)
+        if fuente["hoja"] not in _segmentos:
+            reconstruir.add(fuente["hoja"])
+        elif mtimes[archivo] != _mtimes.get(archivo) and archivo not in _archivos_avisados:
+            # Cambio sin aviso (Excel editado fuera de la app) → todas sus hojas
+            reconstruir.add(fuente["hoja"])
+
+    for fuente in FUENTES_BUSQUEDA:
+        if fuente["hoja"] in reconstruir:
+            inicio = time.perf_counter()
+            df = utils.leer_excel(_archivo(fuente), fuente["hoja"])
+            _segmentos[fuente["hoja"]] = construir_segmento(fuente, df)
+            print(f"[DEBUG] Índice de búsqueda {fuente['hoja']}: {len(df)} filas "
+                  f"({(time.perf_counter() - inicio) * 1000:.0f} ms)")
+
+    _pendientes.difference_update(reconstruir)
+    _archivos_avisados.clear()
+    _mtimes.update(mtimes)
+    return sorted(reconstruir)
+
+# ============================================================================
+# CONSULTA
+# ============================================================================
+
+def _gramas_consulta(consulta):
+    """Trigramas de cada término de la consulta (palabras y teléfonos)"""
+    terminos = []
+    for palabra in normalizar_texto(consulta).split():
+        if palabra.isdigit() and len(palabra) >= MIN_DIGITOS_TELEFONO:
+            terminos.append(_gramas_telefono(palabra))
+        elif len(palabra) >= 2:
+            terminos.append(_gramas_palabra(palabra, prefijo=True))
+
+    # Teléfono escrito con espacios ('612 34 56') → un solo término
+    digitos = "".join(c for c in consulta if c.isdigit())
+    if len(digitos) >= MIN_DIGITOS_TELEFONO and not any(c.isalpha() for c in consulta):
+        terminos = [_gramas_telefono(digitos)]
+    return terminos
+
+
+def _puntuar(segmento, terminos):
+    """Fracción media de trigramas de cada término presentes en cada fila"""
+    n = len(segmento["docs"])
+    puntuacion = np.zeros(n)
+    for gramas in terminos:
+        listas = [segmento["postings"][g] for g in gramas if g in segmento["postings"]]
+        if listas:
+            puntuacion += np.bincount(np.concatenate(listas), minlength=n) / len(gramas)
+    return puntuacion / len(terminos)
+
+
+def buscar(consulta, limite=MAX_RESULTADOS, tipos=None):
+    """
+    Resultados de la búsqueda global, mejores primero
+
+    Args:
+        consulta: Texto libre (nombre parcial, con erratas, o teléfono)
+        limite: Máximo de resultados
+        tipos: Lista de tipos ('Lead', 'Cliente', ...) para filtrar
+
+    Returns:
+        DataFrame con Tipo, Icono, Título, Subtítulo, ID, Hoja y Puntuación
+    """
+    columnas = ["Tipo", "Icono", "Título", "Subtítulo", "ID", "Hoja", "Puntuación"]
+    terminos = _gramas_consulta(consulta or "")
+    if not terminos:
+        return pd.DataFrame(columns=columnas)
+
+    actualizar_indice()
+    normalizada = normalizar_texto(consulta)
+    if not any(c.isalpha() for c in consulta):
+        normalizada = "".join(c for c in consulta if c.isdigit())
+
+    partes = []
+    for fuente in FUENTES_BUSQUEDA:
+        if tipos and fuente["tipo"] not in tipos:
+            continue
+        segmento = _segmentos.get(fuente["hoja"])
+        if segmento is None or segmento["docs"].empty:
+            continue
+
+        puntuacion = _puntuar(segmento, terminos)
+        filas = np.flatnonzero(puntuacion >= UMBRAL_SIMILITUD)
+        if len(filas) == 0:
+            continue
+
+        candidatos = segmento["docs"].iloc[filas].copy()
+        # Coincidencia literal (sin acentos) por delante de las aproximadas
+        exacta = candidatos["Texto"].str.contains(normalizada, regex=False).to_numpy()
+        candidatos["Puntuación"] = puntuacion[filas] + exacta
+        partes.append(candidatos)
+
+    if not partes:
+        return pd.DataFrame(columns=columnas)
+
+    resultados = pd.concat(partes, ignore_index=True)
+    resultados = resultados[resultados["Título"].str.strip() != ""]
+    return resultados.nlargest(limite, "Puntuación")[columnas].reset_index(drop=True)
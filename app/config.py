@@ -46,6 +46,12 @@ else:
     ARCHIVO_PROVEEDORES = os.path.join(RUTA_DATOS, "PROVEEDORES_MERCADO.xlsx")
     ARCHIVO_EMPRESA = os.path.join(RUTA_DATOS, "EMPRESA_BACKOFFICE.xlsx")
 
+# Inventarios particionados: un archivo INVENTARIO_<ID Cliente>.xlsx por cliente
+if USE_ONEDRIVE_API:
+    RUTA_INVENTARIOS = f"{RUTA_DATOS}/inventarios"
+else:
+    RUTA_INVENTARIOS = os.path.join(RUTA_DATOS, "inventarios")
+
 # ============================================================================
 # ONEDRIVE API (Microsoft Graph)
 # ============================================================================
@@ -99,6 +105,22 @@ SERVICIOS_DISPONIBLES = {
     'Asesoramiento': {'precio': 200, 'descripcion': 'Asesoramiento puntual'}
 }
 
+# ============================================================================
+# MÓDULOS DE LA APLICACIÓN
+# ============================================================================
+
+# Opción del menú lateral → (módulo, función que pinta la página).
+# main.py importa cada módulo la primera vez que se abre su página.
+MODULOS_APP = {
+    "📊 Dashboard": ("modulo_dashboard", "modulo_dashboard"),
+    "👥 Clientes": ("modulo_clientes_nuevo", "modulo_clientes"),
+    "🍽️ Escandallos": ("modulo_escandallos", "modulo_escandallos"),
+    "📦 Proveedores": ("modulo_proveedores", "modulo_proveedores"),
+    "🏢 Empresa": ("modulo_empresa", "modulo_empresa"),
+    "📈 Informes": ("modulo_informes", "modulo_informes"),
+    "⚙️ Configuración": ("modulo_configuracion", "modulo_configuracion"),
+}
+
 # ============================================================================
 # FUNCIONES DE VALIDACIÓN
 # ============================================================================
@@ -128,6 +150,7 @@ def crear_carpetas_si_no_existen():
         return True
 
     Path(RUTA_DATOS).mkdir(parents=True, exist_ok=True)
+    Path(RUTA_INVENTARIOS).mkdir(parents=True, exist_ok=True)
     
     # Carpeta para documentos
     carpeta_docs = os.path.join(ONEDRIVE_BASE, "CONSULTORIA_HORECA", "documentos")
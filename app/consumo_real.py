@@ -0,0 +1,220 @@
+"""
+CONSUMO_REAL.PY - Conciliación de consumo real entre visitas
+consumo = stock anterior + cantidad comprada − stock actual
+para cada cliente, ingrediente y periodo entre recuentos
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+import config
+import utils
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+HOJA_CONSUMO_REAL = "CONSUMO_REAL"
+
+COLUMNAS_CONSUMO_REAL = [
+    'ID Cliente', 'Nombre Cliente', 'ID Ingrediente', 'Nombre Ingrediente', 'Unidad',
+    'Fecha Inicio', 'Fecha Fin', 'Semanas', 'Stock Inicial', 'Comprado', 'Stock Final',
+    'Consumo Real', 'Consumo Semanal Real', 'Consumo Semanal Estimado', 'Desviación %',
+    'Estado', 'Fecha Cálculo'
+]
+
+CLAVES = ['ID Cliente', 'ID Ingrediente']
+
+DIAS_SEMANA = 7
+
+# ============================================================================
+# DATOS DE ENTRADA
+# ============================================================================
+
+def lineas_compra_cliente(df_compras, df_lineas):
+    """
+    Cantidades compradas por cliente, ingrediente y fecha
+
+    Las líneas de LINEAS_COMPRA se enlazan con su cabecera de
+    COMPRAS_CLIENTE por 'ID Compra' para obtener cliente y fecha
+    (si la línea ya trae 'ID Cliente' y 'Fecha' se usan directamente).
+
+    Returns:
+        DataFrame con 'ID Cliente', 'ID Ingrediente', 'Nombre Ingrediente',
+        'Fecha', 'Cantidad' e 'Importe' (cantidad × precio unitario)
+    """
+    columnas = ['ID Cliente', 'ID Ingrediente', 'Nombre Ingrediente', 'Fecha', 'Cantidad', 'Importe']
+    if df_lineas is None or df_lineas.empty or not {'ID Ingrediente', 'Cantidad'} <= set(df_lineas.columns):
+        return pd.DataFrame(columns=columnas)
+
+    df = df_lineas.copy()
+    faltan = [c for c in ['ID Cliente', 'Fecha'] if c not in df.columns]
+    if faltan:
+        if df_compras is None or df_compras.empty or 'ID Compra' not in df.columns:
+            return pd.DataFrame(columns=columnas)
+        cabeceras = df_compras.drop_duplicates('ID Compra').set_index('ID Compra')
+        for col in faltan:
+            df[col] = df['ID Compra'].map(cabeceras[col]) if col in cabeceras.columns else None
+
+    df = df.reindex(columns=columnas + ['Precio Unitario'])
+    df['ID Ingrediente'] = utils.clave_id(df['ID Ingrediente'])
+    df['Fecha'] = pd.to_datetime(df['Fecha'], errors='coerce')
+    df['Cantidad'] = pd.to_numeric(df['Cantidad'], errors='coerce').fillna(0)
+    df['Importe'] = (df['Cantidad'] * pd.to_numeric(df['Precio Unitario'], errors='coerce')).fillna(0)
+    df = df[columnas]
+
+    return df.dropna(subset=['ID Cliente', 'Fecha'])
+
+# ============================================================================
+# CONCILIACIÓN
+# ============================================================================
+
+def calcular_consumo_real(df_snapshots, df_compras_lineas):
+    """
+    Consumo real por periodo entre recuentos de stock
+
+    Cada par de recuentos consecutivos de un (cliente, ingrediente) es un
+    periodo (Fecha Inicio, Fecha Fin]. Las compras se asignan al periodo
+    con merge_asof y se suman con un groupby; todo vectorizado.
+
+    Args:
+        df_snapshots: Histórico largo (snapshots.py) con 'Fecha' y 'Stock'
+        df_compras_lineas: Resultado de lineas_compra_cliente()
+
+    Returns:
+        DataFrame con COLUMNAS_CONSUMO_REAL (sin 'Fecha Cálculo')
+    """
+    if df_snapshots.empty:
+        return pd.DataFrame(columns=COLUMNAS_CONSUMO_REAL[:-1])
+
+    recuentos = df_snapshots.copy()
+    recuentos['ID Ingrediente'] = utils.clave_id(recuentos['ID Ingrediente'])
+    recuentos['Fecha'] = pd.to_datetime(recuentos['Fecha'], errors='coerce')
+    recuentos['Stock'] = pd.to_numeric(recuentos['Stock'], errors='coerce')
+    recuentos['Consumo'] = pd.to_numeric(recuentos.get('Consumo'), errors='coerce')
+    recuentos = recuentos.dropna(subset=['Fecha', 'Stock'])
+
+    # Un recuento por (cliente, ingrediente, fecha): el último guardado
+    recuentos = recuentos.sort_values(CLAVES + ['Fecha'], kind='stable')
+    recuentos = recuentos.drop_duplicates(CLAVES + ['Fecha'], keep='last')
+
+    grupos = recuentos.groupby(CLAVES, sort=False)
+    periodos = recuentos.assign(**{
+        'Fecha Inicio': grupos['Fecha'].shift(),
+        'Stock Inicial': grupos['Stock'].shift(),
+        'Consumo Semanal Estimado': grupos['Consumo'].shift(),
+    }).rename(columns={'Fecha': 'Fecha Fin', 'Stock': 'Stock Final'})
+    periodos = periodos.dropna(subset=['Fecha Inicio'])
+
+    if periodos.empty:
+        return pd.DataFrame(columns=COLUMNAS_CONSUMO_REAL[:-1])
+
+    # Compras → periodo: primer recuento en o después de la fecha de compra
+    periodos['Comprado'] = 0.0
+    if df_compras_lineas is not None and not df_compras_lineas.empty:
+        # Clave de cliente como texto en ambos lados (Excel vs CSV)
+        claves = ['Clave Cliente', 'ID Ingrediente']
+        periodos['Clave Cliente'] = utils.clave_id(periodos['ID Cliente'])
+        compras = df_compras_lineas.assign(**{'Clave Cliente': utils.clave_id(df_compras_lineas['ID Cliente'])})
+        compras = compras[claves + ['Fecha', 'Cantidad']].sort_values('Fecha')
+
+        fines = periodos[claves + ['Fecha Inicio', 'Fecha Fin']].sort_values('Fecha Fin')
+        asignadas = pd.merge_asof(
+            compras, fines, left_on='Fecha', right_on='Fecha Fin',
+            by=claves, direction='forward', allow_exact_matches=True
+        )
+        asignadas = asignadas[asignadas['Fecha'] > asignadas['Fecha Inicio']]
+        comprado = asignadas.groupby(claves + ['Fecha Fin'])['Cantidad'].sum()
+
+        periodos = periodos.drop(columns='Comprado').merge(
+            comprado.rename('Comprado').reset_index(), on=claves + ['Fecha Fin'], how='left'
+        )
+        periodos['Comprado'] = periodos['Comprado'].fillna(0.0)
+
+    periodos['Semanas'] = ((periodos['Fecha Fin'] - periodos['Fecha Inicio']).dt.total_seconds()
+                           / (86400 * DIAS_SEMANA)).round(2)
+    periodos['Consumo Real'] = (periodos['Stock Inicial'] + periodos['Comprado'] - periodos['Stock Final']).round(2)
+    periodos['Consumo Semanal Real'] = (periodos['Consumo Real'] / periodos['Semanas']).round(2)
+
+    estimado = periodos['Consumo Semanal Estimado']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        desviacion = (periodos['Consumo Semanal Real'] - estimado) / estimado * 100
+    periodos['Desviación %'] = desviacion.where(estimado > 0).round(1)
+
+    # Consumo negativo: recuento erróneo o compras sin registrar
+    periodos['Estado'] = np.where(periodos['Consumo Real'] < 0, 'Revisar', 'OK')
+
+    for col in ['Nombre Cliente', 'Nombre Ingrediente', 'Unidad']:
+        if col not in periodos.columns:
+            periodos[col] = None
+
+    return periodos.reindex(columns=COLUMNAS_CONSUMO_REAL[:-1]).reset_index(drop=True)
+
+
+def resumir_consumo_real(df_consumo):
+    """Consumo semanal real medio vs estimado por cliente e ingrediente"""
+    if df_consumo.empty:
+        return pd.DataFrame()
+
+    validos = df_consumo[df_consumo['Estado'] == 'OK']
+    return validos.groupby(CLAVES + ['Nombre Ingrediente'], dropna=False).agg(
+        **{
+            'Periodos': ('Consumo Real', 'size'),
+            'Consumo Real Total': ('Consumo Real', 'sum'),
+            'Consumo Semanal Real': ('Consumo Semanal Real', 'mean'),
+            'Consumo Semanal Estimado': ('Consumo Semanal Estimado', 'mean'),
+        }
+    ).round(2).reset_index()
+
+# ============================================================================
+# PROCESO POR LOTES
+# ============================================================================
+
+def cargar_compras():
+    """COMPRAS_CLIENTE + LINEAS_COMPRA como cantidades por cliente/ingrediente/fecha"""
+    df_compras = utils.leer_excel(config.ARCHIVO_OPERACIONES, "COMPRAS_CLIENTE")
+    df_lineas = utils.leer_excel(config.ARCHIVO_OPERACIONES, "LINEAS_COMPRA")
+    return lineas_compra_cliente(df_compras, df_lineas)
+
+
+def consumo_real_cliente(id_cliente):
+    """Conciliación de un solo cliente (para las pantallas)"""
+    import snapshots
+
+    df_compras = cargar_compras()
+    if not df_compras.empty:
+        df_compras = df_compras[df_compras['ID Cliente'] == id_cliente]
+    return calcular_consumo_real(snapshots.obtener_snapshots(id_cliente), df_compras)
+
+
+def ejecutar_consumo_real(guardar=True):
+    """
+    Calcula el consumo real de toda la cartera y lo guarda en CONSUMO_REAL
+
+    Returns:
+        DataFrame con la tabla completa
+    """
+    import snapshots
+
+    df_consumo = calcular_consumo_real(snapshots.leer_todos_snapshots(), cargar_compras())
+    df_consumo['Fecha Cálculo'] = datetime.now()
+
+    if guardar:
+        if utils.escribir_excel(config.ARCHIVO_OPERACIONES, HOJA_CONSUMO_REAL, df_consumo):
+            print(f"[BATCH] ✅ Consumo real: {len(df_consumo)} periodos, "
+                  f"{(df_consumo['Estado'] == 'Revisar').sum()} a revisar")
+        else:
+            print(f"[BATCH] ❌ Error al guardar {HOJA_CONSUMO_REAL}")
+
+    return df_consumo
+
+
+if __name__ == "__main__":
+    print("="*70)
+    print(f"📦 CONSUMO REAL - CARTERA COMPLETA ({datetime.now():%d/%m/%Y %H:%M})")
+    print("="*70)
+
+    resultado = ejecutar_consumo_real()
+    resumen = resumir_consumo_real(resultado)
+    if not resumen.empty:
+        print(resumen.to_string(index=False))
@@ -0,0 +1,513 @@
+"""
+DATOS_SINTETICOS.PY - Generador de datos de prueba
+Libros CLIENTES, OPERACIONES_ESCANDALLOS, PROVEEDORES_MERCADO y
+EMPRESA_BACKOFFICE con la estructura de sincronizacion.ESTRUCTURA_ESPERADA,
+a la escala que se pida, para benchmarks y pruebas de carga
+
+Uso: python datos_sinteticos.py [pequena|media|grande] [carpeta destino]
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import config
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+SEMILLA = 42
+
+# Filas por hoja en cada escala
+ESCALAS = {
+    "pequena": {
+        "clientes": 100, "leads": 200, "contactos": 200, "interacciones": 2000,
+        "platos": 1500, "lineas_escandallo": 10000, "ingredientes": 300, "precios_cliente": 1000,
+        "compras": 500, "lineas_compra": 3000, "proveedores": 50, "cambios": 200,
+        "facturas": 1200, "gastos": 300,
+    },
+    "media": {
+        "clientes": 300, "leads": 600, "contactos": 600, "interacciones": 20000,
+        "platos": 9000, "lineas_escandallo": 60000, "ingredientes": 1000, "precios_cliente": 6000,
+        "compras": 3000, "lineas_compra": 15000, "proveedores": 100, "cambios": 600,
+        "facturas": 3600, "gastos": 1000,
+    },
+    "grande": {
+        "clientes": 1000, "leads": 2000, "contactos": 2000, "interacciones": 100000,
+        "platos": 30000, "lineas_escandallo": 200000, "ingredientes": 2000, "precios_cliente": 20000,
+        "compras": 10000, "lineas_compra": 50000, "proveedores": 200, "cambios": 2000,
+        "facturas": 12000, "gastos": 3000,
+    },
+}
+
+# Columnas que la aplicación usa además de ESTRUCTURA_ESPERADA
+COLUMNAS_EXTRA = {
+    "CLIENTES_ACTIVOS": ["Ciudad", "Fecha Fin", "Última Actualización"],
+    "ESCANDALLOS": ["Rendimiento %"],
+}
+
+# Hoja usada por compras y alertas que no figura en ESTRUCTURA_ESPERADA
+HOJAS_EXTRA = {
+    "OPERACIONES_ESCANDALLOS.xlsx": {
+        "LINEAS_COMPRA": ['ID Línea', 'ID Compra', 'ID Ingrediente', 'Nombre Ingrediente',
+                          'Cantidad', 'Unidad', 'Precio Unitario', 'Total'],
+    },
+}
+
+ARCHIVO_CAMBIOS = "CAMBIOS_REGISTRO.csv"
+
+# Vocabulario para nombres verosímiles
+TIPOS_NEGOCIO = ["Bar", "Restaurante", "Taberna", "Cafetería", "Gastrobar", "Asador", "Mesón", "Cervecería"]
+NOMBRES_NEGOCIO = ["El Rincón", "La Plaza", "Casa Pepe", "El Puerto", "La Bodega", "Los Arcos", "El Olivo",
+                   "La Esquina", "El Mirador", "La Tasca", "San Marcos", "El Faro", "La Estación", "Don Manuel"]
+CIUDADES = ["Madrid", "Oviedo", "Gijón", "Sevilla", "Valencia", "Bilbao", "Zaragoza", "Málaga", "León", "Santander"]
+CALLES = ["Calle Mayor", "Avda. de la Constitución", "Calle Real", "Plaza de España", "Calle Uría", "Paseo del Muro"]
+NOMBRES = ["Ana", "Luis", "Marta", "Javier", "Lucía", "Carlos", "Elena", "Pablo", "Sara", "Diego", "Laura", "Iván"]
+APELLIDOS = ["García", "Fernández", "López", "Martínez", "Suárez", "Álvarez", "Rodríguez", "Menéndez", "Díaz"]
+COMERCIALES = ["Fernando", "Marta", "Jorge"]
+PLATOS = ["Cachopo", "Fabada", "Croquetas", "Tortilla", "Pulpo", "Calamares", "Ensalada", "Solomillo",
+          "Merluza", "Arroz", "Tarta de queso", "Arroz con leche", "Chipirones", "Lacón", "Entrecot"]
+VARIANTES = ["de la casa", "tradicional", "de temporada", "al horno", "a la plancha", "con guarnición", ""]
+INGREDIENTES = ["Ternera", "Cerdo", "Pollo", "Merluza", "Pulpo", "Calamar", "Patata", "Cebolla", "Tomate",
+                "Lechuga", "Huevo", "Leche", "Queso", "Aceite de oliva", "Harina", "Arroz", "Faba", "Chorizo",
+                "Morcilla", "Pimiento", "Ajo", "Nata", "Azúcar", "Pan rallado", "Sal"]
+UNIDADES = ["kg", "l", "ud"]
+TIPOS_INTERACCION = ["Llamada", "Visita", "Email", "WhatsApp", "Reunión"]
+ACCIONES = ["Llamar para seguimiento", "Enviar propuesta", "Revisar carta", "Visita de control",
+            "Actualizar escandallos", "Renovar contrato"]
+
+# ============================================================================
+# UTILIDADES
+# ============================================================================
+
+def _elegir(rng, opciones, n):
+    return np.asarray(opciones, dtype=object)[rng.integers(0, len(opciones), n)]
+
+
+def _fechas(rng, n, desde_dias, hasta_dias, ahora):
+    """Fechas aleatorias entre ahora + desde_dias y ahora + hasta_dias"""
+    return pd.to_datetime(ahora).normalize() + pd.to_timedelta(rng.integers(desde_dias, hasta_dias, n), unit="D")
+
+
+def _telefonos(rng, n):
+    return pd.Series(rng.integers(600000000, 699999999, n)).astype(str).to_numpy(dtype=object)
+
+
+def _nombres_negocio(rng, n):
+    base = pd.Series(_elegir(rng, TIPOS_NEGOCIO, n)) + " " + pd.Series(_elegir(rng, NOMBRES_NEGOCIO, n))
+    return (base + " " + pd.Series(np.arange(1, n + 1)).astype(str)).to_numpy(dtype=object)
+
+
+def _personas(rng, n):
+    return (pd.Series(_elegir(rng, NOMBRES, n)) + " " + pd.Series(_elegir(rng, APELLIDOS, n))).to_numpy(dtype=object)
+
+
+def _emails(nombres):
+    return (pd.Series(nombres).str.lower().str.replace(r"[^a-z0-9]+", ".", regex=True).str.strip(".")
+            + "@ejemplo.es").to_numpy(dtype=object)
+
+
+def _vaciar(rng, valores, fraccion):
+    """Deja vacía una fracción de los valores (para que salten alertas de datos incompletos)"""
+    valores = np.array(valores, dtype=object)
+    valores[rng.random(len(valores)) < fraccion] = ""
+    return valores
+
+# ============================================================================
+# GENERACIÓN
+# ============================================================================
+
+def _generar_crm(rng, n, ahora):
+    ids = np.arange(1, n["clientes"] + 1)
+    nombres = _nombres_negocio(rng, n["clientes"])
+    precio = _elegir(rng, [250, 350, 600], n["clientes"]).astype(float)
+    clientes = pd.DataFrame({
+        'ID': ids,
+        'Nombre Comercial': nombres,
+        'CIF': pd.Series(rng.integers(10000000, 99999999, n["clientes"])).map(lambda x: f"B{x}").to_numpy(),
+        'Tipo Local': _elegir(rng, config.TIPOS_LOCAL, n["clientes"]),
+        'Comercial Asignado': _elegir(rng, COMERCIALES, n["clientes"]),
+        'Teléfono': _vaciar(rng, _telefonos(rng, n["clientes"]), 0.03),
+        'Email': _vaciar(rng, _emails(nombres), 0.05),
+        'Dirección': _vaciar(rng, pd.Series(_elegir(rng, CALLES, n["clientes"])) + " "
+                             + pd.Series(rng.integers(1, 120, n["clientes"])).astype(str), 0.03),
+        'Ciudad': _vaciar(rng, _elegir(rng, CIUDADES, n["clientes"]), 0.03),
+        'Estado': _elegir(rng, ["Activo"] * 8 + ["Pausado", "Baja"], n["clientes"]),
+        'Servicio Contratado': _elegir(rng, config.SERVICIOS, n["clientes"]),
+        'Precio Mensual': precio,
+        'MRR': precio,
+        'Fecha Alta': _fechas(rng, n["clientes"], -1000, -30, ahora),
+        'Fecha Fin': _fechas(rng, n["clientes"], -60, 365, ahora),
+        'Última Actualización': _fechas(rng, n["clientes"], -90, 0, ahora),
+        'Satisfacción (1-5)': rng.integers(1, 6, n["clientes"]),
+        'Notas': "",
+    })
+
+    nombres_leads = _nombres_negocio(rng, n["leads"])
+    leads = pd.DataFrame({
+        'ID': np.arange(1, n["leads"] + 1),
+        'Nombre Comercial': nombres_leads,
+        'Persona Contacto': _personas(rng, n["leads"]),
+        'Email': _emails(nombres_leads),
+        'Teléfono': _telefonos(rng, n["leads"]),
+        'Estado Lead': _elegir(rng, ["Lead"] * 6 + ["Baja", "Cliente"], n["leads"]),
+        'Temas Interés': _elegir(rng, ["Escandallos", "Carta", "Compras", "Formación"], n["leads"]),
+        'Canal Preferido': _elegir(rng, ["Teléfono", "Email", "WhatsApp"], n["leads"]),
+        'Comercial Asignado': _elegir(rng, COMERCIALES, n["leads"]),
+        'Origen': _elegir(rng, config.FUENTES_CAPTACION, n["leads"]),
+        'CIF': "",
+        'Dirección': pd.Series(_elegir(rng, CALLES, n["leads"])) + ", " + pd.Series(_elegir(rng, CIUDADES, n["leads"])),
+        'Notas': "",
+        'Fecha Registro': _fechas(rng, n["leads"], -400, 0, ahora),
+    })
+
+    cliente_int = rng.integers(0, n["clientes"], n["interacciones"])
+    con_accion = rng.random(n["interacciones"]) < 0.6
+    interacciones = pd.DataFrame({
+        'ID': np.arange(1, n["interacciones"] + 1),
+        'ID Cliente': ids[cliente_int],
+        'Nombre Cliente': nombres[cliente_int],
+        'Tipo': _elegir(rng, TIPOS_INTERACCION, n["interacciones"]),
+        'Descripción': "Seguimiento del servicio",
+        'Fecha': _fechas(rng, n["interacciones"], -365, 0, ahora),
+        'Próxima Acción': np.where(con_accion, _elegir(rng, ACCIONES, n["interacciones"]), ""),
+        'Fecha Próxima Acción': pd.Series(_fechas(rng, n["interacciones"], -30, 60, ahora)).where(con_accion),
+        'Usuario': _elegir(rng, COMERCIALES, n["interacciones"]),
+        'Notas': "",
+    })
+
+    servicios = pd.DataFrame([
+        {'ID': i, 'Nombre Servicio': nombre, 'Descripción': datos['descripcion'], 'Precio': datos['precio'], 'Activo': "Sí"}
+        for i, (nombre, datos) in enumerate(config.SERVICIOS_DISPONIBLES.items(), 1)
+    ])
+
+    cliente_contacto = rng.integers(0, n["clientes"], n["contactos"])
+    personas = _personas(rng, n["contactos"])
+    contactos = pd.DataFrame({
+        'ID': np.arange(1, n["contactos"] + 1),
+        'ID Cliente': ids[cliente_contacto],
+        'Nombre Cliente': nombres[cliente_contacto],
+        'Nombre Contacto': personas,
+        'Cargo': _elegir(rng, ["Propietario", "Encargado", "Jefe de cocina", "Sala"], n["contactos"]),
+        'Teléfono': _telefonos(rng, n["contactos"]),
+        'Email': _emails(personas),
+        'WhatsApp': "Sí",
+        'Es Principal': np.where(rng.random(n["contactos"]) < 0.3, "Sí", "No"),
+        'Notas': "",
+        'Fecha Registro': _fechas(rng, n["contactos"], -400, 0, ahora),
+    })
+
+    return {"LEADS": leads, "CLIENTES_ACTIVOS": clientes, "INTERACCIONES": interacciones,
+            "SERVICIOS": servicios, "CONTACTOS": contactos}
+
+
+def _generar_operaciones(rng, n, clientes, ids_proveedor, ahora):
+    # ---- Ingredientes maestro ----
+    ids_ing = np.arange(1, n["ingredientes"] + 1)
+    nombres_ing = (pd.Series(_elegir(rng, INGREDIENTES, n["ingredientes"])) + " "
+                   + pd.Series(ids_ing).astype(str)).to_numpy(dtype=object)
+    unidad_ing = _elegir(rng, UNIDADES, n["ingredientes"])
+    precio_ing = np.round(rng.uniform(0.5, 15, n["ingredientes"]), 2)
+    ingredientes = pd.DataFrame({
+        'ID Ingrediente': ids_ing,
+        'Nombre': nombres_ing,
+        'Categoría': _elegir(rng, config.CATEGORIAS_INGREDIENTE, n["ingredientes"]),
+        'Unidad Compra': unidad_ing,
+        'Precio Mercado Medio': precio_ing,
+        'Var % Semana': np.round(rng.normal(0, 2, n["ingredientes"]), 1),
+        'Var % Mes': np.round(rng.normal(0, 5, n["ingredientes"]), 1),
+        'Última Actualización': _fechas(rng, n["ingredientes"], -30, 0, ahora),
+        'Estacionalidad': "",
+        'Marca': "",
+        'Notas': "",
+    })
+
+    # ---- Escandallos (líneas de ingrediente por plato) ----
+    ids_cliente = clientes['ID'].to_numpy()
+    nombres_cliente = clientes['Nombre Comercial'].to_numpy()
+    ids_plato = np.arange(1, n["platos"] + 1)
+    nombres_plato = (pd.Series(_elegir(rng, PLATOS, n["platos"])) + " "
+                     + pd.Series(_elegir(rng, VARIANTES, n["platos"]))).str.strip().to_numpy(dtype=object)
+
+    plato_linea = np.sort(rng.integers(0, n["platos"], n["lineas_escandallo"]))
+    ing_linea = rng.integers(0, n["ingredientes"], n["lineas_escandallo"])
+    cantidad = np.round(rng.uniform(0.01, 0.25, n["lineas_escandallo"]), 3)
+    coste_linea = np.round(cantidad * precio_ing[ing_linea], 4)
+    coste_plato = np.bincount(plato_linea, weights=coste_linea, minlength=n["platos"])
+    escandallos = pd.DataFrame({
+        'ID Escandallo': np.arange(1, n["lineas_escandallo"] + 1),
+        'ID Plato': ids_plato[plato_linea],
+        'Nombre Plato': nombres_plato[plato_linea],
+        'ID Ingrediente': ids_ing[ing_linea],
+        'Nombre Ingrediente': nombres_ing[ing_linea],
+        'Cantidad': cantidad,
+        'Unidad': unidad_ing[ing_linea],
+        'Coste Unitario': precio_ing[ing_linea],
+        'Coste Total': coste_linea,
+        '% del Plato': np.round(coste_linea / np.where(coste_plato > 0, coste_plato, 1)[plato_linea] * 100, 1),
+        'ID Proveedor': _elegir(rng, ids_proveedor, n["lineas_escandallo"]),
+        'Última Actualización': _fechas(rng, n["lineas_escandallo"], -60, 0, ahora),
+        'Rendimiento %': 100,
+    })
+
+    # ---- Carta (coste = suma de su escandallo) ----
+    cliente_plato = rng.integers(0, len(ids_cliente), n["platos"])
+    coste_plato = np.round(coste_plato, 2)
+    precio_venta = np.round(np.maximum(coste_plato * rng.uniform(2.0, 4.5, n["platos"]), 3.5), 1)
+    margen = precio_venta - coste_plato
+    margen_pct = margen / precio_venta * 100
+    ventas = rng.integers(0, 150, n["platos"])
+    clasificacion = np.select(
+        [(margen_pct >= 60) & (ventas >= 50), margen_pct >= 60, ventas >= 50],
+        ["Estrella", "Rompecabezas", "Caballo"], default="Perro"
+    )
+    carta = pd.DataFrame({
+        'ID Plato': ids_plato,
+        'ID Cliente': ids_cliente[cliente_plato],
+        'Nombre Cliente': nombres_cliente[cliente_plato],
+        'Nombre Plato': nombres_plato,
+        'Categoría': _elegir(rng, config.CATEGORIAS_PLATO, n["platos"]),
+        'Precio Venta': precio_venta,
+        'Coste Total': coste_plato,
+        'Margen €': np.round(margen, 2),
+        'Margen %': np.round(margen_pct, 1),
+        'Food Cost %': np.round(coste_plato / precio_venta * 100, 1),
+        'Ventas/Mes': ventas,
+        'Clasificación': clasificacion,
+        'Precio Recomendado': np.round(np.where(coste_plato > 0, coste_plato / 0.28, precio_venta), 2),
+        'Activo': np.where(rng.random(n["platos"]) < 0.9, "Sí", "No"),
+        'Notas': "",
+    })
+
+    # ---- Precios por cliente ----
+    cliente_precio = rng.integers(0, len(ids_cliente), n["precios_cliente"])
+    ing_precio = rng.integers(0, n["ingredientes"], n["precios_cliente"])
+    precio_cliente = np.round(precio_ing[ing_precio] * rng.uniform(0.85, 1.35, n["precios_cliente"]), 2)
+    precios = pd.DataFrame({
+        'ID Precio': np.arange(1, n["precios_cliente"] + 1),
+        'ID Cliente': ids_cliente[cliente_precio],
+        'Nombre Cliente': nombres_cliente[cliente_precio],
+        'ID Ingrediente': ids_ing[ing_precio],
+        'Nombre Ingrediente': nombres_ing[ing_precio],
+        'Precio Cliente': precio_cliente,
+        'Unidad': unidad_ing[ing_precio],
+        'Precio Mercado Referencia': precio_ing[ing_precio],
+        'Desviación %': np.round((precio_cliente / precio_ing[ing_precio] - 1) * 100, 1),
+        'Última Actualización': _fechas(rng, n["precios_cliente"], -90, 0, ahora),
+        'ID Proveedor': _elegir(rng, ids_proveedor, n["precios_cliente"]),
+        'Notas': "",
+    })
+
+    # ---- Compras (cabecera + líneas) ----
+    cliente_compra = rng.integers(0, len(ids_cliente), n["compras"])
+    compra_linea = rng.integers(0, n["compras"], n["lineas_compra"])
+    ing_compra = rng.integers(0, n["ingredientes"], n["lineas_compra"])
+    cantidad_compra = np.round(rng.uniform(1, 25, n["lineas_compra"]), 2)
+    precio_compra = np.round(precio_ing[ing_compra] * rng.uniform(0.8, 1.5, n["lineas_compra"]), 2)
+    total_linea = np.round(cantidad_compra * precio_compra, 2)
+    lineas_compra = pd.DataFrame({
+        'ID Línea': np.arange(1, n["lineas_compra"] + 1),
+        'ID Compra': compra_linea + 1,
+        'ID Ingrediente': ids_ing[ing_compra],
+        'Nombre Ingrediente': nombres_ing[ing_compra],
+        'Cantidad': cantidad_compra,
+        'Unidad': unidad_ing[ing_compra],
+        'Precio Unitario': precio_compra,
+        'Total': total_linea,
+    })
+    compras = pd.DataFrame({
+        'ID Compra': np.arange(1, n["compras"] + 1),
+        'ID Cliente': ids_cliente[cliente_compra],
+        'Nombre Cliente': nombres_cliente[cliente_compra],
+        'Fecha': _fechas(rng, n["compras"], -180, 0, ahora),
+        'Total': np.round(np.bincount(compra_linea, weights=total_linea, minlength=n["compras"]), 2),
+        'Proveedor': _elegir(rng, ids_proveedor, n["compras"]),
+        'Descripción': "Pedido semanal",
+        'Número Factura': pd.Series(np.arange(1, n["compras"] + 1)).map(lambda x: f"F-{x:06d}").to_numpy(),
+    })
+
+    return {"CARTA_CLIENTES": carta, "ESCANDALLOS": escandallos, "INGREDIENTES_MAESTRO": ingredientes,
+            "PRECIOS_POR_CLIENTE": precios, "COMPRAS_CLIENTE": compras, "LINEAS_COMPRA": lineas_compra}
+
+
+def _generar_proveedores(rng, n):
+    nombres = (pd.Series(_elegir(rng, ["Distribuciones", "Pescados", "Cárnicas", "Frutas", "Lácteos"], n["proveedores"]))
+               + " " + pd.Series(_elegir(rng, APELLIDOS, n["proveedores"]))
+               + " " + pd.Series(np.arange(1, n["proveedores"] + 1)).astype(str)).to_numpy(dtype=object)
+    return {"PROVEEDORES": pd.DataFrame({
+        'ID Proveedor': np.arange(1, n["proveedores"] + 1),
+        'Nombre Comercial': nombres,
+        'CIF': pd.Series(rng.integers(10000000, 99999999, n["proveedores"])).map(lambda x: f"A{x}").to_numpy(),
+        'Tipo': _elegir(rng, config.TIPOS_PROVEEDOR, n["proveedores"]),
+        'Especialidad': _elegir(rng, config.CATEGORIAS_INGREDIENTE, n["proveedores"]),
+        'Teléfono': _telefonos(rng, n["proveedores"]),
+        'Email': _emails(nombres),
+        'Contacto': _personas(rng, n["proveedores"]),
+        'Condiciones Pago': _elegir(rng, ["Contado", "30 días", "60 días"], n["proveedores"]),
+        'Pedido Mínimo': _elegir(rng, [0, 50, 100, 150], n["proveedores"]),
+        'Envío Gratis': _elegir(rng, ["Sí", "No"], n["proveedores"]),
+        'Coste Envío': _elegir(rng, [0, 5, 10, 15], n["proveedores"]),
+        'Días Entrega': _elegir(rng, ["L-V", "L-X-V", "M-J"], n["proveedores"]),
+        'Calidad (1-5)': rng.integers(2, 6, n["proveedores"]),
+        'Servicio (1-5)': rng.integers(2, 6, n["proveedores"]),
+        'Precio (1-5)': rng.integers(2, 6, n["proveedores"]),
+        'Activo': "Sí",
+        'Notas': "",
+    })}
+
+
+def _generar_empresa(rng, n, clientes, ahora):
+    meses = pd.date_range(end=pd.Timestamp(ahora).normalize(), periods=24, freq="MS")
+    ingresos = np.round(rng.uniform(8000, 25000, len(meses)), 2)
+    gastos = np.round(ingresos * rng.uniform(0.4, 0.8, len(meses)), 2)
+    kpis = pd.DataFrame({
+        'Mes': meses.month, 'Año': meses.year, 'Ingresos': ingresos, 'Gastos': gastos,
+        'Beneficio': ingresos - gastos, 'ROI %': np.round((ingresos - gastos) / gastos * 100, 1),
+    })
+    facturacion = pd.DataFrame({
+        'ID Factura': np.arange(1, n["facturas"] + 1),
+        'Fecha': _fechas(rng, n["facturas"], -730, 0, ahora),
+        'ID Cliente': _elegir(rng, clientes['ID'].to_numpy(), n["facturas"]),
+        'Concepto': "Cuota mensual",
+        'Importe': _elegir(rng, [250, 350, 600], n["facturas"]).astype(float),
+        'Estado': _elegir(rng, ["Cobrada"] * 8 + ["Pendiente", "Vencida"], n["facturas"]),
+    })
+    gastos_df = pd.DataFrame({
+        'ID Gasto': np.arange(1, n["gastos"] + 1),
+        'Fecha': _fechas(rng, n["gastos"], -730, 0, ahora),
+        'Categoría': _elegir(rng, ["Desplazamientos", "Software", "Formación", "Material", "Comidas"], n["gastos"]),
+        'Descripción': "",
+        'Importe': np.round(rng.uniform(5, 400, n["gastos"]), 2),
+        'Proveedor': "",
+    })
+    return {"KPIS_MENSUALES": kpis, "FACTURACION": facturacion, "GASTOS": gastos_df}
+
+
+def _generar_cambios(rng, n, clientes, ahora):
+    cliente = rng.integers(0, len(clientes), n["cambios"])
+    es_precio = rng.random(n["cambios"]) < 0.5
+    anterior = np.round(rng.uniform(5, 30, n["cambios"]), 2)
+    nuevo = np.round(anterior * rng.uniform(0.8, 1.3, n["cambios"]), 2)
+    fechas = pd.to_datetime(ahora) - pd.to_timedelta(rng.integers(0, 14 * 24 * 3600, n["cambios"]), unit="s")
+    return pd.DataFrame({
+        'Fecha': fechas.strftime("%d/%m/%Y %H:%M:%S"),
+        'Tipo': np.where(es_precio, "precio", "datos"),
+        'ID Cliente': clientes['ID'].to_numpy()[cliente],
+        'Nombre Cliente': clientes['Nombre Comercial'].to_numpy()[cliente],
+        'Campo': np.where(es_precio, _elegir(rng, PLATOS, n["cambios"]), _elegir(rng, ["Teléfono", "Email", "Dirección"], n["cambios"])),
+        'Valor Anterior': np.where(es_precio, anterior.astype(str), "antiguo"),
+        'Valor Nuevo': np.where(es_precio, nuevo.astype(str), "nuevo"),
+        'Detalle': "",
+    })
+
+
+def generar_datos(escala="pequena", semilla=SEMILLA, ahora=None):
+    """
+    Juego de datos completo y coherente (IDs, nombres y costes cuadran entre hojas)
+
+    Args:
+        escala: clave de ESCALAS o dict con el número de filas de cada tabla
+        semilla: semilla del generador (mismos datos en cada ejecución)
+        ahora: fecha de referencia (por defecto, hoy)
+
+    Returns:
+        Dict {nombre de archivo: {hoja: DataFrame}} con todas las hojas de
+        ESTRUCTURA_ESPERADA (vacías las que no se generan) y el CSV de cambios
+        en la clave ARCHIVO_CAMBIOS
+    """
+    import sincronizacion
+
+    n = ESCALAS[escala] if isinstance(escala, str) else {**ESCALAS["pequena"], **escala}
+    rng = np.random.default_rng(semilla)
+    ahora = ahora or datetime.now()
+
+    crm = _generar_crm(rng, n, ahora)
+    proveedores = _generar_proveedores(rng, n)
+    ids_proveedor = proveedores["PROVEEDORES"]['ID Proveedor'].to_numpy()
+    hojas = {
+        **crm,
+        **_generar_operaciones(rng, n, crm["CLIENTES_ACTIVOS"], ids_proveedor, ahora),
+        **proveedores,
+        **_generar_empresa(rng, n, crm["CLIENTES_ACTIVOS"], ahora),
+    }
+
+    datos = {}
+    for archivo, estructura in sincronizacion.ESTRUCTURA_ESPERADA.items():
+        nombre_archivo = os.path.basename(archivo)
+        estructura = {**estructura, **HOJAS_EXTRA.get(nombre_archivo, {})}
+        datos[nombre_archivo] = {}
+        for hoja, columnas in estructura.items():
+            columnas = columnas + [c for c in COLUMNAS_EXTRA.get(hoja, []) if c not in columnas]
+            df = hojas.get(hoja, pd.DataFrame())
+            datos[nombre_archivo][hoja] = df.reindex(columns=columnas)
+
+    datos[ARCHIVO_CAMBIOS] = _generar_cambios(rng, n, crm["CLIENTES_ACTIVOS"], ahora)
+    return datos
+
+# ============================================================================
+# ESCRITURA Y USO
+# ============================================================================
+
+def guardar_datos(datos, destino):
+    """
+    Escribe los libros (y el CSV de cambios) en 'destino'
+
+    Returns:
+        Lista de rutas escritas
+    """
+    os.makedirs(destino, exist_ok=True)
+    rutas = []
+    for nombre_archivo, contenido in datos.items():
+        ruta = os.path.join(destino, nombre_archivo)
+        if isinstance(contenido, pd.DataFrame):
+            contenido.to_csv(ruta, index=False, encoding="utf-8")
+        else:
+            with pd.ExcelWriter(ruta, engine="openpyxl") as writer:
+                for hoja, df in contenido.items():
+                    df.to_excel(writer, sheet_name=hoja, index=False)
+        filas = len(contenido) if isinstance(contenido, pd.DataFrame) else sum(len(df) for df in contenido.values())
+        print(f"[BATCH] {nombre_archivo}: {filas} filas")
+        rutas.append(ruta)
+    return rutas
+
+
+def apuntar_config(destino):
+    """
+    Redirige las rutas de config a 'destino'
+
+    Llamar antes de importar los módulos que fijan rutas al importarse
+    (tracking_cambios, tabla_alertas, snapshots...).
+    """
+    config.RUTA_DATOS = destino
+    config.ARCHIVO_CRM = os.path.join(destino, "CLIENTES.xlsx")
+    config.ARCHIVO_OPERACIONES = os.path.join(destino, "OPERACIONES_ESCANDALLOS.xlsx")
+    config.ARCHIVO_PROVEEDORES = os.path.join(destino, "PROVEEDORES_MERCADO.xlsx")
+    config.ARCHIVO_EMPRESA = os.path.join(destino, "EMPRESA_BACKOFFICE.xlsx")
+    config.RUTA_INVENTARIOS = os.path.join(destino, "inventarios")
+
+
+def generar(escala="pequena", destino=None, semilla=SEMILLA):
+    """Genera y guarda un juego de datos; devuelve (carpeta, datos)"""
+    if destino is None:
+        import tempfile
+        destino = tempfile.mkdtemp(prefix=f"crm_horeca_{escala}_")
+
+    inicio = datetime.now()
+    datos = generar_datos(escala, semilla)
+    guardar_datos(datos, destino)
+    print(f"[BATCH] Datos '{escala}' generados en {destino} ({(datetime.now() - inicio).total_seconds():.1f}s)")
+    return destino, datos
+
+
+if __name__ == "__main__":
+    import sys
+
+    escala = sys.argv[1] if len(sys.argv) > 1 else "pequena"
+    destino = sys.argv[2] if len(sys.argv) > 2 else None
+    if escala not in ESCALAS:
+        print(f"Escala desconocida '{escala}'. Opciones: {', '.join(ESCALAS)}")
+        sys.exit(1)
+
+    generar(escala, destino)
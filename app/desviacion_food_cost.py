@@ -0,0 +1,189 @@
+"""
+DESVIACION_FOOD_COST.PY - Food cost teórico vs real
+Explota las ventas de la carta a través de la matriz de recetas y compara
+el consumo teórico de cada ingrediente con lo comprado por cliente y mes
+"""
+
+import numpy as np
+import pandas as pd
+import config
+import utils
+import matriz_recetas
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# PVP con IVA → base imponible (mismo criterio que los escandallos)
+IVA_HOSTELERIA = 1.10
+
+COLUMNAS_DESVIACION = [
+    'ID Cliente', 'Periodo', 'ID Ingrediente', 'Nombre Ingrediente',
+    'Teórico', 'Comprado', 'Desviación', 'Desviación %', 'Precio Medio',
+    'Coste Teórico', 'Coste Comprado', 'Fuga €'
+]
+
+# ============================================================================
+# CÁLCULO
+# ============================================================================
+
+def _carta_activa(df_carta):
+    """Platos activos con ventas, claves normalizadas"""
+    df = df_carta.copy()
+    if 'Activo' in df.columns:
+        df = df[df['Activo'] == 'Sí']
+
+    df['Clave Plato'] = utils.clave_id(df['ID Plato'])
+    df['Clave Cliente'] = utils.clave_id(df['ID Cliente'])
+    df['Ventas/Mes'] = pd.to_numeric(df.get('Ventas/Mes'), errors='coerce').fillna(0)
+    df['Precio Venta'] = pd.to_numeric(df.get('Precio Venta'), errors='coerce').fillna(0)
+    return df.drop_duplicates('Clave Plato')
+
+
+def consumo_teorico(df_esc, df_carta):
+    """
+    Consumo teórico mensual por cliente e ingrediente
+
+    consumo = Aᵀ · ventas, con A la matriz plato × ingrediente base
+    (sub-recetas explotadas), desglosado por cliente en una sola operación.
+
+    Returns:
+        Tupla (DataFrame con 'ID Cliente', 'ID Ingrediente' y 'Teórico', matriz)
+    """
+    import explosion_recetas
+
+    carta = _carta_activa(df_carta)
+    esc, _ = explosion_recetas.aplanar_escandallos(df_esc)
+    esc = esc[esc['ID Plato'].isin(carta['Clave Plato'])]
+    matriz = matriz_recetas.construir_matriz(esc)
+
+    if not len(matriz['platos']):
+        return pd.DataFrame(columns=['ID Cliente', 'ID Ingrediente', 'Teórico']), matriz
+
+    carta = carta.set_index('Clave Plato').reindex(matriz['platos'])
+    teorico = matriz_recetas.consumo_por_grupo(
+        matriz, carta['Ventas/Mes'].to_numpy(dtype=np.float64), carta['Clave Cliente'].to_numpy()
+    )
+    teorico.columns = ['ID Cliente', 'ID Ingrediente', 'Teórico']
+    return teorico, matriz
+
+
+def calcular_desviacion(df_esc, df_carta, df_compras_lineas):
+    """
+    Desviación consumo teórico vs compras por cliente, mes e ingrediente
+
+    Args:
+        df_esc: ESCANDALLOS
+        df_carta: CARTA_CLIENTES (Ventas/Mes, Precio Venta, ID Cliente)
+        df_compras_lineas: consumo_real.lineas_compra_cliente()
+
+    Returns:
+        DataFrame con COLUMNAS_DESVIACION; 'Fuga €' > 0 = se compra más
+        de lo que justifican las ventas
+    """
+    teorico, matriz = consumo_teorico(df_esc, df_carta)
+
+    if df_compras_lineas is None or df_compras_lineas.empty:
+        return pd.DataFrame(columns=COLUMNAS_DESVIACION)
+
+    compras = df_compras_lineas.assign(**{
+        'ID Cliente': utils.clave_id(df_compras_lineas['ID Cliente']),
+        'Periodo': df_compras_lineas['Fecha'].dt.to_period('M').astype(str),
+    })
+    comprado = compras.groupby(['ID Cliente', 'Periodo', 'ID Ingrediente'], as_index=False).agg(
+        **{'Comprado': ('Cantidad', 'sum'), 'Coste Comprado': ('Importe', 'sum')}
+    )
+
+    # El teórico mensual se repite en cada mes con compras del cliente
+    periodos = compras[['ID Cliente', 'Periodo']].drop_duplicates()
+    teorico_periodo = teorico.merge(periodos, on='ID Cliente')
+
+    df = teorico_periodo.merge(comprado, on=['ID Cliente', 'Periodo', 'ID Ingrediente'], how='outer')
+    df[['Teórico', 'Comprado', 'Coste Comprado']] = df[['Teórico', 'Comprado', 'Coste Comprado']].fillna(0.0)
+
+    # Precio: medio pagado por el cliente; si no compró, coste unitario del escandallo
+    pagado = compras.groupby(['ID Cliente', 'ID Ingrediente'])[['Importe', 'Cantidad']].sum()
+    precio_pagado = (pagado['Importe'] / pagado['Cantidad'].where(pagado['Cantidad'] > 0)).rename('Precio Medio')
+    df = df.merge(precio_pagado.reset_index(), on=['ID Cliente', 'ID Ingrediente'], how='left')
+
+    if not df_esc.empty and 'Coste Unitario' in df_esc.columns:
+        esc_base = df_esc[~matriz_recetas.es_subreceta(df_esc)]
+        coste_esc = pd.to_numeric(esc_base['Coste Unitario'], errors='coerce').groupby(
+            utils.clave_id(esc_base['ID Ingrediente'])).mean()
+        df['Precio Medio'] = df['Precio Medio'].fillna(df['ID Ingrediente'].map(coste_esc))
+    df['Precio Medio'] = df['Precio Medio'].fillna(0.0)
+
+    df['Desviación'] = df['Comprado'] - df['Teórico']
+    df['Desviación %'] = (df['Desviación'] / df['Teórico'].where(df['Teórico'] > 0) * 100).round(1)
+    df['Coste Teórico'] = df['Teórico'] * df['Precio Medio']
+    df['Fuga €'] = df['Desviación'] * df['Precio Medio']
+
+    nombres = compras.dropna(subset=['Nombre Ingrediente']).drop_duplicates('ID Ingrediente')
+    nombres = nombres.set_index('ID Ingrediente')['Nombre Ingrediente']
+    nombres = matriz['nombres'].combine_first(nombres)
+    df['Nombre Ingrediente'] = df['ID Ingrediente'].map(nombres).fillna(df['ID Ingrediente'])
+
+    for col in ['Teórico', 'Comprado', 'Desviación', 'Precio Medio', 'Coste Teórico', 'Coste Comprado', 'Fuga €']:
+        df[col] = df[col].round(2)
+
+    return df[COLUMNAS_DESVIACION].sort_values(['ID Cliente', 'Periodo', 'Fuga €'], ascending=[True, True, False])
+
+
+def ranking_fugas(df_desviacion, top=None):
+    """Ingredientes ordenados por € de fuga acumulada (cliente × ingrediente)"""
+    if df_desviacion.empty:
+        return pd.DataFrame()
+
+    ranking = df_desviacion.groupby(['ID Cliente', 'ID Ingrediente', 'Nombre Ingrediente'], as_index=False).agg(
+        **{
+            'Meses': ('Periodo', 'nunique'),
+            'Teórico': ('Teórico', 'sum'),
+            'Comprado': ('Comprado', 'sum'),
+            'Fuga €': ('Fuga €', 'sum'),
+        }
+    ).sort_values('Fuga €', ascending=False)
+
+    return ranking.head(top) if top else ranking
+
+
+def food_cost_periodo(df_desviacion, df_carta):
+    """
+    Food cost % teórico vs real por cliente y mes
+
+    Ventas netas mensuales = Σ Ventas/Mes × PVP / 1.10
+    """
+    if df_desviacion.empty:
+        return pd.DataFrame()
+
+    carta = _carta_activa(df_carta)
+    ventas = (carta['Ventas/Mes'] * carta['Precio Venta'] / IVA_HOSTELERIA).groupby(carta['Clave Cliente']).sum()
+
+    df = df_desviacion.groupby(['ID Cliente', 'Periodo'], as_index=False)[
+        ['Coste Teórico', 'Coste Comprado', 'Fuga €']].sum()
+    df['Ventas Netas'] = df['ID Cliente'].map(ventas).fillna(0)
+
+    base = df['Ventas Netas'].where(df['Ventas Netas'] > 0)
+    df['Food Cost Teórico %'] = (df['Coste Teórico'] / base * 100).round(1)
+    df['Food Cost Real %'] = (df['Coste Comprado'] / base * 100).round(1)
+    df['Diferencia pp'] = (df['Food Cost Real %'] - df['Food Cost Teórico %']).round(1)
+    return df
+
+# ============================================================================
+# CARGA
+# ============================================================================
+
+def ejecutar_desviacion():
+    """
+    Desviación de toda la cartera con una lectura de cada hoja
+
+    Returns:
+        Tupla (df_desviacion, df_carta)
+    """
+    import consumo_real
+
+    df_esc = utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+    df_carta = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+    if df_carta.empty:
+        return pd.DataFrame(columns=COLUMNAS_DESVIACION), df_carta
+
+    return calcular_desviacion(df_esc, df_carta, consumo_real.cargar_compras()), df_carta
@@ -0,0 +1,351 @@
+"""
+DUPLICADOS.PY - Detección de leads y clientes duplicados
+CIF, teléfono y email normalizados, claves de bloqueo para comparar solo
+registros que comparten alguna clave (sin O(n²)), similitud difusa de
+nombre y dirección, y agrupación de duplicados entre LEADS y CLIENTES_ACTIVOS
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import config
+import utils
+import buscador
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# Palabras que no distinguen un local de otro ("Bar El Sol" ≈ "Sol")
+PALABRAS_GENERICAS = {
+    'bar', 'bares', 'restaurante', 'rest', 'cafe', 'cafeteria', 'cerveceria', 'taberna',
+    'meson', 'tasca', 'asador', 'pizzeria', 'marisqueria', 'hotel', 'hostal', 'grupo',
+    'el', 'la', 'los', 'las', 'de', 'del', 'y', 'e', 'sl', 'slu', 'sa', 'cb', 's', 'l', 'u',
+}
+
+# Peso de cada señal en la puntuación (CIF igual = duplicado seguro)
+PESO_NOMBRE = 0.8
+PESO_DIRECCION = 0.2
+PESO_CONTACTO = 0.4
+
+# Puntuación mínima para considerar dos registros duplicados
+UMBRAL_DUPLICADO = 0.75
+
+# Puntuación mínima para avisar en el alta (basta un teléfono o email igual)
+UMBRAL_AVISO_ALTA = 0.4
+
+# Bloques por palabra del nombre con más registros que esto se ignoran
+# (palabras demasiado comunes para discriminar)
+MAX_BLOQUE_NOMBRE = 200
+
+# Pares que solo comparten palabras del nombre: fracción mínima de palabras
+# comunes para calcular su similitud (descarta 'Sol Playa' / 'Sol Monte')
+MIN_PALABRAS_COMUNES = 0.5
+
+COLUMNAS_REGISTRO = ['Origen', 'ID', 'Nombre Comercial', 'CIF', 'Teléfono', 'Email', 'Dirección']
+
+# Registros preparados de la última llamada (huella → DataFrame)
+_preparados = {}
+
+# ============================================================================
+# NORMALIZACIÓN
+# ============================================================================
+
+def normalizar_cif(serie):
+    """'es-b12.345.678' → 'B12345678'"""
+    cif = serie.fillna('').astype(str).str.upper().str.replace(r'[^0-9A-Z]', '', regex=True)
+    return cif.str.replace(r'^ES(?=[0-9A-Z]{9}$)', '', regex=True)
+
+
+def normalizar_telefono(serie):
+    """Últimos 9 dígitos ('+34 600 11 22 33', '0034600112233' y 600112233.0 → '600112233')"""
+    digitos = utils.clave_id(serie.fillna('')).str.replace(r'\D', '', regex=True)
+    return digitos.str[-9:].where(digitos.str.len() >= 6, '')
+
+
+def normalizar_email(serie):
+    return serie.fillna('').astype(str).str.strip().str.lower().where(lambda s: s.str.contains('@'), '')
+
+
+def normalizar_nombre(serie):
+    """Nombre sin acentos ni palabras genéricas ('Bar El Sol, S.L.' → 'sol')"""
+    palabras = buscador.normalizar_serie(serie).str.split()
+    return palabras.map(lambda p: ' '.join(w for w in p if w not in PALABRAS_GENERICAS) if isinstance(p, list) else '')
+
+# ============================================================================
+# PREPARACIÓN Y BLOQUEO
+# ============================================================================
+
+def _columna(df, columna):
+    if columna in df.columns:
+        return df[columna]
+    return pd.Series('', index=df.index, dtype=object)
+
+
+def preparar_registros(df_leads, df_clientes):
+    """
+    LEADS + CLIENTES_ACTIVOS en un solo DataFrame con campos normalizados
+
+    Los leads ya convertidos ('Estado Lead' = Cliente) se omiten: siguen en
+    LEADS con los mismos datos que el cliente creado y saldrían siempre
+    como duplicados.
+
+    Returns:
+        DataFrame con COLUMNAS_REGISTRO + 'CIF Norm', 'Tel Norm', 'Email Norm',
+        'Nombre Norm' y 'Dirección Norm'
+    """
+    if df_leads is not None and 'Estado Lead' in df_leads.columns:
+        convertidos = df_leads['Estado Lead'].astype(str).str.strip().str.casefold() == 'cliente'
+        df_leads = df_leads[~convertidos]
+
+    partes = []
+    for origen, df in (('LEADS', df_leads), ('CLIENTES_ACTIVOS', df_clientes)):
+        if df is None or df.empty:
+            continue
+        partes.append(pd.DataFrame({
+            'Origen': origen,
+            **{c: _columna(df, c).to_numpy() for c in COLUMNAS_REGISTRO[1:]},
+        }))
+
+    if not partes:
+        return pd.DataFrame(columns=COLUMNAS_REGISTRO)
+
+    df = pd.concat(partes, ignore_index=True)
+    df['ID'] = utils.clave_id(df['ID'])
+
+    huella = utils.hash_datos(df)
+    if huella in _preparados:
+        return _preparados[huella]
+
+    df['CIF Norm'] = normalizar_cif(df['CIF'])
+    df['Tel Norm'] = normalizar_telefono(df['Teléfono'])
+    df['Email Norm'] = normalizar_email(df['Email'])
+    df['Nombre Norm'] = normalizar_nombre(df['Nombre Comercial'])
+    df['Dirección Norm'] = buscador.normalizar_serie(df['Dirección'])
+
+    _preparados.clear()
+    _preparados[huella] = df
+    return df
+
+
+def claves_bloqueo(df):
+    """
+    Pares (fila, clave): CIF, teléfono, email, nombre completo y cada
+    palabra del nombre
+
+    Dos registros solo se comparan si comparten alguna clave.
+    """
+    partes = []
+    for prefijo, columna in (('cif', 'CIF Norm'), ('tel', 'Tel Norm'), ('email', 'Email Norm'),
+                             ('nombre', 'Nombre Norm')):
+        valores = df[columna]
+        validos = valores != ''
+        partes.append(pd.DataFrame({'fila': df.index[validos], 'clave': prefijo + ':' + valores[validos]}))
+
+    palabras = df['Nombre Norm'].str.split().explode().dropna()
+    palabras = palabras[palabras.str.len() >= 3]
+    bloques = pd.DataFrame({'fila': palabras.index, 'clave': 'nom:' + palabras.to_numpy()}).drop_duplicates()
+    tamano = bloques.groupby('clave')['fila'].transform('size')
+    partes.append(bloques[tamano <= MAX_BLOQUE_NOMBRE])
+
+    return pd.concat(partes, ignore_index=True)
+
+
+def pares_candidatos(df):
+    """
+    Pares (a, b) con a < b que comparten al menos una clave de bloqueo
+
+    Los que solo coinciden en palabras del nombre se quedan si comparten al
+    menos MIN_PALABRAS_COMUNES de sus palabras.
+    """
+    bloques = claves_bloqueo(df)
+    pares = bloques.merge(bloques, on='clave', suffixes=('_a', '_b'))
+    pares = pares[pares['fila_a'] < pares['fila_b']]
+
+    pares['nombre'] = pares['clave'].str.startswith('nom:')
+    resumen = pares.groupby(['fila_a', 'fila_b'], sort=False)['nombre'].agg(['size', 'sum', 'all']).reset_index()
+
+    palabras = df['Nombre Norm'].str.split().str.len().fillna(0).to_numpy()
+    union = palabras[resumen['fila_a']] + palabras[resumen['fila_b']] - resumen['sum'].to_numpy()
+    parecidos = resumen['sum'].to_numpy() / np.maximum(union, 1) >= MIN_PALABRAS_COMUNES
+    resumen = resumen[~resumen['all'].to_numpy() | parecidos]
+    return resumen[['fila_a', 'fila_b']].reset_index(drop=True)
+
+# ============================================================================
+# PUNTUACIÓN
+# ============================================================================
+
+def _trigramas(texto):
+    marcado = f"  {texto} "
+    return {marcado[i:i + 3] for i in range(len(marcado) - 2)} if texto else set()
+
+
+def similitud(textos_a, textos_b):
+    """Similitud de Jaccard de trigramas, par a par (0 si alguno está vacío)"""
+    cache = {}
+
+    def _gramas(texto):
+        if texto not in cache:
+            cache[texto] = _trigramas(texto)
+        return cache[texto]
+
+    resultado = np.zeros(len(textos_a))
+    for i, (a, b) in enumerate(zip(textos_a, textos_b)):
+        if not a or not b:
+            continue
+        if a == b:
+            resultado[i] = 1.0
+            continue
+        ga, gb = _gramas(a), _gramas(b)
+        resultado[i] = len(ga & gb) / len(ga | gb)
+    return resultado
+
+
+def puntuar_pares(df, pares):
+    """
+    Puntuación de duplicado de cada par y motivo
+
+    CIF igual → 1. Si no: nombre y dirección difusos más teléfono/email iguales.
+    """
+    a = df.loc[pares['fila_a']].reset_index(drop=True)
+    b = df.loc[pares['fila_b']].reset_index(drop=True)
+
+    cif = (a['CIF Norm'] != '') & (a['CIF Norm'] == b['CIF Norm'])
+    tel = (a['Tel Norm'] != '') & (a['Tel Norm'] == b['Tel Norm'])
+    email = (a['Email Norm'] != '') & (a['Email Norm'] == b['Email Norm'])
+    nombre = similitud(a['Nombre Norm'].tolist(), b['Nombre Norm'].tolist())
+    direccion = similitud(a['Dirección Norm'].tolist(), b['Dirección Norm'].tolist())
+
+    puntuacion = PESO_NOMBRE * nombre + PESO_DIRECCION * direccion + PESO_CONTACTO * (tel | email)
+    puntuacion = np.where(cif, 1.0, np.minimum(puntuacion, 1.0))
+
+    motivo = pd.Series('', index=a.index)
+    for mascara, texto in ((cif, 'CIF'), (tel, 'Teléfono'), (email, 'Email'), (nombre >= 0.6, 'Nombre'),
+                           (direccion >= 0.6, 'Dirección')):
+        motivo = motivo + np.where(mascara, texto + ', ', '')
+
+    resultado = pares.copy()
+    resultado['Puntuación'] = puntuacion.round(3)
+    resultado['Similitud Nombre'] = nombre.round(3)
+    resultado['Motivo'] = motivo.str[:-2].to_numpy()
+    return resultado
+
+# ============================================================================
+# DETECCIÓN
+# ============================================================================
+
+def _agrupar(n, pares):
+    """Componentes conexas de los pares (unión-búsqueda)"""
+    padre = list(range(n))
+
+    def raiz(x):
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]
+            x = padre[x]
+        return x
+
+    for x, y in zip(pares['fila_a'], pares['fila_b']):
+        rx, ry = raiz(x), raiz(y)
+        if rx != ry:
+            padre[max(rx, ry)] = min(rx, ry)
+    return np.array([raiz(x) for x in range(n)])
+
+
+def detectar_duplicados(df_leads=None, df_clientes=None, umbral=UMBRAL_DUPLICADO):
+    """
+    Duplicados entre LEADS y CLIENTES_ACTIVOS
+
+    Args:
+        df_leads, df_clientes: Hojas (si None se leen del CRM)
+        umbral: Puntuación mínima
+
+    Returns:
+        (df_pares, df_grupos): pares con puntuación y motivo, y registros
+        agrupados ('Grupo') de los grupos con más de un registro
+    """
+    inicio = time.perf_counter()
+    if df_leads is None:
+        df_leads = utils.leer_excel(config.ARCHIVO_CRM, "LEADS")
+    if df_clientes is None:
+        df_clientes = utils.leer_excel(config.ARCHIVO_CRM, "CLIENTES_ACTIVOS")
+
+    df = preparar_registros(df_leads, df_clientes)
+    if df.empty:
+        return pd.DataFrame(), pd.DataFrame()
+
+    pares = puntuar_pares(df, pares_candidatos(df))
+    pares = pares[pares['Puntuación'] >= umbral].sort_values('Puntuación', ascending=False)
+
+    raices = _agrupar(len(df), pares)
+    tamano = pd.Series(raices).map(pd.Series(raices).value_counts()).to_numpy()
+    grupos = df.loc[tamano > 1, COLUMNAS_REGISTRO].copy()
+    grupos.insert(0, 'Grupo', pd.factorize(raices[tamano > 1])[0] + 1)
+    grupos = grupos.sort_values(['Grupo', 'Origen'], kind='stable')
+
+    df_pares = pd.DataFrame({
+        'Origen A': df.loc[pares['fila_a'], 'Origen'].to_numpy(),
+        'ID A': df.loc[pares['fila_a'], 'ID'].to_numpy(),
+        'Nombre A': df.loc[pares['fila_a'], 'Nombre Comercial'].to_numpy(),
+        'Origen B': df.loc[pares['fila_b'], 'Origen'].to_numpy(),
+        'ID B': df.loc[pares['fila_b'], 'ID'].to_numpy(),
+        'Nombre B': df.loc[pares['fila_b'], 'Nombre Comercial'].to_numpy(),
+        'Puntuación': pares['Puntuación'].to_numpy(),
+        'Motivo': pares['Motivo'].to_numpy(),
+    })
+
+    print(f"[DEBUG] Duplicados: {len(df)} registros, {len(df_pares)} pares, "
+          f"{grupos['Grupo'].nunique()} grupos ({time.perf_counter() - inicio:.2f}s)")
+    return df_pares, grupos.reset_index(drop=True)
+
+
+def buscar_duplicados_de(registro, df_leads=None, df_clientes=None, umbral=UMBRAL_AVISO_ALTA):
+    """
+    Comprobación previa al alta: registros existentes parecidos a uno nuevo
+
+    Args:
+        registro: Dict con 'Nombre Comercial', 'Teléfono', 'Email', 'CIF', 'Dirección'
+
+    Returns:
+        DataFrame con COLUMNAS_REGISTRO + 'Puntuación' y 'Motivo', mejores primero
+    """
+    if df_leads is None:
+        df_leads = utils.leer_excel(config.ARCHIVO_CRM, "LEADS")
+    if df_clientes is None:
+        df_clientes = utils.leer_excel(config.ARCHIVO_CRM, "CLIENTES_ACTIVOS")
+
+    existentes = preparar_registros(df_leads, df_clientes)
+    if existentes.empty:
+        return pd.DataFrame(columns=COLUMNAS_REGISTRO + ['Puntuación', 'Motivo'])
+
+    nuevo = pd.DataFrame([{c: registro.get(c, '') for c in COLUMNAS_REGISTRO[1:]}])
+    nuevo = pd.DataFrame({
+        'CIF Norm': normalizar_cif(nuevo['CIF']),
+        'Tel Norm': normalizar_telefono(nuevo['Teléfono']),
+        'Email Norm': normalizar_email(nuevo['Email']),
+        'Nombre Norm': normalizar_nombre(nuevo['Nombre Comercial']),
+        'Dirección Norm': buscador.normalizar_serie(nuevo['Dirección']),
+    }).iloc[0]
+
+    # Candidatos: comparten CIF, teléfono, email o alguna palabra del nombre
+    candidatos = pd.Series(False, index=existentes.index)
+    for columna in ('CIF Norm', 'Tel Norm', 'Email Norm'):
+        if nuevo[columna]:
+            candidatos |= existentes[columna] == nuevo[columna]
+    for palabra in nuevo['Nombre Norm'].split():
+        if len(palabra) >= 3:
+            candidatos |= existentes['Nombre Norm'].str.contains(rf'\b{palabra}\b', regex=True)
+
+    filas = existentes.index[candidatos]
+    if len(filas) == 0:
+        return pd.DataFrame(columns=COLUMNAS_REGISTRO + ['Puntuación', 'Motivo'])
+
+    # Se puntúa como par (nuevo, existente) añadiendo el nuevo al final
+    df = pd.concat([existentes.loc[filas], nuevo.to_frame().T], ignore_index=True)
+    pares = pd.DataFrame({'fila_a': np.arange(len(filas)), 'fila_b': len(filas)})
+    pares = puntuar_pares(df, pares)
+
+    resultado = existentes.loc[filas, COLUMNAS_REGISTRO].reset_index(drop=True)
+    resultado['Puntuación'] = pares['Puntuación'].to_numpy()
+    resultado['Motivo'] = pares['Motivo'].to_numpy()
+    return resultado[resultado['Puntuación'] >= umbral].sort_values('Puntuación', ascending=False)
@@ -0,0 +1,136 @@
+"""
+ESCENARIOS_PRECIOS.PY - Simulación de subidas de precio de ingredientes
+"Aceite +30%, ternera +12%": nuevo coste, margen y food cost de todos los
+platos de la cartera con un único producto matriz-vector
+"""
+
+import numpy as np
+import pandas as pd
+import config
+import utils
+import matriz_recetas
+import explosion_recetas
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+COLUMNAS_ESCENARIO = [
+    'ID Cliente', 'ID Plato', 'Nombre Plato', 'Precio Venta',
+    'Coste Actual', 'Coste Nuevo', 'Δ Coste €', 'Margen % Actual', 'Margen % Nuevo',
+    'Food Cost % Nuevo', 'Bajo Mínimo', 'Cruza Umbral'
+]
+
+# Matriz de costes de la última explosión (se reconstruye si cambia)
+_matriz = {}
+
+# ============================================================================
+# MATRIZ DE COSTES
+# ============================================================================
+
+def matriz_costes(df_esc):
+    """
+    Matriz plato × ingrediente base con el coste de cada componente
+
+    C[p, i] = cantidad bruta × coste unitario (sub-recetas explotadas), de
+    modo que C · 1 es el coste actual y C · (1 + shock) el coste simulado.
+    La explosión es incremental (explosion_recetas); la matriz solo se
+    reconstruye cuando cambia el resultado aplanado.
+    """
+    df_plano, _ = explosion_recetas.aplanar_escandallos(df_esc)
+    if _matriz.get('plano') is not df_plano:
+        _matriz['plano'] = df_plano
+        _matriz['matriz'] = matriz_recetas.construir_matriz(df_plano, ponderacion='Coste Unitario')
+    return _matriz['matriz']
+
+
+def vector_shock(matriz, shocks):
+    """
+    Multiplicador por ingrediente a partir de las variaciones en %
+
+    Args:
+        shocks: Dict {ID Ingrediente: variación %} (p. ej. {12: 30, 7: 12})
+
+    Returns:
+        Array (n_ingredientes,) con 1 + variación / 100
+    """
+    variaciones = pd.Series(shocks, dtype=np.float64)
+    variaciones.index = utils.clave_id(pd.Series(variaciones.index)).to_numpy()
+    variaciones = variaciones.groupby(level=0).last()
+    return 1.0 + variaciones.reindex(matriz['ingredientes']).fillna(0.0).to_numpy() / 100.0
+
+# ============================================================================
+# SIMULACIÓN
+# ============================================================================
+
+def simular_shock(df_esc, df_carta, shocks, umbral_margen=None):
+    """
+    Impacto de una variación de precios en todos los platos
+
+    Márgenes con el mismo criterio que CARTA_CLIENTES
+    (utils.recalcular_costes_platos): sobre el Precio Venta.
+
+    Args:
+        df_esc: ESCANDALLOS
+        df_carta: CARTA_CLIENTES
+        shocks: Dict {ID Ingrediente: variación %}
+        umbral_margen: Margen % mínimo (por defecto config.UMBRAL_MARGEN_MINIMO)
+
+    Returns:
+        DataFrame con COLUMNAS_ESCENARIO; 'Cruza Umbral' marca los platos
+        que pasan de cumplir el margen mínimo a no cumplirlo
+    """
+    umbral = config.UMBRAL_MARGEN_MINIMO if umbral_margen is None else umbral_margen
+    if df_carta.empty or df_esc.empty:
+        return pd.DataFrame(columns=COLUMNAS_ESCENARIO)
+
+    matriz = matriz_costes(df_esc)
+    coste_actual = matriz_recetas.producto(matriz, np.ones(len(matriz['ingredientes'])))
+    coste_nuevo = matriz_recetas.producto(matriz, vector_shock(matriz, shocks))
+
+    carta = df_carta.copy()
+    if 'Activo' in carta.columns:
+        carta = carta[carta['Activo'] == 'Sí']
+    claves = utils.clave_id(carta['ID Plato'])
+
+    df = pd.DataFrame({
+        'ID Cliente': carta['ID Cliente'].to_numpy(),
+        'ID Plato': carta['ID Plato'].to_numpy(),
+        'Nombre Plato': carta['Nombre Plato'].to_numpy(),
+        'Precio Venta': pd.to_numeric(carta['Precio Venta'], errors='coerce').fillna(0).to_numpy(),
+        'Coste Actual': pd.Series(coste_actual, index=matriz['platos']).reindex(claves).fillna(0).to_numpy(),
+        'Coste Nuevo': pd.Series(coste_nuevo, index=matriz['platos']).reindex(claves).fillna(0).to_numpy(),
+    })
+    df = df[df['Precio Venta'] > 0]
+
+    df['Δ Coste €'] = df['Coste Nuevo'] - df['Coste Actual']
+    df['Margen % Actual'] = (df['Precio Venta'] - df['Coste Actual']) / df['Precio Venta'] * 100
+    df['Margen % Nuevo'] = (df['Precio Venta'] - df['Coste Nuevo']) / df['Precio Venta'] * 100
+    df['Food Cost % Nuevo'] = df['Coste Nuevo'] / df['Precio Venta'] * 100
+    df['Bajo Mínimo'] = df['Margen % Nuevo'] < umbral
+    df['Cruza Umbral'] = df['Bajo Mínimo'] & (df['Margen % Actual'] >= umbral)
+
+    for col in ['Coste Actual', 'Coste Nuevo', 'Δ Coste €']:
+        df[col] = df[col].round(2)
+    for col in ['Margen % Actual', 'Margen % Nuevo', 'Food Cost % Nuevo']:
+        df[col] = df[col].round(1)
+
+    return df[COLUMNAS_ESCENARIO].sort_values(
+        ['Cruza Umbral', 'Bajo Mínimo', 'Margen % Nuevo'], ascending=[False, False, True]
+    ).reset_index(drop=True)
+
+
+def resumen_por_cliente(df_escenario):
+    """Platos afectados y que caen bajo el mínimo, por cliente"""
+    if df_escenario.empty:
+        return pd.DataFrame()
+
+    return df_escenario.groupby('ID Cliente', as_index=False).agg(
+        **{
+            'Platos': ('ID Plato', 'size'),
+            'Afectados': ('Δ Coste €', lambda s: int((s != 0).sum())),
+            'Bajo Mínimo': ('Bajo Mínimo', 'sum'),
+            'Cruzan Umbral': ('Cruza Umbral', 'sum'),
+            'Δ Coste Medio €': ('Δ Coste €', 'mean'),
+        }
+    ).round(2).sort_values('Cruzan Umbral', ascending=False)
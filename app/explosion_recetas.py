@@ -0,0 +1,334 @@
+"""
+EXPLOSION_RECETAS.PY - Explosión de escandallos (BOM) con sub-recetas
+Aplana recursivamente las sub-recetas ("SUB-RECETA: ..." / REC|) hasta
+ingredientes base, detecta ciclos y memoriza la expansión de cada plato
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import utils
+import matriz_recetas
+
+# ============================================================================
+# CACHÉ
+# ============================================================================
+
+# Expansiones por contenido de ESCANDALLOS (LRU pequeño: cambia poco)
+MAX_EXPANSIONES_CACHE = 8
+
+# Por encima de esta fracción de platos cambiados se re-explota todo
+FRACCION_MAXIMA_INCREMENTAL = 0.5
+
+_cache_expansiones = OrderedDict()
+
+# Última explosión calculada: base para la actualización incremental
+_ultima = {}
+
+COLUMNAS_APLANADAS = ['ID Plato', 'ID Ingrediente', 'Nombre Ingrediente', 'Cantidad',
+                      'Unidad', 'Coste Unitario', 'Rendimiento %']
+
+# ============================================================================
+# EXPANSIÓN
+# ============================================================================
+
+def _preparar_lineas(df_esc, df_ingredientes=None):
+    """
+    Líneas del escandallo con claves normalizadas, cantidad bruta y coste
+
+    La cantidad bruta se expresa en la unidad del precio (unidades.py) para
+    que las cantidades de un mismo ingrediente se puedan sumar.
+    """
+    import unidades
+
+    costeo = unidades.costear_lineas(df_esc, df_ingredientes)
+    return df_esc.assign(**{
+        'Clave Plato': utils.clave_id(df_esc['ID Plato']),
+        'Clave Ingrediente': utils.clave_id(df_esc['ID Ingrediente']),
+        'Es Subreceta': matriz_recetas.es_subreceta(df_esc).to_numpy(),
+        'Cantidad Bruta': (costeo['Cantidad Bruta'] * costeo['Factor Unidad']).to_numpy(),
+        'Coste Linea': costeo['Coste Total'].to_numpy(),
+        'Unidad': unidades.unidades_precio(df_esc).to_numpy(),
+    })
+
+
+def _lineas_por_plato(df_lineas):
+    """plato → [(clave, es_sub, cantidad_bruta, coste_linea)]"""
+    lineas = {}
+    for plato, clave, es_sub, cantidad, coste in zip(
+        df_lineas['Clave Plato'], df_lineas['Clave Ingrediente'], df_lineas['Es Subreceta'],
+        df_lineas['Cantidad Bruta'], df_lineas['Coste Linea']
+    ):
+        lineas.setdefault(plato, []).append((clave, es_sub, cantidad, coste))
+    return lineas
+
+
+def _sumar_expansion(destino, expansion, factor):
+    """destino += factor × expansion (ingrediente → [cantidad, coste])"""
+    for ing, (cantidad, coste) in expansion.items():
+        previo = destino.setdefault(ing, [0.0, 0.0])
+        previo[0] += factor * cantidad
+        previo[1] += factor * coste
+
+
+def expandir_platos(df_esc, memo=None, df_ingredientes=None):
+    """
+    Expansión a ingredientes base de todos los platos
+
+    Args:
+        df_esc: ESCANDALLOS
+        memo: Expansiones ya conocidas (se reutilizan sin recalcular)
+        df_ingredientes: INGREDIENTES_MAESTRO (densidades)
+
+    Returns:
+        Dict con:
+          'expansiones': plato → {ingrediente: [cantidad por ración, coste por ración]}
+          'ciclos': lista de rutas [plato, ..., plato] detectadas
+    """
+    return _expandir(_lineas_por_plato(_preparar_lineas(df_esc, df_ingredientes)), memo)
+
+
+def _expandir(lineas, memo=None):
+    """
+    Recorrido en profundidad con memoria: cada sub-receta se expande una
+    sola vez aunque aparezca en muchos platos. Una línea que cerraría un
+    ciclo (A → B → A) se descarta y se informa. Pila explícita (sin
+    recursión) para no depender de la profundidad de anidamiento.
+
+    Args:
+        lineas: plato → líneas (_lineas_por_plato)
+        memo: Expansiones ya conocidas; solo se expanden los que faltan
+    """
+    memo = {} if memo is None else memo
+    ciclos = []
+
+    for raiz in lineas:
+        if raiz in memo:
+            continue
+
+        # Marco: [plato, siguiente línea, expansión acumulada]
+        pila = [[raiz, 0, {}]]
+        ruta = [raiz]
+        while pila:
+            marco = pila[-1]
+            plato, i, acumulado = marco
+            lineas_plato = lineas.get(plato, [])
+
+            if i == len(lineas_plato):
+                pila.pop()
+                ruta.pop()
+                memo[plato] = acumulado
+                if pila:
+                    padre, j, acumulado_padre = pila[-1]
+                    _sumar_expansion(acumulado_padre, acumulado, lineas[padre][j - 1][2])
+                continue
+
+            marco[1] += 1
+            clave, es_sub, cantidad, coste = lineas_plato[i]
+
+            if not es_sub:
+                _sumar_expansion(acumulado, {clave: (cantidad, coste)}, 1.0)
+            elif clave in ruta:
+                ciclo = ruta[ruta.index(clave):] + [clave]
+                ciclos.append(ciclo)
+                print(f"[DEBUG] ⚠️ Ciclo en sub-recetas: {' → '.join(ciclo)}")
+            elif clave in memo:
+                _sumar_expansion(acumulado, memo[clave], cantidad)
+            else:
+                pila.append([clave, 0, {}])
+                ruta.append(clave)
+
+    return {'expansiones': memo, 'ciclos': ciclos}
+
+
+def _filas_aplanadas(expansiones, platos, df_lineas):
+    """DataFrame aplanado (COLUMNAS_APLANADAS) de los platos indicados"""
+    filas = [
+        (plato, ing, cantidad, coste)
+        for plato in platos
+        for ing, (cantidad, coste) in expansiones.get(plato, {}).items()
+    ]
+    if not filas:
+        return pd.DataFrame(columns=COLUMNAS_APLANADAS)
+
+    platos_col, ingredientes, cantidades, costes = map(list, zip(*filas))
+    cantidades = np.asarray(cantidades, dtype=np.float64)
+    costes = np.asarray(costes, dtype=np.float64)
+
+    base = df_lineas[~df_lineas['Es Subreceta']].drop_duplicates('Clave Ingrediente').set_index('Clave Ingrediente')
+    ingredientes = pd.Series(ingredientes)
+    return pd.DataFrame({
+        'ID Plato': platos_col,
+        'ID Ingrediente': ingredientes,
+        'Nombre Ingrediente': ingredientes.map(base['Nombre Ingrediente']),
+        'Cantidad': cantidades,
+        'Unidad': ingredientes.map(base['Unidad']) if 'Unidad' in base.columns else None,
+        'Coste Unitario': np.divide(costes, cantidades, out=np.zeros_like(costes), where=cantidades != 0),
+        'Rendimiento %': 100.0,
+    })[COLUMNAS_APLANADAS]
+
+
+def _huellas_por_plato(df_lineas):
+    """Huella del contenido de cada plato (suma de los hashes de sus líneas)"""
+    columnas = ['Clave Ingrediente', 'Nombre Ingrediente', 'Cantidad Bruta', 'Coste Linea', 'Unidad']
+    columnas = [c for c in columnas if c in df_lineas.columns]
+    try:
+        filas = pd.util.hash_pandas_object(df_lineas[columnas], index=False)
+    except TypeError:
+        filas = pd.util.hash_pandas_object(df_lineas[columnas].astype(str), index=False)
+    return filas.groupby(df_lineas['Clave Plato'].to_numpy()).sum()
+
+
+def _ascendientes(df_lineas, platos):
+    """Platos afectados: los indicados y todos los que los usan como sub-receta"""
+    subs = df_lineas[df_lineas['Es Subreceta']]
+    padres = subs.groupby('Clave Ingrediente')['Clave Plato'].agg(list).to_dict()
+
+    afectados = set(platos)
+    pendientes = list(platos)
+    while pendientes:
+        for padre in padres.get(pendientes.pop(), []):
+            if padre not in afectados:
+                afectados.add(padre)
+                pendientes.append(padre)
+    return afectados
+
+
+def _huella_ingredientes(df_ingredientes):
+    """Hash de las columnas de INGREDIENTES_MAESTRO que afectan al costeo"""
+    import unidades
+
+    columnas = ['ID Ingrediente', unidades.COLUMNA_DENSIDAD]
+    columnas = [c for c in columnas if df_ingredientes is not None and c in df_ingredientes.columns]
+    if not columnas:
+        return ''
+    return utils.hash_datos(df_ingredientes[columnas])
+
+
+def aplanar_escandallos(df_esc, df_ingredientes=None):
+    """
+    Escandallos con las sub-recetas sustituidas por sus ingredientes base
+
+    Resultado cacheado por contenido: volver a planificar con los mismos
+    escandallos no recalcula la explosión. Tras una escritura solo se
+    re-explotan los platos cambiados y los que los usan como sub-receta.
+
+    Args:
+        df_esc: ESCANDALLOS
+        df_ingredientes: INGREDIENTES_MAESTRO (densidades); si no se pasa
+                         se lee
+
+    Returns:
+        Tupla (DataFrame con COLUMNAS_APLANADAS, lista de ciclos).
+        'Cantidad' ya es bruta (Rendimiento % = 100) y 'Coste Unitario'
+        es el coste medio de esa cantidad.
+    """
+    if df_esc.empty:
+        return pd.DataFrame(columns=COLUMNAS_APLANADAS), []
+
+    if df_ingredientes is None:
+        import config
+        df_ingredientes = utils.leer_excel(config.ARCHIVO_OPERACIONES, "INGREDIENTES_MAESTRO")
+
+    clave = utils.hash_datos(df_esc, _huella_ingredientes(df_ingredientes))
+    if clave in _cache_expansiones:
+        _cache_expansiones.move_to_end(clave)
+        return _cache_expansiones[clave]
+
+    df_lineas = _preparar_lineas(df_esc, df_ingredientes)
+    huellas = _huellas_por_plato(df_lineas)
+
+    afectados = None
+    if _ultima:
+        previas = _ultima['huellas']
+        todos = huellas.index.union(previas.index)
+        cambiados = todos[huellas.reindex(todos).ne(previas.reindex(todos)).to_numpy()]
+        if len(cambiados) <= FRACCION_MAXIMA_INCREMENTAL * len(huellas):
+            afectados = _ascendientes(df_lineas, cambiados)
+
+    if afectados is None:
+        explosion = _expandir(_lineas_por_plato(df_lineas))
+        df_plano = _filas_aplanadas(explosion['expansiones'], list(huellas.index), df_lineas)
+        ciclos = explosion['ciclos']
+    else:
+        memo = {p: e for p, e in _ultima['expansiones'].items() if p not in afectados}
+        # Solo hacen falta las líneas de los afectados: el resto está en memo
+        explosion = _expandir(_lineas_por_plato(df_lineas[df_lineas['Clave Plato'].isin(afectados)]), memo)
+        previo = _ultima['plano']
+        df_plano = pd.concat([
+            previo[~previo['ID Plato'].isin(afectados)],
+            _filas_aplanadas(explosion['expansiones'], [p for p in afectados if p in huellas.index], df_lineas),
+        ], ignore_index=True)
+        ciclos = [c for c in _ultima['ciclos'] if not set(c) & afectados] + explosion['ciclos']
+        print(f"[DEBUG] Explosión incremental: {len(afectados)} platos re-explotados")
+
+    _ultima.update({
+        'huellas': huellas,
+        'expansiones': explosion['expansiones'],
+        'plano': df_plano,
+        'ciclos': ciclos,
+    })
+
+    resultado = (df_plano, ciclos)
+    _cache_expansiones[clave] = resultado
+    while len(_cache_expansiones) > MAX_EXPANSIONES_CACHE:
+        _cache_expansiones.popitem(last=False)
+    return resultado
+
+
+def limpiar_cache():
+    """Olvida todas las expansiones (la siguiente explosión es completa)"""
+    _cache_expansiones.clear()
+    _ultima.clear()
+
+# ============================================================================
+# PLANIFICACIÓN DE PRODUCCIÓN
+# ============================================================================
+
+def necesidades_produccion(df_plan, df_esc, df_carta=None):
+    """
+    Ingredientes base necesarios para una producción planificada
+
+    Args:
+        df_plan: 'ID Plato' y 'Raciones' planificadas
+        df_esc: ESCANDALLOS
+        df_carta: CARTA_CLIENTES (para agrupar por 'ID Cliente'); opcional
+
+    Returns:
+        DataFrame con 'ID Cliente', 'ID Ingrediente', 'Nombre Ingrediente',
+        'Unidad', 'Cantidad Necesaria' y 'Coste Estimado'
+    """
+    columnas = ['ID Cliente', 'ID Ingrediente', 'Nombre Ingrediente', 'Unidad',
+                'Cantidad Necesaria', 'Coste Estimado']
+    df_plano, _ = aplanar_escandallos(df_esc)
+    if df_plano.empty or df_plan.empty:
+        return pd.DataFrame(columns=columnas)
+
+    matriz = matriz_recetas.construir_matriz(df_plano)
+    matriz_coste = matriz_recetas.construir_matriz(df_plano, ponderacion='Coste Unitario')
+
+    plan = df_plan.assign(**{'Clave Plato': utils.clave_id(df_plan['ID Plato'])})
+    raciones = pd.to_numeric(plan['Raciones'], errors='coerce').fillna(0).groupby(plan['Clave Plato']).sum()
+    raciones = raciones.reindex(matriz['platos']).fillna(0).to_numpy(dtype=np.float64)
+
+    if df_carta is not None and not df_carta.empty:
+        clientes = df_carta.assign(**{'Clave Plato': utils.clave_id(df_carta['ID Plato'])})
+        clientes = clientes.drop_duplicates('Clave Plato').set_index('Clave Plato')['ID Cliente']
+        grupo = clientes.reindex(matriz['platos']).fillna('').astype(str).to_numpy()
+    else:
+        grupo = np.full(len(matriz['platos']), '')
+
+    claves = ['ID Cliente', 'ID Ingrediente']
+    df = matriz_recetas.consumo_por_grupo(matriz, raciones, grupo)
+    df.columns = claves + ['Cantidad Necesaria']
+    coste = matriz_recetas.consumo_por_grupo(matriz_coste, raciones, grupo)
+    coste.columns = claves + ['Coste Estimado']
+    df = df.merge(coste, on=claves, how='left')
+
+    info = df_plano.drop_duplicates('ID Ingrediente').set_index('ID Ingrediente')[['Nombre Ingrediente', 'Unidad']]
+    df = df.join(info, on='ID Ingrediente')
+    df['Cantidad Necesaria'] = df['Cantidad Necesaria'].round(3)
+    df['Coste Estimado'] = df['Coste Estimado'].fillna(0).round(2)
+
+    return df[columnas].sort_values(['ID Cliente', 'Coste Estimado'], ascending=[True, False]).reset_index(drop=True)
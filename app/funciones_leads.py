@@ -65,6 +65,22 @@ def crear_nuevo_lead_modal():
             else:
                 df_leads = utils.leer_excel(config.ARCHIVO_CRM, "LEADS")
                 
+                # Comprobar duplicados antes de crear (CIF/teléfono/email y nombre parecido)
+                import duplicados
+                firma = f"{nombre}|{telefono}|{email}"
+                posibles = duplicados.buscar_duplicados_de(
+                    {'Nombre Comercial': nombre, 'Teléfono': telefono, 'Email': email}, df_leads=df_leads
+                )
+                if not posibles.empty and st.session_state.get('lead_duplicado_confirmado') != firma:
+                    st.session_state['lead_duplicado_confirmado'] = firma
+                    st.warning(f"⚠️ Hay {len(posibles)} registro(s) parecido(s). Pulsa **Crear Lead** otra vez para crearlo igualmente.")
+                    st.dataframe(
+                        posibles[['Origen', 'ID', 'Nombre Comercial', 'Teléfono', 'Email', 'Motivo']].head(5),
+                        use_container_width=True, hide_index=True
+                    )
+                    return
+                st.session_state.pop('lead_duplicado_confirmado', None)
+                
                 nuevo_lead = {
                     'ID': utils.generar_id(),
                     'Nombre Comercial': nombre,
@@ -110,17 +126,25 @@ def convertir_lead_a_cliente_modal():
         st.error("❌ No hay leads disponibles")
         return
     
-    # Buscar por ID
-    lead_mask = df_leads['ID'] == id_lead
+    # Buscar por ID (12, 12.0 y '12' son el mismo)
+    lead_mask = utils.clave_id(df_leads['ID']) == utils.clave_id(pd.Series([id_lead])).iloc[0]
     if not lead_mask.any():
-        # Si no encuentra por ID, buscar por nombre
-        lead_mask = df_leads['Nombre Comercial'] == nombre_lead
+        # Si no encuentra por ID, buscar por nombre exacto (solo espacios y mayúsculas)
+        nombre_buscado = str(nombre_lead or '').strip().casefold()
+        nombres = df_leads['Nombre Comercial'].fillna('').astype(str).str.strip().str.casefold()
+        lead_mask = (nombres == nombre_buscado) & (nombre_buscado != '')
     
     if not lead_mask.any():
         st.error(f"❌ Lead no encontrado (ID: {id_lead}, Nombre: {nombre_lead})")
         st.session_state['convertir_a_cliente'] = False
         return
     
+    if lead_mask.sum() > 1:
+        st.error(f"❌ Hay {lead_mask.sum()} leads que coinciden (ID: {id_lead}, Nombre: {nombre_lead}). "
+                 "Revisa los duplicados antes de convertir.")
+        st.session_state['convertir_a_cliente'] = False
+        return
+    
     lead_info = df_leads[lead_mask].iloc[0]
     
     st.success(f"🎉 ¡Enhorabuena! Estás convirtiendo a **{nombre_lead}** en Cliente.")
@@ -478,3 +502,29 @@ def convertir_lead_a_cliente_modal():
                             st.error("❌ Error al crear cliente")
                     else:
                         st.error("❌ Error al actualizar lead")
+
+
+def mostrar_duplicados_leads():
+    """Grupos de posibles duplicados entre LEADS y CLIENTES_ACTIVOS"""
+    with st.expander("🧬 Posibles duplicados", expanded=False):
+        st.caption("Compara CIF, teléfono, email, nombre y dirección normalizados entre leads y clientes.")
+        
+        if st.button("🔍 Buscar duplicados", key="buscar_duplicados_leads"):
+            import duplicados
+            with st.spinner("Comparando registros..."):
+                st.session_state['duplicados_leads'] = duplicados.detectar_duplicados()
+        
+        resultado = st.session_state.get('duplicados_leads')
+        if resultado is None:
+            return
+        
+        df_pares, df_grupos = resultado
+        if df_grupos.empty:
+            st.success("✅ No se han encontrado duplicados")
+            return
+        
+        st.warning(f"⚠️ {df_grupos['Grupo'].nunique()} grupos de posibles duplicados ({len(df_grupos)} registros)")
+        st.dataframe(df_grupos, use_container_width=True, hide_index=True)
+        
+        with st.expander("Detalle por pares"):
+            st.dataframe(df_pares, use_container_width=True, hide_index=True)
@@ -0,0 +1,258 @@
+"""
+GRAFICOS.PY - Caché de gráficos para dashboard e informes PDF
+Construye cada figura (Plotly y PNG rasterizado) una sola vez por
+combinación de datos y la comparte entre las pestañas y los PDFs
+"""
+
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import utils
+
+try:
+    import plotly.graph_objects as go
+    PLOTLY_AVAILABLE = True
+except ImportError:
+    PLOTLY_AVAILABLE = False
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+COLORES_CUADRANTE = {
+    '⭐ ESTRELLA': '#70AD47',      # Verde
+    '🐴 CABALLO': '#4472C4',       # Azul
+    '❓ ROMPECABEZAS': '#FFC000',  # Amarillo
+    '🐕 PERRO': '#C00000'          # Rojo
+}
+
+COLUMNAS_BCG = ['Nombre Plato', 'Ventas/Mes', 'Margen %', 'Facturación', 'Food Cost %']
+
+# Máximo de figuras/imágenes en memoria (LRU)
+MAX_ELEMENTOS_CACHE = 64
+
+_cache = OrderedDict()
+_estadisticas = {'aciertos': 0, 'fallos': 0}
+
+# ============================================================================
+# CACHÉ EN MEMORIA
+# ============================================================================
+
+def _obtener(clave, constructor):
+    """Devuelve el elemento cacheado o lo construye y lo guarda (LRU)"""
+    if clave in _cache:
+        _cache.move_to_end(clave)
+        _estadisticas['aciertos'] += 1
+        return _cache[clave]
+
+    _estadisticas['fallos'] += 1
+    valor = constructor()
+    _cache[clave] = valor
+    while len(_cache) > MAX_ELEMENTOS_CACHE:
+        _cache.popitem(last=False)
+    return valor
+
+
+def limpiar_cache():
+    """Vacía la caché de gráficos"""
+    _cache.clear()
+
+
+def estadisticas_cache():
+    """Aciertos, fallos y tamaño actual de la caché"""
+    return dict(_estadisticas, elementos=len(_cache))
+
+# ============================================================================
+# MATRIZ BCG
+# ============================================================================
+
+def _datos_bcg(df_carta):
+    """
+    Extrae las columnas que usa la matriz BCG y clasifica por cuadrante
+
+    Returns:
+        Tupla (df, ventas_media, margen_medio)
+    """
+    df = pd.DataFrame({
+        col: df_carta[col] if col in df_carta.columns else 0
+        for col in COLUMNAS_BCG
+    }, index=df_carta.index).reset_index(drop=True)
+
+    for col in COLUMNAS_BCG[1:]:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    ventas_media = df['Ventas/Mes'].median()
+    margen_medio = df['Margen %'].median()
+
+    populares = df['Ventas/Mes'] >= ventas_media
+    rentables = df['Margen %'] >= margen_medio
+    df['Cuadrante'] = np.select(
+        [populares & rentables, populares & ~rentables, ~populares & rentables],
+        ['⭐ ESTRELLA', '🐴 CABALLO', '❓ ROMPECABEZAS'],
+        default='🐕 PERRO'
+    )
+    df['Color'] = df['Cuadrante'].map(COLORES_CUADRANTE)
+
+    return df, ventas_media, margen_medio
+
+
+def _construir_figura_bcg(df_carta, variante):
+    """Construye la figura Plotly de la matriz BCG"""
+    df, ventas_media, margen_medio = _datos_bcg(df_carta)
+    avanzada = variante == 'avanzada'
+
+    fig = go.Figure()
+
+    for cuadrante in df['Cuadrante'].unique():
+        df_cuad = df[df['Cuadrante'] == cuadrante]
+
+        if avanzada:
+            # Color por Food Cost %: verde < 28 <= amarillo < 35 <= rojo
+            colores = np.select(
+                [df_cuad['Food Cost %'] < 28, df_cuad['Food Cost %'] < 35],
+                ['#70AD47', '#FFC000'],
+                default='#C00000'
+            ).tolist()
+        else:
+            colores = df_cuad['Color']
+
+        fig.add_trace(go.Scatter(
+            x=df_cuad['Ventas/Mes'],
+            y=df_cuad['Margen %'],
+            mode='markers+text',
+            name=cuadrante,
+            text=df_cuad['Nombre Plato'],
+            textposition='top center',
+            textfont=dict(size=9, color='black') if avanzada else dict(size=10),
+            marker=dict(
+                size=df_cuad['Facturación'] / (25 if avanzada else 50),
+                color=colores,
+                line=dict(width=2, color='white'),
+                opacity=0.85 if avanzada else 0.8
+            ),
+            customdata=df_cuad['Facturación'],
+            hovertemplate='<b>%{text}</b><br>' +
+                          'Ventas: %{x} uds/mes<br>' +
+                          'Margen: %{y}%<br>' +
+                          ('Facturación: %{customdata:.2f}€<br>' if avanzada else '') +
+                          '<extra></extra>'
+        ))
+
+    color_linea = "rgba(128,128,128,0.3)" if avanzada else "gray"
+    fig.add_hline(
+        y=margen_medio,
+        line_dash="dash",
+        line_color=color_linea,
+        annotation_text=f"Margen Medio: {margen_medio:.1f}%",
+        annotation_position="right"
+    )
+    fig.add_vline(
+        x=ventas_media,
+        line_dash="dash",
+        line_color=color_linea,
+        annotation_text=f"Ventas Medias: {ventas_media:.0f} uds",
+        annotation_position="top"
+    )
+
+    layout = dict(
+        xaxis_title="Ventas/Mes (unidades)",
+        yaxis_title="Margen (%)",
+        showlegend=True,
+        hovermode='closest'
+    )
+    if variante == 'pdf':
+        layout.update(width=1200, height=800)
+    elif avanzada:
+        layout.update(
+            height=600,
+            legend=dict(orientation="v", yanchor="top", y=0.99, xanchor="left", x=0.01),
+            plot_bgcolor='rgba(240,240,240,0.5)'
+        )
+    else:
+        layout.update(
+            height=500,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+    fig.update_layout(**layout)
+
+    return fig
+
+
+def _png_matplotlib_bcg(df_carta):
+    """Rasteriza la matriz BCG con matplotlib (cuando no hay kaleido)"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    df, ventas_media, margen_medio = _datos_bcg(df_carta)
+
+    fig, ax = plt.subplots(figsize=(12, 8), dpi=100)
+    for cuadrante in df['Cuadrante'].unique():
+        df_cuad = df[df['Cuadrante'] == cuadrante]
+        ax.scatter(
+            df_cuad['Ventas/Mes'], df_cuad['Margen %'],
+            s=np.clip(df_cuad['Facturación'] / 5, 20, 3000),
+            c=COLORES_CUADRANTE[cuadrante], alpha=0.8, edgecolors='white',
+            linewidths=2, label=cuadrante.split(' ', 1)[-1]  # Sin emoji (fuente)
+        )
+        for _, fila in df_cuad.iterrows():
+            ax.annotate(str(fila['Nombre Plato'])[:25], (fila['Ventas/Mes'], fila['Margen %']),
+                        fontsize=8, ha='center', va='bottom')
+
+    ax.axhline(margen_medio, linestyle='--', color='gray')
+    ax.axvline(ventas_media, linestyle='--', color='gray')
+    ax.set_xlabel("Ventas/Mes (unidades)")
+    ax.set_ylabel("Margen (%)")
+    ax.legend()
+
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight')
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def figura_bcg(df_carta, variante='simple'):
+    """
+    Figura Plotly de la matriz BCG (cacheada por contenido)
+
+    La figura devuelta es compartida: no modificarla.
+
+    Args:
+        df_carta: Carta con 'Nombre Plato', 'Ventas/Mes', 'Margen %',
+                  'Facturación' y opcionalmente 'Food Cost %'
+        variante: 'simple', 'avanzada' o 'pdf'
+
+    Returns:
+        plotly Figure (o None si plotly no está instalado)
+    """
+    if not PLOTLY_AVAILABLE:
+        return None
+
+    df = df_carta[[c for c in COLUMNAS_BCG if c in df_carta.columns]]
+    clave = ('figura_bcg', utils.hash_datos(df, variante))
+    return _obtener(clave, lambda: _construir_figura_bcg(df, variante))
+
+
+def png_bcg(df_carta):
+    """
+    Imagen PNG de la matriz BCG para los informes PDF (cacheada)
+
+    Usa kaleido si está disponible; si no, matplotlib.
+
+    Returns:
+        Bytes del PNG
+    """
+    df = df_carta[[c for c in COLUMNAS_BCG if c in df_carta.columns]]
+    clave = ('png_bcg', utils.hash_datos(df))
+
+    def _rasterizar():
+        if PLOTLY_AVAILABLE:
+            try:
+                return figura_bcg(df, 'pdf').to_image(format="png")
+            except Exception as e:
+                print(f"[DEBUG] kaleido no disponible, usando matplotlib: {e}")
+        return _png_matplotlib_bcg(df)
+
+    return _obtener(clave, _rasterizar)
@@ -0,0 +1,155 @@
+"""
+INDICE_ACCIONES.PY - Índice de próximas acciones por fecha
+INTERACCIONES con 'Próxima Acción' ordenadas por 'Fecha Próxima Acción'
+(parseada una vez al cargar); vencidas / hoy / esta semana / próximamente
+son rangos de fechas resueltos con búsqueda binaria
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import config
+import utils
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# Urgencias (mismo código que calcular_urgencia de las pantallas)
+VENCIDA, HOY, SEMANA, FUTURA = 1, 2, 3, 4
+
+# Días que cuenta "esta semana" (mañana incluido, hasta hoy + 7)
+DIAS_SEMANA = 7
+
+# Acciones pintadas por grupo (el resto se resume en un contador)
+MAX_ACCIONES_VISIBLES = 100
+
+# Índice de la última lectura de INTERACCIONES (se reutiliza mientras el
+# Excel no cambie en disco)
+_indice = {"mtime": None, "indice": None}
+
+# ============================================================================
+# CONSTRUCCIÓN
+# ============================================================================
+
+def construir_indice(df_int):
+    """
+    Índice de acciones pendientes ordenado por fecha
+
+    Args:
+        df_int: INTERACCIONES completa
+
+    Returns:
+        Dict con 'df' (acciones ordenadas por fecha, fechas vacías o no
+        válidas al final, índice original conservado), 'fechas' (array
+        datetime64[D] ordenado de las fechas válidas) y 'interacciones'
+        (df_int, para reescribir la hoja al completar una acción)
+    """
+    if df_int is None or df_int.empty or 'Próxima Acción' not in df_int.columns:
+        return {"df": pd.DataFrame(), "fechas": np.array([], dtype="datetime64[D]"), "interacciones": df_int}
+
+    accion = df_int['Próxima Acción']
+    df = df_int[accion.notna() & (accion.astype(str).str.strip() != '')].copy()
+
+    # Una sola conversión vectorizada (antes: pd.to_datetime por fila)
+    fechas = pd.to_datetime(df.get('Fecha Próxima Acción', pd.Series(pd.NaT, index=df.index)),
+                            errors='coerce', format='mixed')
+    df['Fecha Acción'] = fechas.dt.normalize()
+    df = df.sort_values('Fecha Acción', kind='stable', na_position='last')
+
+    validas = df['Fecha Acción'].notna().to_numpy()
+    return {
+        "df": df,
+        "fechas": df['Fecha Acción'].to_numpy()[validas].astype("datetime64[D]"),
+        "interacciones": df_int,
+    }
+
+
+def obtener_indice(forzar=False):
+    """
+    Índice de INTERACCIONES, reconstruido solo si el Excel ha cambiado
+
+    Args:
+        forzar: True para releer la hoja sin caché
+    """
+    mtime = None
+    if not config.USE_ONEDRIVE_API and os.path.exists(config.ARCHIVO_CRM):
+        mtime = os.path.getmtime(config.ARCHIVO_CRM)
+
+    if not forzar and mtime is not None and _indice["indice"] is not None and _indice["mtime"] == mtime:
+        utils.registrar_cache("indice_acciones", True)
+        return _indice["indice"]
+    utils.registrar_cache("indice_acciones", False)
+
+    if forzar:
+        df_int = utils.leer_excel_forzado(config.ARCHIVO_CRM, "INTERACCIONES")
+    else:
+        df_int = utils.leer_excel(config.ARCHIVO_CRM, "INTERACCIONES")
+
+    indice = construir_indice(df_int)
+    _indice.update({"mtime": mtime, "indice": indice})
+    return indice
+
+# ============================================================================
+# CONSULTAS
+# ============================================================================
+
+def _posicion(indice, fecha):
+    """Primera posición con fecha >= 'fecha' (búsqueda binaria)"""
+    return int(np.searchsorted(indice["fechas"], np.datetime64(pd.Timestamp(fecha).date(), "D"), side="left"))
+
+
+def rango(indice, desde=None, hasta=None):
+    """
+    Acciones con desde <= fecha < hasta (None = sin límite)
+
+    Las acciones sin fecha válida no entran en ningún rango.
+    """
+    inicio = 0 if desde is None else _posicion(indice, desde)
+    fin = len(indice["fechas"]) if hasta is None else _posicion(indice, hasta)
+    return indice["df"].iloc[inicio:max(inicio, fin)]
+
+
+def agrupar_por_urgencia(indice, hoy=None):
+    """
+    Acciones de cada grupo de urgencia
+
+    vencidas: fecha < hoy · hoy · semana: hasta hoy + DIAS_SEMANA ·
+    futuras: después, más las que no tienen fecha válida
+
+    Returns:
+        Dict {'vencidas', 'hoy', 'semana', 'futuras'} → DataFrame
+    """
+    hoy = pd.Timestamp(hoy or datetime.now()).normalize()
+    manana = hoy + pd.Timedelta(days=1)
+    fin_semana = hoy + pd.Timedelta(days=DIAS_SEMANA + 1)
+
+    cortes = [0] + [_posicion(indice, f) for f in (hoy, manana, fin_semana)]
+    df = indice["df"]
+    return {
+        "vencidas": df.iloc[cortes[0]:cortes[1]],
+        "hoy": df.iloc[cortes[1]:cortes[2]],
+        "semana": df.iloc[cortes[2]:cortes[3]],
+        "futuras": df.iloc[cortes[3]:],
+    }
+
+
+def calcular_urgencias(fechas, hoy=None):
+    """Urgencia (VENCIDA..FUTURA) de una serie de fechas, vectorizada"""
+    hoy = pd.Timestamp(hoy or datetime.now()).normalize()
+    dias = (pd.to_datetime(fechas, errors='coerce', format='mixed').dt.normalize() - hoy).dt.days
+    return pd.Series(
+        np.select([dias < 0, dias == 0, dias <= DIAS_SEMANA], [VENCIDA, HOY, SEMANA], default=FUTURA),
+        index=dias.index
+    )
+
+
+def textos_acciones(df, formato_fecha='%d/%m/%Y'):
+    """Listas (índice original, fecha, cliente, acción) para pintar sin iterrows()"""
+    fecha = df['Fecha Acción'].dt.strftime(formato_fecha)
+    fecha = fecha.fillna(df.get('Fecha Próxima Acción', pd.Series('N/A', index=df.index)).fillna('N/A').astype(str))
+    cliente = df['Nombre Cliente'].fillna('N/A').astype(str) if 'Nombre Cliente' in df.columns else pd.Series('N/A', index=df.index)
+    accion = df['Próxima Acción'].fillna('N/A').astype(str)
+    return list(zip(df.index, fecha, cliente, accion))
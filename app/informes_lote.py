@@ -0,0 +1,217 @@
+"""
+INFORMES_LOTE.PY - Generación de informes PDF en lote
+Genera el informe de todos los clientes activos en paralelo
+(ProcessPoolExecutor) y los empaqueta en un único ZIP
+"""
+
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+import config
+import utils
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+TIPO_INGENIERIA = "ingenieria"
+TIPO_MENSUAL = "mensual"
+
+MESES = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+         'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
+
+# ============================================================================
+# PREPARACIÓN DE DATOS (PROCESO PRINCIPAL)
+# ============================================================================
+
+def preparar_lotes(df_clientes, df_carta):
+    """
+    Prepara los datos de cada cliente como arrays compactos
+
+    Se ordena la carta una sola vez por cliente y se corta en bloques
+    contiguos, de modo que a cada proceso solo viaja su trozo de arrays
+    numpy (precio, coste, ventas) y la lista de nombres de plato.
+
+    Args:
+        df_clientes: CLIENTES_ACTIVOS (ya filtrado a activos)
+        df_carta: CARTA_CLIENTES completa
+
+    Returns:
+        Lista de dicts {id_cliente, nombre_cliente, platos, precio, coste, ventas}
+    """
+    lotes = []
+
+    if df_clientes.empty or df_carta.empty or 'ID Cliente' not in df_carta.columns:
+        return lotes
+
+    df = df_carta.copy()
+    if 'Activo' in df.columns:
+        df = df[df['Activo'] == 'Sí']
+
+    for col in ['Precio Venta', 'Coste Total', 'Ventas/Mes']:
+        df[col] = pd.to_numeric(df.get(col), errors='coerce').fillna(0)
+
+    df = df[df['ID Cliente'].isin(df_clientes['ID'])].sort_values('ID Cliente', kind='stable')
+    if df.empty:
+        return lotes
+
+    ids = df['ID Cliente'].to_numpy()
+    precio = df['Precio Venta'].to_numpy(dtype=np.float64)
+    coste = df['Coste Total'].to_numpy(dtype=np.float64)
+    ventas = df['Ventas/Mes'].to_numpy(dtype=np.float64)
+    platos = df['Nombre Plato'].astype(str).to_numpy()
+
+    ids_unicos, inicios = np.unique(ids, return_index=True)
+    finales = np.append(inicios[1:], len(ids))
+    nombres = dict(zip(df_clientes['ID'], df_clientes['Nombre Comercial']))
+
+    for id_cliente, ini, fin in zip(ids_unicos, inicios, finales):
+        lotes.append({
+            'id_cliente': id_cliente,
+            'nombre_cliente': str(nombres.get(id_cliente, id_cliente)),
+            'platos': platos[ini:fin].tolist(),
+            'precio': precio[ini:fin],
+            'coste': coste[ini:fin],
+            'ventas': ventas[ini:fin],
+        })
+
+    return lotes
+
+
+def nombre_archivo_informe(tipo, nombre_cliente, mes=None, año=None, id_cliente=None):
+    """
+    Nombre del PDF dentro del ZIP (mismo formato que la descarga individual)
+
+    Con id_cliente se añade el ID tras el nombre: dos clientes con el mismo
+    Nombre Comercial no pueden compartir entrada en el ZIP.
+    """
+    nombre = str(nombre_cliente).replace(' ', '_').replace('/', '-')
+    if id_cliente is not None:
+        nombre = f"{nombre}_{utils.clave_id(pd.Series([id_cliente])).iloc[0]}"
+    if tipo == TIPO_MENSUAL:
+        return f"Reporte_Mensual_{MESES[mes-1]}_{año}_{nombre}.pdf"
+    return f"Informe_Ingenieria_Menu_{nombre}_{datetime.now().strftime('%Y%m%d')}.pdf"
+
+# ============================================================================
+# TRABAJO POR CLIENTE (PROCESO HIJO)
+# ============================================================================
+
+def _generar_informe_cliente(lote, tipo, mes, año):
+    """
+    Genera el PDF de un cliente. Se ejecuta en un proceso del pool.
+
+    Returns:
+        Tupla (nombre_archivo, bytes_pdf)
+    """
+    import pdf_generator
+
+    df_carta = pd.DataFrame({
+        'Nombre Plato': lote['platos'],
+        'Precio Venta': lote['precio'],
+        'Coste Total': lote['coste'],
+        'Ventas/Mes': lote['ventas'],
+    })
+
+    nombre_pdf = nombre_archivo_informe(tipo, lote['nombre_cliente'], mes, año, lote['id_cliente'])
+
+    if tipo == TIPO_MENSUAL:
+        facturacion = float(np.dot(lote['precio'], lote['ventas']))
+        beneficio = float(np.dot(lote['precio'] - lote['coste'], lote['ventas']))
+        datos_mes = {
+            'facturacion': facturacion,
+            'beneficio': beneficio,
+            'clientes_activos': 1,
+            'platos_vendidos': int(lote['ventas'].sum()),
+            'top_platos': df_carta.sort_values('Ventas/Mes', ascending=False),
+            'alertas': [
+                "Revisar precios de platos con margen <20%",
+                "Actualizar costes de proveedores",
+                "Realizar inventario quincenal"
+            ]
+        }
+        pdf_bytes, _ = pdf_generator.pdf_reporte_mensual(lote['nombre_cliente'], mes, año, datos_mes, df_carta)
+    else:
+        df_carta = df_carta[
+            (df_carta['Precio Venta'] > 0) & (df_carta['Ventas/Mes'] > 0)
+        ].reset_index(drop=True)
+        pdf_bytes, _ = pdf_generator.pdf_ingenieria_menu(lote['nombre_cliente'], df_carta)
+
+    return nombre_pdf, pdf_bytes
+
+# ============================================================================
+# EJECUCIÓN EN LOTE
+# ============================================================================
+
+def generar_informes_lote(tipo=TIPO_INGENIERIA, mes=None, año=None, max_workers=None, progreso=None):
+    """
+    Genera el informe de todos los clientes activos y devuelve un ZIP
+
+    Args:
+        tipo: TIPO_INGENIERIA o TIPO_MENSUAL
+        mes, año: Periodo del reporte mensual (por defecto, el actual)
+        max_workers: Procesos del pool (por defecto, nº de CPUs)
+        progreso: Callback opcional progreso(hechos, total, nombre_cliente)
+
+    Returns:
+        Tupla (bytes_zip, lista_errores)
+    """
+    mes = mes or datetime.now().month
+    año = año or datetime.now().year
+
+    df_clientes = utils.leer_excel(config.ARCHIVO_CRM, "CLIENTES_ACTIVOS")
+    if 'Estado' in df_clientes.columns:
+        df_clientes = df_clientes[df_clientes['Estado'] == 'Activo']
+    df_carta = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+
+    lotes = preparar_lotes(df_clientes, df_carta)
+    total = len(lotes)
+    errores = []
+    buffer = BytesIO()
+
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        if total:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futuros = {
+                    pool.submit(_generar_informe_cliente, lote, tipo, mes, año): lote['nombre_cliente']
+                    for lote in lotes
+                }
+
+                for hechos, futuro in enumerate(as_completed(futuros), 1):
+                    nombre_cliente = futuros[futuro]
+                    try:
+                        nombre_pdf, pdf_bytes = futuro.result()
+                        zf.writestr(nombre_pdf, pdf_bytes)
+                    except Exception as e:
+                        errores.append(f"{nombre_cliente}: {str(e)}")
+                        print(f"[BATCH] ❌ Informe de {nombre_cliente}: {e}")
+
+                    if progreso:
+                        progreso(hechos, total, nombre_cliente)
+
+    return buffer.getvalue(), errores
+
+
+if __name__ == "__main__":
+    import sys
+
+    tipo = sys.argv[1] if len(sys.argv) > 1 else TIPO_INGENIERIA
+    destino = os.path.join(tempfile.gettempdir(), f"Informes_{tipo}_{datetime.now():%Y%m%d}.zip")
+
+    def _imprimir(hechos, total, nombre):
+        print(f"[{hechos}/{total}] {nombre}")
+
+    zip_bytes, errores = generar_informes_lote(tipo, progreso=_imprimir)
+
+    with open(destino, 'wb') as f:
+        f.write(zip_bytes)
+
+    print(f"✅ ZIP generado: {destino}")
+    for error in errores:
+        print(f"   ❌ {error}")
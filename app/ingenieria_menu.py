@@ -0,0 +1,290 @@
+"""
+INGENIERIA_MENU.PY - Ingeniería de Menú para toda la cartera
+Clasificación BCG, food cost y precio recomendado de todos los clientes
+en una sola pasada vectorizada sobre CARTA_CLIENTES
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+import config
+import utils
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# Valores que se guardan en la columna 'Clasificación' de CARTA_CLIENTES
+ESTRELLA = "Estrella"
+CABALLO = "Caballo"
+ROMPECABEZAS = "Rompecabezas"
+PERRO = "Perro"
+
+# Food cost objetivo (🟢 verde) usado para el precio recomendado
+FOOD_COST_OBJETIVO = 0.28
+
+# ============================================================================
+# CÁLCULOS VECTORIZADOS
+# ============================================================================
+
+def preparar_carta(df_carta):
+    """
+    Normaliza las columnas numéricas de la carta y calcula márgenes
+
+    Args:
+        df_carta: DataFrame de CARTA_CLIENTES (uno o varios clientes)
+
+    Returns:
+        Copia del DataFrame con 'Margen', 'Margen %', 'Food Cost %',
+        'Facturación' y 'Beneficio' recalculados
+    """
+    df = df_carta.copy()
+
+    for col in ['Precio Venta', 'Coste Total', 'Ventas/Mes']:
+        if col not in df.columns:
+            df[col] = 0
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    precio = df['Precio Venta'].to_numpy(dtype=float)
+    coste = df['Coste Total'].to_numpy(dtype=float)
+    ventas = df['Ventas/Mes'].to_numpy(dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        margen = precio - coste
+        margen_pct = np.where(precio > 0, margen / precio * 100, 0.0)
+        food_cost = np.where(precio > 0, coste / precio * 100, 0.0)
+
+    df['Margen'] = margen
+    df['Margen %'] = np.round(margen_pct, 1)
+    df['Food Cost %'] = np.round(food_cost, 1)
+    df['Facturación'] = precio * ventas
+    df['Beneficio'] = margen * ventas
+
+    return df
+
+
+def clasificar_cuadrantes(df_carta, columna_cliente='ID Cliente'):
+    """
+    Clasifica cada plato en su cuadrante BCG respecto a la mediana de su cliente
+
+    Las líneas divisorias (mediana de ventas y de margen %) se calculan por
+    cliente con groupby().transform(), igual que en la pantalla de
+    Ingeniería de Menú pero para todos los clientes a la vez.
+
+    Args:
+        df_carta: DataFrame ya preparado con preparar_carta()
+        columna_cliente: Columna por la que agrupar
+
+    Returns:
+        Series con 'Estrella', 'Caballo', 'Rompecabezas' o 'Perro'
+    """
+    if df_carta.empty:
+        return pd.Series(dtype=object, index=df_carta.index)
+
+    grupos = df_carta.groupby(columna_cliente, sort=False)
+    ventas_media = grupos['Ventas/Mes'].transform('median')
+    margen_medio = grupos['Margen %'].transform('median')
+
+    populares = df_carta['Ventas/Mes'] >= ventas_media
+    rentables = df_carta['Margen %'] >= margen_medio
+
+    return pd.Series(
+        np.select(
+            [populares & rentables, populares & ~rentables, ~populares & rentables],
+            [ESTRELLA, CABALLO, ROMPECABEZAS],
+            default=PERRO
+        ),
+        index=df_carta.index
+    )
+
+
+def calcular_ingenieria_cartera(df_carta):
+    """
+    Calcula la ingeniería de menú de todos los clientes a la vez
+
+    Solo se analizan platos activos con precio, coste y ventas > 0.
+
+    Args:
+        df_carta: DataFrame completo de CARTA_CLIENTES
+
+    Returns:
+        DataFrame (mismo índice que df_carta, solo filas analizadas) con
+        'Clasificación', 'Precio Recomendado', 'Food Cost Alto' e
+        'Impacto Mensual'
+    """
+    if df_carta.empty or 'ID Cliente' not in df_carta.columns:
+        return pd.DataFrame()
+
+    df = preparar_carta(df_carta)
+
+    mascara = (df['Precio Venta'] > 0) & (df['Coste Total'] > 0) & (df['Ventas/Mes'] > 0)
+    if 'Activo' in df.columns:
+        mascara &= df['Activo'] == 'Sí'
+    df = df[mascara]
+
+    if df.empty:
+        return pd.DataFrame()
+
+    df['Clasificación'] = clasificar_cuadrantes(df)
+    df['Precio Recomendado'] = (df['Coste Total'] / FOOD_COST_OBJETIVO).round(2)
+    df['Food Cost Alto'] = df['Food Cost %'] > config.UMBRAL_FOOD_COST_MAXIMO
+
+    # Impacto: solo cuenta la subida de precio de los platos por debajo del recomendado
+    subida = (df['Precio Recomendado'] - df['Precio Venta']).clip(lower=0)
+    df['Impacto Mensual'] = (subida * df['Ventas/Mes']).round(2)
+
+    return df
+
+
+def resumir_por_cliente(df_resultado):
+    """
+    Agrega el resultado de calcular_ingenieria_cartera() por cliente
+
+    Returns:
+        DataFrame con una fila por cliente: nº de platos por cuadrante,
+        platos con food cost alto, beneficio actual e impacto proyectado
+    """
+    if df_resultado.empty:
+        return pd.DataFrame()
+
+    claves = ['ID Cliente']
+    if 'Nombre Cliente' in df_resultado.columns:
+        claves.append('Nombre Cliente')
+
+    conteo = pd.crosstab(
+        [df_resultado[c] for c in claves],
+        df_resultado['Clasificación']
+    ).reindex(columns=[ESTRELLA, CABALLO, ROMPECABEZAS, PERRO], fill_value=0)
+
+    totales = df_resultado.groupby(claves).agg(
+        **{
+            'Platos': ('Clasificación', 'size'),
+            'Food Cost Alto': ('Food Cost Alto', 'sum'),
+            'Beneficio/Mes': ('Beneficio', 'sum'),
+            'Impacto/Mes': ('Impacto Mensual', 'sum'),
+        }
+    )
+
+    resumen = totales.join(conteo).reset_index()
+    resumen['Impacto %'] = np.where(
+        resumen['Beneficio/Mes'] > 0,
+        (resumen['Impacto/Mes'] / resumen['Beneficio/Mes'] * 100).round(1),
+        0.0
+    )
+
+    return resumen.sort_values('Impacto/Mes', ascending=False)
+
+
+def _asignar_clasificacion(df_carta, df_resultado):
+    """Copia 'Clasificación' de las filas analizadas sobre df_carta (in situ)"""
+    # La columna puede venir vacía (float) desde Excel
+    df_carta['Clasificación'] = df_carta.get('Clasificación', pd.Series(index=df_carta.index)).astype(object)
+    if not df_resultado.empty:
+        df_carta.loc[df_resultado.index, 'Clasificación'] = df_resultado['Clasificación']
+
+# ============================================================================
+# GUARDADO DE PLATOS
+# ============================================================================
+
+def reclasificar_cliente(df_carta, id_cliente):
+    """
+    Recalcula la 'Clasificación' de los platos de un cliente
+
+    Usa el mismo criterio que el proceso nocturno (mediana del cliente), así
+    la clasificación guardada desde la pantalla no cambia al día siguiente.
+
+    Args:
+        df_carta: DataFrame completo de CARTA_CLIENTES (se modifica in situ)
+        id_cliente: ID del cliente cuyos platos se reclasifican
+
+    Returns:
+        El mismo df_carta
+    """
+    if df_carta.empty or 'ID Cliente' not in df_carta.columns:
+        return df_carta
+
+    clave = utils.clave_id(pd.Series([id_cliente])).iloc[0]
+    del_cliente = utils.clave_id(df_carta['ID Cliente']) == clave
+
+    _asignar_clasificacion(df_carta, calcular_ingenieria_cartera(df_carta[del_cliente]))
+    return df_carta
+
+
+def guardar_carta(df_carta, id_cliente):
+    """
+    Escribe CARTA_CLIENTES tras reclasificar la carta de un cliente
+
+    Returns:
+        True si se guardó correctamente
+    """
+    reclasificar_cliente(df_carta, id_cliente)
+    return utils.escribir_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES", df_carta)
+
+
+def agregar_plato(nuevo_plato):
+    """
+    Añade un plato a CARTA_CLIENTES y reclasifica la carta de su cliente
+
+    Sustituye a utils.agregar_fila() para que el alta y la reclasificación
+    vayan en una sola escritura.
+
+    Returns:
+        True si se guardó correctamente
+    """
+    try:
+        df_carta = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES", estricto=True)
+    except Exception as e:
+        print(f"[DEBUG] Error leyendo CARTA_CLIENTES: {e}")
+        return False
+
+    df_carta = pd.concat([df_carta, pd.DataFrame([nuevo_plato])], ignore_index=True)
+    return guardar_carta(df_carta, nuevo_plato['ID Cliente'])
+
+# ============================================================================
+# PROCESO POR LOTES
+# ============================================================================
+
+def ejecutar_ingenieria_cartera(guardar=True):
+    """
+    Proceso nocturno: ingeniería de menú de todos los clientes
+
+    Lee CARTA_CLIENTES una sola vez, clasifica todos los platos y escribe
+    'Clasificación' y 'Precio Recomendado' en una única escritura.
+
+    Args:
+        guardar: Si False solo calcula (simulación)
+
+    Returns:
+        DataFrame con el resumen por cliente (vacío si no hay datos)
+    """
+    df_carta = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+
+    df_resultado = calcular_ingenieria_cartera(df_carta)
+
+    if df_resultado.empty:
+        print("[BATCH] Ingeniería de menú: sin platos con datos completos")
+        return pd.DataFrame()
+
+    if guardar:
+        _asignar_clasificacion(df_carta, df_resultado)
+        df_carta.loc[df_resultado.index, 'Precio Recomendado'] = df_resultado['Precio Recomendado']
+
+        if utils.escribir_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES", df_carta):
+            print(f"[BATCH] ✅ Ingeniería de menú guardada: {len(df_resultado)} platos, "
+                  f"{df_resultado['ID Cliente'].nunique()} clientes")
+        else:
+            print("[BATCH] ❌ Error al guardar CARTA_CLIENTES")
+
+    return resumir_por_cliente(df_resultado)
+
+
+if __name__ == "__main__":
+    print("="*70)
+    print(f"🎯 INGENIERÍA DE MENÚ - CARTERA COMPLETA ({datetime.now():%d/%m/%Y %H:%M})")
+    print("="*70)
+
+    resumen = ejecutar_ingenieria_cartera()
+
+    if not resumen.empty:
+        print(resumen.to_string(index=False))
+        print(f"\n💰 Impacto total proyectado: {resumen['Impacto/Mes'].sum():,.2f} €/mes")
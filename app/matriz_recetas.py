@@ -0,0 +1,166 @@
+"""
+MATRIZ_RECETAS.PY - Matriz dispersa plato × ingrediente
+Representación compacta (formato COO en NumPy) de los escandallos para
+pasar de ventas a consumo teórico y de precios a costes en una operación
+"""
+
+import numpy as np
+import pandas as pd
+import utils
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+PREFIJO_SUBRECETA = "SUB-RECETA"
+
+# ============================================================================
+# UTILIDADES
+# ============================================================================
+
+def es_subreceta(df_esc):
+    """Máscara de las líneas que apuntan a otro plato (sub-receta)"""
+    return df_esc['Nombre Ingrediente'].astype(str).str.startswith(PREFIJO_SUBRECETA)
+
+
+def cantidad_bruta(df_esc):
+    """
+    Cantidad que se descuenta del stock: neta / (Rendimiento % / 100)
+
+    Sin 'Rendimiento %' (o 0) se toma la cantidad neta.
+    """
+    import unidades
+
+    neta = pd.to_numeric(df_esc['Cantidad'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    return neta / (unidades.rendimientos(df_esc) / 100.0)
+
+# ============================================================================
+# CONSTRUCCIÓN
+# ============================================================================
+
+def construir_matriz(df_esc, ponderacion=None):
+    """
+    Matriz plato × ingrediente (cantidad bruta) en formato COO
+
+    Solo entran las líneas de ingrediente; las de sub-receta se ignoran
+    (explosion_recetas.aplanar_escandallos las sustituye antes por sus
+    ingredientes base).
+
+    Args:
+        df_esc: Líneas de ESCANDALLOS
+        ponderacion: Columna por la que multiplicar la cantidad bruta
+                     (p. ej. 'Coste Unitario' → matriz de costes)
+
+    Returns:
+        Dict con:
+          'platos': Index de claves de plato (filas)
+          'ingredientes': Index de claves de ingrediente (columnas)
+          'filas', 'columnas', 'valores': arrays COO (duplicados sumados)
+          'nombres': Serie clave ingrediente → nombre
+    """
+    if df_esc.empty:
+        return matriz_vacia()
+
+    df = df_esc[~es_subreceta(df_esc)]
+    df = df.assign(**{
+        'Clave Plato': utils.clave_id(df['ID Plato']),
+        'Clave Ingrediente': utils.clave_id(df['ID Ingrediente']),
+        'Cantidad Bruta': cantidad_bruta(df),
+    })
+    df = df[df['Cantidad Bruta'] != 0]
+    pesos = df['Cantidad Bruta'].to_numpy(dtype=np.float64)
+    if ponderacion:
+        pesos = pesos * pd.to_numeric(df[ponderacion], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+    platos = pd.Index(pd.unique(df['Clave Plato']))
+    ingredientes = pd.Index(pd.unique(df['Clave Ingrediente']))
+
+    filas = platos.get_indexer(df['Clave Plato'])
+    columnas = ingredientes.get_indexer(df['Clave Ingrediente'])
+
+    # Sumar duplicados (mismo ingrediente dos veces en un plato)
+    plano = filas.astype(np.int64) * len(ingredientes) + columnas
+    unicos, inverso = np.unique(plano, return_inverse=True)
+    valores = np.bincount(inverso, weights=pesos)
+
+    return {
+        'platos': platos,
+        'ingredientes': ingredientes,
+        'filas': (unicos // max(len(ingredientes), 1)).astype(np.int64),
+        'columnas': (unicos % max(len(ingredientes), 1)).astype(np.int64),
+        'valores': valores,
+        'nombres': df.drop_duplicates('Clave Ingrediente').set_index('Clave Ingrediente')['Nombre Ingrediente'],
+    }
+
+
+def matriz_vacia():
+    """Matriz sin platos ni ingredientes"""
+    return {
+        'platos': pd.Index([]),
+        'ingredientes': pd.Index([]),
+        'filas': np.array([], dtype=np.int64),
+        'columnas': np.array([], dtype=np.int64),
+        'valores': np.array([], dtype=np.float64),
+        'nombres': pd.Series(dtype=object),
+    }
+
+# ============================================================================
+# OPERACIONES
+# ============================================================================
+
+def producto(matriz, vector_ingredientes):
+    """
+    A · x: valor por plato (p. ej. precios → coste de cada plato)
+
+    Args:
+        vector_ingredientes: Array (n_ingredientes,)
+
+    Returns:
+        Array (n_platos,)
+    """
+    x = np.asarray(vector_ingredientes, dtype=np.float64)
+    return np.bincount(matriz['filas'], weights=matriz['valores'] * x[matriz['columnas']],
+                       minlength=len(matriz['platos']))
+
+
+def producto_traspuesto(matriz, vector_platos):
+    """
+    Aᵀ · y: valor por ingrediente (p. ej. ventas → consumo teórico)
+
+    Args:
+        vector_platos: Array (n_platos,)
+
+    Returns:
+        Array (n_ingredientes,)
+    """
+    y = np.asarray(vector_platos, dtype=np.float64)
+    return np.bincount(matriz['columnas'], weights=matriz['valores'] * y[matriz['filas']],
+                       minlength=len(matriz['ingredientes']))
+
+
+def consumo_por_grupo(matriz, vector_platos, grupo_platos):
+    """
+    Aᵀ · y desglosado por grupo de platos (p. ej. por cliente)
+
+    Args:
+        vector_platos: Array (n_platos,) con las unidades vendidas
+        grupo_platos: Array (n_platos,) con el grupo de cada plato
+
+    Returns:
+        DataFrame con 'Grupo', 'Clave Ingrediente', 'Cantidad'
+    """
+    grupos = pd.Index(pd.unique(np.asarray(grupo_platos)))
+    g = grupos.get_indexer(np.asarray(grupo_platos))[matriz['filas']]
+    n_ing = len(matriz['ingredientes'])
+
+    y = np.asarray(vector_platos, dtype=np.float64)
+    plano = g.astype(np.int64) * n_ing + matriz['columnas']
+    cantidades = np.bincount(plano, weights=matriz['valores'] * y[matriz['filas']],
+                             minlength=len(grupos) * n_ing)
+
+    no_cero = np.flatnonzero(cantidades)
+    return pd.DataFrame({
+        'Grupo': grupos[no_cero // max(n_ing, 1)],
+        'Clave Ingrediente': matriz['ingredientes'][no_cero % max(n_ing, 1)],
+        'Cantidad': cantidades[no_cero],
+    })
@@ -4,171 +4,136 @@ Detecta cambios y genera alertas relevantes para cada cliente
 """
 
 import streamlit as st
+import os
 import pandas as pd
 from datetime import datetime, timedelta
 import config
 import utils
-import tracking_cambios
+import reglas_alertas
+import tabla_alertas
 
 # ============================================================================
-# CONSTRUCCIÓN DE ALERTAS
+# CONSTANTES
 # ============================================================================
 
-def construir_alertas_cliente(id_cliente, nombre_cliente):
+# Umbrales y columnas de las reglas (registro en reglas_alertas)
+COLUMNAS_ALERTAS = reglas_alertas.COLUMNAS_ALERTAS
+CAMPOS_OBLIGATORIOS = reglas_alertas.CAMPOS_OBLIGATORIOS
+DIAS_AVISO_VENCIMIENTO = reglas_alertas.DIAS_AVISO_VENCIMIENTO
+SATISFACCION_MINIMA = reglas_alertas.SATISFACCION_MINIMA
+DIAS_SIN_ACTUALIZAR = reglas_alertas.DIAS_SIN_ACTUALIZAR
+DIAS_CAMBIOS_RECIENTES = reglas_alertas.DIAS_CAMBIOS_RECIENTES
+
+# ============================================================================
+# MOTOR DE ALERTAS (TODA LA CARTERA)
+# ============================================================================
+
+def construir_alertas_cartera(df_clientes, ahora=None):
 	"""
-	Construye alertas para un cliente específico.
-	Lee de CLIENTES_ACTIVOS y genera alertas básicas.
+	Alertas de estado de todos los clientes en una pasada
+
+	Las reglas de la fuente 'clientes' de reglas_alertas se evalúan como
+	máscaras sobre la hoja completa de CLIENTES_ACTIVOS.
+
+	Args:
+		df_clientes: CLIENTES_ACTIVOS
+		ahora: Fecha de referencia (por defecto, ahora)
+
+	Returns:
+		DataFrame con COLUMNAS_ALERTAS ('ID Cliente' normalizado con utils.clave_id)
 	"""
-	alertas = []
+	if df_clientes is None or df_clientes.empty or "ID" not in df_clientes.columns:
+		return pd.DataFrame(columns=COLUMNAS_ALERTAS)
+
+	alertas = reglas_alertas.evaluar_fuente("clientes", df_clientes, ahora=ahora, incremental=False)
+	return alertas[COLUMNAS_ALERTAS]
 
+
+def construir_alertas_cambios_cartera(df_cambios):
+	"""
+	Alertas de cambios recientes (precio y datos) de todos los clientes
+
+	Args:
+		df_cambios: tracking_cambios.obtener_cambios_ultimos()
+
+	Returns:
+		DataFrame con COLUMNAS_ALERTAS (mismo orden que el registro)
+	"""
+	if df_cambios is None or df_cambios.empty:
+		return pd.DataFrame(columns=COLUMNAS_ALERTAS)
+
+	alertas = reglas_alertas.evaluar_fuente("cambios", df_cambios, incremental=False)
+	return alertas[COLUMNAS_ALERTAS]
+
+# ============================================================================
+# TABLA DE ALERTAS (CONSULTAS POR CLIENTE)
+# ============================================================================
+
+def obtener_tabla_alertas(forzar=False):
+	"""
+	Tabla materializada de alertas (ALERTAS.csv, ver tabla_alertas)
+
+	La pantalla no evalúa reglas: el programador en segundo plano recalcula
+	cada pocos minutos y tras cada escritura. forzar=True recalcula ya
+	(lectura sin caché y evaluación completa).
+
+	Returns:
+		Dict con 'tabla' (alertas activas), 'historial' (tabla completa),
+		'por_cliente' (clave → lista de alertas activas) y 'fecha'
+	"""
+	tabla_alertas.iniciar_programador()
+
+	if forzar:
+		st.cache_data.clear()
+		tabla_alertas.refrescar(completo=True)
+	elif not os.path.exists(tabla_alertas.ARCHIVO_ALERTAS):
+		# Primera ejecución: aún no hay tabla que leer
+		tabla_alertas.refrescar()
+
+	resultado = tabla_alertas.obtener_tabla()
+	historial = resultado["tabla"]
+	return {
+		"tabla": historial[historial["Estado"] == "Activa"],
+		"historial": historial,
+		"por_cliente": resultado["por_cliente"],
+		"fecha": resultado["fecha"] or datetime.now(),
+	}
+
+
+def alertas_de_cliente(id_cliente, origen=None, categoria=None, incluir_reconocidas=True):
+	"""Alertas activas de un cliente (búsqueda en la tabla materializada)"""
+	alertas = tabla_alertas.alertas_activas_cliente(id_cliente)
+
+	if origen:
+		alertas = [a for a in alertas if a["origen"] == origen]
+	if categoria:
+		alertas = [a for a in alertas if a["categoria"] == categoria]
+	if not incluir_reconocidas:
+		alertas = [a for a in alertas if a.get("Reconocida") != "Sí"]
+	return alertas
+
+
+def construir_alertas_cliente(id_cliente, nombre_cliente):
+	"""
+	Alertas de estado de un cliente (CLIENTES_ACTIVOS).
+	Consulta a la tabla de la cartera, sin releer la hoja.
+	"""
 	try:
-		# Leer datos del cliente desde CLIENTES_ACTIVOS
-		df_clientes = utils.leer_excel_forzado(config.ARCHIVO_CRM, "CLIENTES_ACTIVOS")
-		
-		if df_clientes.empty:
-			return alertas
-		
-		# Filtrar por cliente
-		cliente = df_clientes[df_clientes["ID"] == id_cliente]
-		
-		if cliente.empty:
-			return alertas
-		
-		cliente = cliente.iloc[0]
-		
-		# ----- ALERTA: DATOS INCOMPLETOS -----
-		campos_obligatorios = ["Dirección", "Ciudad", "Teléfono", "Email"]
-		campos_vacios = [c for c in campos_obligatorios if pd.isna(cliente.get(c)) or str(cliente.get(c)).strip() == ""]
-		
-		if campos_vacios:
-			alertas.append({
-				"nivel": "advertencia",
-				"categoria": "Cliente",
-				"titulo": "Datos incompletos",
-				"detalle": f"Faltan: {', '.join(campos_vacios)}",
-				"impacto": "Completa los datos para mejorar comunicación",
-				"origen": "CLIENTES_ACTIVOS"
-			})
-		
-		# ----- ALERTA: SERVICIO PRÓXIMO A VENCER -----
-		fecha_fin = cliente.get("Fecha Fin")
-		if pd.notna(fecha_fin):
-			fecha_fin = pd.to_datetime(fecha_fin)
-			dias_restantes = (fecha_fin - datetime.now()).days
-			
-			if 0 <= dias_restantes <= 30:
-				alertas.append({
-					"nivel": "critica",
-					"categoria": "Cliente",
-					"titulo": "Servicio próximo a vencer",
-					"detalle": f"Vence en {dias_restantes} días ({fecha_fin.strftime('%d/%m/%Y')})",
-					"impacto": "Contacta cliente para renovación",
-					"origen": "CLIENTES_ACTIVOS"
-				})
-			elif dias_restantes < 0:
-				alertas.append({
-					"nivel": "critica",
-					"categoria": "Cliente",
-					"titulo": "Servicio vencido",
-					"detalle": f"Vencido hace {abs(dias_restantes)} días",
-					"impacto": "Contacta inmediatamente para renovación",
-					"origen": "CLIENTES_ACTIVOS"
-				})
-		
-		# ----- ALERTA: BAJA SATISFACCIÓN -----
-		satisfaccion = cliente.get("Satisfacción (1-5)")
-		if pd.notna(satisfaccion):
-			try:
-				satisfaccion = float(satisfaccion)
-				if satisfaccion < 3:
-					alertas.append({
-						"nivel": "critica",
-						"categoria": "Cliente",
-						"titulo": "Baja satisfacción del cliente",
-						"detalle": f"Puntuación: {satisfaccion:.1f}/5",
-						"impacto": "Realiza seguimiento urgente para mejorar relación",
-						"origen": "CLIENTES_ACTIVOS"
-					})
-			except:
-				pass
-		
-		# ----- ALERTA: SIN ACTUALIZACIONES RECIENTES -----
-		ultima_act = cliente.get("Última Actualización")
-		if pd.notna(ultima_act):
-			ultima_act = pd.to_datetime(ultima_act)
-			dias_sin_actualizar = (datetime.now() - ultima_act).days
-			
-			if dias_sin_actualizar > 30:
-				alertas.append({
-					"nivel": "advertencia",
-					"categoria": "Cliente",
-					"titulo": "Sin actualizaciones recientes",
-					"detalle": f"Última actualización hace {dias_sin_actualizar} días",
-					"impacto": "Realiza seguimiento y actualiza información",
-					"origen": "CLIENTES_ACTIVOS"
-				})
-		
+		return alertas_de_cliente(id_cliente, origen="CLIENTES_ACTIVOS")
 	except Exception as e:
 		print(f"Error en construir_alertas_cliente: {e}")
-	
-	return alertas
+		return []
 
 
 def construir_alertas_cambios(id_cliente, nombre_cliente):
 	"""
-	Construye alertas basadas en cambios recientes
+	Alertas basadas en cambios recientes (consulta a la tabla de la cartera)
 	"""
-	alertas = []
-	
 	try:
-		# Obtener cambios de últimos 7 días
-		df_cambios = tracking_cambios.obtener_cambios_cliente(id_cliente, dias=7)
-		
-		if df_cambios.empty:
-			return alertas
-		
-		# Por cada cambio, crear una alerta
-		for _, row in df_cambios.iterrows():
-			tipo = row.get("Tipo", "")
-			campo = row.get("Campo", "")
-			valor_anterior = row.get("Valor Anterior", "")
-			valor_nuevo = row.get("Valor Nuevo", "")
-			fecha = row.get("Fecha", "")
-			
-			# Cambios de precio
-			if tipo == "precio":
-				try:
-					ant = float(valor_anterior)
-					nue = float(valor_nuevo)
-					dif = nue - ant
-					dif_pct = (dif / ant * 100) if ant > 0 else 0
-					
-					alertas.append({
-						"nivel": "advertencia",
-						"categoria": "Cambios",
-						"titulo": f"Cambio de precio en {campo}",
-						"detalle": f"{ant:.2f}€ → {nue:.2f}€ ({dif_pct:+.1f}%)",
-						"impacto": f"Cambio registrado el {fecha}",
-						"origen": "CAMBIOS_REGISTRO"
-					})
-				except:
-					pass
-			
-			# Cambios de datos
-			elif tipo == "datos":
-				alertas.append({
-					"nivel": "advertencia",
-					"categoria": "Cambios",
-					"titulo": f"Actualización en {campo}",
-					"detalle": f"'{valor_anterior}' → '{valor_nuevo}'",
-					"impacto": f"Cambio registrado el {fecha}",
-					"origen": "CAMBIOS_REGISTRO"
-				})
-	
+		return alertas_de_cliente(id_cliente, origen="CAMBIOS_REGISTRO")
 	except Exception as e:
 		print(f"Error en construir_alertas_cambios: {e}")
-	
-	return alertas
+		return []
 
 # ============================================================================
 # RENDERIZADO
@@ -191,6 +156,8 @@ def _render_alerta(alerta, id_cliente=None):
 	detalle = alerta.get("detalle", "")
 	impacto = alerta.get("impacto", "")
 	categoria = alerta.get("categoria", "")
+	desde = alerta.get("Primera Vez", "")
+	reconocida = alerta.get("Reconocida") == "Sí"
 
 	st.markdown(
 		f"""
@@ -199,12 +166,29 @@ def _render_alerta(alerta, id_cliente=None):
 			<span>{detalle}</span><br/>
 			<em>{impacto}</em>
 			{f"<br/><small>Área: {categoria}</small>" if categoria else ""}
+			{f"<br/><small>Desde: {desde}{' · ✔️ Reconocida' if reconocida else ''}</small>" if desde else ""}
 		</div>
 		""",
 		unsafe_allow_html=True
 	)
 
 
+def _render_alerta_reconocible(alerta, id_cliente=None):
+	"""Alerta con botón para reconocerla (o volver a marcarla pendiente)"""
+	_render_alerta(alerta, id_cliente)
+	clave = alerta.get("Clave")
+	if not clave:
+		return
+
+	reconocida = alerta.get("Reconocida") == "Sí"
+	etiqueta = "↩️ Marcar pendiente" if reconocida else "✔️ Reconocer"
+	if st.button(etiqueta, key=f"alerta_reconocer_{clave}"):
+		if tabla_alertas.reconocer_alerta(clave, reconocida=not reconocida):
+			st.rerun()
+		else:
+			st.error("No se pudo guardar el reconocimiento")
+
+
 # ============================================================================
 # BANNERS CONTEXTUALES
 # ============================================================================
@@ -212,10 +196,8 @@ def _render_alerta(alerta, id_cliente=None):
 def mostrar_banners_alertas(id_cliente, nombre_cliente, contexto=None, max_items=3):
 	"""Muestra alertas en contexto (usado en diferentes pantallas)"""
 	try:
-		alertas = construir_alertas_cliente(id_cliente, nombre_cliente)
-
-		if contexto:
-			alertas = [a for a in alertas if a.get("categoria") == contexto]
+		# Búsqueda en la tabla materializada (sin leer hojas ni evaluar reglas)
+		alertas = alertas_de_cliente(id_cliente, origen="CLIENTES_ACTIVOS", categoria=contexto, incluir_reconocidas=False)
 
 		if not alertas:
 			return
@@ -232,16 +214,74 @@ def mostrar_banners_alertas(id_cliente, nombre_cliente, contexto=None, max_items
 # MÓDULO PRINCIPAL
 # ============================================================================
 
+def mostrar_resumen_cartera(tabla, df_clientes):
+	"""Alertas por cliente de toda la cartera"""
+	with st.expander("🌐 Alertas de toda la cartera", expanded=False):
+		if tabla.empty:
+			st.success("✅ Ninguna alerta en la cartera")
+			return
+
+		resumen = pd.crosstab(tabla["ID Cliente"], tabla["nivel"])
+		resumen = resumen.reindex(columns=["critica", "advertencia", "oportunidad"], fill_value=0)
+		resumen.columns = ["🚨 Críticas", "⚠️ Advertencias", "✅ Oportunidades"]
+
+		nombres = df_clientes.set_index(utils.clave_id(df_clientes["ID"]))["Nombre Comercial"]
+		resumen.insert(0, "Cliente", resumen.index.map(nombres))
+		resumen = resumen.sort_values(["🚨 Críticas", "⚠️ Advertencias"], ascending=False)
+		st.dataframe(resumen, use_container_width=True)
+
+
+def mostrar_historial_cliente(historial, id_cliente):
+	"""Alertas activas y resueltas de un cliente con sus fechas"""
+	st.markdown("### 🕓 Historial de alertas")
+	clave = utils.clave_id(pd.Series([id_cliente])).iloc[0]
+	df_hist = historial[historial["ID Cliente"] == clave]
+
+	if df_hist.empty:
+		st.info("Sin historial de alertas")
+		return
+
+	st.dataframe(
+		df_hist[["Estado", "nivel", "categoria", "titulo", "Primera Vez", "Última Vez",
+				"Fecha Resolución", "Reconocida"]].rename(columns={
+			"nivel": "Nivel", "categoria": "Categoría", "titulo": "Título"
+		}),
+		use_container_width=True,
+		hide_index=True
+	)
+
+
+def mostrar_estadisticas_reglas():
+	"""Coste de evaluación de cada regla del registro"""
+	with st.expander("⏱️ Reglas de alerta", expanded=False):
+		df_stats = reglas_alertas.estadisticas_reglas()
+		if df_stats.empty:
+			st.info("Aún no se ha evaluado ninguna regla")
+			return
+		st.dataframe(df_stats, use_container_width=True, hide_index=True)
+
+
 def modulo_alertas():
 	"""Pantalla principal de alertas"""
 	st.markdown('<h1 class="main-header">🚨 Alertas Inteligentes</h1>', unsafe_allow_html=True)
 
+	# Tabla de alertas de toda la cartera (una lectura, reutilizada por cliente)
+	forzar = st.button("🔄 Recalcular alertas", key="alertas_recalcular")
+	resultado = obtener_tabla_alertas(forzar=forzar)
+	st.caption(
+		f"Alertas calculadas a las {resultado['fecha'].strftime('%H:%M:%S')} "
+		f"(se recalculan cada {tabla_alertas.INTERVALO_REFRESCO // 60} min y tras cada cambio de datos)"
+	)
+
 	# Selector de cliente
-	df_clientes = utils.leer_excel_forzado(config.ARCHIVO_CRM, "CLIENTES_ACTIVOS")
+	df_clientes = utils.leer_excel(config.ARCHIVO_CRM, "CLIENTES_ACTIVOS")
 	if df_clientes.empty:
 		st.info("No hay clientes activos registrados")
 		return
 
+	mostrar_resumen_cartera(resultado["tabla"], df_clientes)
+	mostrar_estadisticas_reglas()
+
 	opciones = [f"{int(row['ID'])} - {row['Nombre Comercial']}" for _, row in df_clientes.iterrows()]
 	cliente_sel = st.selectbox("Selecciona Cliente", opciones, key="alertas_cliente_sel")
 
@@ -252,10 +292,11 @@ def modulo_alertas():
 		st.error("Error al procesar selección de cliente")
 		return
 
-	# Combinar alertas de estado + cambios
+	# Combinar alertas de estado + cambios + carta y compras
 	alertas_estado = construir_alertas_cliente(id_cliente, nombre_cliente)
 	alertas_cambios = construir_alertas_cambios(id_cliente, nombre_cliente)
-	alertas = alertas_estado + alertas_cambios
+	alertas_operativas = alertas_de_cliente(id_cliente, origen="CARTA_CLIENTES") + alertas_de_cliente(id_cliente, origen="LINEAS_COMPRA")
+	alertas = alertas_estado + alertas_cambios + alertas_operativas
 
 	# Métricas
 	total = len(alertas)
@@ -279,7 +320,7 @@ def modulo_alertas():
 		st.success("✅ No hay alertas. Cliente en buen estado.")
 		return
 
-	tab1, tab2, tab3, tab4 = st.tabs(["🚨 Críticas", "⚠️ Advertencias", "📝 Cambios Recientes", "📌 Resumen"])
+	tab1, tab2, tab3, tab4, tab5 = st.tabs(["🚨 Críticas", "⚠️ Advertencias", "📝 Cambios Recientes", "📌 Resumen", "🕓 Historial"])
 
 	with tab1:
 		criticas_list = [a for a in alertas if a["nivel"] == "critica"]
@@ -287,7 +328,7 @@ def modulo_alertas():
 			st.success("Sin alertas críticas")
 		else:
 			for a in criticas_list:
-				_render_alerta(a, id_cliente)
+				_render_alerta_reconocible(a, id_cliente)
 
 	with tab2:
 		advert_list = [a for a in alertas if a["nivel"] == "advertencia" and a["categoria"] != "Cambios"]
@@ -295,7 +336,7 @@ def modulo_alertas():
 			st.success("Sin advertencias")
 		else:
 			for a in advert_list:
-				_render_alerta(a, id_cliente)
+				_render_alerta_reconocible(a, id_cliente)
 
 	with tab3:
 		cambios_list = [a for a in alertas if a["categoria"] == "Cambios"]
@@ -303,7 +344,7 @@ def modulo_alertas():
 			st.info("Sin cambios recientes (últimos 7 días)")
 		else:
 			for a in cambios_list:
-				_render_alerta(a, id_cliente)
+				_render_alerta_reconocible(a, id_cliente)
 
 	with tab4:
 		st.markdown("### 📋 Resumen Completo")
@@ -329,3 +370,5 @@ def modulo_alertas():
 		for alerta in alertas:
 			st.markdown(f"- **{alerta['titulo']}**: {alerta['impacto']}")
 
+	with tab5:
+		mostrar_historial_cliente(resultado["historial"], id_cliente)
@@ -15,7 +15,9 @@ from datetime import datetime, timedelta
 import time
 import config
 import utils
-from funciones_leads import crear_nuevo_lead_modal, convertir_lead_a_cliente_modal
+import indice_acciones
+import paginacion
+from funciones_leads import crear_nuevo_lead_modal, convertir_lead_a_cliente_modal, mostrar_duplicados_leads
 
 # ============================================================================
 # FUNCIÓN PRINCIPAL DEL MÓDULO
@@ -175,6 +177,9 @@ def mostrar_lista_clientes():
     
     st.markdown("---")
     
+    # ========== POSIBLES DUPLICADOS ==========
+    mostrar_duplicados_leads()
+    
     # ========== TABLA DE LEADS ==========
     if df_filtrado.empty:
         st.info("No se encontraron leads con los filtros aplicados.")
@@ -214,7 +219,13 @@ def mostrar_lista_clientes():
         # Verificar que las columnas existan
         columnas_mostrar = [col for col in columnas_mostrar if col in df_filtrado.columns]
         
-        df_tabla = df_filtrado[columnas_mostrar].copy()
+        # Solo la página visible viaja al navegador
+        df_tabla = paginacion.paginar(
+            df_filtrado[columnas_mostrar], "tabla_leads",
+            columnas_orden=['Nombre Comercial', 'Estado Lead', 'Fuente Captación', 'Comercial Asignado'],
+            tamano_pagina=50,
+            etiqueta="leads"
+        )
         
         st.dataframe(
             df_tabla,
@@ -231,7 +242,8 @@ def mostrar_lista_clientes():
             }
         )
         
-        st.caption(f"Mostrando {len(df_filtrado)} de {len(df_leads)} leads")
+        if len(df_filtrado) < len(df_leads):
+            st.caption(f"{len(df_filtrado)} de {len(df_leads)} leads cumplen los filtros")
     
     st.markdown("---")
     
@@ -1378,15 +1390,17 @@ def mostrar_proximas_acciones():
     with col3:
         if st.button("🔄 Refrescar", use_container_width=True):
             st.cache_data.clear()
+            indice_acciones.obtener_indice(forzar=True)
             st.rerun()
     
-    # Cargar interacciones
+    # Índice de acciones por fecha (se relee solo si el Excel ha cambiado)
     try:
-        df_int = utils.leer_excel_forzado(config.ARCHIVO_CRM, "INTERACCIONES")
+        indice = indice_acciones.obtener_indice()
     except:
-        df_int = pd.DataFrame()
+        indice = indice_acciones.construir_indice(pd.DataFrame())
     
-    if df_int.empty:
+    df_int = indice['interacciones']
+    if df_int is None or df_int.empty:
         st.info("No hay acciones programadas.")
         return
     
@@ -1395,139 +1409,61 @@ def mostrar_proximas_acciones():
         st.warning("⚠️ La hoja INTERACCIONES no tiene la columna 'Próxima Acción'")
         return
     
-    # Filtrar con próxima acción
-    df_acciones = df_int[
-        (df_int['Próxima Acción'].notna()) & 
-        (df_int['Próxima Acción'] != '')
-    ].copy()
-    
-    if df_acciones.empty:
+    if indice['df'].empty:
         st.info("No hay próximas acciones programadas.")
         return
     
-    st.info(f"📊 Total: **{len(df_acciones)}** acciones")
-    
-    # Calcular urgencia
-    hoy = datetime.now().date()
-    
-    def calcular_urgencia(fecha):
-        if pd.isna(fecha):
-            return 4
-        try:
-            fecha_dt = pd.to_datetime(fecha).date()
-            dias = (fecha_dt - hoy).days
-            if dias < 0:
-                return 1
-            elif dias == 0:
-                return 2
-            elif dias <= 7:
-                return 3
-            else:
-                return 4
-        except:
-            return 4
+    st.info(f"📊 Total: **{len(indice['df'])}** acciones")
     
-    df_acciones['Urgencia'] = df_acciones['Fecha Próxima Acción'].apply(calcular_urgencia)
-    df_acciones = df_acciones.sort_values('Urgencia')
+    # Urgencia por rangos de fecha (búsqueda binaria sobre el índice)
+    grupos = indice_acciones.agrupar_por_urgencia(indice)
     
     # Mostrar por categorías
     st.markdown("---")
     st.markdown("### 🔴 URGENTE (Vencidas)")
-    vencidas = df_acciones[df_acciones['Urgencia'] == 1]
-    if not vencidas.empty:
-        for idx, (row_idx, row) in enumerate(vencidas.iterrows()):
-            try:
-                fecha = pd.to_datetime(row.get('Fecha Próxima Acción')).strftime('%d/%m/%Y')
-            except:
-                fecha = str(row.get('Fecha Próxima Acción', 'N/A'))
-            
-            col1, col2 = st.columns([9, 1])
-            with col1:
-                st.error(f"⚠️ **{fecha}** - {row.get('Nombre Cliente', 'N/A')} - {row.get('Próxima Acción', 'N/A')}")
-            with col2:
-                if st.button("✅", key=f"completar_vencida_{idx}", help="Marcar como completada"):
-                    # Eliminar la acción
-                    df_int_actualizado = df_int.drop(row_idx)
-                    if utils.escribir_excel(config.ARCHIVO_CRM, "INTERACCIONES", df_int_actualizado):
-                        st.success("✅ Acción completada y eliminada")
-                        st.cache_data.clear()
-                        time.sleep(0.3)
-                        st.rerun()
-                    else:
-                        st.error("❌ Error al actualizar")
-    else:
+    _mostrar_grupo_acciones(grupos['vencidas'], df_int, st.error, "⚠️ **{fecha}**", "vencida")
+    if grupos['vencidas'].empty:
         st.success("✅ No hay acciones vencidas")
     
     st.markdown("### 🟡 HOY")
-    hoy_acc = df_acciones[df_acciones['Urgencia'] == 2]
-    if not hoy_acc.empty:
-        for idx, (row_idx, row) in enumerate(hoy_acc.iterrows()):
-            col1, col2 = st.columns([9, 1])
-            with col1:
-                st.warning(f"📅 **HOY** - {row.get('Nombre Cliente', 'N/A')} - {row.get('Próxima Acción', 'N/A')}")
-            with col2:
-                if st.button("✅", key=f"completar_hoy_{idx}", help="Marcar como completada"):
-                    df_int_actualizado = df_int.drop(row_idx)
-                    if utils.escribir_excel(config.ARCHIVO_CRM, "INTERACCIONES", df_int_actualizado):
-                        st.success("✅ Acción completada y eliminada")
-                        st.cache_data.clear()
-                        time.sleep(0.3)
-                        st.rerun()
-                    else:
-                        st.error("❌ Error al actualizar")
-    else:
+    _mostrar_grupo_acciones(grupos['hoy'], df_int, st.warning, "📅 **HOY**", "hoy")
+    if grupos['hoy'].empty:
         st.info("✅ No hay acciones para hoy")
     
     st.markdown("### 🟢 ESTA SEMANA")
-    semana = df_acciones[df_acciones['Urgencia'] == 3]
-    if not semana.empty:
-        for idx, (row_idx, row) in enumerate(semana.iterrows()):
-            try:
-                fecha = pd.to_datetime(row.get('Fecha Próxima Acción')).strftime('%d/%m/%Y')
-            except:
-                fecha = str(row.get('Fecha Próxima Acción', 'N/A'))
-            
-            col1, col2 = st.columns([9, 1])
-            with col1:
-                st.info(f"📆 **{fecha}** - {row.get('Nombre Cliente', 'N/A')} - {row.get('Próxima Acción', 'N/A')}")
-            with col2:
-                if st.button("✅", key=f"completar_semana_{idx}", help="Marcar como completada"):
-                    df_int_actualizado = df_int.drop(row_idx)
-                    if utils.escribir_excel(config.ARCHIVO_CRM, "INTERACCIONES", df_int_actualizado):
-                        st.success("✅ Acción completada y eliminada")
-                        st.cache_data.clear()
-                        time.sleep(0.3)
-                        st.rerun()
-                    else:
-                        st.error("❌ Error al actualizar")
-    else:
+    _mostrar_grupo_acciones(grupos['semana'], df_int, st.info, "📆 **{fecha}**", "semana")
+    if grupos['semana'].empty:
         st.info("✅ No hay acciones esta semana")
     
     st.markdown("### 🔵 PRÓXIMAMENTE")
-    futuras = df_acciones[df_acciones['Urgencia'] == 4]
-    if not futuras.empty:
-        for idx, (row_idx, row) in enumerate(futuras.iterrows()):
-            try:
-                fecha = pd.to_datetime(row.get('Fecha Próxima Acción')).strftime('%d/%m/%Y')
-            except:
-                fecha = str(row.get('Fecha Próxima Acción', 'N/A'))
-            
-            col1, col2 = st.columns([9, 1])
-            with col1:
-                st.info(f"📅 **{fecha}** - {row.get('Nombre Cliente', 'N/A')} - {row.get('Próxima Acción', 'N/A')}")
-            with col2:
-                if st.button("✅", key=f"completar_futura_{idx}", help="Marcar como completada"):
-                    df_int_actualizado = df_int.drop(row_idx)
-                    if utils.escribir_excel(config.ARCHIVO_CRM, "INTERACCIONES", df_int_actualizado):
-                        st.success("✅ Acción completada y eliminada")
-                        st.cache_data.clear()
-                        time.sleep(0.3)
-                        st.rerun()
-                    else:
-                        st.error("❌ Error al actualizar")
-    else:
+    _mostrar_grupo_acciones(grupos['futuras'], df_int, st.info, "📅 **{fecha}**", "futura")
+    if grupos['futuras'].empty:
         st.info("✅ No hay acciones programadas después de una semana")
 
+def _mostrar_grupo_acciones(df_grupo, df_int, aviso, etiqueta, clave):
+    """Acciones de un grupo de urgencia con botón para completarlas"""
+    for idx, (row_idx, fecha, cliente, accion) in enumerate(
+        indice_acciones.textos_acciones(df_grupo.head(indice_acciones.MAX_ACCIONES_VISIBLES))
+    ):
+        col1, col2 = st.columns([9, 1])
+        with col1:
+            aviso(f"{etiqueta.format(fecha=fecha)} - {cliente} - {accion}")
+        with col2:
+            if st.button("✅", key=f"completar_{clave}_{idx}", help="Marcar como completada"):
+                # Eliminar la acción
+                df_int_actualizado = df_int.drop(row_idx)
+                if utils.escribir_excel(config.ARCHIVO_CRM, "INTERACCIONES", df_int_actualizado):
+                    st.success("✅ Acción completada y eliminada")
+                    st.cache_data.clear()
+                    time.sleep(0.3)
+                    st.rerun()
+                else:
+                    st.error("❌ Error al actualizar")
+    
+    ocultas = len(df_grupo) - indice_acciones.MAX_ACCIONES_VISIBLES
+    if ocultas > 0:
+        st.caption(f"… y {ocultas} acciones más")
+
 # ============================================================================
 # FUNCIONES AUXILIARES
 # ============================================================================
@@ -0,0 +1,269 @@
+"""
+MODULO_CONFIGURACION.PY - Configuración
+Rutas, estado de los archivos, procesos por lotes, rendimiento de la capa
+de datos y tiempos de importación
+"""
+
+import os
+import subprocess
+import sys
+
+import streamlit as st
+import pandas as pd
+import config
+import utils
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# Lo que carga cualquier página antes que su propio código
+MODULOS_BASE = ["streamlit", "pandas", "config", "utils"]
+
+# Paquetes más pesados que se listan por página
+TOP_PAQUETES = 5
+
+# ============================================================================
+# TIEMPOS DE IMPORTACIÓN (python -X importtime)
+# ============================================================================
+
+def resumir_importtime(texto):
+    """
+    Salida de 'python -X importtime' a DataFrame
+
+    Returns:
+        DataFrame con 'Módulo', 'Paquete' (primer componente del nombre),
+        'Nivel' (0 = importado directamente), 'Propio (ms)' y 'Acumulado (ms)'
+    """
+    filas = []
+    for linea in texto.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        try:
+            propio, acumulado, nombre = linea[len("import time:"):].split("|", 2)
+            sangria = len(nombre) - len(nombre.lstrip())
+            filas.append({
+                "Módulo": nombre.strip(),
+                "Paquete": nombre.strip().split(".")[0],
+                "Nivel": max(0, (sangria - 1) // 2),
+                "Propio (ms)": int(propio) / 1000,
+                "Acumulado (ms)": int(acumulado) / 1000,
+            })
+        except ValueError:
+            continue
+    return pd.DataFrame(filas, columns=["Módulo", "Paquete", "Nivel", "Propio (ms)", "Acumulado (ms)"])
+
+
+def medir_importacion(modulos):
+    """
+    Importa 'modulos' en un proceso Python limpio con -X importtime
+
+    Returns:
+        DataFrame de resumir_importtime (vacío si el proceso falla)
+    """
+    codigo = "; ".join(f"import {m}" for m in modulos)
+    try:
+        proceso = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", codigo],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=120
+        )
+        if proceso.returncode != 0:
+            print(f"[DEBUG] Error importando {codigo}: {proceso.stderr.strip().splitlines()[-1:]}")
+            return resumir_importtime("")
+        return resumir_importtime(proceso.stderr)
+    except Exception as e:
+        print(f"[DEBUG] Error midiendo importación de {codigo}: {e}")
+        return resumir_importtime("")
+
+
+def informe_importacion():
+    """
+    Coste de importar cada página en frío frente a la base común
+
+    Returns:
+        DataFrame con 'Página', 'Módulo', 'Total (ms)', 'Propio de la página (ms)'
+        y 'Paquetes más pesados' (los TOP_PAQUETES que solo añade esa página)
+    """
+    df_base = medir_importacion(MODULOS_BASE)
+    paquetes_base = set(df_base["Paquete"])
+    total_base = df_base.loc[df_base["Nivel"] == 0, "Acumulado (ms)"].sum()
+
+    filas = [{
+        "Página": "(base común)",
+        "Módulo": ", ".join(MODULOS_BASE),
+        "Total (ms)": round(total_base),
+        "Propio de la página (ms)": 0,
+        "Paquetes más pesados": "",
+    }]
+    for pagina, (nombre_modulo, _) in config.MODULOS_APP.items():
+        df = medir_importacion([nombre_modulo])
+        if df.empty:
+            filas.append({"Página": pagina, "Módulo": nombre_modulo, "Total (ms)": None,
+                          "Propio de la página (ms)": None, "Paquetes más pesados": "⚠️ Error al importar"})
+            continue
+
+        total = df.loc[df["Nivel"] == 0, "Acumulado (ms)"].sum()
+        extra = df[~df["Paquete"].isin(paquetes_base)]
+        pesados = extra.groupby("Paquete")["Propio (ms)"].sum().nlargest(TOP_PAQUETES)
+        filas.append({
+            "Página": pagina,
+            "Módulo": nombre_modulo,
+            "Total (ms)": round(total),
+            "Propio de la página (ms)": round(extra["Propio (ms)"].sum()),
+            "Paquetes más pesados": ", ".join(f"{p} ({ms:.0f} ms)" for p, ms in pesados.items()),
+        })
+    return pd.DataFrame(filas)
+
+# ============================================================================
+# PANEL DE RENDIMIENTO (LECTURAS Y ESCRITURAS)
+# ============================================================================
+
+def mostrar_panel_rendimiento():
+    """Lecturas/escrituras de Excel y OneDrive agregadas por página, rerun y hoja"""
+    st.subheader("📈 Rendimiento de la Capa de Datos")
+    st.caption(f"Últimas {utils.MAX_MEDICIONES} operaciones de este proceso "
+               "(leer_excel, leer_excel_forzado, escribir_excel, OneDrive y cachés en memoria)")
+
+    df = utils.obtener_mediciones()
+    if df.empty:
+        st.info("Aún no hay mediciones: navega por la aplicación y vuelve aquí")
+        return
+
+    parseos = df["Operación"].isin(utils.OPERACIONES_PARSEO)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("🔁 Reruns", int(df["Ejecución"].nunique()))
+    with col2:
+        st.metric("📄 Excel parseados", int(parseos.sum()))
+    with col3:
+        st.metric("⏱️ Tiempo en lecturas", f"{df.loc[parseos, 'Segundos'].sum():.1f}s")
+    with col4:
+        st.metric("💾 Escrituras", int((df["Operación"] == "escribir_excel").sum()))
+
+    tab_pagina, tab_rerun, tab_hoja, tab_detalle = st.tabs(["Por página", "Por rerun", "Por hoja", "Detalle"])
+
+    with tab_pagina:
+        resumen = utils.resumen_mediciones(df, por="Página")
+        reruns = df.groupby("Página")["Ejecución"].nunique()
+        resumen.insert(1, "Reruns", resumen["Página"].map(reruns))
+        resumen.insert(3, "Parseos/Rerun", (resumen["Excel Parseados"] / resumen["Reruns"]).round(1))
+        st.dataframe(resumen.sort_values("Excel Parseados", ascending=False),
+                     use_container_width=True, hide_index=True)
+
+    with tab_rerun:
+        resumen = utils.resumen_mediciones(df, por=["Ejecución", "Página"])
+        st.dataframe(resumen.sort_values("Ejecución", ascending=False).head(50),
+                     use_container_width=True, hide_index=True)
+
+    with tab_hoja:
+        st.dataframe(utils.resumen_mediciones(df, por=["Operación", "Archivo", "Hoja"]),
+                     use_container_width=True, hide_index=True)
+
+    with tab_detalle:
+        st.dataframe(df.iloc[::-1].head(200), use_container_width=True, hide_index=True)
+
+    if st.button("🧹 Reiniciar mediciones", key="btn_reiniciar_mediciones"):
+        utils.reiniciar_mediciones()
+        st.rerun()
+
+# ============================================================================
+# MÓDULO: CONFIGURACIÓN
+# ============================================================================
+
+def modulo_configuracion():
+    """Configuración del sistema"""
+    st.markdown('<h1 class="main-header">⚙️ Configuración</h1>', unsafe_allow_html=True)
+    
+    st.subheader("📁 Rutas del Sistema")
+    st.code(f"OneDrive: {config.ONEDRIVE_BASE}")
+    st.code(f"Datos: {config.RUTA_DATOS}")
+    
+    st.markdown("---")
+    
+    st.subheader("📊 Estado de los Archivos")
+    archivos_faltantes = config.verificar_archivos_excel()
+    
+    if not archivos_faltantes:
+        st.success("✅ Todos los archivos Excel están correctamente ubicados")
+    else:
+        st.error("❌ Archivos faltantes:")
+        for archivo in archivos_faltantes:
+            st.write(archivo)
+
+    st.markdown("---")
+
+    st.subheader("🌙 Procesos por Lotes")
+    st.caption("También desde línea de comandos: `python ingenieria_menu.py`, `python propuestas_pedido.py` y `python consumo_real.py`")
+
+    if st.button("🎯 Ingeniería de Menú - Todos los clientes", key="btn_batch_ingenieria"):
+        import ingenieria_menu
+        with st.spinner("Calculando ingeniería de menú de toda la cartera..."):
+            st.cache_data.clear()
+            resumen = ingenieria_menu.ejecutar_ingenieria_cartera()
+
+        if resumen.empty:
+            st.info("No hay platos activos con precio, coste y ventas")
+        else:
+            st.success(f"✅ {int(resumen['Platos'].sum())} platos clasificados en {len(resumen)} clientes")
+            st.metric("💰 Impacto proyectado", f"+{resumen['Impacto/Mes'].sum():,.0f}€/mes")
+            st.dataframe(resumen, use_container_width=True, hide_index=True)
+
+    if st.button("🛒 Propuestas de Pedido - Todos los clientes", key="btn_batch_propuestas"):
+        import propuestas_pedido
+        with st.spinner("Calculando propuestas de pedido de toda la cartera..."):
+            st.cache_data.clear()
+            propuestas = propuestas_pedido.ejecutar_propuestas_cartera()
+
+        if propuestas.empty:
+            st.info("Ningún cliente necesita pedir con su stock actual")
+        else:
+            resumen = propuestas_pedido.resumir_propuestas(propuestas)
+            st.success(f"✅ {len(propuestas)} líneas propuestas para {len(resumen)} clientes (hoja {propuestas_pedido.HOJA_PROPUESTAS})")
+            st.metric("💰 Total propuesto", f"{resumen['Coste Total'].sum():,.2f}€")
+            st.dataframe(resumen, use_container_width=True, hide_index=True)
+
+    if st.button("📦 Consumo Real - Todos los clientes", key="btn_batch_consumo_real"):
+        import consumo_real
+        with st.spinner("Conciliando stock y compras de toda la cartera..."):
+            st.cache_data.clear()
+            df_consumo = consumo_real.ejecutar_consumo_real()
+
+        if df_consumo.empty:
+            st.info("No hay suficientes snapshots para calcular consumos")
+        else:
+            n_revisar = int((df_consumo['Estado'] == 'Revisar').sum())
+            st.success(f"✅ {len(df_consumo)} periodos calculados (hoja {consumo_real.HOJA_CONSUMO_REAL}), {n_revisar} a revisar")
+            st.dataframe(consumo_real.resumir_consumo_real(df_consumo), use_container_width=True, hide_index=True)
+
+    if st.button("🗂️ Migrar Inventarios a Archivos por Cliente", key="btn_migrar_inventarios",
+                 help="Reparte la hoja INVENTARIO_CLIENTES en un archivo por cliente"):
+        with st.spinner("Migrando inventarios..."):
+            st.cache_data.clear()
+            migrados = utils.migrar_inventario_particionado()
+        st.success(f"✅ {migrados} clientes migrados a {config.RUTA_INVENTARIOS}")
+
+    if st.button("📸 Migrar Snapshots JSON a Histórico por Cliente", key="btn_migrar_snapshots",
+                 help="Convierte los snapshots antiguos de SNAPSHOTS_PEDIDOS (Datos JSON) al formato largo"):
+        import snapshots
+        with st.spinner("Migrando snapshots..."):
+            st.cache_data.clear()
+            migrados = snapshots.migrar_snapshots_legacy()
+        st.success(f"✅ {migrados} clientes migrados a {snapshots.RUTA_SNAPSHOTS}")
+
+    st.markdown("---")
+
+    mostrar_panel_rendimiento()
+
+    st.markdown("---")
+
+    st.subheader("⏱️ Tiempos de Importación")
+    st.caption("Cada página se importa en un proceso limpio con `python -X importtime`; "
+               "'Propio de la página' es lo que añade sobre la base común (streamlit, pandas, config, utils)")
+
+    if st.button("⏱️ Medir importaciones", key="btn_medir_importaciones"):
+        with st.spinner("Importando cada página en un proceso nuevo..."):
+            st.session_state['informe_importacion'] = informe_importacion()
+
+    if 'informe_importacion' in st.session_state:
+        st.dataframe(st.session_state['informe_importacion'], use_container_width=True, hide_index=True)
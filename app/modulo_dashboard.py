@@ -0,0 +1,701 @@
+"""
+MODULO_DASHBOARD.PY - Dashboard
+KPIs de la cartera, mapa de clientes y próximas acciones
+"""
+
+import streamlit as st
+import pandas as pd
+import time
+import config
+
+# ============================================================================
+# MÓDULO: DASHBOARD
+# ============================================================================
+
+def modulo_dashboard():
+    """Dashboard principal con resumen ejecutivo"""
+    st.markdown('<h1 class="main-header">Dashboard Ejecutivo</h1>', unsafe_allow_html=True)
+    
+    # LIMPIAR CACHÉ Y LEER DATOS FRESCOS
+    st.cache_data.clear()
+    import utils
+    
+    # Leer CLIENTES_ACTIVOS para contar clientes reales
+    df_clientes_activos = utils.leer_excel_forzado(config.ARCHIVO_CRM, 'CLIENTES_ACTIVOS')
+    
+    # Leer LEADS para información de leads
+    df_leads = utils.leer_excel_forzado(config.ARCHIVO_CRM, 'LEADS')
+    
+    if df_clientes_activos.empty and df_leads.empty:
+        st.info("No hay datos para contar.")
+        return
+
+    # Calcular métricas con datos frescos (SIN CACHE)
+    total_clientes = len(df_clientes_activos)
+    total_leads = len(df_leads)
+    
+    # DEBUG: Mostrar conteos
+    print(f"[DEBUG] CLIENTES_ACTIVOS: {total_clientes} filas")
+    print(f"[DEBUG] LEADS: {total_leads} filas")
+    
+    # Buscar bajas y pausados en LEADS (si tienen la columna Estado Lead)
+    total_bajas = 0
+    total_pausados = 0
+    if 'Estado Lead' in df_leads.columns:
+        total_bajas = len(df_leads[df_leads['Estado Lead'] == 'Baja'])
+        total_pausados = len(df_leads[df_leads['Estado Lead'] == 'Pausado'])
+    
+    # ===== GAUGE CHART - GAMIFICACIÓN =====
+   
+    
+    col_gauge, col_stats = st.columns([2, 1])
+    
+    with col_gauge:
+        # Gauge Chart para meta de 10 clientes activos
+        import plotly.graph_objects as go
+        
+        meta = 10
+        valor = total_clientes
+        porcentaje = (valor / meta) * 100 if meta > 0 else 0
+        
+        # Determinar color según rango
+        if valor <= 4:
+            color_gauge = "red"
+            estado_texto = "🔴 CRÍTICO"
+        elif valor <= 8:
+            color_gauge = "orange"
+            estado_texto = "🟡 EN PROGRESO"
+        else:
+            color_gauge = "green"
+            estado_texto = "🟢 OBJETIVO CUMPLIDO!"
+        
+        fig = go.Figure(go.Indicator(
+            mode="gauge+number+delta",
+            value=valor,
+            domain={'x': [0, 1], 'y': [0, 1]},
+            title={'text': "🎯 Meta de Clientes Activos"},
+            delta={'reference': meta, 'suffix': " clientes faltantes"},
+            gauge={
+                'axis': {'range': [None, meta]},
+                'bar': {'color': color_gauge},
+                'steps': [
+                    {'range': [0, 4], 'color': "rgba(255, 0, 0, 0.2)"},
+                    {'range': [4, 8], 'color': "rgba(255, 165, 0, 0.2)"},
+                    {'range': [8, 10], 'color': "rgba(0, 255, 0, 0.2)"}
+                ],
+                'threshold': {
+                    'line': {'color': "red", 'width': 4},
+                    'thickness': 0.75,
+                    'value': 10
+                }
+            }
+        ))
+        
+        fig.update_layout(
+            height=300,
+            margin=dict(l=0, r=0, t=50, b=0),
+            font=dict(size=14)
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col_stats:
+        st.metric("📋 Leads", total_leads)
+        st.metric("🟢 Clientes Activos", total_clientes)
+        st.metric("❌ Bajas", total_bajas)
+        
+        # Mostrar estado de progreso
+        st.markdown(f"**Progreso:** {porcentaje:.1f}%")
+    
+    st.markdown("---")
+    
+    # ===== ALERTA DE DATOS INCOMPLETOS =====
+    # Leer CLIENTES_ACTIVOS para verificar si hay clientes sin dirección
+    try:
+        df_check_direcciones = utils.leer_excel_forzado(config.ARCHIVO_CRM, 'CLIENTES_ACTIVOS')
+        clientes_sin_dir = df_check_direcciones[
+            (df_check_direcciones['Dirección'].isna()) | 
+            (df_check_direcciones['Dirección'] == '')
+        ]
+        clientes_sin_ciudad = df_check_direcciones[
+            (df_check_direcciones['Ciudad'].isna()) | 
+            (df_check_direcciones['Ciudad'] == '')
+        ]
+        
+        if not clientes_sin_dir.empty or not clientes_sin_ciudad.empty:
+            col_alerta1, col_alerta2 = st.columns(2)
+            
+            with col_alerta1:
+                if not clientes_sin_dir.empty:
+                    st.error(f"⚠️ **{len(clientes_sin_dir)} cliente(s) sin DIRECCIÓN**")
+                    for idx, row in clientes_sin_dir.iterrows():
+                        st.caption(f"• {row['Nombre Comercial']}")
+            
+            with col_alerta2:
+                if not clientes_sin_ciudad.empty:
+                    st.error(f"⚠️ **{len(clientes_sin_ciudad)} cliente(s) sin CIUDAD**")
+                    for idx, row in clientes_sin_ciudad.iterrows():
+                        st.caption(f"• {row['Nombre Comercial']}")
+    except:
+        pass
+    
+    # ===== MAPA DE GEOLOCALIZACIÓN - SOLO CLIENTES ACTIVOS =====
+    st.markdown("### 🗺️ Geolocalización de Clientes Activos")
+    
+    # Leer CLIENTES_ACTIVOS Y INTERACCIONES - SIEMPRE FRESCOS
+    df_clientes = utils.leer_excel_forzado(config.ARCHIVO_CRM, 'CLIENTES_ACTIVOS')
+    df_interacciones = utils.leer_excel_forzado(config.ARCHIVO_CRM, 'INTERACCIONES')
+    
+    # Preparar datos para el mapa - LEER COORDENADAS DE EXCEL (SIN REQUESTS)
+    mapa_datos = []
+    
+    for idx, row in df_clientes.iterrows():
+        # Validar que la dirección Y la ciudad no estén vacías (igual que el selector)
+        direccion = row.get('Dirección', '')
+        ciudad = row.get('Ciudad', '')
+        
+        # Solo incluir en el mapa si tiene AMBAS: Dirección y Ciudad
+        if (pd.isna(direccion) or direccion == '') or (pd.isna(ciudad) or ciudad == ''):
+            continue
+        
+        nombre = row.get('Nombre Comercial', 'Sin nombre')
+        id_cliente = row.get('ID', None)
+        encargado = row.get('Encargado', 'No asignado')
+        contrato = row.get('Servicio Contratado', 'Sin contrato')
+        
+        # Buscar próxima acción en INTERACCIONES
+        proxima_accion = 'Sin acción pendiente'
+        if not df_interacciones.empty and id_cliente is not None:
+            interacciones_cliente = df_interacciones[df_interacciones['ID Cliente'] == id_cliente]
+            if not interacciones_cliente.empty:
+                # Filtrar las que tienen próxima acción
+                con_proxima = interacciones_cliente[interacciones_cliente['Próxima Acción'].notna()]
+                if not con_proxima.empty:
+                    proxima_accion = str(con_proxima.iloc[-1]['Próxima Acción'])
+        
+        # LEER COORDENADAS DEL EXCEL
+        lat = row.get('Latitud', None)
+        lon = row.get('Longitud', None)
+        
+        # Si no hay coordenadas guardadas O son coordenadas genéricas de Madrid, geocodificar la dirección
+        es_madrid_generico = (lat == 40.4168 and lon == -3.7038) or pd.isna(lat) or pd.isna(lon)
+        
+        if es_madrid_generico:
+            try:
+                from geopy.geocoders import Nominatim
+                
+                geolocator = Nominatim(user_agent="horeca_crm", timeout=3)
+                # Construir dirección completa para geocodificación
+                direccion_completa = f"{direccion.strip()}, {ciudad.strip()}, España"
+                
+                try:
+                    location = geolocator.geocode(direccion_completa, language='es')
+                    if location:
+                        lat = location.latitude
+                        lon = location.longitude
+                    else:
+                        # Si no encuentra, usar centro de la ciudad
+                        ciudades_cache = {'madrid': (40.4168, -3.7038), 'barcelona': (41.3874, 2.1686), 'valencia': (39.4699, -0.3763)}
+                        ciudad_lower = ciudad.lower().strip() if isinstance(ciudad, str) else ''
+                        lat, lon = ciudades_cache.get(ciudad_lower, (40.4168, -3.7038))
+                except Exception as e_geo:
+                    # Fallback a caché
+                    ciudades_cache = {'madrid': (40.4168, -3.7038), 'barcelona': (41.3874, 2.1686), 'valencia': (39.4699, -0.3763)}
+                    ciudad_lower = ciudad.lower().strip() if isinstance(ciudad, str) else ''
+                    lat, lon = ciudades_cache.get(ciudad_lower, (40.4168, -3.7038))
+            except ImportError:
+                # Si no tiene geopy, usar caché
+                ciudades_cache = {'madrid': (40.4168, -3.7038), 'barcelona': (41.3874, 2.1686), 'valencia': (39.4699, -0.3763)}
+                ciudad_lower = ciudad.lower().strip() if isinstance(ciudad, str) else ''
+                lat, lon = ciudades_cache.get(ciudad_lower, (40.4168, -3.7038))
+        
+        mapa_datos.append({
+            'lat': lat,
+            'lon': lon,
+            'nombre': nombre,
+            'direccion': direccion,
+            'ciudad': ciudad,
+            'encargado': encargado,
+            'contrato': contrato,
+            'proxima_accion': proxima_accion
+        })
+    
+    if mapa_datos:
+        # Crear mapa
+        try:
+            import folium
+            from streamlit_folium import st_folium
+            
+            # Calcular centro del mapa
+            lats = [d['lat'] for d in mapa_datos]
+            lons = [d['lon'] for d in mapa_datos]
+            center_lat = sum(lats) / len(lats) if lats else 40.4168
+            center_lon = sum(lons) / len(lons) if lons else -3.7038
+            
+            m = folium.Map(
+                location=[center_lat, center_lon],
+                zoom_start=13,
+                tiles="OpenStreetMap"
+            )
+            
+            for dato in mapa_datos:
+                # Todos son Clientes Activos - color verde
+                color_pin = 'green'
+                
+                # Crear tooltip enriquecido con HTML
+                tooltip_html = f"""
+                <div style="font-family: Arial; font-size: 13px; line-height: 1.8; min-width: 200px;">
+                    <b>🏪 {dato['nombre']}</b><br>
+                    <b>👤 Encargado:</b> {dato['encargado']}<br>
+                    <b>⚙️ Contrato:</b> {dato['contrato']}<br>
+                    <b>📅 Próxima Acción:</b> {dato['proxima_accion']}
+                </div>
+                """
+                
+                folium.CircleMarker(
+                    location=[dato['lat'], dato['lon']],
+                    radius=10,
+                    popup=f"<b>{dato['nombre']}</b><br>📍 {dato['direccion']}<br>🏙️ {dato['ciudad']}",
+                    tooltip=folium.Tooltip(tooltip_html, sticky=True),
+                    color=color_pin,
+                    fill=True,
+                    fillColor=color_pin,
+                    fillOpacity=0.7
+                ).add_to(m)
+            
+            # Mostrar mapa
+            col_mapa, col_info = st.columns([3, 1])
+            
+            with col_mapa:
+                st_folium(m, width=700, height=400)
+            
+            with col_info:
+                st.markdown("**Información del Mapa:**")
+                st.metric("✅ Clientes Activos", len(mapa_datos))
+                
+                sin_direccion = len(df_clientes) - len(mapa_datos)
+                if sin_direccion > 0:
+                    st.warning(f"⚠️ {sin_direccion} cliente(s) sin dirección")
+                    # Mostrar cuáles son
+                    clientes_sin_dir = df_clientes[
+                        (df_clientes['Dirección'].isna()) | (df_clientes['Dirección'] == '')
+                    ]['Nombre Comercial'].tolist()
+                    if clientes_sin_dir:
+                        st.caption("Sin dirección:")
+                        for cliente_sin_dir in clientes_sin_dir:
+                            st.caption(f"• {cliente_sin_dir}")
+        except ImportError:
+            st.warning("⚠️ Instala 'geopy' para usar geocodificación: pip install geopy")
+    else:
+        st.warning("⚠️ No hay direcciones registradas para mostrar en el mapa")
+    
+    # Debug: mostrar qué clientes no tienen datos completos
+    with st.expander("🔍 Debug: Clientes incompletos"):
+        clientes_incompletos = []
+        for idx, row in df_clientes.iterrows():
+            direccion = row.get('Dirección', '')
+            ciudad = row.get('Ciudad', '')
+            nombre = row.get('Nombre Comercial', 'Sin nombre')
+            
+            if (pd.isna(direccion) or direccion == ''):
+                clientes_incompletos.append(f"• {nombre}: **Sin Dirección**")
+            if (pd.isna(ciudad) or ciudad == ''):
+                clientes_incompletos.append(f"• {nombre}: **Sin Ciudad**")
+        
+        if clientes_incompletos:
+            st.write("**Clientes sin datos completos:**")
+            for item in clientes_incompletos:
+                st.write(item)
+        else:
+            st.success("✅ Todos los clientes tienen datos completos")
+    
+    # ===== KANBAN SEMANAL - PRÓXIMAS ACCIONES =====
+    st.markdown("### 📋 Kanban Semanal - Próximas Acciones")
+    
+    # Botón para añadir nueva acción
+    col_titulo, col_boton = st.columns([4, 1])
+    with col_boton:
+        if st.button("➕ Nueva Acción", use_container_width=True):
+            st.session_state['mostrar_modal_accion'] = True
+    
+    # Leer interacciones (ya se leyó arriba, reutilizar)
+    if 'df_interacciones' not in locals():
+        try:
+            df_interacciones = utils.leer_excel_forzado(config.ARCHIVO_CRM, 'INTERACCIONES')
+        except:
+            df_interacciones = pd.DataFrame()
+    
+    if not df_interacciones.empty:
+        from datetime import datetime, timedelta
+        
+        # Filtrar solo las que tienen Próxima Acción
+        df_acciones = df_interacciones[df_interacciones['Próxima Acción'].notna()].copy()
+        
+        if not df_acciones.empty:
+            hoy = datetime.now().date()
+            
+            # Agrupar por urgencia
+            vencidas = []
+            hoy_acciones = []
+            esta_semana = []
+            proximamente = []
+            
+            for idx, row in df_acciones.iterrows():
+                fecha_accion = row.get('Fecha Próxima Acción', None)
+                
+                if pd.notna(fecha_accion):
+                    try:
+                        if isinstance(fecha_accion, str):
+                            fecha_accion = pd.to_datetime(fecha_accion).date()
+                        elif hasattr(fecha_accion, 'date'):
+                            fecha_accion = fecha_accion.date()
+                        
+                        dias_diferencia = (fecha_accion - hoy).days
+                        
+                        if dias_diferencia < 0:
+                            vencidas.append(row)
+                        elif dias_diferencia == 0:
+                            hoy_acciones.append(row)
+                        elif dias_diferencia <= 7:
+                            esta_semana.append(row)
+                        else:
+                            proximamente.append(row)
+                    except:
+                        proximamente.append(row)
+                else:
+                    proximamente.append(row)
+            
+            # Crear 4 columnas para el Kanban
+            col1, col2, col3, col4 = st.columns(4)
+            
+            grupos = [
+                (col1, "🔴 Vencidas", vencidas, "#FF4444"),
+                (col2, "🟠 Hoy", hoy_acciones, "#FFAA00"),
+                (col3, "🟡 Esta Semana", esta_semana, "#FFD700"),
+                (col4, "🟢 Próximamente", proximamente, "#4CAF50")
+            ]
+            
+            for col, titulo, acciones, color in grupos:
+                with col:
+                    st.markdown(f"**{titulo}** ({len(acciones)})")
+                    st.markdown("---")
+                    
+                    if acciones:
+                        # Leer clientes activos para obtener encargados
+                        try:
+                            df_clientes_encargados = utils.leer_excel_forzado(config.ARCHIVO_CRM, 'CLIENTES_ACTIVOS')
+                            dict_encargados = dict(zip(df_clientes_encargados['ID'], df_clientes_encargados['Encargado']))
+                        except:
+                            dict_encargados = {}
+                        
+                        for idx_list, accion in enumerate(acciones):
+                            cliente = accion.get('Nombre Cliente', 'Sin cliente')
+                            descripcion_accion = accion.get('Próxima Acción', 'Sin descripción')
+                            fecha = accion.get('Fecha Próxima Acción', '')
+                            tipo = accion.get('Tipo', 'General')
+                            id_accion = accion.get('ID Interacción', None)
+                            completada = accion.get('Completada', False)
+                            id_cliente = accion.get('ID Cliente', None)
+                            
+                            # Obtener encargado del cliente
+                            encargado = dict_encargados.get(id_cliente, 'Sin asignar')
+                            
+                            # Formatear fecha
+                            if pd.notna(fecha):
+                                try:
+                                    if isinstance(fecha, str):
+                                        fecha_dt = pd.to_datetime(fecha)
+                                    else:
+                                        fecha_dt = fecha
+                                    fecha_str = fecha_dt.strftime('%d/%m/%Y')
+                                except:
+                                    fecha_str = str(fecha)
+                            else:
+                                fecha_str = 'Sin fecha'
+                            
+                            # Crear card con botones interactivos
+                            import hashlib
+                            key_base = f"{id_accion}|{id_cliente}|{fecha_str}|{descripcion_accion}|{idx_list}"
+                            key_suffix = hashlib.md5(key_base.encode("utf-8")).hexdigest()[:10]
+                            col_card, col_acciones = st.columns([4, 1])
+                            
+                            with col_card:
+                                estado_check = "✅" if completada else "⭕"
+                                st.markdown(
+                                    f"""
+                                    <div style="
+                                        border-left: 4px solid {color};
+                                        padding: 10px;
+                                        margin: 8px 0;
+                                        background-color: {'#e8f5e9' if completada else '#f9f9f9'};
+                                        border-radius: 4px;
+                                        opacity: {'0.6' if completada else '1'};
+                                    ">
+                                        <strong><span style="font-size: 14px;">🏢</span> {cliente}</strong><br>
+                                        <small><span style="font-size: 12px;">👤</span> {encargado}</small><br>
+                                        <small><span style="font-size: 12px;">📝</span> {descripcion_accion}</small><br>
+                                        <small><span style="font-size: 12px;">📅</span> {fecha_str} | <span style="font-size: 12px;">🏷️</span> {tipo}</small>
+                                    </div>
+                                    """,
+                                    unsafe_allow_html=True
+                                )
+                            
+                            with col_acciones:
+                                col_check, col_delete = st.columns(2)
+                                
+                                with col_check:
+                                    if st.button(
+                                        "✅" if not completada else "↩️",
+                                        key=f"check_{key_suffix}",
+                                        help="Marcar como completada" if not completada else "Desmarcar",
+                                        use_container_width=True
+                                    ):
+                                        try:
+                                            # Leer interacciones
+                                            df_int_actualizar = utils.leer_excel_forzado(config.ARCHIVO_CRM, 'INTERACCIONES')
+                                            
+                                            # Actualizar fila
+                                            mask = df_int_actualizar['ID Interacción'] == id_accion
+                                            df_int_actualizar.loc[mask, 'Completada'] = not completada
+                                            
+                                            # Guardar
+                                            if utils.escribir_excel(config.ARCHIVO_CRM, 'INTERACCIONES', df_int_actualizar):
+                                                st.success("✅ Actualizado" if not completada else "↩️ Desmarcado")
+                                                time.sleep(0.5)
+                                                st.rerun()
+                                            else:
+                                                st.error("Error al guardar")
+                                        except Exception as e:
+                                            st.error(f"Error: {str(e)}")
+                                
+                                with col_delete:
+                                    if st.button(
+                                        "🗑️",
+                                        key=f"delete_{key_suffix}",
+                                        help="Eliminar acción",
+                                        use_container_width=True
+                                    ):
+                                        st.session_state[f'confirmar_delete_{id_accion}'] = True
+                                
+                                # Confirmación de eliminación
+                                if st.session_state.get(f'confirmar_delete_{id_accion}', False):
+                                    st.warning(f"¿Eliminar esta acción?")
+                                    col_si, col_no = st.columns(2)
+                                    
+                                    with col_si:
+                                        if st.button("Sí, eliminar", key=f"confirm_yes_{key_suffix}"):
+                                            try:
+                                                df_int_eliminar = utils.leer_excel_forzado(config.ARCHIVO_CRM, 'INTERACCIONES')
+                                                df_int_eliminar = df_int_eliminar[df_int_eliminar['ID Interacción'] != id_accion]
+                                                
+                                                if utils.escribir_excel(config.ARCHIVO_CRM, 'INTERACCIONES', df_int_eliminar):
+                                                    st.success("🗑️ Eliminado")
+                                                    st.session_state[f'confirmar_delete_{id_accion}'] = False
+                                                    time.sleep(0.5)
+                                                    st.rerun()
+                                                else:
+                                                    st.error("Error al eliminar")
+                                            except Exception as e:
+                                                st.error(f"Error: {str(e)}")
+                                    
+                                    with col_no:
+                                        if st.button("No, cancelar", key=f"confirm_no_{key_suffix}"):
+                                            st.session_state[f'confirmar_delete_{id_accion}'] = False
+                                            st.rerun()
+                    else:
+                        st.markdown('<div style="padding: 20px; text-align: center; color: #999;">—</div>', 
+                                   unsafe_allow_html=True)
+        else:
+            st.info("📝 No hay próximas acciones registradas.")
+    else:
+        st.info("📝 No hay interacciones registradas. Accede a 'Próximas Acciones' para crear nuevas.")
+    
+    # ===== MODAL PARA AÑADIR NUEVA ACCIÓN =====
+    if st.session_state.get('mostrar_modal_accion', False):
+        with st.form(key='form_nueva_accion_kanban'):
+            st.markdown("### ➕ Añadir Nueva Acción")
+            
+            # Leer clientes activos
+            try:
+                df_clientes = utils.leer_excel_forzado(config.ARCHIVO_CRM, 'CLIENTES_ACTIVOS')
+                opciones_clientes = df_clientes['Nombre Comercial'].tolist()
+                ids_clientes = df_clientes['ID'].tolist()
+                dict_clientes = dict(zip(opciones_clientes, ids_clientes))
+            except:
+                opciones_clientes = []
+                dict_clientes = {}
+                st.error("No se pudieron cargar los clientes activos")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                cliente_seleccionado = st.selectbox(
+                    "Cliente *",
+                    options=opciones_clientes,
+                    help="Selecciona el cliente para esta acción"
+                )
+                
+                tipo_accion = st.selectbox(
+                    "Tipo de Acción *",
+                    options=['Llamada', 'Email', 'Reunión', 'Visita', 'Seguimiento', 'Otro'],
+                    help="Tipo de acción a realizar"
+                )
+            
+            with col2:
+                fecha_accion = st.date_input(
+                    "Fecha Próxima Acción *",
+                    value=datetime.now().date(),
+                    help="¿Cuándo se debe realizar esta acción?"
+                )
+                
+                prioridad = st.selectbox(
+                    "Prioridad",
+                    options=['Alta', 'Media', 'Baja'],
+                    index=1
+                )
+            
+            descripcion_accion = st.text_area(
+                "Descripción de la Acción *",
+                placeholder="Describe qué hay que hacer...",
+                help="Detalla la acción a realizar"
+            )
+            
+            col_btn1, col_btn2 = st.columns(2)
+            with col_btn1:
+                submit = st.form_submit_button("✅ Guardar Acción", use_container_width=True)
+            with col_btn2:
+                cancel = st.form_submit_button("❌ Cancelar", use_container_width=True)
+            
+            if submit:
+                if cliente_seleccionado and descripcion_accion:
+                    try:
+                        # Leer interacciones
+                        try:
+                            df_interacciones = utils.leer_excel_forzado(config.ARCHIVO_CRM, 'INTERACCIONES')
+                        except:
+                            df_interacciones = pd.DataFrame(columns=[
+                                'ID Interacción', 'ID Cliente', 'Nombre Cliente', 'Fecha',
+                                'Tipo', 'Resultado', 'Descripción', 'Próxima Acción', 'Fecha Próxima Acción',
+                                'Responsable', 'Prioridad', 'Completada', 'Fecha Fin Prevista', 'ID'
+                            ])
+                        
+                        # Crear nueva interacción
+                        nuevo_id = int(df_interacciones['ID Interacción'].max()) + 1 if not df_interacciones.empty else 1
+                        id_cliente = dict_clientes.get(cliente_seleccionado, None)
+                        
+                        nueva_accion = pd.DataFrame([{
+                            'ID Interacción': nuevo_id,
+                            'ID Cliente': id_cliente,
+                            'Nombre Cliente': cliente_seleccionado,
+                            'Fecha': datetime.now().strftime('%Y-%m-%d'),
+                            'Tipo': tipo_accion,
+                            'Resultado': '',
+                            'Descripción': descripcion_accion,
+                            'Próxima Acción': descripcion_accion,
+                            'Fecha Próxima Acción': fecha_accion.strftime('%Y-%m-%d'),
+                            'Responsable': st.session_state.get('usuario', 'Sistema'),
+                            'Prioridad': prioridad,
+                            'Completada': False,
+                            'Fecha Fin Prevista': '',
+                            'ID': nuevo_id
+                        }])
+                        
+                        # Concatenar
+                        df_interacciones = pd.concat([df_interacciones, nueva_accion], ignore_index=True)
+                        
+                        # Guardar
+                        if utils.escribir_excel(config.ARCHIVO_CRM, 'INTERACCIONES', df_interacciones):
+                            st.success("✅ Acción añadida correctamente")
+                            st.session_state['mostrar_modal_accion'] = False
+                            time.sleep(1)
+                            st.rerun()
+                        else:
+                            st.error("❌ Error al guardar la acción")
+                    
+                    except Exception as e:
+                        st.error(f"❌ Error: {str(e)}")
+                else:
+                    st.warning("⚠️ Completa todos los campos obligatorios (*)")
+            
+            if cancel:
+                st.session_state['mostrar_modal_accion'] = False
+                st.rerun()
+    
+    st.markdown("---")
+    
+    # Fila 2: Gráficos
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📊 Distribución de Leads por Estado")
+        # Forzar recálculo con datos frescos
+        df_leads = utils.leer_excel_forzado(config.ARCHIVO_CRM, 'LEADS')
+        if not df_leads.empty and 'Estado' in df_leads.columns:
+            estados = df_leads['Estado'].value_counts()
+            st.bar_chart(estados)
+        else:
+            st.info("No hay datos de leads todavía")
+    
+    with col2:
+        st.subheader("📅 Próximas Acciones")
+        mostrar_proximas_acciones_dashboard()
+    
+    st.markdown("---")
+    
+ 
+# ============================================================================
+# FUNCIÓN: PRÓXIMAS ACCIONES (DASHBOARD)
+# ============================================================================
+
+def mostrar_proximas_acciones_dashboard():
+    """Muestra las próximas acciones en el dashboard"""
+    try:
+        import indice_acciones
+        indice = indice_acciones.obtener_indice()
+        df_int = indice['interacciones']
+        
+        if df_int is None or df_int.empty or 'Próxima Acción' not in df_int.columns:
+            st.info("Sin acciones programadas")
+            return
+        
+        if indice['df'].empty:
+            st.info("✅ Sin acciones pendientes")
+            return
+        
+        # Urgencia por rangos de fecha (búsqueda binaria sobre el índice)
+        grupos = indice_acciones.agrupar_por_urgencia(indice)
+        maximo = indice_acciones.MAX_ACCIONES_VISIBLES
+        
+        # VENCIDAS
+        vencidas = grupos['vencidas']
+        if not vencidas.empty:
+            st.error(f"🔴 **{len(vencidas)} VENCIDAS**")
+            for _, _, cliente, accion in indice_acciones.textos_acciones(vencidas.head(maximo)):
+                st.write(f"  • **{cliente}** - {accion}")
+        
+        # HOY
+        hoy_acciones = grupos['hoy']
+        if not hoy_acciones.empty:
+            st.warning(f"🟡 **{len(hoy_acciones)} PARA HOY**")
+            for _, _, cliente, accion in indice_acciones.textos_acciones(hoy_acciones.head(maximo)):
+                st.write(f"  • **{cliente}** - {accion}")
+        
+        # ESTA SEMANA
+        semana = grupos['semana']
+        if not semana.empty:
+            st.info(f"🟢 **{len(semana)} ESTA SEMANA**")
+            for _, fecha, cliente, accion in indice_acciones.textos_acciones(semana.head(maximo), '%d/%m'):
+                st.write(f"  • **{fecha}** - {cliente} - {accion}")
+        
+        # PRÓXIMAMENTE
+        futuras = grupos['futuras']
+        if not futuras.empty:
+            with st.expander(f"🔵 {len(futuras)} PRÓXIMAMENTE"):
+                for _, fecha, cliente, accion in indice_acciones.textos_acciones(futuras.head(maximo), '%d/%m'):
+                    st.write(f"  • **{fecha}** - {cliente} - {accion}")
+        
+        if len(vencidas) == 0 and len(hoy_acciones) == 0 and len(semana) == 0 and len(futuras) == 0:
+            st.success("✅ Todo al día")
+    
+    except Exception as e:
+        st.warning(f"⚠️ Error al cargar acciones: {str(e)}")
@@ -0,0 +1,42 @@
+"""
+MODULO_EMPRESA.PY - Empresa
+Datos de la propia consultoría
+"""
+
+import streamlit as st
+import config
+import utils
+
+# ============================================================================
+# MÓDULO: EMPRESA
+# ============================================================================
+
+def modulo_empresa():
+    """Módulo de backoffice y empresa"""
+    st.markdown('<h1 class="main-header">💼 Gestión Empresarial</h1>', unsafe_allow_html=True)
+    
+    tab1, tab2, tab3 = st.tabs(["📊 KPIs", "💰 Facturación", "📉 Gastos"])
+    
+    with tab1:
+        df_kpis = utils.leer_excel(config.ARCHIVO_EMPRESA, "KPIS_MENSUALES")
+        
+        if not df_kpis.empty:
+            st.dataframe(df_kpis, use_container_width=True, hide_index=True)
+        else:
+            st.info("No hay KPIs registrados")
+    
+    with tab2:
+        df_fact = utils.leer_excel(config.ARCHIVO_EMPRESA, "FACTURACION")
+        
+        if not df_fact.empty:
+            st.dataframe(df_fact, use_container_width=True, hide_index=True)
+        else:
+            st.info("No hay facturas registradas")
+    
+    with tab3:
+        df_gastos = utils.leer_excel(config.ARCHIVO_EMPRESA, "GASTOS")
+        
+        if not df_gastos.empty:
+            st.dataframe(df_gastos, use_container_width=True, hide_index=True)
+        else:
+            st.info("No hay gastos registrados")
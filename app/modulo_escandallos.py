@@ -0,0 +1,3215 @@
+"""
+MODULO_ESCANDALLOS.PY - Gestión de Escandallos
+Carta, escandallos, ingredientes, compras, pedidos e ingeniería de menú por cliente
+"""
+
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+import time
+import io
+import config
+import utils
+import paginacion
+import ingenieria_menu
+
+try:
+    import plotly.graph_objects as go
+    import plotly.express as px
+    PLOTLY_AVAILABLE = True
+except ImportError:
+    PLOTLY_AVAILABLE = False
+
+# ============================================================================
+# MÓDULO: ESCANDALLOS
+# ============================================================================
+
+def modulo_escandallos():
+    """Módulo de gestión de escandallos y carta - Por Cliente"""
+    st.markdown('<h1 class="main-header">🍽️ Gestión de Escandallos</h1>', unsafe_allow_html=True)
+    
+    # Cargar TODOS los clientes (lectura forzada sin caché)
+    df_clientes_todos = utils.leer_excel_forzado(config.ARCHIVO_CRM, "CLIENTES_ACTIVOS")
+    
+    # Filtrar SOLO clientes ACTIVOS para el selector
+    if 'Estado' in df_clientes_todos.columns:
+        df_clientes = df_clientes_todos[df_clientes_todos['Estado'] == 'Activo'].copy()
+    else:
+        df_clientes = df_clientes_todos.copy()
+    
+    if df_clientes.empty or len(df_clientes) == 0:
+        st.warning("⚠️ No hay clientes activos.")
+        
+        # Mostrar info si hay clientes pausados/baja
+        if not df_clientes_todos.empty:
+            pausados = len(df_clientes_todos[df_clientes_todos['Estado'] == 'Pausado']) if 'Estado' in df_clientes_todos.columns else 0
+            bajas = len(df_clientes_todos[df_clientes_todos['Estado'] == 'Baja']) if 'Estado' in df_clientes_todos.columns else 0
+            
+            if pausados > 0 or bajas > 0:
+                st.info(f"ℹ️ Tienes {pausados} cliente(s) pausado(s) y {bajas} de baja. Sus datos se conservan y volverán a aparecer aquí si los reactivas desde CRM → Pausados/Baja.")
+        
+        st.info("💡 **Cómo empezar:**")
+        st.write("1. Ve a **CRM → Leads**")
+        st.write("2. Agrega un Lead o cambia el estado de uno existente a **'Cliente'**")
+        st.write("3. El sistema lo convertirá automáticamente a Cliente Activo")
+        st.write("4. Vuelve aquí para gestionar sus escandallos")
+        return
+    
+    # ========== SELECTOR DE CLIENTE ==========
+    st.markdown("### 👤 Selecciona el Cliente")
+    
+    col1, col2, col3 = st.columns([3, 1, 1])
+    
+    with col1:
+        # Solo mostrar clientes ACTIVOS
+        opciones_clientes = [f"{row['ID']} - {row['Nombre Comercial']}" 
+                            for _, row in df_clientes.iterrows()]
+        
+        # Recordar el cliente seleccionado
+        if 'cliente_escandallo_actual' not in st.session_state:
+            st.session_state.cliente_escandallo_actual = 0
+        
+        # Validar que el índice no se salga de rango
+        indice_default = min(st.session_state.cliente_escandallo_actual, len(opciones_clientes) - 1)
+        
+        cliente_seleccionado = st.selectbox(
+            "Trabajar con:",
+            opciones_clientes,
+            index=indice_default,
+            key="selector_cliente_escandallos",
+            help="Solo se muestran clientes ACTIVOS. Los datos de pausados/baja se conservan."
+        )
+        
+        # Guardar índice seleccionado
+        st.session_state.cliente_escandallo_actual = opciones_clientes.index(cliente_seleccionado)
+        
+        id_cliente = int(float(cliente_seleccionado.split(" - ")[0]))
+        nombre_cliente = cliente_seleccionado.split(" - ")[1]
+    
+    with col2:
+        # Info del cliente
+        cliente_info = df_clientes[df_clientes['ID'] == id_cliente].iloc[0]
+        st.metric("Tipo", cliente_info.get('Tipo Local', 'N/A'))
+    
+    with col3:
+        st.metric("Ciudad", cliente_info.get('Ciudad', 'N/A'))
+    
+    st.markdown("---")
+    
+    # ========== TABS DEL CLIENTE ==========
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs([
+        "🍴 Carta", 
+        "🔍 Escandallos", 
+        "📊 Ingredientes", 
+        "💰 Compras",
+        "💵 Simulador Precios",
+        "🛒 Pedido Inteligente",
+        "🎯 Ingeniería de Menú",
+        "📄 Informes PDF",
+        "📉 Teórico vs Real",
+        "🧪 Escenarios Precio"
+    ])
+    
+    with tab1:
+        mostrar_carta_cliente(id_cliente, nombre_cliente)
+    
+    with tab2:
+        mostrar_escandallos_cliente(id_cliente, nombre_cliente)
+    
+    with tab3:
+        mostrar_ingredientes_cliente(id_cliente, nombre_cliente)
+    
+    with tab4:
+        mostrar_compras_cliente(id_cliente, nombre_cliente)
+    
+    with tab5:
+        mostrar_simulador_precios(id_cliente, nombre_cliente)
+    
+    with tab6:
+        mostrar_pedido_inteligente(id_cliente, nombre_cliente)
+    
+    with tab7:
+        mostrar_ingenieria_menu(id_cliente, nombre_cliente)
+        mostrar_compras_cliente(id_cliente, nombre_cliente)
+    
+    with tab8:
+        from modulo_informes import mostrar_informes_pdf
+        mostrar_informes_pdf(id_cliente, nombre_cliente)
+    
+    with tab9:
+        mostrar_desviacion_food_cost(id_cliente, nombre_cliente)
+    
+    with tab10:
+        mostrar_escenarios_precios(id_cliente, nombre_cliente)
+
+def mostrar_carta_cliente(id_cliente, nombre_cliente):
+    """Carta del cliente seleccionado"""
+    st.subheader(f"🍴 Carta de {nombre_cliente}")
+    
+    # Cargar platos solo de este cliente
+    df_carta_completa = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+    df_carta = df_carta_completa[df_carta_completa['ID Cliente'] == id_cliente] if not df_carta_completa.empty else pd.DataFrame()
+    
+    # Botón agregar
+    if st.button("➕ Agregar Plato a la Carta", type="primary", key="btn_agregar_plato"):
+        st.session_state.agregar_plato = True
+    
+    # Formulario nuevo plato
+    if st.session_state.get('agregar_plato', False):
+        with st.expander("➕ **Nuevo Plato**", expanded=True):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                nombre_plato = st.text_input("Nombre del Plato*", 
+                    placeholder="Ej: Cachopo de ternera", 
+                    key="nombre_plato_form",
+                    help="Nombre que sale en la carta")
+                
+                categoria = st.selectbox("Categoría*", config.CATEGORIAS_PLATO, key="cat_plato_form")
+                
+                precio_venta = st.number_input("Precio de Venta (€)*", 
+                    min_value=0.0, value=0.0, step=0.5, format="%.2f", 
+                    key="precio_plato_form",
+                    help="IVA INCLUIDO")
+            
+            with col2:
+                coste_total = st.number_input("Coste Total (€)", 
+                    min_value=0.0, value=0.0, step=0.1, format="%.2f",
+                    help="Suma automática de ingredientes desde escandallos", 
+                    key="coste_plato_form",
+                    disabled=True)  # Deshabilitado porque se calcula automáticamente
+                
+                ventas_mes = st.number_input("Ventas/Mes Estimadas", 
+                    min_value=0, value=0, step=5, key="ventas_plato_form")
+                
+                activo = st.selectbox("Estado", ["Activo", "Inactivo"], key="activo_plato_form")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("💾 Guardar", use_container_width=True, type="primary", key="btn_guardar_plato"):
+                    if not nombre_plato:
+                        st.error("El nombre es obligatorio")
+                    elif precio_venta <= 0:
+                        st.error("El precio debe ser mayor que 0")
+                    else:
+                        nuevo_id = utils.obtener_siguiente_id(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+                        
+                        margen_euros = precio_venta - coste_total
+                        margen_pct = (margen_euros / precio_venta * 100) if precio_venta > 0 else 0
+                        food_cost = (coste_total / precio_venta * 100) if precio_venta > 0 else 0
+                        
+                        # Convertir "Activo"/"Inactivo" a "Sí"/"No" para compatibilidad
+                        activo_valor = "Sí" if activo == "Activo" else "No"
+                        
+                        nuevo_plato = {
+                            'ID Plato': nuevo_id,
+                            'ID Cliente': id_cliente,
+                            'Nombre Cliente': nombre_cliente,
+                            'Nombre Plato': nombre_plato,
+                            'Categoría': categoria,
+                            'Precio Venta': precio_venta,
+                            'Coste Total': coste_total,
+                            'Margen €': margen_euros,
+                            'Margen %': margen_pct,
+                            'Food Cost %': food_cost,
+                            'Ventas/Mes': ventas_mes,
+                            'Clasificación': '',
+                            'Precio Recomendado': coste_total * 3 if coste_total > 0 else precio_venta * 1.5,
+                            'Activo': activo_valor,
+                            'Notas': ''
+                        }
+                        
+                        # La clasificación la calcula ingenieria_menu con la mediana del cliente
+                        if ingenieria_menu.agregar_plato(nuevo_plato):
+                            st.success(f"✅ '{nombre_plato}' agregado")
+                            st.info("💡 Ahora ve a la pestaña 'Escandallos' para agregar ingredientes")
+                            st.session_state.agregar_plato = False
+                            time.sleep(0.5)
+                            st.rerun()
+            with col2:
+                if st.button("❌ Cancelar", use_container_width=True, key="btn_cancelar_plato"):
+                    st.session_state.agregar_plato = False
+                    st.rerun()
+    
+    # Mostrar tabla de platos guardados
+    st.markdown("---")
+    st.subheader("Platos en la Carta")
+    
+    if not df_carta.empty:
+        # Convertir "Sí"/"No" a "Activo"/"Inactivo" para mostrar
+        df_carta_display = df_carta.copy()
+        if 'Activo' in df_carta_display.columns:
+            df_carta_display['Activo'] = df_carta_display['Activo'].apply(
+                lambda x: "Activo" if x == "Sí" else "Inactivo"
+            )
+        
+        # ALERTAS: Food Cost incorrecto
+        coste = pd.to_numeric(df_carta['Coste Total'], errors='coerce').fillna(0)
+        precio = pd.to_numeric(df_carta['Precio Venta'], errors='coerce').fillna(0)
+        con_alerta = (coste > 0) & (precio > 0) & (coste / precio.where(precio > 0) * 100 > 35)
+        platos_alerta = pd.DataFrame({
+            'nombre': df_carta['Nombre Plato'],
+            'food_cost': coste / precio.where(precio > 0) * 100,
+            'precio_actual': precio,
+            'precio_recomendado': coste / 0.28,
+            'id_plato': df_carta['ID Plato']
+        })[con_alerta].to_dict('records')
+        
+        if platos_alerta:
+            st.subheader("🚨 ALERTAS - Precios Incorrectos")
+            # Solo se pintan las alertas de la página visible (WhatsApp las envía todas)
+            df_alertas_pagina = paginacion.paginar(
+                pd.DataFrame(platos_alerta), f"alertas_carta_{id_cliente}", tamano_pagina=10, etiqueta="alertas"
+            )
+            for alerta in df_alertas_pagina.to_dict('records'):
+                col_alerta1, col_alerta2 = st.columns([4, 1.2])
+                with col_alerta1:
+                    st.error(f"⚠️ **{alerta['nombre']}** - Precio actual: {alerta['precio_actual']:.2f}€ → Recomendado: **{alerta['precio_recomendado']:.2f}€**")
+                with col_alerta2:
+                    if st.button("💾 Actualizar", key=f"update_alert_{alerta['id_plato']}", use_container_width=True):
+                        df_carta_temp = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+                        mask = df_carta_temp['ID Plato'] == alerta['id_plato']
+                        coste_total = float(df_carta_temp.loc[mask, 'Coste Total'].values[0] or 0)
+                        nuevo_precio = alerta['precio_recomendado']
+                        margen_euros = nuevo_precio - coste_total
+                        margen_pct = (margen_euros / nuevo_precio * 100) if nuevo_precio > 0 else 0
+                        food_cost = (coste_total / nuevo_precio * 100) if nuevo_precio > 0 else 0
+                        
+                        df_carta_temp.loc[mask, 'Precio Venta'] = nuevo_precio
+                        df_carta_temp.loc[mask, 'Margen €'] = margen_euros
+                        df_carta_temp.loc[mask, 'Margen %'] = margen_pct
+                        df_carta_temp.loc[mask, 'Food Cost %'] = food_cost
+                        df_carta_temp.loc[mask, 'Precio Recomendado'] = nuevo_precio
+                        
+                        if ingenieria_menu.guardar_carta(df_carta_temp, id_cliente):
+                            st.success(f"✅ {alerta['nombre']} actualizado a {nuevo_precio:.2f}€")
+                            time.sleep(0.5)
+                            st.rerun()
+            
+            # ========== ENVÍO A WHATSAPP ==========
+            st.markdown("---")
+            st.subheader("📱 Enviar Alertas por WhatsApp")
+            
+            # Obtener número de teléfono del cliente
+            df_clientes_all = utils.leer_excel(config.ARCHIVO_CRM, "CLIENTES_ACTIVOS")
+            cliente_info = df_clientes_all[df_clientes_all['ID'] == id_cliente]
+            
+            if not cliente_info.empty:
+                numero_telefono = cliente_info.iloc[0].get('Teléfono', '')
+                
+                if numero_telefono and numero_telefono != '':
+                    from whatsapp_sender import mostrar_boton_enviar_whatsapp
+                    mostrar_boton_enviar_whatsapp(
+                        nombre_cliente,
+                        numero_telefono,
+                        platos_alerta,
+                        id_cliente=id_cliente,
+                        key_suffix=f"{id_cliente}"
+                    )
+                else:
+                    st.warning("⚠️ Este cliente no tiene teléfono registrado")
+                    st.info("📱 Actualiza el teléfono en 👥 Clientes para poder enviar alertas por WhatsApp")
+            
+            st.markdown("---")
+        
+        # Métricas rápidas
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Platos", len(df_carta))
+        with col2:
+            activos = len(df_carta[df_carta['Activo'] == 'Sí'])
+            st.metric("Activos", activos)
+        with col3:
+            if 'Margen %' in df_carta.columns:
+                margen_medio = df_carta['Margen %'].mean()
+                st.metric("Margen Medio", f"{margen_medio:.1f}%")
+        with col4:
+            if 'Clasificación' in df_carta.columns:
+                estrellas = len(df_carta[df_carta['Clasificación'] == 'Estrella'])
+                st.metric("⭐ Estrellas", estrellas)
+        
+        st.markdown("---")
+        
+        # Listado con botones por fila (solo la página visible)
+        df_carta_pagina = paginacion.paginar(
+            df_carta, f"carta_{id_cliente}",
+            columnas_filtro=['Nombre Plato', 'Categoría', 'Clasificación'],
+            columnas_orden=['Nombre Plato', 'Categoría', 'Precio Venta', 'Margen %', 'Ventas/Mes'],
+            etiqueta="platos"
+        )
+        for _, plato in df_carta_pagina.iterrows():
+            col_a, col_b, col_c, col_d, col_e, col_f = st.columns([3, 1.5, 1.5, 1.2, 0.5, 0.5])
+            
+            with col_a:
+                estado_icon = "✅" if plato.get('Activo') == 'Sí' else "⏸️"
+                clasificacion_icon = {"Estrella": "⭐", "Caballo": "🐴", "Rompecabezas": "🧩", "Perro": "🐕"}.get(plato.get('Clasificación', ''), '')
+                st.write(f"{estado_icon} **{plato['Nombre Plato']}** {clasificacion_icon}")
+                st.caption(f"{plato.get('Categoría', '')}")
+            
+            with col_b:
+                st.write(f"**{plato['Precio Venta']:.2f}€**")
+                st.caption(f"Coste: {plato['Coste Total']:.2f}€")
+            
+            with col_c:
+                st.write(f"Margen: {plato['Margen %']:.1f}%")
+                st.caption(f"Ventas: {plato.get('Ventas/Mes', 0)}/mes")
+            
+            with col_d:
+                st.write(f"{plato.get('Clasificación', '')}")
+                st.caption(f"Recom.: {plato.get('Precio Recomendado', 0):.2f}€")
+            
+            with col_e:
+                if st.button("✏️", key=f"edit_plato_{plato['ID Plato']}", help="Editar plato"):
+                    st.session_state.editando_plato = plato['ID Plato']
+            
+            with col_f:
+                if st.button("🗑️", key=f"del_plato_{plato['ID Plato']}", help="Eliminar plato"):
+                    st.session_state.eliminar_plato = plato['ID Plato']
+            
+            # Edición inline
+            if st.session_state.get('editando_plato') == plato['ID Plato']:
+                st.markdown("---")
+                st.markdown(f"**✏️ Editando: {plato['Nombre Plato']}**")
+                col_e1, col_e2, col_e3 = st.columns(3)
+                
+                with col_e1:
+                    nuevo_precio = st.number_input(
+                        "Precio Venta (€)",
+                        min_value=0.01,
+                        value=float(plato['Precio Venta']),
+                        step=0.5,
+                        format="%.2f",
+                        key=f"edit_precio_{plato['ID Plato']}"
+                    )
+                    nuevo_estado = st.selectbox(
+                        "Estado",
+                        ["Activo", "Inactivo"],
+                        index=0 if plato['Activo'] == 'Sí' else 1,
+                        key=f"edit_estado_{plato['ID Plato']}"
+                    )
+                
+                with col_e2:
+                    nuevas_ventas = st.number_input(
+                        "Ventas/Mes",
+                        min_value=0,
+                        value=int(plato.get('Ventas/Mes', 0) or 0),
+                        step=5,
+                        key=f"edit_ventas_{plato['ID Plato']}"
+                    )
+                    st.caption(f"Coste Total: {plato['Coste Total']:.2f}€ (calculado)")
+                
+                with col_e3:
+                    st.write("")
+                    if st.button("💾 Guardar", key=f"save_plato_{plato['ID Plato']}"):
+                        df_carta_temp = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+                        mask = df_carta_temp['ID Plato'] == plato['ID Plato']
+                        coste_total = float(df_carta_temp.loc[mask, 'Coste Total'].values[0] or 0)
+                        margen_euros = nuevo_precio - coste_total
+                        margen_pct = (margen_euros / nuevo_precio * 100) if nuevo_precio > 0 else 0
+                        food_cost = (coste_total / nuevo_precio * 100) if nuevo_precio > 0 else 0
+                        
+                        # Precio recomendado apuntando a 28% Food Cost (🟢 verde)
+                        precio_recomendado = (coste_total / 0.28) if coste_total > 0 else nuevo_precio * 1.5
+                        
+                        df_carta_temp.loc[mask, 'Precio Venta'] = nuevo_precio
+                        df_carta_temp.loc[mask, 'Ventas/Mes'] = nuevas_ventas
+                        df_carta_temp.loc[mask, 'Activo'] = "Sí" if nuevo_estado == "Activo" else "No"
+                        df_carta_temp.loc[mask, 'Margen €'] = margen_euros
+                        df_carta_temp.loc[mask, 'Margen %'] = margen_pct
+                        df_carta_temp.loc[mask, 'Food Cost %'] = food_cost
+                        df_carta_temp.loc[mask, 'Precio Recomendado'] = precio_recomendado
+                        
+                        if ingenieria_menu.guardar_carta(df_carta_temp, id_cliente):
+                            st.success("✅ Plato actualizado")
+                            st.session_state.editando_plato = None
+                            time.sleep(0.5)
+                            st.rerun()
+                    if st.button("❌ Cancelar", key=f"cancel_plato_{plato['ID Plato']}"):
+                        st.session_state.editando_plato = None
+                        st.rerun()
+            
+            # Eliminar
+            if st.session_state.get('eliminar_plato') == plato['ID Plato']:
+                st.warning("¿Eliminar este plato?")
+                col_del1, col_del2 = st.columns(2)
+                with col_del1:
+                    if st.button("Sí, eliminar", key=f"confirm_del_{plato['ID Plato']}"):
+                        df_carta_temp = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+                        df_carta_temp = df_carta_temp[df_carta_temp['ID Plato'] != plato['ID Plato']]
+                        if utils.escribir_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES", df_carta_temp):
+                            st.success("🗑️ Plato eliminado")
+                            st.session_state.eliminar_plato = None
+                            time.sleep(0.5)
+                            st.rerun()
+                with col_del2:
+                    if st.button("No, cancelar", key=f"cancel_del_{plato['ID Plato']}"):
+                        st.session_state.eliminar_plato = None
+                        st.rerun()
+    else:
+        st.info("🍽️ No hay platos registrados. ¡Agrega el primero!")
+
+def mostrar_escandallos_cliente(id_cliente, nombre_cliente):
+    """Escandallos del cliente seleccionado"""
+    import unidades
+    
+    st.subheader(f"🔍 Escandallos de {nombre_cliente}")
+    
+    df_esc_completo = utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+    df_platos_completo = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+    df_ing = utils.leer_excel(config.ARCHIVO_OPERACIONES, "INGREDIENTES_MAESTRO")
+    
+    # Filtrar platos de este cliente
+    df_platos = df_platos_completo[df_platos_completo['ID Cliente'] == id_cliente] if not df_platos_completo.empty else pd.DataFrame()
+    
+    if df_platos.empty:
+        st.warning(f"⚠️ {nombre_cliente} no tiene platos. Agrega platos en la pestaña 'Carta' primero.")
+        return
+    
+    # Lista de platos del cliente
+    platos_cliente = [f"{row['ID Plato']} - {row['Nombre Plato']}" for _, row in df_platos.iterrows()]
+    ingredientes_disp = [f"{row['ID Ingrediente']} - {row['Nombre']}" for _, row in df_ing.iterrows()] if not df_ing.empty else []
+    
+    # Selector de plato
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        plato_ver = st.selectbox("Ver escandallo de:", ["📋 Todos"] + platos_cliente, key="ver_escandallo")
+    with col2:
+        st.caption("Edición en bloque")
+    
+    # Mostrar escandallos
+    st.markdown("---")
+    
+    # Filtrar escandallos por platos del cliente
+    ids_platos_cliente = df_platos['ID Plato'].tolist()
+    df_esc = df_esc_completo[df_esc_completo['ID Plato'].isin(ids_platos_cliente)] if not df_esc_completo.empty else pd.DataFrame()
+    
+    if plato_ver == "📋 Todos":
+        if not df_esc.empty:
+            st.dataframe(df_esc, use_container_width=True, hide_index=True)
+            mostrar_planificacion_produccion(id_cliente, df_platos, df_esc_completo)
+        else:
+            st.info("🔍 No hay escandallos. Selecciona un plato para empezar.")
+        return
+    
+    id_plato_filtro = int(float(plato_ver.split(" - ")[0]))
+    plato_info = df_platos[df_platos['ID Plato'] == id_plato_filtro].iloc[0]
+    nombre_plato = plato_info.get('Nombre Plato', '')
+    
+    df_esc_plato = df_esc[df_esc['ID Plato'] == id_plato_filtro].copy() if not df_esc.empty else pd.DataFrame()
+    
+    # ===== PVP + MÉTRICAS =====
+    precio_venta_actual = float(plato_info.get('Precio Venta', 0))
+    col_pvp, col_coste, col_margen, col_food = st.columns(4)
+    
+    with col_pvp:
+        pvp = st.number_input(
+            "💵 PVP (con IVA)",
+            min_value=0.01,
+            value=precio_venta_actual if precio_venta_actual > 0 else 0.01,
+            step=0.5,
+            format="%.2f",
+            key=f"pvp_plato_{id_plato_filtro}"
+        )
+        if abs(pvp - precio_venta_actual) > 0.001:
+            if st.button("💾 Guardar PVP", key=f"guardar_pvp_{id_plato_filtro}"):
+                df_carta_temp = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+                mask = df_carta_temp['ID Plato'] == id_plato_filtro
+                df_carta_temp.loc[mask, 'Precio Venta'] = pvp
+                utils.escribir_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES", df_carta_temp)
+                st.success("✅ PVP actualizado")
+                time.sleep(0.3)
+                st.rerun()
+    
+    # ===== PRECIOS CLIENTE + SUB-RECETAS =====
+    df_precios_cliente = utils.leer_excel(config.ARCHIVO_OPERACIONES, "PRECIOS_POR_CLIENTE")
+    df_precios_cliente = df_precios_cliente[df_precios_cliente['ID Cliente'] == id_cliente] if not df_precios_cliente.empty else pd.DataFrame()
+    
+    opciones = {}
+    if not df_precios_cliente.empty:
+        for _, row in df_precios_cliente.iterrows():
+            label = f"ING|{row['ID Ingrediente']} - {row['Nombre Ingrediente']}"
+            # Merma del ingrediente (nivel base). Si no existe, usar 0%.
+            merma_base = float(row.get('Merma %', 0)) if 'Merma %' in row and pd.notna(row.get('Merma %')) else 0.0
+            rendimiento_base = max(0.0, 100.0 - merma_base)
+            
+            opciones[label] = {
+                'tipo': 'ingrediente',
+                'id': row['ID Ingrediente'],
+                'nombre': row['Nombre Ingrediente'],
+                'precio': row['Precio Cliente'],
+                'unidad': row['Unidad'],
+                'merma': merma_base,
+                'rendimiento': rendimiento_base,
+                'id_proveedor': row.get('ID Proveedor')
+            }
+    
+    for _, row in df_platos.iterrows():
+        if row['ID Plato'] != id_plato_filtro:
+            label = f"REC|{row['ID Plato']} - {row['Nombre Plato']}"
+            opciones[label] = {
+                'tipo': 'subreceta',
+                'id': row['ID Plato'],
+                'nombre': f"SUB-RECETA: {row['Nombre Plato']}",
+                'precio': float(row.get('Coste Total', 0)),
+                'unidad': 'ud',
+                'merma': 0.0,
+                'rendimiento': 100.0,  # Las sub-recetas siempre tienen 100% de rendimiento
+                'id_proveedor': None
+            }
+    
+    opciones_labels = [""] + list(opciones.keys())
+    
+    # ===== CONSTRUIR LISTA DE INGREDIENTES ACTUALES =====
+    ingredientes_actuales = []
+    if not df_esc_plato.empty:
+        for idx, row in df_esc_plato.iterrows():
+            id_ing = row.get('ID Ingrediente')
+            nombre_ing = str(row.get('Nombre Ingrediente', ''))
+            label = None
+            if nombre_ing.startswith("SUB-RECETA") and id_ing is not None:
+                label = f"REC|{id_ing} - {nombre_ing.replace('SUB-RECETA:', '').strip()}"
+            else:
+                label = f"ING|{id_ing} - {nombre_ing}"
+            
+            if label not in opciones:
+                # Si no está en opciones, crear entrada con datos del escandallo
+                rendimiento_guardado = row.get('Rendimiento %', row.get('Rendimiento_Pct', 100))
+                rendimiento_guardado = 100 if rendimiento_guardado in [None, 0, ""] else float(rendimiento_guardado)
+                merma_guardada = max(0.0, 100.0 - rendimiento_guardado)
+                
+                opciones[label] = {
+                    'tipo': 'ingrediente',
+                    'id': id_ing,
+                    'nombre': nombre_ing,
+                    'precio': row.get('Coste Unitario', 0),
+                    'unidad': row.get('Unidad', ''),
+                    'merma': merma_guardada,
+                    'rendimiento': rendimiento_guardado,
+                    'id_proveedor': row.get('ID Proveedor')
+                }
+                if label not in opciones_labels:
+                    opciones_labels.append(label)
+            
+            # Usar el rendimiento y precio del ingrediente base (de opciones)
+            ingredientes_actuales.append({
+                'idx': idx,
+                'Ingrediente': label,
+                'Unidad': opciones[label].get('unidad', row.get('Unidad', '')),
+                'Precio Unitario': float(opciones[label].get('precio') or 0),
+                'Merma_Pct': float(opciones[label].get('merma', 0)),
+                'Rendimiento_Pct': float(opciones[label].get('rendimiento', 100)),
+            })
+        
+        # CANTIDAD BRUTA (Neta / Rendimiento) y COSTE REAL de todas las líneas a la vez
+        df_actuales = pd.DataFrame(ingredientes_actuales)
+        costeo = unidades.costear_lineas(
+            df_esc_plato.assign(**{'Rendimiento %': df_actuales['Rendimiento_Pct'].to_numpy()}),
+            precios=df_actuales['Precio Unitario'].to_numpy()
+        )
+        for ing, neta, bruta, coste in zip(ingredientes_actuales, costeo['Cantidad Neta'],
+                                           costeo['Cantidad Bruta'], costeo['Coste Total']):
+            ing['Cantidad_Neta'] = float(neta)  # Lo que va en el plato
+            ing['Cantidad_Bruta'] = float(bruta)  # Lo que se descuenta del stock
+            ing['Coste Real'] = float(coste)
+    
+    # Calcular totales
+    coste_total = sum([ing['Coste Real'] for ing in ingredientes_actuales])
+    base_imponible = pvp / 1.10
+    margen_neto = base_imponible - coste_total
+    food_cost_pct = (coste_total / base_imponible * 100) if base_imponible > 0 else 0
+    # Precio recomendado apuntando a 28% Food Cost (🟢 verde)
+    precio_recomendado = (coste_total / 0.28) if coste_total > 0 else pvp * 1.5
+    ingredientes_count = len(ingredientes_actuales)
+    
+    with col_coste:
+        st.metric("💰 Coste Total", f"{coste_total:.2f} €")
+    with col_margen:
+        st.metric("💵 Margen Neto", f"{margen_neto:.2f} €")
+    with col_food:
+        if food_cost_pct > 35:
+            st.markdown(f"<h3 style='color: red;'>🔴 {food_cost_pct:.1f}%</h3>", unsafe_allow_html=True)
+        elif food_cost_pct >= 30:
+            st.markdown(f"<h3 style='color: orange;'>🟠 {food_cost_pct:.1f}%</h3>", unsafe_allow_html=True)
+        else:
+            st.markdown(f"<h3 style='color: green;'>🟢 {food_cost_pct:.1f}%</h3>", unsafe_allow_html=True)
+        st.caption("Food Cost %")
+    
+    # EXPLICACIÓN FOOD COST - Pequeño expander a la izquierda
+    with st.expander("📖 ¿Cómo se calcula el Food Cost %?"):
+        st.markdown("""
+        **Cálculo del Food Cost %**
+        
+        `Food Cost % = (Coste Total / Base Imponible) × 100`
+        
+        - **Coste Total**: Suma ingredientes (con merma)
+        - **Base Imponible**: PVP ÷ 1.10
+        
+        **Umbrales:**
+        - 🟢 < 30%: Excelente
+        - 🟠 30-35%: Aceptable
+        - 🔴 > 35%: Revisar
+        """)
+    
+    st.markdown("---")
+    
+    # TARJETA RESUMEN DEL ESCANDALLO
+    st.markdown(
+        f"""
+        <div class="metric-card">
+            <strong>📋 Escandallo actual de: {nombre_plato}</strong><br/>
+            🥘 Ingredientes: {ingredientes_count}<br/>
+            💰 Coste Total: {coste_total:.2f}€<br/>
+            💵 Precio Venta: {pvp:.2f}€<br/>
+            📊 Margen: {((pvp - coste_total) / pvp * 100) if pvp > 0 else 0:.1f}%<br/>
+            💡 Precio Recomendado: {precio_recomendado:.2f}€
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    
+    st.markdown("---")
+    
+    # LISTA DE INGREDIENTES EN FORMATO VISUAL
+    st.subheader("🥘 Ingredientes del Escandallo")
+    
+    # Botón para agregar ingrediente
+    if st.button("➕ Agregar Ingrediente", type="primary", key=f"btn_add_ing_{id_plato_filtro}"):
+        st.session_state[f'agregar_ingrediente_{id_plato_filtro}'] = True
+    
+    # Formulario para agregar nuevo ingrediente
+    if st.session_state.get(f'agregar_ingrediente_{id_plato_filtro}', False):
+        with st.expander("➕ **Nuevo Ingrediente**", expanded=True):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                nuevo_ing = st.selectbox(
+                    "Ingrediente*",
+                    opciones_labels,
+                    key=f"nuevo_ing_sel_{id_plato_filtro}",
+                    help="Selecciona un ingrediente o sub-receta"
+                )
+            
+            with col2:
+                nueva_cantidad_neta = st.number_input(
+                    "Cantidad Neta (en el plato)*",
+                    min_value=0.01,
+                    value=1.0,
+                    step=0.1,
+                    format="%.3f",
+                    key=f"nueva_cantidad_{id_plato_filtro}",
+                    help="Peso neto que lleva el plato según la receta"
+                )
+            
+            # Mostrar info del ingrediente seleccionado
+            if nuevo_ing and nuevo_ing in opciones:
+                info = opciones[nuevo_ing]
+                merma_ing = info.get('merma', 0)
+                rendimiento_ing = max(0.0, 100.0 - merma_ing)
+                cantidad_bruta_calc = nueva_cantidad_neta / (rendimiento_ing / 100) if rendimiento_ing > 0 else nueva_cantidad_neta
+                coste_calc = cantidad_bruta_calc * info.get('precio', 0)
+                
+                st.info(f"""
+                📊 **Cálculo automático:**
+                - Merma del ingrediente: **{merma_ing:.0f}%** (Rendimiento: {rendimiento_ing:.0f}%)
+                - Cantidad Bruta (a descontar): **{cantidad_bruta_calc:.3f} {info.get('unidad', '')}**
+                - Coste Real: **{coste_calc:.3f}€**
+                """)
+            
+            col_btn1, col_btn2 = st.columns(2)
+            with col_btn1:
+                if st.button("💾 Guardar", type="primary", use_container_width=True, key=f"guardar_nuevo_ing_{id_plato_filtro}"):
+                    if not nuevo_ing or nuevo_ing == "":
+                        st.error("Debes seleccionar un ingrediente")
+                    else:
+                        info = opciones.get(nuevo_ing)
+                        merma_base = info.get('merma', 0)
+                        rendimiento_base = max(0.0, 100.0 - merma_base)
+                        precio_unit = float(info.get('precio', 0) or 0)
+                        cantidad_bruta = nueva_cantidad_neta / (rendimiento_base / 100) if rendimiento_base > 0 else nueva_cantidad_neta
+                        coste_real = cantidad_bruta * precio_unit
+                        
+                        nuevo_id = utils.obtener_siguiente_id(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+                        nueva_fila = {
+                            'ID Escandallo': nuevo_id,
+                            'ID Plato': id_plato_filtro,
+                            'Nombre Plato': nombre_plato,
+                            'ID Ingrediente': info.get('id'),
+                            'Nombre Ingrediente': info.get('nombre'),
+                            'Cantidad': nueva_cantidad_neta,  # Guardamos la cantidad NETA
+                            'Unidad': info.get('unidad'),
+                            'Coste Unitario': precio_unit,
+                            'Unidad Precio': info.get('unidad'),  # Unidad del precio (PRECIOS_POR_CLIENTE)
+                            'Rendimiento %': rendimiento_base,  # Guardamos el rendimiento del ingrediente
+                            'Coste Total': coste_real,
+                            '% del Plato': 0,
+                            'ID Proveedor': info.get('id_proveedor'),
+                            'Última Actualización': datetime.now().date()
+                        }
+                        
+                        if utils.agregar_fila(config.ARCHIVO_OPERACIONES, "ESCANDALLOS", nueva_fila):
+                            utils.recalcular_costes_platos(utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS"))
+                            st.success("✅ Ingrediente agregado")
+                            st.session_state[f'agregar_ingrediente_{id_plato_filtro}'] = False
+                            time.sleep(0.5)
+                            st.rerun()
+            
+            with col_btn2:
+                if st.button("❌ Cancelar", use_container_width=True, key=f"cancelar_nuevo_ing_{id_plato_filtro}"):
+                    st.session_state[f'agregar_ingrediente_{id_plato_filtro}'] = False
+                    st.rerun()
+    
+    st.markdown("---")
+    
+    if ingredientes_actuales:
+        for ing in ingredientes_actuales:
+            col_a, col_b, col_c, col_d, col_e, col_f = st.columns([4, 1.5, 1.5, 1.2, 0.5, 0.5])
+            
+            # Limpiar nombre del ingrediente
+            ingrediente_nombre = str(ing['Ingrediente'])
+            if ingrediente_nombre.startswith("REC|"):
+                # Sub-receta: quitar REC|número - y dejar solo el nombre
+                ingrediente_nombre = ingrediente_nombre.split(" - ", 1)[-1] if " - " in ingrediente_nombre else ingrediente_nombre.replace("REC|", "")
+                ingrediente_nombre = f"🔁 {ingrediente_nombre}"
+            elif ingrediente_nombre.startswith("ING|"):
+                # Ingrediente: quitar ING|número - y dejar solo el nombre
+                ingrediente_nombre = ingrediente_nombre.split(" - ", 1)[-1] if " - " in ingrediente_nombre else ingrediente_nombre.replace("ING|", "")
+            else:
+                ingrediente_nombre = ingrediente_nombre.split(" - ", 1)[-1] if " - " in ingrediente_nombre else ingrediente_nombre
+            
+            with col_a:
+                st.write(f"**{ingrediente_nombre}**")
+                st.caption(f"{ing.get('Unidad', '')}")
+            
+            with col_b:
+                # Mostrar CANTIDAD NETA (receta) y CANTIDAD BRUTA (stock)
+                st.write(f"📋 Neta: {ing.get('Cantidad_Neta', 0):.3f} {ing.get('Unidad', '')}")
+                st.caption(f"📦 Bruta: {ing.get('Cantidad_Bruta', 0):.3f} {ing.get('Unidad', '')}")
+            
+            with col_c:
+                merma_val = ing.get('Merma_Pct', 0)
+                rendimiento_val = max(0.0, 100.0 - merma_val)
+                if merma_val > 0:
+                    st.write(f"🔻 Merma {merma_val:.0f}%")
+                    st.caption(f"Rend.: {rendimiento_val:.0f}%")
+                else:
+                    st.write("✅ Sin merma")
+                    st.caption("Rend. 100%")
+            
+            with col_d:
+                st.write(f"**{ing.get('Coste Real', 0):.3f}€**")
+                pct_del_plato = (ing.get('Coste Real', 0) / coste_total * 100) if coste_total > 0 else 0
+                st.caption(f"{pct_del_plato:.1f}% del plato")
+            
+            with col_e:
+                if st.button("✏️", key=f"edit_ing_{id_plato_filtro}_{ing['idx']}", help="Editar ingrediente"):
+                    st.session_state[f'editando_ingrediente_{id_plato_filtro}'] = ing['idx']
+            
+            with col_f:
+                if st.button("🗑️", key=f"del_ing_{id_plato_filtro}_{ing['idx']}", help="Eliminar ingrediente"):
+                    st.session_state[f'eliminar_ingrediente_{id_plato_filtro}'] = ing['idx']
+            
+            # Edición inline
+            if st.session_state.get(f'editando_ingrediente_{id_plato_filtro}') == ing['idx']:
+                st.markdown("---")
+                st.markdown(f"**✏️ Editando: {ingrediente_nombre}**")
+                col_e1, col_e2 = st.columns(2)
+                
+                with col_e1:
+                    edit_ing = st.selectbox(
+                        "Ingrediente",
+                        opciones_labels,
+                        index=opciones_labels.index(ing['Ingrediente']) if ing['Ingrediente'] in opciones_labels else 0,
+                        key=f"edit_ing_sel_{id_plato_filtro}_{ing['idx']}"
+                    )
+                
+                with col_e2:
+                    edit_cantidad_neta = st.number_input(
+                        "Cantidad Neta (en el plato)",
+                        min_value=0.01,
+                        value=float(ing['Cantidad_Neta']),
+                        step=0.1,
+                        format="%.3f",
+                        key=f"edit_cant_{id_plato_filtro}_{ing['idx']}",
+                        help="Peso neto que lleva el plato según la receta"
+                    )
+                
+                # Mostrar info calculada
+                if edit_ing and edit_ing in opciones:
+                    info_edit = opciones[edit_ing]
+                    merma_edit = info_edit.get('merma', 0)
+                    rendimiento_edit = max(0.0, 100.0 - merma_edit)
+                    cantidad_bruta_edit = edit_cantidad_neta / (rendimiento_edit / 100) if rendimiento_edit > 0 else edit_cantidad_neta
+                    coste_edit = cantidad_bruta_edit * info_edit.get('precio', 0)
+                    
+                    st.info(f"""
+                    📊 **Cálculo automático:**
+                    - Merma: **{merma_edit:.0f}%** (Rendimiento: {rendimiento_edit:.0f}%)
+                    - Cantidad Bruta: **{cantidad_bruta_edit:.3f} {info_edit.get('unidad', '')}**
+                    - Coste Real: **{coste_edit:.3f}€**
+                    """)
+                
+                col_btn1, col_btn2 = st.columns(2)
+                with col_btn1:
+                    if st.button("💾 Guardar", type="primary", use_container_width=True, key=f"save_ing_{id_plato_filtro}_{ing['idx']}"):
+                        df_esc_temp = utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+                        mask = df_esc_temp.index == ing['idx']
+                        
+                        info = opciones.get(edit_ing)
+                        merma_base = info.get('merma', 0)
+                        rendimiento_base = max(0.0, 100.0 - merma_base)
+                        precio_unit = float(info.get('precio', 0) or 0)
+                        cantidad_bruta = edit_cantidad_neta / (rendimiento_base / 100) if rendimiento_base > 0 else edit_cantidad_neta
+                        coste_real = cantidad_bruta * precio_unit
+                        
+                        df_esc_temp.loc[mask, 'ID Ingrediente'] = info.get('id')
+                        df_esc_temp.loc[mask, 'Nombre Ingrediente'] = info.get('nombre')
+                        df_esc_temp.loc[mask, 'Cantidad'] = edit_cantidad_neta  # Guardamos cantidad NETA
+                        df_esc_temp.loc[mask, 'Unidad'] = info.get('unidad')
+                        df_esc_temp.loc[mask, 'Coste Unitario'] = precio_unit
+                        df_esc_temp.loc[mask, 'Rendimiento %'] = rendimiento_base  # Rendimiento del ingrediente
+                        df_esc_temp.loc[mask, 'Coste Total'] = coste_real
+                        df_esc_temp.loc[mask, 'ID Proveedor'] = info.get('id_proveedor')
+                        df_esc_temp.loc[mask, 'Última Actualización'] = datetime.now().date()
+                        
+                        if utils.escribir_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS", df_esc_temp):
+                            utils.recalcular_costes_platos(df_esc_temp)
+                            st.success("✅ Ingrediente actualizado")
+                            st.session_state[f'editando_ingrediente_{id_plato_filtro}'] = None
+                            time.sleep(0.5)
+                            st.rerun()
+                
+                with col_btn2:
+                    if st.button("❌ Cancelar", use_container_width=True, key=f"cancel_ing_{id_plato_filtro}_{ing['idx']}"):
+                        st.session_state[f'editando_ingrediente_{id_plato_filtro}'] = None
+                        st.rerun()
+            
+            # Confirmación de eliminación
+            if st.session_state.get(f'eliminar_ingrediente_{id_plato_filtro}') == ing['idx']:
+                st.warning(f"⚠️ ¿Eliminar **{ingrediente_nombre}**?")
+                col_conf1, col_conf2 = st.columns(2)
+                with col_conf1:
+                    if st.button("✅ Sí, eliminar", type="primary", use_container_width=True, key=f"confirm_del_{id_plato_filtro}_{ing['idx']}"):
+                        df_esc_temp = utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+                        df_esc_temp = df_esc_temp.drop(index=ing['idx']).reset_index(drop=True)
+                        
+                        if utils.escribir_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS", df_esc_temp):
+                            utils.recalcular_costes_platos(df_esc_temp)
+                            st.success("✅ Ingrediente eliminado")
+                            st.session_state[f'eliminar_ingrediente_{id_plato_filtro}'] = None
+                            time.sleep(0.5)
+                            st.rerun()
+                
+                with col_conf2:
+                    if st.button("❌ Cancelar", use_container_width=True, key=f"cancel_del_{id_plato_filtro}_{ing['idx']}"):
+                        st.session_state[f'eliminar_ingrediente_{id_plato_filtro}'] = None
+                        st.rerun()
+            
+            st.markdown("---")
+    else:
+        st.info("No hay ingredientes en este escandallo. Haz clic en ➕ Agregar Ingrediente para empezar.")
+    
+    st.markdown("---")
+    
+    # ===== PARETO COSTES =====
+    st.subheader("📊 Pareto de Costes")
+    
+    if ingredientes_actuales:
+        df_pareto_data = []
+        for ing in ingredientes_actuales:
+            ingrediente_nombre = str(ing['Ingrediente']).replace("ING|", "").replace("REC|", "SUB-RECETA: ")
+            ingrediente_nombre = ingrediente_nombre.split(" - ")[-1] if " - " in ingrediente_nombre else ingrediente_nombre
+            
+            df_pareto_data.append({
+                'Ingrediente': ingrediente_nombre,
+                'Coste Real': ing['Coste Real']
+            })
+        
+        df_pareto = pd.DataFrame(df_pareto_data)
+        df_pareto = df_pareto[df_pareto['Coste Real'] > 0].copy()
+        
+        if not df_pareto.empty:
+            df_pareto['% Coste'] = (df_pareto['Coste Real'] / df_pareto['Coste Real'].sum() * 100).round(1)
+            try:
+                import plotly.express as px
+                fig = px.bar(
+                    df_pareto,
+                    x='Ingrediente',
+                    y='% Coste',
+                    text='% Coste',
+                    title='Peso porcentual por ingrediente'
+                )
+                fig.update_traces(texttemplate='%{text}%', textposition='outside')
+                fig.update_layout(height=350, xaxis_title='', yaxis_title='% del coste')
+                st.plotly_chart(fig, use_container_width=True)
+            except ImportError:
+                st.dataframe(df_pareto[['Ingrediente', 'Coste Real', '% Coste']], hide_index=True, use_container_width=True)
+        else:
+            st.info("No hay costes para analizar.")
+    else:
+        st.info("No hay ingredientes para analizar.")
+
+def mostrar_compras_cliente(id_cliente, nombre_cliente):
+    """Compras del cliente seleccionado"""
+    st.subheader(f"💰 Compras de {nombre_cliente}")
+    
+    df_compras_completo = utils.leer_excel(config.ARCHIVO_OPERACIONES, "COMPRAS_CLIENTE")
+    df_compras = df_compras_completo[df_compras_completo['ID Cliente'] == id_cliente] if not df_compras_completo.empty else pd.DataFrame()
+    
+    if not df_compras.empty:
+        st.dataframe(df_compras, use_container_width=True, hide_index=True)
+    else:
+        st.info(f"💰 {nombre_cliente} no tiene compras registradas todavía.")
+
+def mostrar_planificacion_produccion(id_cliente, df_platos, df_esc_completo):
+    """Raciones planificadas → ingredientes base (sub-recetas explotadas)"""
+    import explosion_recetas
+    
+    with st.expander("🏭 Planificación de Producción", expanded=False):
+        st.caption("Indica las raciones a producir; las sub-recetas se desglosan hasta ingrediente base (cantidad bruta, con merma).")
+        
+        df_plan = df_platos[['ID Plato', 'Nombre Plato']].copy()
+        if 'Ventas/Mes' in df_platos.columns:
+            df_plan['Raciones'] = (pd.to_numeric(df_platos['Ventas/Mes'], errors='coerce').fillna(0) / 4).round().astype(int)
+        else:
+            df_plan['Raciones'] = 0
+        
+        df_plan = st.data_editor(
+            df_plan,
+            use_container_width=True,
+            hide_index=True,
+            disabled=['ID Plato', 'Nombre Plato'],
+            column_config={
+                'Raciones': st.column_config.NumberColumn("Raciones", min_value=0, step=1,
+                                                          help="Por defecto: Ventas/Mes ÷ 4 (una semana)")
+            },
+            key=f"plan_produccion_{id_cliente}"
+        )
+        
+        # La explosión se cachea por contenido de ESCANDALLOS: replanificar es inmediato
+        _, ciclos = explosion_recetas.aplanar_escandallos(df_esc_completo)
+        for ciclo in ciclos:
+            st.error(f"🔁 Ciclo de sub-recetas ignorado: {' → '.join(ciclo)}")
+        
+        df_necesidades = explosion_recetas.necesidades_produccion(df_plan, df_esc_completo)
+        if df_necesidades.empty:
+            st.info("Sin raciones planificadas.")
+            return
+        
+        df_necesidades = df_necesidades.drop(columns='ID Cliente')
+        st.metric("💰 Coste estimado de materia prima", f"{df_necesidades['Coste Estimado'].sum():.2f}€")
+        st.dataframe(df_necesidades, use_container_width=True, hide_index=True)
+        st.download_button(
+            "📥 Descargar necesidades (CSV)",
+            df_necesidades.to_csv(index=False).encode('utf-8'),
+            file_name=f"necesidades_produccion_{id_cliente}.csv",
+            mime="text/csv",
+            key=f"descargar_necesidades_{id_cliente}"
+        )
+
+
+def mostrar_desviacion_food_cost(id_cliente, nombre_cliente):
+    """Food cost teórico (ventas × escandallos) vs compras reales"""
+    import desviacion_food_cost
+    
+    st.subheader(f"📉 Teórico vs Real - {nombre_cliente}")
+    st.info("🎯 **¿Se compra lo que justifican las ventas?** Ventas/Mes × escandallos = consumo teórico; se compara con las líneas de compra de cada mes.")
+    
+    # Cálculo de toda la cartera (matriz dispersa) una vez por sesión
+    if st.button("🔄 Recalcular", key=f"recalcular_desviacion_{id_cliente}"):
+        st.session_state.pop('desviacion_food_cost', None)
+    
+    if 'desviacion_food_cost' not in st.session_state:
+        with st.spinner("Explotando ventas en los escandallos de todos los clientes..."):
+            st.session_state.desviacion_food_cost = desviacion_food_cost.ejecutar_desviacion()
+    
+    df_desviacion, df_carta = st.session_state.desviacion_food_cost
+    clave_cliente = utils.clave_id(pd.Series([id_cliente])).iloc[0]
+    df_cliente = df_desviacion[df_desviacion['ID Cliente'] == clave_cliente] if not df_desviacion.empty else pd.DataFrame()
+    
+    if df_cliente.empty:
+        st.warning("⚠️ Hacen falta escandallos, Ventas/Mes en la carta y líneas de compra (LINEAS_COMPRA) para este análisis.")
+        return
+    
+    periodos = sorted(df_cliente['Periodo'].unique(), reverse=True)
+    periodo = st.selectbox("📅 Mes", ["Todos"] + periodos, key=f"periodo_desviacion_{id_cliente}")
+    if periodo != "Todos":
+        df_cliente = df_cliente[df_cliente['Periodo'] == periodo]
+    
+    # Food cost teórico vs real
+    df_fc = desviacion_food_cost.food_cost_periodo(df_cliente, df_carta)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("📐 Food Cost Teórico", f"{df_fc['Food Cost Teórico %'].mean():.1f}%")
+    with col2:
+        st.metric("🧾 Food Cost Real", f"{df_fc['Food Cost Real %'].mean():.1f}%",
+                  delta=f"{df_fc['Diferencia pp'].mean():+.1f} pp", delta_color="inverse")
+    with col3:
+        fuga_total = df_cliente['Fuga €'].clip(lower=0).sum()
+        st.metric("💸 Fuga Estimada", f"{fuga_total:,.2f} €")
+    
+    # Ranking de ingredientes por € de fuga
+    st.markdown("### 🏆 Ingredientes con más fuga")
+    ranking = desviacion_food_cost.ranking_fugas(df_cliente)
+    st.dataframe(
+        ranking[['Nombre Ingrediente', 'Meses', 'Teórico', 'Comprado', 'Fuga €']],
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    with st.expander("📋 Detalle por mes"):
+        st.dataframe(df_cliente.drop(columns=['ID Cliente']), hide_index=True, use_container_width=True)
+    
+    st.caption("Fuga € > 0: se compra más de lo que justifican las ventas (mermas, desperdicio, raciones o escandallos desactualizados).")
+
+def mostrar_escenarios_precios(id_cliente, nombre_cliente):
+    """Subidas de precio de ingredientes → margen de todos los platos"""
+    import escenarios_precios
+    
+    st.subheader("🧪 Escenarios de Precio de Ingredientes")
+    st.info(f"🎯 **¿Qué platos caen por debajo del {config.UMBRAL_MARGEN_MINIMO}% de margen si sube un ingrediente?** Se recalculan todos los platos (sub-recetas incluidas) de una vez.")
+    
+    df_esc = utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+    df_carta = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+    
+    if df_esc.empty or df_carta.empty:
+        st.warning("⚠️ Hacen falta escandallos y carta para simular escenarios.")
+        return
+    
+    matriz = escenarios_precios.matriz_costes(df_esc)
+    nombres = matriz['nombres'].reindex(matriz['ingredientes']).fillna('').astype(str)
+    opciones = {f"{clave} - {nombre}": clave for clave, nombre in zip(matriz['ingredientes'], nombres)}
+    
+    seleccion = st.multiselect("🥫 Ingredientes que cambian de precio", list(opciones.keys()), key="escenario_ingredientes")
+    if not seleccion:
+        st.caption("Selecciona uno o varios ingredientes e indica su variación.")
+        return
+    
+    df_shock = st.data_editor(
+        pd.DataFrame({'Ingrediente': seleccion, 'Variación %': 10.0}),
+        use_container_width=True,
+        hide_index=True,
+        disabled=['Ingrediente'],
+        column_config={
+            'Variación %': st.column_config.NumberColumn("Variación %", min_value=-90.0, max_value=500.0, step=1.0, format="%.1f%%")
+        },
+        key="escenario_variaciones"
+    )
+    shocks = {opciones[ing]: var for ing, var in zip(df_shock['Ingrediente'], df_shock['Variación %'])}
+    
+    solo_cliente = st.checkbox(f"Solo {nombre_cliente}", value=False, key="escenario_solo_cliente")
+    
+    df_sim = escenarios_precios.simular_shock(df_esc, df_carta, shocks)
+    if solo_cliente and not df_sim.empty:
+        df_sim = df_sim[df_sim['ID Cliente'] == id_cliente]
+    
+    if df_sim.empty:
+        st.info("Sin platos con precio de venta para simular.")
+        return
+    
+    afectados = df_sim[df_sim['Δ Coste €'] != 0]
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("🍽️ Platos afectados", len(afectados))
+    with col2:
+        st.metric("🔻 Cruzan el umbral", int(df_sim['Cruza Umbral'].sum()))
+    with col3:
+        st.metric("⚠️ Bajo mínimo", int(df_sim['Bajo Mínimo'].sum()))
+    with col4:
+        st.metric("💸 Δ Coste medio", f"{afectados['Δ Coste €'].mean() if not afectados.empty else 0:.2f}€")
+    
+    if not solo_cliente:
+        st.markdown("#### 👥 Por cliente")
+        st.dataframe(escenarios_precios.resumen_por_cliente(afectados), use_container_width=True, hide_index=True)
+    
+    st.markdown("#### 🍽️ Platos afectados")
+    st.dataframe(afectados, use_container_width=True, hide_index=True)
+
+
+def mostrar_simulador_precios(id_cliente, nombre_cliente):
+    """Simulador de cambios de precio por plato"""
+    st.subheader(f"💵 Simulador de Precios - {nombre_cliente}")
+    
+    st.info("🎯 **¿Qué pasa si subo/bajo el precio de un plato?** Simula el impacto en tu beneficio considerando la posible caída de demanda.")
+    
+    # Cargar carta del cliente
+    df_carta_completa = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+    df_carta = df_carta_completa[df_carta_completa['ID Cliente'] == id_cliente] if not df_carta_completa.empty else pd.DataFrame()
+    
+    if df_carta.empty:
+        st.warning(f"⚠️ {nombre_cliente} no tiene platos en la carta. Ve al tab 'Carta' para agregar.")
+        return
+    
+    # Filtrar solo platos activos
+    if 'Activo' in df_carta.columns:
+        df_carta = df_carta[df_carta['Activo'] == 'Sí']
+    
+    if df_carta.empty:
+        st.warning("⚠️ No hay platos activos para simular.")
+        return
+    
+    st.markdown("---")
+    
+    col_controles, col_resultados = st.columns([1, 2])
+    
+    with col_controles:
+        st.markdown("### 🎛️ Parámetros de Simulación")
+        
+        # Selector de plato
+        opciones_platos = [f"{row['ID Plato']} - {row['Nombre Plato']}" 
+                          for _, row in df_carta.iterrows()]
+        
+        plato_seleccionado = st.selectbox(
+            "Plato a Simular",
+            opciones_platos,
+            key=f"plato_sim_{id_cliente}"
+        )
+        
+        id_plato = int(float(plato_seleccionado.split(" - ")[0]))
+        plato_info = df_carta[df_carta['ID Plato'] == id_plato].iloc[0]
+        
+        st.markdown("---")
+        
+        # Datos actuales del plato
+        precio_actual = float(plato_info.get('Precio Venta', 0))
+        coste_actual = float(plato_info.get('Coste Total', 0))
+        ventas_mes = int(plato_info.get('Ventas/Mes', 0))
+        
+        st.write("**📊 Datos Actuales:**")
+        st.write(f"• Precio: {precio_actual:.2f}€")
+        st.write(f"• Coste: {coste_actual:.2f}€")
+        st.write(f"• Ventas/mes: {ventas_mes} uds")
+        
+        if ventas_mes == 0:
+            st.warning("⚠️ No hay datos de ventas mensuales. Introduce un valor en la carta.")
+            ventas_mes = st.number_input("Ventas/Mes Estimadas", min_value=1, value=100, step=10)
+        
+        st.markdown("---")
+        st.markdown("### 🚀 Simulación de Cambio")
+        
+        # Cambio de precio propuesto
+        cambio_precio = st.slider(
+            "📈 Cambio de Precio (€)",
+            min_value=-10.0,
+            max_value=10.0,
+            value=0.0,
+            step=0.25,
+            help="Positivo = subida, Negativo = bajada",
+            key=f"cambio_precio_{id_cliente}"
+        )
+        
+        # Caída/aumento de demanda esperada
+        cambio_demanda = st.slider(
+            "📉 Cambio en Demanda (%)",
+            min_value=-50,
+            max_value=50,
+            value=-5 if cambio_precio > 0 else 5,
+            step=5,
+            help="Negativo = pierdes clientes, Positivo = ganas clientes",
+            key=f"cambio_demanda_{id_cliente}"
+        )
+    
+    with col_resultados:
+        st.markdown("### 📊 Análisis de Impacto")
+        
+        # ESCENARIO ACTUAL
+        margen_actual = precio_actual - coste_actual
+        beneficio_mensual_actual = margen_actual * ventas_mes
+        ingreso_actual = precio_actual * ventas_mes
+        
+        # ESCENARIO NUEVO
+        precio_nuevo = precio_actual + cambio_precio
+        volumen_nuevo = int(ventas_mes * (1 + cambio_demanda / 100))
+        margen_nuevo = precio_nuevo - coste_actual
+        beneficio_mensual_nuevo = margen_nuevo * volumen_nuevo
+        ingreso_nuevo = precio_nuevo * volumen_nuevo
+        
+        # DIFERENCIAS
+        incremento_beneficio = beneficio_mensual_nuevo - beneficio_mensual_actual
+        porcentaje_incremento = (incremento_beneficio / beneficio_mensual_actual * 100) if beneficio_mensual_actual > 0 else 0
+        
+        # MÉTRICAS
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric(
+                "💰 Beneficio Actual",
+                f"{beneficio_mensual_actual:.2f}€/mes",
+                help=f"Margen: {margen_actual:.2f}€ × {ventas_mes} ventas"
+            )
+        
+        with col2:
+            st.metric(
+                "🚀 Beneficio Proyectado",
+                f"{beneficio_mensual_nuevo:.2f}€/mes",
+                delta=f"{incremento_beneficio:+.2f}€ ({porcentaje_incremento:+.1f}%)",
+                help=f"Margen: {margen_nuevo:.2f}€ × {volumen_nuevo} ventas"
+            )
+        
+        with col3:
+            anual = incremento_beneficio * 12
+            st.metric(
+                "📅 Impacto Anual",
+                f"{anual:+.2f}€",
+                help="Proyección a 12 meses"
+            )
+        
+        st.markdown("---")
+        
+        # GRÁFICO COMPARATIVO
+        try:
+            import plotly.graph_objects as go
+            
+            fig = go.Figure()
+            
+            categorias = ['Actual', 'Propuesto']
+            
+            fig.add_trace(go.Bar(
+                name='Ingresos',
+                x=categorias,
+                y=[ingreso_actual, ingreso_nuevo],
+                marker_color='#2ecc71',
+                text=[f"{ingreso_actual:.0f}€", f"{ingreso_nuevo:.0f}€"],
+                textposition='outside'
+            ))
+            
+            fig.add_trace(go.Bar(
+                name='Costes',
+                x=categorias,
+                y=[coste_actual * ventas_mes, coste_actual * volumen_nuevo],
+                marker_color='#e74c3c',
+                text=[f"{coste_actual * ventas_mes:.0f}€", f"{coste_actual * volumen_nuevo:.0f}€"],
+                textposition='outside'
+            ))
+            
+            fig.add_trace(go.Bar(
+                name='Beneficio',
+                x=categorias,
+                y=[beneficio_mensual_actual, beneficio_mensual_nuevo],
+                marker_color='#3498db',
+                text=[f"{beneficio_mensual_actual:.0f}€", f"{beneficio_mensual_nuevo:.0f}€"],
+                textposition='outside'
+            ))
+            
+            fig.update_layout(
+                title='Comparativa: Actual vs Propuesto',
+                xaxis_title='Escenario',
+                yaxis_title='Importe (€)',
+                barmode='group',
+                height=400,
+                showlegend=True
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+            
+        except ImportError:
+            st.warning("📊 Instala plotly para ver gráficos: `pip install plotly`")
+            
+            # Tabla alternativa
+            df_comparativa = pd.DataFrame({
+                'Escenario': ['Actual', 'Propuesto'],
+                'Precio': [f"{precio_actual:.2f}€", f"{precio_nuevo:.2f}€"],
+                'Ventas': [ventas_mes, volumen_nuevo],
+                'Ingresos': [f"{ingreso_actual:.2f}€", f"{ingreso_nuevo:.2f}€"],
+                'Beneficio': [f"{beneficio_mensual_actual:.2f}€", f"{beneficio_mensual_nuevo:.2f}€"]
+            })
+            st.dataframe(df_comparativa, use_container_width=True, hide_index=True)
+        
+        # RECOMENDACIÓN
+        st.markdown("---")
+        st.markdown("### 💡 Recomendación")
+        
+        if incremento_beneficio > 0:
+            st.success(f"✅ **FAVORABLE:** El cambio aumentaría tu beneficio en {incremento_beneficio:.2f}€/mes ({anual:.2f}€/año)")
+        elif incremento_beneficio < 0:
+            st.error(f"❌ **DESFAVORABLE:** El cambio reduciría tu beneficio en {abs(incremento_beneficio):.2f}€/mes ({abs(anual):.2f}€/año)")
+        else:
+            st.info("➖ **NEUTRO:** El cambio no afectaría significativamente tu beneficio")
+
+    # ========== OPTIMIZACIÓN DE TODA LA CARTA ==========
+    st.markdown("---")
+    st.markdown("### 🧮 Optimizar Toda la Carta")
+    st.caption("Evalúa todos los platos activos × cambios de precio × sensibilidad de la demanda (elasticidad) de una sola vez.")
+
+    import simulador_precios
+
+    col1, col2 = st.columns(2)
+    with col1:
+        rango_pct = st.slider(
+            "Rango de cambio de precio (±%)",
+            min_value=5, max_value=50, value=30, step=5,
+            key=f"rango_optim_{id_cliente}"
+        )
+    with col2:
+        elasticidades = st.multiselect(
+            "Elasticidades a evaluar",
+            [-0.5, -1.0, -1.5, -2.0, -2.5, -3.0],
+            default=[-0.5, -1.0, -1.5, -2.0],
+            help="-0.5 = clientes poco sensibles al precio, -2 = muy sensibles",
+            key=f"elasticidades_optim_{id_cliente}"
+        )
+
+    if not elasticidades:
+        st.info("Selecciona al menos una elasticidad")
+        return
+
+    cambios_pct = [c / 100 for c in range(-rango_pct, rango_pct + 1)]
+    resultado = simulador_precios.optimizar_carta(df_carta, cambios_pct, sorted(elasticidades, reverse=True))
+
+    st.dataframe(simulador_precios.resumen_optimizacion(resultado['platos']), use_container_width=True, hide_index=True)
+
+    if PLOTLY_AVAILABLE:
+        df_curva = resultado['curva'].melt(id_vars='Cambio %', var_name='Elasticidad', value_name='Beneficio Carta')
+        fig = px.line(
+            df_curva, x='Cambio %', y='Beneficio Carta', color='Elasticidad',
+            title='Beneficio de la carta aplicando el mismo cambio a todos los platos'
+        )
+        fig.update_layout(height=400, yaxis_title='Beneficio (€/mes)')
+        st.plotly_chart(fig, use_container_width=True)
+
+    elasticidad_sel = st.selectbox(
+        "Precio óptimo por plato con elasticidad",
+        sorted(elasticidades, reverse=True),
+        key=f"elasticidad_tabla_{id_cliente}"
+    )
+    df_optimos = resultado['platos'][resultado['platos']['Elasticidad'] == elasticidad_sel]
+    st.dataframe(
+        df_optimos.drop(columns=['Elasticidad']).sort_values('Mejora €/mes', ascending=False),
+        use_container_width=True,
+        hide_index=True
+    )
+
+def mostrar_pedido_inteligente(id_cliente, nombre_cliente):
+    """Calculadora de Pedidos - Simplificada para Consultoría Quincenal"""
+    st.subheader(f"🛒 Pedido Inteligente - {nombre_cliente}")
+    
+    st.info("📦 **Herramienta para tus visitas quincenales:** Actualiza stock, calcula pedido óptimo y guarda snapshot.")
+    
+    # Cargar inventario del cliente
+    df_inventario = utils.obtener_inventario_cliente(id_cliente)
+    
+    # Si no tiene inventario
+    if df_inventario.empty:
+        st.warning(f"⚠️ {nombre_cliente} no tiene inventario configurado.")
+        
+        st.markdown("### 🚀 Primera Visita")
+        st.write("Crea el inventario inicial con los datos que te dé el cliente.")
+        
+        if st.button("➕ Crear Inventario Inicial", type="primary", key=f"crear_inv_pedido_{id_cliente}"):
+            st.session_state.crear_inventario_inicial = True
+        
+        if st.session_state.get('crear_inventario_inicial', False):
+            st.markdown("---")
+            mostrar_formulario_inventario_inicial(id_cliente, nombre_cliente)
+        
+        return
+    
+    # Consumo real entre visitas: alimenta la previsión y la tabla de consumo real
+    import consumo_real
+    df_consumo = consumo_real.consumo_real_cliente(id_cliente)
+    
+    # Consumo semanal por defecto: previsión desde el histórico de visitas
+    import prevision_consumo
+    usar_prevision = st.checkbox(
+        "📈 Usar consumo previsto del histórico",
+        value=True,
+        help="Suavizado exponencial de los snapshots con la estacionalidad del ingrediente",
+        key=f"usar_prevision_pedido_{id_cliente}"
+    )
+    if usar_prevision:
+        df_prevision = prevision_consumo.prever_consumo_cliente(id_cliente, df_consumo=df_consumo)
+        df_inventario, n_previstos = prevision_consumo.aplicar_prevision(df_inventario, df_prevision)
+        if n_previstos:
+            st.caption(f"📈 Consumo/semana previsto para {n_previstos} de {len(df_inventario)} ingredientes (editable)")
+        else:
+            st.caption("📈 Aún no hay histórico suficiente: se usa el consumo guardado")
+    
+    # ========== INTERFAZ PRINCIPAL ==========
+    st.markdown("---")
+    
+    col_edicion, col_calculo = st.columns([3, 2])
+    
+    with col_edicion:
+        st.markdown("### ✏️ Actualizar Datos (Visita Quincenal)")
+        
+        # Tabla editable
+        st.write("**Edita directamente:** stock actual y consumo semanal estimado")
+        
+        df_editable = df_inventario[[
+            'ID Ingrediente',
+            'Nombre Ingrediente',
+            'Stock Actual',
+            'Consumo Semanal',
+            'Unidad',
+            'Precio Unitario'
+        ]].copy()
+        
+        # Editor de datos
+        df_editado = st.data_editor(
+            df_editable,
+            column_config={
+                "ID Ingrediente": st.column_config.NumberColumn(
+                    "ID",
+                    disabled=True,
+                    width="small"
+                ),
+                "Nombre Ingrediente": st.column_config.TextColumn(
+                    "Ingrediente",
+                    disabled=True,
+                    width="medium"
+                ),
+                "Stock Actual": st.column_config.NumberColumn(
+                    "Stock Actual",
+                    help="Lo que el cliente tiene AHORA",
+                    min_value=0,
+                    format="%.1f"
+                ),
+                "Consumo Semanal": st.column_config.NumberColumn(
+                    "Consumo/Semana",
+                    help="Promedio que gasta por semana",
+                    min_value=0,
+                    format="%.1f"
+                ),
+                "Unidad": st.column_config.TextColumn(
+                    "Unidad",
+                    disabled=True,
+                    width="small"
+                ),
+                "Precio Unitario": st.column_config.NumberColumn(
+                    "Precio €",
+                    disabled=True,
+                    format="%.2f",
+                    width="small"
+                )
+            },
+            hide_index=True,
+            use_container_width=True,
+            key="editor_inventario"
+        )
+        
+        st.markdown("---")
+        
+        # Botones de acción
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            if st.button("💾 Guardar Cambios", type="primary", use_container_width=True, key=f"guardar_cambios_pedido_{id_cliente}"):
+                # Actualizar inventario completo
+                df_actualizado = df_inventario.copy()
+                df_actualizado['Stock Actual'] = df_editado['Stock Actual'].values
+                df_actualizado['Consumo Semanal'] = df_editado['Consumo Semanal'].values
+                df_actualizado['Última Actualización'] = datetime.now().date()
+                
+                if utils.guardar_inventario_cliente(id_cliente, df_actualizado):
+                    st.success("✅ Inventario actualizado")
+                    time.sleep(0.5)
+                    st.rerun()
+                else:
+                    st.error("❌ Error al guardar")
+        
+        with col2:
+            if st.button("📸 Guardar Snapshot", use_container_width=True, help="Guarda estado actual para histórico", key=f"guardar_snapshot_pedido_{id_cliente}"):
+                observaciones = f"Visita {datetime.now().strftime('%d/%m/%Y')}"
+                if utils.guardar_snapshot(id_cliente, nombre_cliente, df_editado, observaciones):
+                    st.success("✅ Snapshot guardado")
+                    time.sleep(0.5)
+                    st.rerun()
+    
+    with col_calculo:
+        st.markdown("### 📊 Cálculo de Pedido")
+        
+        # Configuración
+        periodo = st.selectbox(
+            "📅 Periodo",
+            ["1 Semana", "2 Semanas", "1 Mes"],
+            index=1,
+            key=f"periodo_pedido_{id_cliente}"
+        )
+        
+        import propuestas_pedido
+        multiplicador = propuestas_pedido.SEMANAS_PERIODO[periodo]
+        
+        crecimiento = st.slider(
+            "📈 Crecimiento",
+            -50, 100, 0, 5,
+            help="% más/menos de lo normal",
+            format="%d%%",
+            key=f"crecimiento_pedido_{id_cliente}"
+        )
+        
+        seguridad = st.slider(
+            "🛡️ Seguridad",
+            0, 50, 15, 5,
+            help="Stock extra",
+            format="%d%%",
+            key=f"seguridad_pedido_{id_cliente}"
+        )
+        
+        st.markdown("---")
+        
+        # Calcular pedido
+        df_pedido = propuestas_pedido.calcular_pedido(df_editado, multiplicador, crecimiento, seguridad)
+        
+        # Mostrar resultado
+        st.markdown("**📦 Pedido Recomendado:**")
+        
+        df_resultado = df_pedido[df_pedido['Pedido Sugerido'] > 0][[
+            'Nombre Ingrediente',
+            'Pedido Sugerido',
+            'Unidad',
+            'Coste'
+        ]].copy()
+        
+        if not df_resultado.empty:
+            df_resultado.columns = ['Ingrediente', 'Cantidad', 'Unidad', 'Coste €']
+            st.dataframe(df_resultado, hide_index=True, use_container_width=True)
+            
+            # Total
+            total = df_resultado['Coste €'].sum()
+            st.metric("💰 Total Pedido", f"{total:.2f}€")
+            
+            # Botón exportar
+            if st.button("📄 Exportar a Excel", use_container_width=True, key=f"exportar_pedido_excel_{id_cliente}"):
+                # Crear Excel en memoria
+                output = io.BytesIO()
+                with pd.ExcelWriter(output, engine='openpyxl') as writer:
+                    df_resultado.to_excel(writer, index=False, sheet_name='Pedido')
+                    
+                    # Info adicional
+                    df_info = pd.DataFrame({
+                        'Cliente': [nombre_cliente],
+                        'Fecha': [datetime.now().strftime('%d/%m/%Y')],
+                        'Periodo': [periodo],
+                        'Total': [f"{total:.2f}€"]
+                    })
+                    df_info.to_excel(writer, index=False, sheet_name='Info')
+                
+                st.download_button(
+                    label="⬇️ Descargar Excel",
+                    data=output.getvalue(),
+                    file_name=f"Pedido_{nombre_cliente.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    use_container_width=True
+                )
+        else:
+            st.success("✅ No necesita pedir nada. Stock suficiente.")
+
+    # ========== REPARTO ENTRE PROVEEDORES ==========
+    if (df_pedido['Pedido Sugerido'] > 0).any():
+        st.markdown("---")
+        st.markdown("### 🏪 Pedidos por Proveedor")
+        st.caption("Reparte cada línea al proveedor con menor coste total (precio + envío), respetando pedidos mínimos.")
+
+        import optimizador_pedidos
+
+        resultado_cesta = optimizador_pedidos.optimizar_cesta(
+            df_pedido,
+            optimizador_pedidos.cargar_ofertas(id_cliente),
+            optimizador_pedidos.cargar_proveedores()
+        )
+        df_prov_pedido = resultado_cesta['proveedores']
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("🏪 Proveedores", len(df_prov_pedido))
+        with col2:
+            st.metric("🚚 Envíos", f"{df_prov_pedido['Envío'].sum():.2f}€")
+        with col3:
+            st.metric("💰 Coste Total", f"{df_prov_pedido['Total'].sum():.2f}€")
+
+        if (df_prov_pedido['Cumple Mínimo'] == 'No').any():
+            st.warning("⚠️ Algún proveedor no alcanza su pedido mínimo. Revisa las cantidades.")
+
+        for _, prov in df_prov_pedido.iterrows():
+            with st.expander(f"🏪 {prov['Proveedor']} - {prov['Total']:.2f}€ ({prov['Líneas']} líneas)"):
+                st.caption(
+                    f"Subtotal: {prov['Subtotal']:.2f}€ | Envío: {prov['Envío']:.2f}€ | "
+                    f"Mínimo: {prov['Pedido Mínimo']:.2f}€ ({prov['Cumple Mínimo']}) | Entrega: {prov['Días Entrega'] or 'N/A'}"
+                )
+                df_lineas_prov = resultado_cesta['lineas'][resultado_cesta['lineas']['Proveedor'] == prov['Proveedor']]
+                st.dataframe(
+                    df_lineas_prov[['Nombre Ingrediente', 'Pedido Sugerido', 'Unidad', 'Precio', 'Coste']],
+                    hide_index=True,
+                    use_container_width=True
+                )
+
+    # ========== CONSUMO REAL ==========
+    with st.expander("📦 Consumo Real entre Visitas (stock + compras − stock)"):
+        if df_consumo.empty:
+            st.info("📝 Hacen falta al menos dos snapshots para calcular el consumo real.")
+        else:
+            n_revisar = int((df_consumo['Estado'] == 'Revisar').sum())
+            if n_revisar:
+                st.warning(f"⚠️ {n_revisar} periodos con consumo negativo: revisa recuentos o compras sin registrar")
+            st.dataframe(
+                df_consumo[['Nombre Ingrediente', 'Fecha Inicio', 'Fecha Fin', 'Stock Inicial', 'Comprado',
+                            'Stock Final', 'Consumo Real', 'Consumo Semanal Real',
+                            'Consumo Semanal Estimado', 'Desviación %', 'Estado']],
+                hide_index=True,
+                use_container_width=True
+            )
+    
+    # ========== HISTORIAL DE SNAPSHOTS ==========
+    st.markdown("---")
+    st.markdown("### 📅 Histórico de Visitas")
+    
+    import snapshots
+    df_snapshots = utils.obtener_snapshots_cliente(id_cliente, limite=10)
+    
+    if not df_snapshots.empty:
+        # Agrupar por fecha
+        fechas_unicas = df_snapshots['Fecha'].unique()
+        
+        col1, col2 = st.columns([1, 3])
+        
+        with col1:
+            st.write(f"**{len(fechas_unicas)} visitas registradas**")
+            
+            for fecha in sorted(fechas_unicas, reverse=True)[:5]:
+                fecha_str = pd.to_datetime(fecha).strftime('%d/%m/%Y')
+                st.write(f"• {fecha_str}")
+        
+        with col2:
+            # Gráfico de evolución (si hay suficientes datos)
+            if len(fechas_unicas) >= 2:
+                ingredientes = df_snapshots.drop_duplicates('ID Ingrediente').set_index('ID Ingrediente')['Nombre Ingrediente']
+                ingrediente_sel = st.selectbox(
+                    "Ingrediente",
+                    ingredientes.index.tolist(),
+                    format_func=lambda x: str(ingredientes.get(x, x)),
+                    key=f"historico_ingrediente_{id_cliente}"
+                )
+                df_evol = snapshots.historico_ingrediente(id_cliente, ingrediente_sel)
+                
+                if len(df_evol) >= 2:
+                    st.write(f"**Evolución: {df_evol['Nombre Ingrediente'].iloc[0]}**")
+                    
+                    fig_evol = go.Figure()
+                    fig_evol.add_trace(go.Scatter(
+                        x=df_evol['Fecha'],
+                        y=df_evol['Stock'],
+                        mode='lines+markers',
+                        name='Stock',
+                        line=dict(color='#3498db', width=2),
+                        marker=dict(size=8)
+                    ))
+                    
+                    fig_evol.update_layout(
+                        height=200,
+                        margin=dict(l=0, r=0, t=20, b=0),
+                        showlegend=False,
+                        xaxis_title="",
+                        yaxis_title="Stock"
+                    )
+                    
+                    st.plotly_chart(fig_evol, use_container_width=True)
+    else:
+        st.info("📝 No hay snapshots guardados. Usa el botón '📸 Guardar Snapshot' en cada visita.")
+
+def mostrar_formulario_inventario_inicial(id_cliente, nombre_cliente):
+    """Formulario simplificado para crear inventario inicial"""
+    st.subheader("📦 Crear Inventario Inicial")
+    
+    st.write(f"**Cliente:** {nombre_cliente}")
+    st.write("Introduce los datos que te dé el cliente en la primera visita.")
+    
+    # Obtener ingredientes con precios
+    df_precios = utils.leer_excel(config.ARCHIVO_OPERACIONES, "PRECIOS_POR_CLIENTE")
+    df_precios_cliente = df_precios[df_precios['ID Cliente'] == id_cliente] if not df_precios.empty else pd.DataFrame()
+    
+    if df_precios_cliente.empty:
+        st.warning("⚠️ Primero asigna precios a ingredientes en el tab 'Ingredientes'")
+        if st.button("◀️ Cancelar", key=f"cancelar_inv_form_{id_cliente}"):
+            st.session_state.crear_inventario_inicial = False
+            st.rerun()
+        return
+    
+    with st.form("form_inventario_inicial"):
+        st.write("### Ingredientes")
+        
+        inventario_data = []
+        
+        st.write("**Ingrediente | Stock Actual | Consumo/Semana | ✓**")
+        
+        for _, row in df_precios_cliente.iterrows():
+            col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 1, 1])
+            
+            with col1:
+                st.write(f"**{row['Nombre Ingrediente']}**")
+            
+            with col2:
+                stock = st.number_input(
+                    "Stock",
+                    min_value=0.0,
+                    value=0.0,
+                    step=1.0,
+                    key=f"stock_{row['ID Ingrediente']}",
+                    label_visibility="collapsed"
+                )
+            
+            with col3:
+                consumo = st.number_input(
+                    "Consumo",
+                    min_value=0.0,
+                    value=0.0,
+                    step=0.5,
+                    key=f"consumo_{row['ID Ingrediente']}",
+                    label_visibility="collapsed"
+                )
+            
+            with col4:
+                st.write(f"{row.get('Unidad', 'UDS')}")
+            
+            with col5:
+                incluir = st.checkbox("✓", value=True, key=f"inc_{row['ID Ingrediente']}", label_visibility="collapsed")
+            
+            if incluir:
+                inventario_data.append({
+                    'ID Cliente': id_cliente,
+                    'Nombre Cliente': nombre_cliente,
+                    'ID Ingrediente': row['ID Ingrediente'],
+                    'Nombre Ingrediente': row['Nombre Ingrediente'],
+                    'Stock Actual': stock,
+                    'Consumo Semanal': consumo,
+                    'Unidad': row.get('Unidad', 'UDS'),
+                    'Precio Unitario': row.get('Precio Cliente', 0),
+                    'Última Actualización': datetime.now().date(),
+                    'Notas': 'Inventario inicial'
+                })
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            submitted = st.form_submit_button("💾 Crear Inventario", use_container_width=True, type="primary")
+        with col2:
+            cancelar = st.form_submit_button("❌ Cancelar", use_container_width=True)
+        
+        if submitted:
+            if not inventario_data:
+                st.error("❌ Selecciona al menos un ingrediente")
+            else:
+                # Crear DataFrame y guardar
+                df_nuevo_inventario = pd.DataFrame(inventario_data)
+                
+                # Añadir IDs únicos
+                for idx, row in df_nuevo_inventario.iterrows():
+                    df_nuevo_inventario.at[idx, 'ID'] = utils.obtener_siguiente_id(config.ARCHIVO_OPERACIONES, "INVENTARIO") + idx
+                
+                if utils.guardar_inventario_cliente(id_cliente, df_nuevo_inventario):
+                    st.success(f"✅ Inventario creado con {len(inventario_data)} ingredientes")
+                    st.session_state.crear_inventario_inicial = False
+                    time.sleep(1)
+                    st.rerun()
+                else:
+                    st.error("❌ Error al crear inventario")
+        
+        if cancelar:
+            st.session_state.crear_inventario_inicial = False
+            st.rerun()
+
+def mostrar_ingenieria_menu(id_cliente, nombre_cliente):
+    """Matriz de Ingeniería de Menú - Análisis Boston Consulting"""
+    st.subheader(f"  Ingeniería de Menú - {nombre_cliente}")
+    
+    st.info("📊 **Análisis estratégico de tu carta** - Clasifica platos según rentabilidad y popularidad para tomar decisiones basadas en datos.")
+    
+    # Cargar carta del cliente
+    df_carta_completa = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+    df_carta = df_carta_completa[df_carta_completa['ID Cliente'] == id_cliente] if not df_carta_completa.empty else pd.DataFrame()
+    
+    if df_carta.empty:
+        st.warning(f"⚠️ {nombre_cliente} no tiene platos en la carta. Ve al tab 'Carta' para agregar.")
+        return
+    
+    # Filtrar solo platos activos con datos completos
+    if 'Activo' in df_carta.columns:
+        df_carta = df_carta[df_carta['Activo'] == 'Sí']
+    
+    # Verificar columnas necesarias
+    columnas_necesarias = ['Precio Venta', 'Coste Total', 'Ventas/Mes']
+    for col in columnas_necesarias:
+        if col not in df_carta.columns:
+            st.error(f"❌ Falta la columna '{col}' en la carta. Verifica la configuración.")
+            return
+    
+    # Limpiar datos
+    df_carta = df_carta.copy()
+    df_carta['Precio Venta'] = pd.to_numeric(df_carta['Precio Venta'], errors='coerce').fillna(0)
+    df_carta['Coste Total'] = pd.to_numeric(df_carta['Coste Total'], errors='coerce').fillna(0)
+    df_carta['Ventas/Mes'] = pd.to_numeric(df_carta['Ventas/Mes'], errors='coerce').fillna(0)
+    df_carta['Food Cost %'] = pd.to_numeric(df_carta['Food Cost %'], errors='coerce').fillna(0)
+    
+    # Filtrar platos con datos válidos
+    df_carta = df_carta[
+        (df_carta['Precio Venta'] > 0) & 
+        (df_carta['Coste Total'] > 0) & 
+        (df_carta['Ventas/Mes'] > 0)
+    ]
+    
+    if df_carta.empty:
+        st.warning("⚠️ No hay platos con datos completos (Precio, Coste, Ventas). Actualiza la carta primero.")
+        return
+    
+    st.markdown("---")
+    
+    # ========== CÁLCULOS ==========
+    
+    # Calcular métricas
+    df_carta['Margen'] = df_carta['Precio Venta'] - df_carta['Coste Total']
+    df_carta['Margen %'] = (df_carta['Margen'] / df_carta['Precio Venta'] * 100).round(1)
+    df_carta['Facturación'] = df_carta['Precio Venta'] * df_carta['Ventas/Mes']
+    df_carta['Beneficio'] = df_carta['Margen'] * df_carta['Ventas/Mes']
+    
+    # Calcular promedios (líneas divisorias)
+    ventas_media = df_carta['Ventas/Mes'].median()
+    margen_medio = df_carta['Margen %'].median()
+    
+    # Clasificar en cuadrantes
+    def clasificar_plato(row):
+        if row['Ventas/Mes'] >= ventas_media and row['Margen %'] >= margen_medio:
+            return '⭐ ESTRELLA'
+        elif row['Ventas/Mes'] >= ventas_media and row['Margen %'] < margen_medio:
+            return '🐴 CABALLO'
+        elif row['Ventas/Mes'] < ventas_media and row['Margen %'] >= margen_medio:
+            return '❓ ROMPECABEZAS'
+        else:
+            return '🐕 PERRO'
+    
+    df_carta['Cuadrante'] = df_carta.apply(clasificar_plato, axis=1)
+    
+    # Colores por cuadrante
+    color_map = {
+        '⭐ ESTRELLA': '#70AD47',      # Verde
+        '🐴 CABALLO': '#4472C4',       # Azul
+        '❓ ROMPECABEZAS': '#FFC000',  # Amarillo
+        '🐕 PERRO': '#C00000'          # Rojo
+    }
+    
+    df_carta['Color'] = df_carta['Cuadrante'].map(color_map)
+    
+    # ========== TABS PRINCIPALES ==========
+    
+    tab1, tab2, tab3, tab4 = st.tabs([
+        "📊 Matriz Simple",
+        "🎯 Matriz Avanzada",
+        "💡 Oportunidades",
+        "🎯 Plan de Acción"
+    ])
+    
+    # ========== TAB 1: MATRIZ SIMPLE ==========
+    with tab1:
+        col_grafico, col_resumen = st.columns([3, 2])
+        st.markdown("### 📊 Matriz Boston Consulting")
+        
+        if PLOTLY_AVAILABLE:
+            import graficos
+            
+            # Figura cacheada por contenido (compartida con el informe PDF)
+            st.plotly_chart(graficos.figura_bcg(df_carta), use_container_width=True)
+        else:
+            st.warning("📊 Instala plotly para ver el gráfico: `pip install plotly`")
+            
+            # Tabla alternativa
+            df_display = df_carta[['Nombre Plato', 'Cuadrante', 'Ventas/Mes', 'Margen %']].copy()
+            df_display = df_display.sort_values('Cuadrante')
+            st.dataframe(df_display, use_container_width=True, hide_index=True)
+    
+    with col_resumen:
+        st.markdown("### 📈 Resumen General")
+        
+        # Métricas globales
+        total_facturacion = df_carta['Facturación'].sum()
+        total_beneficio = df_carta['Beneficio'].sum()
+        margen_general = (total_beneficio / total_facturacion * 100) if total_facturacion > 0 else 0
+        
+        st.metric("💰 Facturación/Mes", f"{total_facturacion:.2f}€")
+        st.metric("💵 Beneficio/Mes", f"{total_beneficio:.2f}€")
+        st.metric("📊 Margen General", f"{margen_general:.1f}%")
+        
+        st.markdown("---")
+        
+        # Distribución por cuadrante
+        st.markdown("**📊 Distribución:**")
+        
+        for cuadrante in ['⭐ ESTRELLA', '🐴 CABALLO', '🧩 ROMPECABEZAS', '🐕 PERRO']:
+            count = len(df_carta[df_carta['Cuadrante'] == cuadrante])
+            if count > 0:
+                porcentaje = (count / len(df_carta) * 100)
+                st.write(f"{cuadrante}: **{count}** platos ({porcentaje:.0f}%)")
+    
+    
+    # ========== TAB 2: MATRIZ AVANZADA ==========
+    with tab2:
+        st.markdown("### 🎯 Análisis Detallado - Matriz BCG Avanzada")
+        
+        st.info("📊 Scatter plot interactivo: Tamaño = Facturación | Color = Food Cost % | Ejes = Ventas vs Margen %")
+        
+        if PLOTLY_AVAILABLE:
+            import graficos
+            
+            # Calcular Food Cost si no existe
+            if 'Food Cost %' not in df_carta.columns or df_carta['Food Cost %'].isna().all():
+                df_carta['Food Cost %'] = (df_carta['Coste Total'] / df_carta['Precio Venta'] * 100).round(1)
+            
+            st.plotly_chart(graficos.figura_bcg(df_carta, 'avanzada'), use_container_width=True)
+        else:
+            st.warning("📊 Instala plotly: `pip install plotly`")
+        
+        # Tabla detallada
+        st.markdown("### 📋 Tabla Detallada - Ordenada por Cuadrante")
+        
+        df_tabla = df_carta[['Nombre Plato', 'Cuadrante', 'Ventas/Mes', 'Margen %', 'Margen', 'Facturación', 'Beneficio', 'Food Cost %']].copy()
+        df_tabla['Ventas/Mes'] = df_tabla['Ventas/Mes'].astype(int)
+        df_tabla['Margen %'] = df_tabla['Margen %'].round(1)
+        df_tabla['Margen'] = df_tabla['Margen'].round(2)
+        df_tabla['Facturación'] = df_tabla['Facturación'].round(2)
+        df_tabla['Beneficio'] = df_tabla['Beneficio'].round(2)
+        df_tabla['Food Cost %'] = df_tabla['Food Cost %'].round(1)
+        df_tabla = df_tabla.sort_values('Cuadrante')
+        
+        st.dataframe(df_tabla, use_container_width=True, hide_index=True)
+        
+        # Resumen estadístico
+        st.markdown("### 📊 Estadísticas por Cuadrante")
+        
+        stats_cols = st.columns(4)
+        
+        for idx, cuadrante in enumerate(['⭐ ESTRELLA', '🐴 CABALLO', '❓ ROMPECABEZAS', '🐕 PERRO']):
+            with stats_cols[idx]:
+                df_cuad = df_carta[df_carta['Cuadrante'] == cuadrante]
+                
+                if not df_cuad.empty:
+                    count = len(df_cuad)
+                    facturacion = df_cuad['Facturación'].sum()
+                    beneficio = df_cuad['Beneficio'].sum()
+                    margen_promedio = df_cuad['Margen %'].mean()
+                    
+                    with st.expander(f"{cuadrante} ({count} platos)"):
+                        st.metric("Platos", count)
+                        st.metric("Facturación/Mes", f"{facturacion:,.0f}€")
+                        st.metric("Beneficio/Mes", f"{beneficio:,.0f}€")
+                        st.metric("Margen Promedio", f"{margen_promedio:.1f}%")
+    
+    # ========== TAB 3: OPORTUNIDADES ==========
+    with tab3:
+        st.markdown("### 💡 Análisis de Oportunidades")
+        
+        st.info("🎯 Identifica platos que pueden mejorar rápidamente con acciones específicas")
+        
+        # Oportunidad 1: Caballos de batalla
+        st.markdown("#### 1️⃣ 📈 AUMENTAR MARGEN - Platos Populares con Bajo Margen")
+        
+        df_caballos = df_carta[df_carta['Cuadrante'] == '🐴 CABALLO'].sort_values('Ventas/Mes', ascending=False)
+        
+        if not df_caballos.empty:
+            st.warning("⚠️ **Estos platos venden MUCHO pero tienen POCO margen.** Subir precio +0.50€ a +1€ es fácil y muy rentable.")
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Platos a trabajar", len(df_caballos))
+            with col2:
+                impacto_caballos = (df_caballos['Ventas/Mes'].sum() * 0.50)
+                st.metric("Impacto +0.50€", f"+{impacto_caballos:.0f}€/mes")
+            with col3:
+                impacto_caballos_1 = (df_caballos['Ventas/Mes'].sum() * 1.00)
+                st.metric("Impacto +1€", f"+{impacto_caballos_1:.0f}€/mes")
+            
+            st.markdown("**Platos prioritarios:**")
+            for idx, (_, plato) in enumerate(df_caballos.head(5).iterrows(), 1):
+                col1, col2, col3, col4, col5 = st.columns([2, 1.5, 1.5, 2, 2])
+                with col1:
+                    st.write(f"**{idx}. {plato['Nombre Plato']}**")
+                with col2:
+                    st.write(f"📊 {plato['Ventas/Mes']:.0f} u/mes")
+                with col3:
+                    st.write(f"Margen: {plato['Margen %']:.1f}%")
+                with col4:
+                    st.write(f"Precio actual: {plato['Precio Venta']:.2f}€")
+                with col5:
+                    nuevo_precio = plato['Precio Venta'] + 0.75
+                    st.write(f"→ Sugerir: {nuevo_precio:.2f}€")
+        else:
+            st.success("✅ ¡No hay Caballos de Batalla! Tu carta está bien balanceada.")
+        
+        st.markdown("---")
+        
+        # Oportunidad 2: Rompecabezas
+        st.markdown("#### 2️⃣ 📢 PROMOCIONAR - Platos Rentables pero Poco Vendidos")
+        
+        df_rompecabezas = df_carta[df_carta['Cuadrante'] == '❓ ROMPECABEZAS'].sort_values('Margen %', ascending=False)
+        
+        if not df_rompecabezas.empty:
+            st.info("💡 **Estos platos tienen buen margen pero nadie los pide.** Invertir en marketing es la solución.")
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Platos a promocionar", len(df_rompecabezas))
+            with col2:
+                impacto_rompecabezas = (df_rompecabezas['Margen %'].mean() * df_rompecabezas['Ventas/Mes'].mean() * 5)
+                st.metric("Impacto potencial (5x ventas)", f"+{impacto_rompecabezas:.0f}€/mes")
+            with col3:
+                st.metric("Margen promedio", f"{df_rompecabezas['Margen %'].mean():.1f}%")
+            
+            st.markdown("**Platos a promocionar:**")
+            for idx, (_, plato) in enumerate(df_rompecabezas.head(5).iterrows(), 1):
+                col1, col2, col3, col4 = st.columns([2, 1.5, 1.5, 2.5])
+                with col1:
+                    st.write(f"**{idx}. {plato['Nombre Plato']}**")
+                with col2:
+                    st.write(f"📉 Solo {plato['Ventas/Mes']:.0f} u/mes")
+                with col3:
+                    st.write(f"Margen: {plato['Margen %']:.1f}%")
+                with col4:
+                    st.write("→ Post Instagram, menú del día, etc.")
+        else:
+            st.success("✅ ¡Todos tus platos se venden bien!")
+        
+        st.markdown("---")
+        
+        # Oportunidad 3: Perros
+        st.markdown("#### 3️⃣ 🗑️ ELIMINAR - Platos No Rentables")
+        
+        df_perros = df_carta[df_carta['Cuadrante'] == '🐕 PERRO'].sort_values('Beneficio', ascending=True)
+        
+        if not df_perros.empty:
+            st.error("❌ **Estos platos no se venden y no dejan margen.** Candidatos a eliminar de la carta.")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Platos a eliminar", len(df_perros))
+            with col2:
+                impacto_perros = -df_perros['Beneficio'].sum()
+                st.metric("Ahorras eliminándolos", f"{impacto_perros:.0f}€/mes")
+            
+            st.markdown("**Perros - Decisión difícil pero necesaria:**")
+            for idx, (_, plato) in enumerate(df_perros.iterrows(), 1):
+                col1, col2, col3, col4 = st.columns([2, 1.5, 1.5, 2])
+                with col1:
+                    st.write(f"**{idx}. {plato['Nombre Plato']}**")
+                with col2:
+                    st.write(f"📉 {plato['Ventas/Mes']:.0f} u/mes")
+                with col3:
+                    st.write(f"⚠️ Margen: {plato['Margen %']:.1f}%")
+                with col4:
+                    st.write(f"Pérdida: -{abs(plato['Beneficio']):.0f}€/mes")
+        else:
+            st.success("✅ ¡No hay Perros! Todos tus platos son viables.")
+        
+        st.markdown("---")
+        
+        # Oportunidad 4: Food Cost
+        st.markdown("#### 4️⃣ 💸 MEJORAR FOOD COST - Platos con Food Cost > 35%")
+        
+        df_alto_fc = df_carta[df_carta['Food Cost %'] > 35].sort_values('Food Cost %', ascending=False)
+        
+        if not df_alto_fc.empty:
+            st.warning(f"⚠️ **{len(df_alto_fc)} platos tienen Food Cost > 35%.** Target es 28% para márgenes saludables.")
+            
+            st.markdown("**Acciones para reducir Food Cost:**")
+            st.write("• 🔍 Renegociar precios con proveedores")
+            st.write("• 📏 Estandarizar porciones (reducir ligeramente)")
+            st.write("• 🥘 Sustituir ingredientes costosos")
+            st.write("• 💰 Subir precio de venta")
+            
+            st.markdown("**Platos prioritarios:**")
+            for idx, (_, plato) in enumerate(df_alto_fc.head(5).iterrows(), 1):
+                col1, col2, col3 = st.columns([2, 1.5, 2.5])
+                with col1:
+                    st.write(f"**{idx}. {plato['Nombre Plato']}**")
+                with col2:
+                    st.write(f"🔴 FC: {plato['Food Cost %']:.1f}%")
+                with col3:
+                    target_pvp = plato['Coste Total'] / 0.28
+                    incremento = target_pvp - plato['Precio Venta']
+                    if incremento > 0:
+                        st.write(f"💡 Subir a {target_pvp:.2f}€ (+{incremento:.2f}€)")
+                    else:
+                        st.write(f"💡 Reducir coste a {plato['Precio Venta'] * 0.28:.2f}€")
+        else:
+            st.success("✅ ¡Excelente! Todos tus Food Cost están bajo control (<35%).")
+    
+    # ========== TAB 4: PLAN DE ACCIÓN ==========
+    with tab4:
+        st.markdown("### 🎯 Plan de Acción - Roadmap de Mejora")
+        
+        st.info("📅 Calendario de acciones ordenado por impacto y facilidad. Implementa en este orden.")
+        
+        # Calcular oportunidades totales
+        impacto_total = 0
+        acciones = []
+        
+        # Acción 1: Subir caballos
+        if not df_caballos.empty:
+            for _, plato in df_caballos.iterrows():
+                impacto = plato['Ventas/Mes'] * 0.75
+                acciones.append({
+                    'prioridad': 1,
+                    'urgencia': '🚨 INMEDIATA',
+                    'accion': f"Subir precio de '{plato['Nombre Plato']}'",
+                    'detalles': f"De {plato['Precio Venta']:.2f}€ a {plato['Precio Venta'] + 0.75:.2f}€ (+{0.75:.2f}€)",
+                    'impacto': impacto,
+                    'dificultad': '⭐ Fácil',
+                    'timeline': '📍 Esta semana',
+                    'plato_name': plato['Nombre Plato']
+                })
+        
+        # Acción 2: Promocionar rompecabezas
+        if not df_rompecabezas.empty:
+            for idx, (_, plato) in enumerate(df_rompecabezas.iterrows()):
+                if idx < 3:  # Solo top 3
+                    impacto = plato['Margen'] * 3  # Asumir 3 ventas más
+                    acciones.append({
+                        'prioridad': 2,
+                        'urgencia': '📌 SEMANAL',
+                        'accion': f"Promocionar '{plato['Nombre Plato']}'",
+                        'detalles': "Post Instagram + Menú del día + Recomendación personal",
+                        'impacto': impacto,
+                        'dificultad': '⭐ Fácil',
+                        'timeline': '📍 Esta semana',
+                        'plato_name': plato['Nombre Plato']
+                    })
+        
+        # Acción 3: Eliminar perros
+        if not df_perros.empty:
+            for _, plato in df_perros.iterrows():
+                impacto = abs(plato['Beneficio'])  # Ahorro de espacio en carta
+                acciones.append({
+                    'prioridad': 3,
+                    'urgencia': '⏰ MENSUAL',
+                    'accion': f"Eliminar '{plato['Nombre Plato']}'",
+                    'detalles': f"Libera espacio en carta. Hoy vende {plato['Ventas/Mes']:.0f} u/mes = {plato['Beneficio']:.0f}€",
+                    'impacto': impacto,
+                    'dificultad': '⭐⭐ Moderado',
+                    'timeline': '📍 Esta semana (opcional)',
+                    'plato_name': plato['Nombre Plato']
+                })
+        
+        # Acción 4: Mejorar Food Cost
+        if not df_alto_fc.empty:
+            for idx, (_, plato) in enumerate(df_alto_fc.iterrows()):
+                if idx < 3:  # Solo top 3
+                    ahorro_potencial = (plato['Food Cost %'] - 28) * plato['Precio Venta'] * plato['Ventas/Mes'] / 100
+                    acciones.append({
+                        'prioridad': 4,
+                        'urgencia': '📌 SEMANAL',
+                        'accion': f"Reducir Food Cost de '{plato['Nombre Plato']}'",
+                        'detalles': f"FC actual {plato['Food Cost %']:.1f}% → Target 28%. Ahorro potencial: {ahorro_potencial:.0f}€/mes",
+                        'impacto': ahorro_potencial,
+                        'dificultad': '⭐⭐⭐ Complejo',
+                        'timeline': '📍 Este mes',
+                        'plato_name': plato['Nombre Plato']
+                    })
+        
+        # Ordenar por impacto
+        acciones.sort(key=lambda x: -x['impacto'])
+        
+        # Mostrar roadmap
+        if acciones:
+            st.markdown("#### 📊 Impacto Total Potencial")
+            impacto_total = sum(a['impacto'] for a in acciones)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("💰 Ingresos adicionales/mes", f"+{impacto_total:.0f}€")
+            with col2:
+                st.metric("📈 % de aumento", f"+{impacto_total/df_carta['Beneficio'].sum()*100:.1f}%")
+            with col3:
+                st.metric("📅 Timeline", "Este mes")
+            
+            st.markdown("---")
+            
+            st.markdown("#### 🎯 Acciones Priorizadas")
+            
+            for idx, accion in enumerate(acciones, 1):
+                with st.container():
+                    col1, col2 = st.columns([0.5, 9.5])
+                    
+                    with col1:
+                        st.markdown(f"### {idx}")
+                    
+                    with col2:
+                        st.markdown(f"**{accion['accion']}**")
+                        
+                        col_a, col_b, col_c, col_d = st.columns([2, 2, 2, 2])
+                        
+                        with col_a:
+                            st.write(f"{accion['urgencia']}")
+                        with col_b:
+                            st.write(f"{accion['dificultad']}")
+                        with col_c:
+                            st.write(f"💰 +{accion['impacto']:.0f}€/mes")
+                        with col_d:
+                            st.write(f"{accion['timeline']}")
+                        
+                        st.caption(accion['detalles'])
+                    
+                    st.divider()
+        else:
+            st.success("✅ ¡Tu carta está perfectamente balanceada! No hay acciones urgentes.")
+        
+
+
+def mostrar_escandallos():
+    """Vista y gestión de escandallos (ingredientes por plato)"""
+    import unidades
+    
+    st.subheader("🔍 Escandallos - Desglose por Plato")
+    
+    # Cargar datos
+    df_esc = utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+    df_platos = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+    df_ing = utils.leer_excel(config.ARCHIVO_OPERACIONES, "INGREDIENTES_MAESTRO")
+    
+    # Crear listas
+    platos_disponibles = []
+    if not df_platos.empty and 'ID Plato' in df_platos.columns and 'Nombre Plato' in df_platos.columns:
+        for _, row in df_platos.iterrows():
+            platos_disponibles.append(f"{row['ID Plato']} - {row['Nombre Plato']} ({row['Nombre Cliente']})")
+    
+    ingredientes_disponibles = []
+    if not df_ing.empty and 'ID Ingrediente' in df_ing.columns and 'Nombre' in df_ing.columns:
+        for _, row in df_ing.iterrows():
+            ingredientes_disponibles.append(f"{row['ID Ingrediente']} - {row['Nombre']}")
+    
+    # Botón agregar
+    col1, col2 = st.columns([3, 1])
+    with col2:
+        if st.button("➕ Agregar Ingrediente a Plato", type="primary", use_container_width=True):
+            st.session_state.agregar_escandallo = True
+    
+    # Formulario - PRIMERO seleccionar el plato (FUERA del expander)
+    if st.session_state.get('agregar_escandallo', False):
+        st.markdown("### 🍽️ Selecciona el Plato")
+        
+        if platos_disponibles:
+            plato_sel = st.selectbox("¿A qué plato le vas a agregar ingredientes?", 
+                platos_disponibles, key="plato_esc_sel")
+            id_plato = int(float(plato_sel.split(" - ")[0]))
+            nombre_plato = plato_sel.split(" - ")[1].split(" (")[0]
+            
+            # Obtener información del plato
+            if not df_platos.empty:
+                plato_info = df_platos[df_platos['ID Plato'] == id_plato].iloc[0]
+                nombre_cliente = plato_info.get('Nombre Cliente', '')
+                precio_venta = plato_info.get('Precio Venta', 0)
+        else:
+            st.error("No hay platos. Agrega uno primero en 'Carta'")
+            id_plato = 0
+            nombre_plato = ""
+            nombre_cliente = ""
+            precio_venta = 0
+        
+        # Mostrar escandallo actual del plato ANTES de agregar más
+        if platos_disponibles and id_plato > 0:
+            ingredientes_actuales = df_esc[df_esc['ID Plato'] == id_plato]
+            
+            if not ingredientes_actuales.empty:
+                st.markdown("---")
+                st.markdown(f"### 📋 Escandallo actual de: **{nombre_plato}**")
+                
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("🥘 Ingredientes", len(ingredientes_actuales))
+                with col2:
+                    coste_actual = ingredientes_actuales['Coste Total'].sum()
+                    st.metric("💰 Coste Total", f"{coste_actual:.2f}€")
+                with col3:
+                    st.metric("💵 Precio Venta", f"{precio_venta:.2f}€")
+                with col4:
+                    if precio_venta > 0:
+                        margen = ((precio_venta - coste_actual) / precio_venta) * 100
+                        delta_color = "normal" if margen >= 60 else "inverse"
+                        st.metric("📊 Margen", f"{margen:.1f}%", delta=None)
+                
+                # Tabla de ingredientes con opciones de edición
+                st.caption("🔧 **Haz clic en un ingrediente para editarlo o eliminarlo**")
+                
+                df_lineas_pagina = paginacion.paginar(
+                    ingredientes_actuales, f"esc_plato_{id_plato}",
+                    columnas_filtro=['Nombre Ingrediente'],
+                    columnas_orden=['Nombre Ingrediente', 'Coste Total'],
+                    etiqueta="ingredientes"
+                )
+                for idx, ingrediente in df_lineas_pagina.iterrows():
+                    col_a, col_b, col_c, col_d, col_e, col_f = st.columns([3, 1, 1, 1, 1, 1])
+                    
+                    with col_a:
+                        st.write(f"**{ingrediente['Nombre Ingrediente']}**")
+                    with col_b:
+                        st.write(f"{ingrediente['Cantidad']:.3f} {ingrediente['Unidad']}")
+                    with col_c:
+                        st.write(f"{ingrediente['Coste Unitario']:.4f}€")
+                    with col_d:
+                        st.write(f"**{ingrediente['Coste Total']:.2f}€**")
+                    with col_e:
+                        if st.button("✏️", key=f"edit_esc_{ingrediente['ID Escandallo']}", help="Editar cantidad"):
+                            st.session_state.editando_escandallo = ingrediente['ID Escandallo']
+                            st.rerun()
+                    with col_f:
+                        if st.button("🗑️", key=f"del_esc_{ingrediente['ID Escandallo']}", help="Eliminar ingrediente"):
+                            # Eliminar ingrediente del escandallo
+                            df_esc_temp = utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+                            df_esc_temp = df_esc_temp[df_esc_temp['ID Escandallo'] != ingrediente['ID Escandallo']]
+                            utils.escribir_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS", df_esc_temp)
+                            
+                            # Recalcular costes
+                            utils.recalcular_costes_platos(df_esc_temp)
+                            
+                            st.success(f"✅ {ingrediente['Nombre Ingrediente']} eliminado del escandallo")
+                            time.sleep(1)
+                            st.rerun()
+                    
+                    # Formulario de edición si está activo
+                    if st.session_state.get('editando_escandallo') == ingrediente['ID Escandallo']:
+                        with st.container():
+                            st.markdown("---")
+                            st.markdown(f"**✏️ Editando: {ingrediente['Nombre Ingrediente']}**")
+                            
+                            col_edit1, col_edit2 = st.columns(2)
+                            
+                            with col_edit1:
+                                nueva_cantidad = st.number_input(
+                                    f"Nueva Cantidad ({ingrediente['Unidad']})", 
+                                    min_value=0.001, 
+                                    value=float(ingrediente['Cantidad']), 
+                                    step=0.01, 
+                                    format="%.3f",
+                                    key=f"nueva_cant_{ingrediente['ID Escandallo']}"
+                                )
+                                
+                                nuevo_coste = unidades.costear_lineas(
+                                    pd.DataFrame([ingrediente]).assign(Cantidad=nueva_cantidad), df_ing
+                                )['Coste Total'].iloc[0]
+                                st.caption(f"Nuevo Coste Total: **{nuevo_coste:.2f}€**")
+                            
+                            with col_edit2:
+                                st.write("")
+                                st.write("")
+                                col_btn1, col_btn2 = st.columns(2)
+                                
+                                with col_btn1:
+                                    if st.button("💾 Guardar", key=f"save_esc_{ingrediente['ID Escandallo']}", use_container_width=True, type="primary"):
+                                        # Actualizar cantidad
+                                        df_esc_temp = utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+                                        mascara = df_esc_temp['ID Escandallo'] == ingrediente['ID Escandallo']
+                                        df_esc_temp.loc[mascara, 'Cantidad'] = nueva_cantidad
+                                        df_esc_temp.loc[mascara, 'Coste Total'] = nuevo_coste
+                                        df_esc_temp.loc[mascara, 'Última Actualización'] = datetime.now().date()
+                                        
+                                        utils.escribir_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS", df_esc_temp)
+                                        
+                                        # Recalcular costes del plato
+                                        utils.recalcular_costes_platos(df_esc_temp)
+                                        
+                                        st.success(f"✅ Cantidad actualizada: {nueva_cantidad:.3f} {ingrediente['Unidad']}")
+                                        st.session_state.editando_escandallo = None
+                                        time.sleep(1)
+                                        st.rerun()
+                                
+                                with col_btn2:
+                                    if st.button("❌ Cancelar", key=f"cancel_esc_{ingrediente['ID Escandallo']}", use_container_width=True):
+                                        st.session_state.editando_escandallo = None
+                                        st.rerun()
+                            
+                            st.markdown("---")
+                
+                st.markdown("---")
+            else:
+                st.info(f"ℹ️ El plato **{nombre_plato}** aún no tiene ingredientes. ¡Agrega el primero!")
+                st.markdown("---")
+        
+        # AHORA sí, el expander para agregar múltiples ingredientes A ESE PLATO
+        if platos_disponibles:
+            with st.expander(f"➕ **Agregar Ingrediente a: {nombre_plato}**", expanded=True):
+                st.caption("💡 Agrega ingredientes uno por uno. Cada uno se suma al escandallo y actualiza el coste automáticamente.")
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    if ingredientes_disponibles:
+                        ing_sel = st.selectbox("Ingrediente*", ingredientes_disponibles, key="ing_esc_sel")
+                        id_ing = int(float(ing_sel.split(" - ")[0]))
+                        nombre_ing = ing_sel.split(" - ")[1]
+                        
+                        # Obtener precio actual del ingrediente
+                        precio_ing = df_ing[df_ing['ID Ingrediente'] == id_ing]['Precio Mercado Medio'].values[0]
+                        unidad_ing = df_ing[df_ing['ID Ingrediente'] == id_ing]['Unidad Compra'].values[0]
+                    else:
+                        st.error("No hay ingredientes. Agrega uno primero")
+                        id_ing = 0
+                        nombre_ing = ""
+                        precio_ing = 0
+                        unidad_ing = "KG"
+                
+                with col2:
+                    if ingredientes_disponibles:
+                        cantidad = st.number_input(f"Cantidad ({unidad_ing})*", 
+                            min_value=0.0, value=0.0, step=0.01, format="%.3f",
+                            help=f"Cantidad en {unidad_ing}", key="cantidad_esc_input")
+                        
+                        st.caption(f"💰 Coste Unitario: {precio_ing:.4f} €/{unidad_ing}")
+                        
+                        if cantidad > 0:
+                            coste_calculado = cantidad * precio_ing
+                            st.write(f"**Coste de este ingrediente: {coste_calculado:.2f} €**")
+                        
+                        # Proveedor opcional
+                        dict_proveedores = utils.obtener_dict_proveedores()
+                        proveedores_opciones = ["Sin asignar"] + [f"{id_p} - {nombre}" for id_p, nombre in dict_proveedores.items()]
+                        proveedor_seleccionado = st.selectbox("Proveedor (opcional)", 
+                            proveedores_opciones, key="prov_esc_sel")
+                
+                st.markdown("---")
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button("💾 Agregar Ingrediente", use_container_width=True, type="primary", key="btn_agregar_esc"):
+                        if not ingredientes_disponibles:
+                            st.error("Necesitas tener al menos un ingrediente")
+                        elif cantidad <= 0:
+                            st.error("La cantidad debe ser mayor que 0")
+                        else:
+                            # Verificar si ya existe este ingrediente en el plato
+                            existe = df_esc[
+                                (df_esc['ID Plato'] == id_plato) & 
+                                (df_esc['ID Ingrediente'] == id_ing)
+                            ]
+                            
+                            if not existe.empty:
+                                st.warning(f"⚠️ Este ingrediente ya está en el plato. Edítalo o elimínalo primero.")
+                            else:
+                                nuevo_id = utils.obtener_siguiente_id(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+                                coste_total = cantidad * precio_ing
+                                
+                                # Parsear ID proveedor
+                                if proveedor_seleccionado == "Sin asignar":
+                                    id_proveedor = None
+                                else:
+                                    id_proveedor = int(float(proveedor_seleccionado.split(" - ")[0]))
+                                
+                                nuevo_escandallo = {
+                                    'ID Escandallo': nuevo_id,
+                                    'ID Plato': id_plato,
+                                    'Nombre Plato': nombre_plato,
+                                    'ID Ingrediente': id_ing,
+                                    'Nombre Ingrediente': nombre_ing,
+                                    'Cantidad': cantidad,
+                                    'Unidad': unidad_ing,
+                                    'Coste Unitario': precio_ing,
+                                    'Coste Total': coste_total,
+                                    '% del Plato': 0,  # Se calculará después
+                                    'ID Proveedor': id_proveedor,
+                                    'Última Actualización': datetime.now().date()
+                                }
+                                
+                                if utils.agregar_fila(config.ARCHIVO_OPERACIONES, "ESCANDALLOS", nuevo_escandallo):
+                                    st.success(f"✅ {nombre_ing} agregado al escandallo: {cantidad:.2f} {unidad_ing} = {coste_total:.2f}€")
+                                    
+                                    # Recalcular coste total del plato en CARTA_CLIENTES
+                                    df_esc_actualizado = utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+                                    utils.recalcular_costes_platos(df_esc_actualizado)
+                                    
+                                    st.info("♻️ Coste y márgenes del plato actualizados en la Carta")
+                                    time.sleep(1.5)
+                                    st.rerun()
+                
+                with col2:
+                    if st.button("✅ Terminar Escandallo", use_container_width=True, key="btn_cancelar_esc"):
+                        st.session_state.agregar_escandallo = False
+                        st.rerun()
+    
+    # Mostrar escandallos
+    st.markdown("---")
+    
+    if not df_esc.empty:
+        # Filtro por plato
+        if 'Nombre Plato' in df_esc.columns:
+            platos_unicos = df_esc['Nombre Plato'].unique()
+            plato_filtro = st.selectbox("Filtrar por Plato", ["Todos"] + list(platos_unicos))
+            
+            if plato_filtro != "Todos":
+                df_filtrado = df_esc[df_esc['Nombre Plato'] == plato_filtro]
+                
+                # Mostrar resumen del plato
+                if not df_filtrado.empty:
+                    col1, col2, col3, col4 = st.columns(4)
+                    
+                    with col1:
+                        total_ingredientes = len(df_filtrado)
+                        st.metric("Ingredientes", total_ingredientes)
+                    
+                    with col2:
+                        if 'Coste Total' in df_filtrado.columns:
+                            coste_plato = df_filtrado['Coste Total'].sum()
+                            st.metric("Coste Total Plato", f"{coste_plato:.2f} €")
+                    
+                    with col3:
+                        # Buscar precio de venta del plato
+                        if not df_platos.empty:
+                            plato_info = df_platos[df_platos['Nombre Plato'] == plato_filtro]
+                            if not plato_info.empty and 'Precio Venta' in plato_info.columns:
+                                precio_venta = plato_info['Precio Venta'].values[0]
+                                st.metric("Precio Venta", f"{precio_venta:.2f} €")
+                    
+                    with col4:
+                        if 'coste_plato' in locals() and 'precio_venta' in locals() and precio_venta > 0:
+                            margen = ((precio_venta - coste_plato) / precio_venta) * 100
+                            st.metric("Margen", f"{margen:.1f}%")
+                    
+                    st.markdown("---")
+                    
+                    # Mostrar ingredientes con opciones de edición
+                    st.subheader("📝 Ingredientes del Escandallo")
+                    
+                    df_lineas_pagina = paginacion.paginar(
+                        df_filtrado, f"esc_tabla_{plato_filtro}",
+                        columnas_filtro=['Nombre Ingrediente'],
+                        columnas_orden=['Nombre Ingrediente', 'Cantidad', 'Coste Total'],
+                        etiqueta="ingredientes"
+                    )
+                    for idx, ingrediente in df_lineas_pagina.iterrows():
+                        col_a, col_b, col_c, col_d, col_e, col_f = st.columns([3, 1.5, 1.5, 1, 0.5, 0.5])
+                        
+                        with col_a:
+                            st.write(f"**{ingrediente['Nombre Ingrediente']}**")
+                        with col_b:
+                            st.write(f"{ingrediente['Cantidad']:.3f} {ingrediente['Unidad']}")
+                        with col_c:
+                            st.write(f"{ingrediente['Coste Unitario']:.4f} €/{ingrediente['Unidad']}")
+                        with col_d:
+                            st.write(f"**{ingrediente['Coste Total']:.2f} €**")
+                        with col_e:
+                            if st.button("✏️", key=f"edit_table_{ingrediente['ID Escandallo']}", help="Editar cantidad"):
+                                st.session_state.editando_tabla_esc = ingrediente['ID Escandallo']
+                                st.rerun()
+                        with col_f:
+                            if st.button("🗑️", key=f"del_table_{ingrediente['ID Escandallo']}", help="Eliminar ingrediente"):
+                                df_esc_temp = utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+                                df_esc_temp = df_esc_temp[df_esc_temp['ID Escandallo'] != ingrediente['ID Escandallo']]
+                                utils.escribir_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS", df_esc_temp)
+                                utils.recalcular_costes_platos(df_esc_temp)
+                                st.success(f"✅ {ingrediente['Nombre Ingrediente']} eliminado")
+                                time.sleep(1)
+                                st.rerun()
+                        
+                        # Formulario inline de edición
+                        if st.session_state.get('editando_tabla_esc') == ingrediente['ID Escandallo']:
+                            with st.container():
+                                st.markdown(f"**✏️ Editando: {ingrediente['Nombre Ingrediente']}**")
+                                col_e1, col_e2, col_e3 = st.columns([2, 1, 1])
+                                
+                                with col_e1:
+                                    nueva_cant = st.number_input(
+                                        f"Nueva Cantidad ({ingrediente['Unidad']})", 
+                                        min_value=0.001, 
+                                        value=float(ingrediente['Cantidad']), 
+                                        step=0.01,
+                                        format="%.3f",
+                                        key=f"edit_cant_table_{ingrediente['ID Escandallo']}"
+                                    )
+                                    st.caption(f"Nuevo coste: **{unidades.costear_lineas(pd.DataFrame([ingrediente]).assign(Cantidad=nueva_cant), df_ing)['Coste Total'].iloc[0]:.2f}€**")
+                                
+                                with col_e2:
+                                    if st.button("💾 Guardar", key=f"save_table_{ingrediente['ID Escandallo']}", type="primary", use_container_width=True):
+                                        df_esc_temp = utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS")
+                                        mascara = df_esc_temp['ID Escandallo'] == ingrediente['ID Escandallo']
+                                        df_esc_temp.loc[mascara, 'Cantidad'] = nueva_cant
+                                        df_esc_temp.loc[mascara, 'Coste Total'] = unidades.costear_lineas(df_esc_temp[mascara], df_ing)['Coste Total']
+                                        df_esc_temp.loc[mascara, 'Última Actualización'] = datetime.now().date()
+                                        utils.escribir_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS", df_esc_temp)
+                                        utils.recalcular_costes_platos(df_esc_temp)
+                                        st.success(f"✅ Actualizado")
+                                        st.session_state.editando_tabla_esc = None
+                                        time.sleep(1)
+                                        st.rerun()
+                                
+                                with col_e3:
+                                    if st.button("❌", key=f"cancel_table_{ingrediente['ID Escandallo']}", use_container_width=True):
+                                        st.session_state.editando_tabla_esc = None
+                                        st.rerun()
+                                
+                                st.markdown("---")
+            else:
+                df_filtrado = df_esc
+        else:
+            df_filtrado = df_esc
+        
+        # Mostrar tabla completa cuando no hay filtro
+        if plato_filtro == "Todos":
+            df_pagina = paginacion.paginar(
+                df_filtrado, "esc_todos",
+                columnas_filtro=['Nombre Plato', 'Nombre Ingrediente', 'Nombre Cliente'],
+                columnas_orden=['Nombre Plato', 'Nombre Ingrediente', 'Coste Total'],
+                tamano_pagina=50,
+                etiqueta="ingredientes"
+            )
+            st.dataframe(
+                df_pagina,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Coste Unitario": st.column_config.NumberColumn(
+                        "Coste Unitario",
+                        format="%.4f €"
+                    ),
+                    "Coste Total": st.column_config.NumberColumn(
+                        "Coste Total",
+                        format="%.2f €"
+                    ),
+                    "Cantidad": st.column_config.NumberColumn(
+                        "Cantidad",
+                        format="%.3f"
+                    ),
+                    "% del Plato": st.column_config.NumberColumn(
+                        "% del Plato",
+                        format="%.1f%%"
+                    )
+                }
+            )
+    else:
+        st.info("🔍 No hay escandallos registrados. ¡Agrega ingredientes a tus platos!")
+
+def mostrar_carta():
+    """Vista de carta de clientes"""
+    st.subheader("🍴 Carta de Clientes")
+    
+    # Cargar datos
+    df_carta = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+    df_clientes = utils.leer_excel(config.ARCHIVO_CRM, "CLIENTES_ACTIVOS")
+    
+    # Crear lista de clientes
+    clientes_disponibles = []
+    if not df_clientes.empty and 'ID' in df_clientes.columns and 'Nombre Comercial' in df_clientes.columns:
+        for _, row in df_clientes.iterrows():
+            clientes_disponibles.append(f"{row['ID']} - {row['Nombre Comercial']}")
+    
+    # Selector de cliente para filtrar
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        if not df_carta.empty and 'Nombre Cliente' in df_carta.columns:
+            clientes_unicos = df_carta['Nombre Cliente'].unique()
+            cliente_filtro = st.selectbox("Filtrar por Cliente", ["Todos"] + list(clientes_unicos))
+        else:
+            cliente_filtro = "Todos"
+    
+    with col2:
+        if st.button("➕ Agregar Plato", type="primary", use_container_width=True):
+            st.session_state.agregar_plato = True
+    
+    # Formulario de nuevo plato
+    if st.session_state.get('agregar_plato', False):
+        with st.form("form_nuevo_plato"):
+            st.write("**🍽️ Agregar Nuevo Plato a la Carta**")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                if clientes_disponibles:
+                    cliente_sel = st.selectbox("Cliente*", clientes_disponibles)
+                    id_cliente = int(float(cliente_sel.split(" - ")[0]))
+                    nombre_cliente = cliente_sel.split(" - ")[1]
+                else:
+                    st.error("No hay clientes activos. Agrega uno primero.")
+                    id_cliente = 0
+                    nombre_cliente = ""
+                
+                nombre_plato = st.text_input("Nombre del Plato*", 
+                    placeholder="Ej: Cachopo de ternera")
+                
+                categoria = st.selectbox("Categoría*", config.CATEGORIAS_PLATO)
+                
+                precio_venta = st.number_input("Precio de Venta (€)*", 
+                    min_value=0.0, value=0.0, step=0.5, format="%.2f")
+            
+            with col2:
+                coste_total = st.number_input("Coste Total (€)*", 
+                    min_value=0.0, value=0.0, step=0.1, format="%.2f",
+                    help="Suma de todos los ingredientes. Se puede calcular automáticamente desde Escandallos")
+                
+                ventas_mes = st.number_input("Ventas/Mes Estimadas", 
+                    min_value=0, value=0, step=5)
+                
+                activo = st.selectbox("¿Activo en carta?", ["Sí", "No"])
+            
+            descripcion = st.text_area("Descripción del Plato", 
+                placeholder="Opcional: descripción del plato para la carta")
+            
+            notas = st.text_area("Notas Internas", 
+                placeholder="Notas sobre el plato, ingredientes especiales, etc.")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                submitted = st.form_submit_button("💾 Guardar Plato", use_container_width=True)
+            with col2:
+                cancelar = st.form_submit_button("❌ Cancelar", use_container_width=True)
+            
+            if submitted:
+                if not clientes_disponibles:
+                    st.error("No puedes agregar platos sin clientes activos")
+                elif not nombre_plato:
+                    st.error("El nombre del plato es obligatorio")
+                elif precio_venta <= 0:
+                    st.error("El precio de venta debe ser mayor que 0")
+                else:
+                    nuevo_id = utils.obtener_siguiente_id(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+                    
+                    # Calcular márgenes
+                    margen_euros = precio_venta - coste_total
+                    margen_pct = (margen_euros / precio_venta * 100) if precio_venta > 0 else 0
+                    food_cost = (coste_total / precio_venta * 100) if precio_venta > 0 else 0
+                    
+                    # Precio recomendado apuntando a 28% Food Cost (🟢 verde)
+                    precio_recomendado = (coste_total / 0.28) if coste_total > 0 else 0
+                    
+                    nuevo_plato = {
+                        'ID Plato': nuevo_id,
+                        'ID Cliente': id_cliente,
+                        'Nombre Cliente': nombre_cliente,
+                        'Nombre Plato': nombre_plato,
+                        'Categoría': categoria,
+                        'Precio Venta': precio_venta,
+                        'Coste Total': coste_total,
+                        'Margen €': margen_euros,
+                        'Margen %': margen_pct,
+                        'Food Cost %': food_cost,
+                        'Ventas/Mes': ventas_mes,
+                        'Clasificación': '',
+                        'Precio Recomendado': precio_recomendado,
+                        'Activo': activo,
+                        'Notas': notas
+                    }
+                    
+                    # La clasificación la calcula ingenieria_menu con la mediana del cliente
+                    if ingenieria_menu.agregar_plato(nuevo_plato):
+                        st.success(f"✅ Plato '{nombre_plato}' agregado correctamente")
+                        st.info(f"📊 Margen: {margen_pct:.1f}% | Food Cost: {food_cost:.1f}%")
+                        st.session_state.agregar_plato = False
+                        st.cache_data.clear()
+                        st.rerun()
+            
+            if cancelar:
+                st.session_state.agregar_plato = False
+                st.rerun()
+    
+    # Mostrar platos
+    st.markdown("---")
+    
+    if not df_carta.empty:
+        # Aplicar filtro de cliente
+        df_filtrado = df_carta.copy()
+        if cliente_filtro != "Todos":
+            df_filtrado = df_filtrado[df_filtrado['Nombre Cliente'] == cliente_filtro]
+        
+        # Métricas rápidas
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Total Platos", len(df_filtrado))
+        
+        with col2:
+            if 'Margen %' in df_filtrado.columns:
+                margen_medio = df_filtrado['Margen %'].mean()
+                st.metric("Margen Medio", f"{margen_medio:.1f}%")
+        
+        with col3:
+            if 'Clasificación' in df_filtrado.columns:
+                estrellas = len(df_filtrado[df_filtrado['Clasificación'] == 'Estrella'])
+                st.metric("⭐ Estrellas", estrellas)
+        
+        with col4:
+            if 'Activo' in df_filtrado.columns:
+                activos = len(df_filtrado[df_filtrado['Activo'] == 'Sí'])
+                st.metric("Platos Activos", activos)
+        
+        st.markdown("---")
+        
+        # Alertas de márgenes bajos
+        if 'Margen %' in df_filtrado.columns:
+            platos_bajo_margen = df_filtrado[df_filtrado['Margen %'] < config.UMBRAL_MARGEN_MINIMO]
+            if not platos_bajo_margen.empty:
+                st.warning(f"⚠️ {len(platos_bajo_margen)} platos con margen bajo (<{config.UMBRAL_MARGEN_MINIMO}%)")
+        
+        # Mostrar tabla con formato condicional
+        st.dataframe(
+            df_filtrado,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Margen %": st.column_config.NumberColumn(
+                    "Margen %",
+                    format="%.1f%%"
+                ),
+                "Food Cost %": st.column_config.NumberColumn(
+                    "Food Cost %",
+                    format="%.1f%%"
+                ),
+                "Precio Venta": st.column_config.NumberColumn(
+                    "Precio Venta",
+                    format="%.2f €"
+                ),
+                "Coste Total": st.column_config.NumberColumn(
+                    "Coste Total",
+                    format="%.2f €"
+                ),
+                "Margen €": st.column_config.NumberColumn(
+                    "Margen €",
+                    format="%.2f €"
+                )
+            }
+        )
+        
+        st.caption(f"Mostrando {len(df_filtrado)} de {len(df_carta)} platos")
+    else:
+        st.info("🍽️ No hay platos registrados. ¡Agrega el primero!")
+
+def mostrar_ingredientes():
+    """Vista de ingredientes maestro (compartido) pero no se usa directamente"""
+    st.info("ℹ️ **Nota:** Los ingredientes maestro son solo referencia. Cada cliente tiene sus propios precios.")
+    
+    if st.button("📊 Ver Base de Ingredientes Maestro", key="ver_ingredientes_maestro"):
+        st.session_state.ver_ingredientes_maestro = not st.session_state.get('ver_ingredientes_maestro', False)
+    
+    if st.session_state.get('ver_ingredientes_maestro', False):
+        df_ing = utils.leer_excel(config.ARCHIVO_OPERACIONES, "INGREDIENTES_MAESTRO")
+        
+        if not df_ing.empty:
+            st.caption("**Base de datos de referencia** (precio promedio del mercado)")
+            st.dataframe(df_ing, use_container_width=True, hide_index=True)
+        else:
+            st.info("No hay ingredientes en la base maestra")
+
+def mostrar_ingredientes_cliente(id_cliente, nombre_cliente):
+    """Ingredientes con precios específicos del cliente seleccionado"""
+    st.subheader(f"📊 Ingredientes de {nombre_cliente}")
+    
+    # Cargar datos
+    df_ing_maestro = utils.leer_excel(config.ARCHIVO_OPERACIONES, "INGREDIENTES_MAESTRO")
+    df_precios_todos = utils.leer_excel(config.ARCHIVO_OPERACIONES, "PRECIOS_POR_CLIENTE")
+    
+    # Filtrar precios de este cliente
+    df_precios_cliente = df_precios_todos[df_precios_todos['ID Cliente'] == id_cliente] if not df_precios_todos.empty else pd.DataFrame()
+    
+    st.write("---")
+    
+    # Botones de acción
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("➕ Asignar Ingrediente a este Cliente", type="primary", key="btn_asignar_ing"):
+            st.session_state.asignar_ingrediente_cliente = True
+    
+    with col2:
+        if st.button("🆕 Crear Nuevo Ingrediente en Base", key="btn_nuevo_ing_base"):
+            st.session_state.crear_ingrediente_base = True
+    
+    # Formulario: Asignar ingrediente existente al cliente
+    if st.session_state.get('asignar_ingrediente_cliente', False):
+        with st.expander(f"➕ **Asignar Ingrediente a {nombre_cliente}**", expanded=True):
+            if df_ing_maestro.empty:
+                st.error("No hay ingredientes en la base. Crea uno primero.")
+                if st.button("❌ Cancelar", key="cancelar_asignar_ing_vacio"):
+                    st.session_state.asignar_ingrediente_cliente = False
+                    st.rerun()
+            else:
+                # Selección de ingrediente
+                opciones_ing = [f"{row['ID Ingrediente']} - {row['Nombre']}" 
+                               for _, row in df_ing_maestro.iterrows()]
+                
+                ing_sel = st.selectbox("Ingrediente*", opciones_ing, key="ing_asignar_form")
+                id_ing = int(float(ing_sel.split(" - ")[0]))
+                nombre_ing = ing_sel.split(" - ")[1]
+                
+                # Datos del ingrediente seleccionado
+                ing_data = df_ing_maestro[df_ing_maestro['ID Ingrediente'] == id_ing].iloc[0]
+                precio_mercado = ing_data['Precio Mercado Medio']
+                unidad = ing_data['Unidad Compra']
+                
+                # Layout compacto en 4 columnas
+                col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+                
+                with col1:
+                    st.caption("📊 Precio Mercado")
+                    st.write(f"**{precio_mercado:.2f} €/{unidad}**")
+                
+                with col2:
+                    precio_cliente = st.number_input(f"Precio {nombre_cliente} (€/{unidad})*", 
+                        min_value=0.0, value=float(precio_mercado), step=0.1, format="%.2f", 
+                        key="precio_asignar_form", label_visibility="visible")
+                
+                with col3:
+                    dict_proveedores = utils.obtener_dict_proveedores()
+                    proveedores_opciones = ["Sin asignar"] + [f"{id_p} - {nombre}" for id_p, nombre in dict_proveedores.items()]
+                    proveedor_seleccionado = st.selectbox("Proveedor", proveedores_opciones, key="prov_asignar_form")
+
+                with col4:
+                    merma_pct = st.number_input(
+                        "Merma %",
+                        min_value=0.0,
+                        max_value=95.0,
+                        value=0.0,
+                        step=1.0,
+                        format="%.0f",
+                        key="merma_asignar_form",
+                        help="Merma estimada del ingrediente (0% = sin merma)"
+                    )
+                
+                # Desviación compacta
+                if precio_mercado > 0:
+                    desviacion = ((precio_cliente - precio_mercado) / precio_mercado) * 100
+                    
+                    if desviacion > 10:
+                        st.error(f"⚠️ +{desviacion:.1f}% MÁS CARO")
+                    elif desviacion < -10:
+                        st.success(f"✅ {abs(desviacion):.1f}% MÁS BARATO")
+                    else:
+                        st.info(f"📊 {desviacion:+.1f}%")
+                
+                # Botones compactos
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button("💾 Asignar", use_container_width=True, type="primary", key="btn_submit_asignar"):
+                        # Parsear ID de proveedor
+                        if proveedor_seleccionado == "Sin asignar":
+                            id_proveedor_asignar = None
+                        else:
+                            id_proveedor_asignar = int(float(proveedor_seleccionado.split(" - ")[0]))
+                        
+                        if precio_cliente <= 0:
+                            st.error("El precio debe ser mayor que 0")
+                        else:
+                            # Verificar si ya existe
+                            existe = df_precios_cliente[
+                                (df_precios_cliente['ID Cliente'] == id_cliente) & 
+                                (df_precios_cliente['ID Ingrediente'] == id_ing)
+                            ]
+                            
+                            if not existe.empty:
+                                st.warning(f"⚠️ {nombre_cliente} ya tiene este ingrediente.")
+                            else:
+                                nuevo_id = utils.obtener_siguiente_id(config.ARCHIVO_OPERACIONES, "PRECIOS_POR_CLIENTE")
+                                desviacion = ((precio_cliente - precio_mercado) / precio_mercado * 100) if precio_mercado > 0 else 0
+                                
+                                nuevo_precio = {
+                                    'ID Precio': nuevo_id,
+                                    'ID Cliente': id_cliente,
+                                    'Nombre Cliente': nombre_cliente,
+                                    'ID Ingrediente': id_ing,
+                                    'Nombre Ingrediente': nombre_ing,
+                                    'Precio Cliente': precio_cliente,
+                                    'Unidad': unidad,
+                                    'Precio Mercado Referencia': precio_mercado,
+                                    'Desviación %': desviacion,
+                                    'Última Actualización': datetime.now().date(),
+                                    'ID Proveedor': id_proveedor_asignar,
+                                    'Merma %': merma_pct,
+                                    'Notas': ''
+                                }
+                                
+                                if utils.agregar_fila(config.ARCHIVO_OPERACIONES, "PRECIOS_POR_CLIENTE", nuevo_precio):
+                                    st.success(f"✅ {nombre_ing} asignado a {precio_cliente:.2f}€")
+                                    st.session_state.asignar_ingrediente_cliente = False
+                                    time.sleep(0.5)
+                                    st.rerun()
+                
+                with col2:
+                    if st.button("❌ Cancelar", use_container_width=True, key="btn_cancel_asignar"):
+                        st.session_state.asignar_ingrediente_cliente = False
+                        st.rerun()
+    
+    # Formulario: Crear nuevo ingrediente en la base
+    if st.session_state.get('crear_ingrediente_base', False):
+        st.write("**Crear nuevo ingrediente en Base Maestro**")
+        st.caption("Después podrás asignarlo a clientes con sus precios específicos")
+        
+        # INPUTS FUERA DEL FORMULARIO para poder buscar ingredientes similares
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            nombre_ing = st.text_input("Nombre*", key="nombre_ing_base_form")
+            categoria = st.selectbox("Categoría*", config.CATEGORIAS_INGREDIENTE, key="cat_ing_base_form")
+            unidad = st.selectbox("Unidad*", ["KG", "Litro", "Unidad", "Docena", "Gramos", "ML"], key="unidad_ing_base_form")
+        
+        with col2:
+            # Calcular precio medio automáticamente de ingredientes similares
+            precio_mercado_calculado = None
+            mensaje_calculo = ""
+            
+            if nombre_ing:  # Solo buscar si hay nombre
+                # Buscar en PRECIOS_POR_CLIENTE ingredientes con nombre similar
+                df_precios_todos = utils.leer_excel(config.ARCHIVO_OPERACIONES, "PRECIOS_POR_CLIENTE")
+                
+                if not df_precios_todos.empty and 'Nombre Ingrediente' in df_precios_todos.columns:
+                    # Buscar ingredientes con nombre similar (case insensitive)
+                    nombre_lower = nombre_ing.lower()
+                    similares = df_precios_todos[
+                        df_precios_todos['Nombre Ingrediente'].str.lower().str.contains(nombre_lower, na=False)
+                    ]
+                    
+                    if len(similares) >= 1:  # Si hay al menos 1 precio
+                        precio_mercado_calculado = similares['Precio Cliente'].mean()
+                        mensaje_calculo = f"✅ Calculado automáticamente (media de {len(similares)} precio(s) de '{nombre_ing}')"
+                    else:
+                        mensaje_calculo = "⚠️ No disponemos de datos suficientes para realizar el cálculo"
+                else:
+                    mensaje_calculo = "⚠️ No disponemos de datos suficientes para realizar el cálculo"
+            else:
+                mensaje_calculo = "💡 Introduce un nombre para calcular el precio automáticamente"
+            
+            # Mostrar mensaje
+            if precio_mercado_calculado:
+                st.success(mensaje_calculo)
+            elif "No disponemos" in mensaje_calculo:
+                st.warning(mensaje_calculo)
+            else:
+                st.info(mensaje_calculo)
+            
+            # Input de precio (autocompletado si existe cálculo)
+            valor_inicial = precio_mercado_calculado if precio_mercado_calculado else 0.0
+            precio_mercado = st.number_input("Precio Mercado Medio (€) - Opcional", 
+                min_value=0.0, step=0.1, format="%.2f", key="precio_ing_base_form",
+                value=float(valor_inicial),
+                help="Se calcula automáticamente. Si no hay datos, déjalo en 0 y se actualizará después")
+            
+            marca = st.text_input("Marca (opcional)", key="marca_ing_base_form")
+        
+        st.markdown("---")
+        
+        # Botones de acción
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("💾 Crear en Base", use_container_width=True, type="primary", key="btn_crear_ing_base"):
+                if not nombre_ing:
+                    st.error("El nombre es obligatorio")
+                elif precio_mercado < 0:
+                    st.error("El precio no puede ser negativo")
+                else:
+                    # Crear ingrediente (precio puede ser 0 si no hay datos)
+                    nuevo_id = utils.obtener_siguiente_id(config.ARCHIVO_OPERACIONES, "INGREDIENTES_MAESTRO")
+                    
+                    nuevo_ing = {
+                        'ID Ingrediente': nuevo_id,
+                        'Nombre': nombre_ing,
+                        'Categoría': categoria,
+                        'Unidad Compra': unidad,
+                        'Precio Mercado Medio': precio_mercado,
+                        'Var % Semana': 0,
+                        'Var % Mes': 0,
+                        'Última Actualización': datetime.now().date(),
+                        'Estacionalidad': '',
+                        'Marca': marca if marca else '',
+                        'Notas': ''
+                    }
+                    
+                    if utils.agregar_fila(config.ARCHIVO_OPERACIONES, "INGREDIENTES_MAESTRO", nuevo_ing):
+                        if precio_mercado == 0:
+                            st.success(f"✅ '{nombre_ing}' creado (sin precio de referencia)")
+                            st.info("💡 Asígnalo a clientes y el precio medio se calculará automáticamente")
+                        else:
+                            st.success(f"✅ '{nombre_ing}' creado con precio medio de {precio_mercado:.2f}€")
+                        st.session_state.crear_ingrediente_base = False
+                        time.sleep(0.5)
+                        st.rerun()
+        
+        with col2:
+            if st.button("❌ Cancelar", use_container_width=True, key="btn_cancelar_ing_base"):
+                st.session_state.crear_ingrediente_base = False
+                st.rerun()
+    
+    # Mostrar ingredientes del cliente
+    st.markdown("---")
+    st.subheader(f"Ingredientes asignados a {nombre_cliente}")
+    
+    if not df_precios_cliente.empty:
+        # Métricas
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Total Ingredientes", len(df_precios_cliente))
+        
+        with col2:
+            if 'Precio Cliente' in df_precios_cliente.columns:
+                precio_medio = df_precios_cliente['Precio Cliente'].mean()
+                st.metric("Precio Medio", f"{precio_medio:.2f} €")
+        
+        with col3:
+            if 'Desviación %' in df_precios_cliente.columns:
+                desv_media = df_precios_cliente['Desviación %'].mean()
+                color = "normal" if abs(desv_media) < 5 else "inverse"
+                st.metric("Desviación Media", f"{desv_media:+.1f}%", delta_color=color)
+        
+        with col4:
+            if 'Desviación %' in df_precios_cliente.columns:
+                caros = len(df_precios_cliente[df_precios_cliente['Desviación %'] > 10])
+                st.metric("⚠️ Más Caros", caros)
+        
+        st.markdown("---")
+        
+        # Actualización rápida de precio
+        with st.expander("⚡ Actualización Rápida de Precio"):
+            col1, col2, col3 = st.columns([2, 1, 1])
+            
+            with col1:
+                opciones_ing_cliente = [f"{row['ID Ingrediente']} - {row['Nombre Ingrediente']}" 
+                                       for _, row in df_precios_cliente.iterrows()]
+                ing_actualizar = st.selectbox("Ingrediente", opciones_ing_cliente, key="ing_actualizar_select")
+                id_ing_act = int(float(ing_actualizar.split(" - ")[0]))
+            
+            with col2:
+                precio_actual = df_precios_cliente[df_precios_cliente['ID Ingrediente'] == id_ing_act]['Precio Cliente'].values[0]
+                nuevo_precio = st.number_input("Nuevo Precio (€)", value=float(precio_actual), 
+                                              min_value=0.0, step=0.1, format="%.2f", key="nuevo_precio_act")
+            
+            with col3:
+                st.write("")
+                st.write("")
+                if st.button("🔄 Actualizar", use_container_width=True, key="btn_actualizar_precio"):
+                    if nuevo_precio > 0:
+                        # Actualizar en PRECIOS_POR_CLIENTE
+                        df_precios_actualizado = df_precios_todos.copy()
+                        mascara = (df_precios_actualizado['ID Cliente'] == id_cliente) & \
+                                 (df_precios_actualizado['ID Ingrediente'] == id_ing_act)
+                        
+                        precio_mercado_ref = df_precios_actualizado.loc[mascara, 'Precio Mercado Referencia'].values[0]
+                        nueva_desv = ((nuevo_precio - precio_mercado_ref) / precio_mercado_ref * 100) if precio_mercado_ref > 0 else 0
+                        
+                        df_precios_actualizado.loc[mascara, 'Precio Cliente'] = nuevo_precio
+                        df_precios_actualizado.loc[mascara, 'Desviación %'] = nueva_desv
+                        df_precios_actualizado.loc[mascara, 'Última Actualización'] = datetime.now().date()
+                        
+                        if utils.escribir_excel(config.ARCHIVO_OPERACIONES, "PRECIOS_POR_CLIENTE", df_precios_actualizado):
+                            st.success(f"✅ Precio actualizado a {nuevo_precio:.2f}€")
+                            
+                            # Recalcular escandallos
+                            st.info("♻️ Recalculando escandallos de este cliente...")
+                            utils.recalcular_costes_platos(utils.leer_excel(config.ARCHIVO_OPERACIONES, "ESCANDALLOS"))
+                            
+                            time.sleep(1)
+                            st.rerun()
+        
+        # Tabla de ingredientes
+        st.dataframe(
+            df_precios_cliente,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Precio Cliente": st.column_config.NumberColumn("Precio Cliente", format="%.2f €"),
+                "Precio Mercado Referencia": st.column_config.NumberColumn("Ref. Mercado", format="%.2f €"),
+                "Desviación %": st.column_config.NumberColumn("Desviación", format="%+.1f%%")
+            }
+        )
+        
+    else:
+        st.info(f"📊 {nombre_cliente} no tiene ingredientes asignados. Usa el botón '➕ Asignar Ingrediente' arriba.")
+def mostrar_compras():
+    """Vista de compras de clientes"""
+    st.subheader("💰 Registro de Compras")
+    
+    df_comp = utils.leer_excel(config.ARCHIVO_OPERACIONES, "COMPRAS_CLIENTE")
+    
+    if not df_comp.empty:
+        st.dataframe(
+            df_comp,
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.info("No hay compras registradas")
@@ -0,0 +1,511 @@
+"""
+MODULO_INFORMES.PY - Informes
+Informes PDF por cliente y generación por lotes
+"""
+
+import streamlit as st
+from datetime import datetime
+import config
+import utils
+
+# ============================================================================
+# FUNCIÓN: INFORMES PDF
+# ============================================================================
+
+def mostrar_informes_pdf(id_cliente, nombre_cliente):
+    """Generación de informes PDF profesionales"""
+    st.header(f"📄 Informes PDF - {nombre_cliente}")
+    
+    st.info("""
+    💡 **Genera informes profesionales en PDF** para entregar a tus clientes.
+    Incluye gráficos, análisis y recomendaciones personalizadas.
+    """)
+    
+    st.markdown("---")
+    
+    # Selector de tipo de informe
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        tipo_informe = st.selectbox(
+            "Tipo de Informe",
+            [
+                "🎯 Ingeniería de Menú",
+                "📊 Reporte Mensual",
+                "📈 Análisis Completo"
+            ],
+            key=f"tipo_informe_{id_cliente}"
+        )
+    
+    st.markdown("---")
+    
+    # ========================================================================
+    # INFORME DE INGENIERÍA DE MENÚ
+    # ========================================================================
+    
+    if tipo_informe == "🎯 Ingeniería de Menú":
+        st.subheader("🎯 Informe de Ingeniería de Menú")
+        
+        st.markdown("""
+        Este informe incluye:
+        - 📊 Clasificación BCG de todos los platos
+        - 📈 Gráfico de burbujas interactivo (opcional)
+        - 💡 Recomendaciones específicas por cuadrante
+        - 📉 Proyección de impacto financiero
+        """)
+        
+        # Verificar que hay datos
+        df_carta = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+        df_carta_cliente = df_carta[df_carta['ID Cliente'] == id_cliente].copy()
+        
+        if df_carta_cliente.empty:
+            st.warning("⚠️ No hay platos en la carta para generar el informe.")
+        else:
+            # Calcular métricas
+            df_carta_cliente['Margen'] = df_carta_cliente['Precio Venta'] - df_carta_cliente['Coste Total']
+            df_carta_cliente['Margen %'] = (df_carta_cliente['Margen'] / df_carta_cliente['Precio Venta'] * 100).round(1)
+            df_carta_cliente['Facturación'] = df_carta_cliente['Precio Venta'] * df_carta_cliente['Ventas/Mes']
+            df_carta_cliente['Beneficio'] = df_carta_cliente['Margen'] * df_carta_cliente['Ventas/Mes']
+            
+            # Preview de métricas
+            col1, col2, col3 = st.columns(3)
+            
+            total_facturacion = df_carta_cliente['Facturación'].sum()
+            total_beneficio = df_carta_cliente['Beneficio'].sum()
+            margen_general = (total_beneficio / total_facturacion * 100) if total_facturacion > 0 else 0
+            
+            with col1:
+                st.metric("💰 Facturación/Mes", f"{total_facturacion:,.2f}€")
+            with col2:
+                st.metric("💵 Beneficio/Mes", f"{total_beneficio:,.2f}€")
+            with col3:
+                st.metric("📊 Margen General", f"{margen_general:.1f}%")
+            
+            st.markdown("---")
+            
+            # Opciones del informe
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                incluir_grafico = st.checkbox(
+                    "📊 Incluir Gráfico BCG",
+                    value=False,
+                    help="Usa kaleido si está instalado; si no, matplotlib",
+                    key=f"incluir_grafico_{id_cliente}"
+                )
+            
+            with col2:
+                incluir_proyeccion = st.checkbox(
+                    "📈 Incluir Proyección Financiera",
+                    value=True,
+                    key=f"incluir_proyeccion_{id_cliente}"
+                )
+            
+            st.markdown("---")
+            
+            # Botón generar
+            if st.button("📄 Generar Informe PDF", type="primary", use_container_width=True, key=f"gen_pdf_menu_{id_cliente}"):
+                with st.spinner("Generando informe PDF..."):
+                    try:
+                        import pdf_generator
+                        
+                        # Generar gráfico si se requiere
+                        grafico_png = None
+                        if incluir_grafico:
+                            try:
+                                import graficos
+                                
+                                # PNG cacheado por contenido (kaleido o matplotlib)
+                                grafico_png = graficos.png_bcg(df_carta_cliente)
+                            except Exception as e:
+                                st.warning(f"⚠️ No se pudo generar el gráfico: {str(e)}")
+                        
+                        # Generar PDF en memoria (o recuperarlo de la caché)
+                        pdf_bytes, desde_cache = pdf_generator.pdf_ingenieria_menu(
+                            nombre_cliente,
+                            df_carta_cliente,
+                            grafico_png
+                        )
+                        
+                        # Botón de descarga
+                        st.success("✅ ¡Informe generado exitosamente!" + (" (desde caché)" if desde_cache else ""))
+                        
+                        st.download_button(
+                            label="⬇️ Descargar Informe PDF",
+                            data=pdf_bytes,
+                            file_name=f"Informe_Ingenieria_Menu_{nombre_cliente.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf",
+                            mime="application/pdf",
+                            use_container_width=True
+                        )
+                        
+                    except Exception as e:
+                        st.error(f"❌ Error al generar el informe: {str(e)}")
+                        st.write("**Detalles:**")
+                        st.write("- Verifica que `pdf_generator.py` esté en la carpeta del proyecto")
+                        st.write("- Instala: `pip install reportlab --break-system-packages`")
+                        st.write("- Para gráficos: `pip install kaleido --break-system-packages`")
+    
+    # ========================================================================
+    # REPORTE MENSUAL
+    # ========================================================================
+    
+    elif tipo_informe == "📊 Reporte Mensual":
+        st.subheader("📊 Reporte Mensual Automático")
+        
+        st.markdown("""
+        Este informe incluye:
+        - 📅 KPIs del mes seleccionado
+        - 🏆 Top 5 platos más vendidos
+        - ⚠️ Alertas y recomendaciones
+        - 🎯 Plan de acción para próximo mes
+        """)
+        
+        # Selector de mes
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            mes = st.selectbox(
+                "Mes",
+                list(range(1, 13)),
+                format_func=lambda x: [
+                    'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+                    'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'
+                ][x-1],
+                index=datetime.now().month - 1,
+                key=f"mes_reporte_{id_cliente}"
+            )
+        
+        with col2:
+            año = st.number_input(
+                "Año",
+                min_value=2020,
+                max_value=2030,
+                value=datetime.now().year,
+                key=f"año_reporte_{id_cliente}"
+            )
+        
+        st.markdown("---")
+        
+        # Botón generar
+        if st.button("📄 Generar Reporte Mensual", type="primary", use_container_width=True, key=f"gen_pdf_mensual_{id_cliente}"):
+            with st.spinner("Generando reporte mensual..."):
+                try:
+                    import pdf_generator
+                    
+                    # Preparar datos del mes
+                    df_carta = utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
+                    df_carta_cliente = df_carta[df_carta['ID Cliente'] == id_cliente].copy()
+                    
+                    if df_carta_cliente.empty:
+                        st.warning("⚠️ No hay datos suficientes para generar el reporte.")
+                    else:
+                        # Calcular datos del mes
+                        df_carta_cliente['Facturación'] = df_carta_cliente['Precio Venta'] * df_carta_cliente['Ventas/Mes']
+                        df_carta_cliente['Margen'] = df_carta_cliente['Precio Venta'] - df_carta_cliente['Coste Total']
+                        df_carta_cliente['Beneficio'] = df_carta_cliente['Margen'] * df_carta_cliente['Ventas/Mes']
+                        
+                        datos_mes = {
+                            'facturacion': df_carta_cliente['Facturación'].sum(),
+                            'beneficio': df_carta_cliente['Beneficio'].sum(),
+                            'clientes_activos': 1,
+                            'platos_vendidos': int(df_carta_cliente['Ventas/Mes'].sum()),
+                            'top_platos': df_carta_cliente.sort_values('Ventas/Mes', ascending=False),
+                            'alertas': [
+                                "Revisar precios de platos con margen <20%",
+                                "Actualizar costes de proveedores",
+                                "Realizar inventario quincenal"
+                            ]
+                        }
+                        
+                        meses = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+                                'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
+                        
+                        # Generar PDF en memoria (o recuperarlo de la caché)
+                        pdf_bytes, desde_cache = pdf_generator.pdf_reporte_mensual(
+                            nombre_cliente,
+                            mes,
+                            año,
+                            datos_mes,
+                            df_carta_cliente
+                        )
+                        
+                        # Botón de descarga
+                        st.success("✅ ¡Reporte generado exitosamente!" + (" (desde caché)" if desde_cache else ""))
+                        
+                        st.download_button(
+                            label="⬇️ Descargar Reporte Mensual",
+                            data=pdf_bytes,
+                            file_name=f"Reporte_Mensual_{meses[mes-1]}_{año}_{nombre_cliente.replace(' ', '_')}.pdf",
+                            mime="application/pdf",
+                            use_container_width=True
+                        )
+                        
+                except Exception as e:
+                    st.error(f"❌ Error al generar el reporte: {str(e)}")
+                    st.write("**Detalles:**")
+                    st.write("- Verifica que `pdf_generator.py` esté en la carpeta del proyecto")
+                    st.write("- Instala: `pip install reportlab --break-system-packages`")
+    
+    # ========================================================================
+    # ANÁLISIS COMPLETO
+    # ========================================================================
+    
+    elif tipo_informe == "📈 Análisis Completo":
+        st.subheader("📈 Análisis Completo")
+        
+        st.info("🚧 Próximamente: Informe completo que combina Ingeniería de Menú + Reporte Mensual + Análisis de Proveedores")
+        
+        st.markdown("""
+        **Incluirá:**
+        - 🎯 Análisis de Ingeniería de Menú
+        - 📊 KPIs mensuales y evolución
+        - 🏢 Análisis de proveedores
+        - 💰 Proyecciones financieras
+        - 📈 Gráficos de tendencias
+        """)
+
+# ============================================================================
+# MÓDULO: INFORMES
+# ============================================================================
+
+# ============================================================================
+# MÓDULO: INFORMES
+# ============================================================================
+
+def modulo_informes():
+    """Módulo independiente de generación de informes"""
+    st.markdown('<h1 class="main-header">📊 Generación de Informes</h1>', unsafe_allow_html=True)
+    
+    # Cargar clientes activos
+    df_clientes_todos = utils.leer_excel(config.ARCHIVO_CRM, "CLIENTES_ACTIVOS")
+    
+    # Filtrar solo activos
+    if 'Estado' in df_clientes_todos.columns:
+        df_clientes = df_clientes_todos[df_clientes_todos['Estado'] == 'Activo'].copy()
+    else:
+        df_clientes = df_clientes_todos.copy()
+    
+    if df_clientes.empty:
+        st.warning("⚠️ No hay clientes activos.")
+        st.info("Ve a CRM → Clientes Activos para gestionar clientes antes de generar informes.")
+        return
+    
+    # ========== SELECTOR DE CLIENTE ==========
+    st.markdown("### 👤 Selecciona el Cliente")
+    
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        opciones_clientes = [f"{row['ID']} - {row['Nombre Comercial']}" 
+                            for _, row in df_clientes.iterrows()]
+        
+        cliente_seleccionado = st.selectbox(
+            "Cliente para generar informe:",
+            opciones_clientes,
+            help="Selecciona el cliente para el cual quieres generar el informe"
+        )
+        
+        id_cliente = int(float(cliente_seleccionado.split(" - ")[0]))
+        nombre_cliente = cliente_seleccionado.split(" - ")[1]
+        cliente_info = df_clientes[df_clientes['ID'] == id_cliente].iloc[0]
+    
+    with col2:
+        st.metric("Tipo", cliente_info.get('Tipo Local', 'N/A'))
+    
+    st.markdown("---")
+    
+    # ========== TIPOS DE INFORMES ==========
+    st.subheader("📋 Tipos de Informes Disponibles")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("### 📊 Informe de Apertura")
+        st.caption("Análisis inicial de compras y presencia digital")
+        if st.button("Generar", key="btn_apertura", use_container_width=True, type="primary"):
+            st.session_state.tipo_informe = "apertura"
+            st.rerun()
+    
+    with col2:
+        st.markdown("### 📈 Informe de Seguimiento")
+        st.caption("Evolución y seguimiento mensual")
+        if st.button("Próximamente", key="btn_seguimiento", use_container_width=True, disabled=True):
+            pass
+    
+    with col3:
+        st.markdown("### 🎯 Informe Ejecutivo")
+        st.caption("Resumen ejecutivo para dirección")
+        if st.button("Próximamente", key="btn_ejecutivo", use_container_width=True, disabled=True):
+            pass
+    
+    st.markdown("---")
+    
+    # ========== GENERACIÓN DEL INFORME ==========
+    if st.session_state.get('tipo_informe') == "apertura":
+        generar_informe_apertura(id_cliente, nombre_cliente, cliente_info)
+
+    st.markdown("---")
+
+    # ========== INFORMES EN LOTE ==========
+    with st.expander(f"📦 Informes en Lote - {len(df_clientes)} clientes activos"):
+        import informes_lote
+
+        col1, col2, col3 = st.columns([2, 1, 1])
+
+        with col1:
+            tipo_lote = st.selectbox(
+                "Tipo de informe",
+                [informes_lote.TIPO_INGENIERIA, informes_lote.TIPO_MENSUAL],
+                format_func=lambda x: "🎯 Ingeniería de Menú" if x == informes_lote.TIPO_INGENIERIA else "📊 Reporte Mensual",
+                key="tipo_informe_lote"
+            )
+
+        with col2:
+            mes_lote = st.selectbox(
+                "Mes",
+                list(range(1, 13)),
+                format_func=lambda x: informes_lote.MESES[x-1],
+                index=datetime.now().month - 1,
+                key="mes_informe_lote"
+            )
+
+        with col3:
+            año_lote = st.number_input(
+                "Año",
+                min_value=2020,
+                max_value=2030,
+                value=datetime.now().year,
+                key="año_informe_lote"
+            )
+
+        if st.button("📦 Generar todos los informes", type="primary", use_container_width=True, key="btn_informes_lote"):
+            barra = st.progress(0.0, text="Preparando datos...")
+
+            def _actualizar_progreso(hechos, total, nombre):
+                barra.progress(hechos / total, text=f"[{hechos}/{total}] {nombre}")
+
+            zip_bytes, errores = informes_lote.generar_informes_lote(
+                tipo_lote, mes_lote, int(año_lote), progreso=_actualizar_progreso
+            )
+
+            for error in errores:
+                st.error(f"❌ {error}")
+
+            st.session_state.zip_informes_lote = zip_bytes
+
+        if st.session_state.get('zip_informes_lote'):
+            st.download_button(
+                label="⬇️ Descargar ZIP",
+                data=st.session_state.zip_informes_lote,
+                file_name=f"Informes_{tipo_lote}_{datetime.now().strftime('%Y%m%d')}.zip",
+                mime="application/zip",
+                use_container_width=True
+            )
+
+
+def mostrar_generador_informes():
+    """Función legacy - redirige al módulo de informes"""
+    st.info("ℹ️ La funcionalidad de informes se ha movido al módulo 📊 Informes en el menú principal.")
+    st.markdown("Por favor, usa el módulo **📊 Informes** del menú lateral para generar informes.")
+
+
+def generar_informe_apertura(id_cliente, nombre_cliente, cliente_info):
+    """Genera el informe de apertura para un cliente específico"""
+    st.header(f"📊 Informe de Apertura - {nombre_cliente}")
+    
+    st.success("✅ Cliente seleccionado correctamente")
+    
+    # Tabs del informe
+    tab1, tab2, tab3, tab4 = st.tabs([
+        "1️⃣ Datos Básicos",
+        "2️⃣ Análisis de Compras",
+        "3️⃣ Análisis Digital",
+        "4️⃣ Generar PDF"
+    ])
+    
+    with tab1:
+        st.subheader("📋 Datos del Cliente")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Información General**")
+            st.write(f"• Nombre Comercial: {cliente_info.get('Nombre Comercial', 'N/A')}")
+            st.write(f"• CIF: {cliente_info.get('CIF', 'N/A')}")
+            st.write(f"• Tipo de Local: {cliente_info.get('Tipo Local', 'N/A')}")
+            st.write(f"• Dirección: {cliente_info.get('Dirección', 'N/A')}")
+            st.write(f"• Ciudad: {cliente_info.get('Ciudad', 'N/A')}, {cliente_info.get('CP', 'N/A')}")
+        
+        with col2:
+            st.write("**Datos de Contacto**")
+            st.write(f"• Teléfono: {cliente_info.get('Teléfono', 'N/A')}")
+            st.write(f"• Email: {cliente_info.get('Email', 'N/A')}")
+            st.write(f"• Contacto: {cliente_info.get('Nombre Contacto', 'N/A')}")
+            
+            st.write("**Servicio**")
+            st.write(f"• Contratado: {cliente_info.get('Servicio Contratado', 'N/A')}")
+            st.write(f"• Precio Mensual: {cliente_info.get('Precio Mensual', 0):.2f}€")
+        
+        st.markdown("---")
+        
+        st.write("**📝 Datos Adicionales para el Informe**")
+        
+        telefono_comercial = st.text_input("Teléfono Comercial (Consultoría)", 
+            placeholder="ej: +34 600 000 000",
+            help="Tu teléfono de contacto que aparecerá en el informe",
+            key="tel_comercial_apertura")
+        
+        email_comercial = st.text_input("Email Comercial (Consultoría)", 
+            placeholder="ej: info@consultoria.com",
+            help="Tu email que aparecerá en el informe",
+            key="email_comercial_apertura")
+    
+    with tab2:
+        st.subheader("💰 Análisis de Compras y Proveedores")
+        st.info("📊 Aquí podrás analizar productos y detectar sobreprecios")
+        
+        st.write("**Funcionalidad:** Comparar precios del cliente vs. mercado")
+        st.caption("🚧 En desarrollo - Próximamente podrás:")
+        st.write("• Añadir productos que compra el cliente")
+        st.write("• Comparar con precios de mercado")
+        st.write("• Detectar sobreprecios automáticamente")
+        st.write("• Calcular ahorro potencial mensual/anual")
+    
+    with tab3:
+        st.subheader("🌐 Análisis de Presencia Digital")
+        st.info("📱 Análisis de Google My Business y redes sociales")
+        
+        st.write("**Funcionalidad:** Detectar problemas en presencia digital")
+        st.caption("🚧 En desarrollo - Próximamente podrás:")
+        st.write("• Subir capturas de Google My Business")
+        st.write("• Detectar problemas (fotos antiguas, reseñas sin responder)")
+        st.write("• Analizar competencia local")
+        st.write("• Estimar pérdidas por mala gestión digital")
+    
+    with tab4:
+        st.subheader("📄 Generar Informe PDF")
+        st.info("🎯 Genera el informe profesional en PDF")
+        
+        st.write("**Estado del informe:**")
+        st.write(f"✅ Datos del cliente: Completos")
+        st.write(f"⏳ Análisis de compras: Pendiente")
+        st.write(f"⏳ Análisis digital: Pendiente")
+        
+        st.markdown("---")
+        
+        if st.button("📄 GENERAR INFORME PDF (Preview)", type="primary", use_container_width=True, key="gen_pdf_apertura"):
+            st.success("✅ Generación de PDF implementada próximamente")
+            st.info("El informe incluirá:")
+            st.write("• Portada con datos del cliente")
+            st.write("• Análisis de sobreprecios en compras")
+            st.write("• Detección de problemas digitales")
+            st.write("• Recomendaciones y plan de acción")
+            st.write("• Estimación de ahorro mensual/anual")
+            st.balloons()
+    
+    # Botón para volver
+    st.markdown("---")
+    if st.button("◀️ Volver a Selección de Informes", key="volver_informes"):
+        if 'tipo_informe' in st.session_state:
+            del st.session_state.tipo_informe
+        st.rerun()
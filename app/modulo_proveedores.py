@@ -0,0 +1,353 @@
+"""
+MODULO_PROVEEDORES.PY - Proveedores
+Listado, alta y comparativa de proveedores
+"""
+
+import streamlit as st
+import time
+import config
+import utils
+
+# ============================================================================
+# MÓDULO: PROVEEDORES
+# ============================================================================
+
+def modulo_proveedores():
+    """Módulo de gestión de proveedores"""
+    st.markdown('<h1 class="main-header">🏢 Gestión de Proveedores</h1>', unsafe_allow_html=True)
+    
+    tab1, tab2, tab3 = st.tabs(["📋 Listado", "➕ Agregar/Editar", "📊 Comparativa"])
+    
+    with tab1:
+        mostrar_listado_proveedores()
+    
+    with tab2:
+        mostrar_formulario_proveedor()
+    
+    with tab3:
+        mostrar_comparativa_proveedores()
+
+def mostrar_listado_proveedores():
+    """Lista de todos los proveedores"""
+    st.subheader("📋 Proveedores Registrados")
+    
+    df_prov = utils.leer_excel(config.ARCHIVO_PROVEEDORES, "PROVEEDORES")
+    
+    if not df_prov.empty:
+        # Métricas rápidas
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            total = len(df_prov)
+            st.metric("Total Proveedores", total)
+        with col2:
+            activos = len(df_prov[df_prov['Activo'] == 'Sí']) if 'Activo' in df_prov.columns else 0
+            st.metric("Activos", activos)
+        with col3:
+            if 'Calidad (1-5)' in df_prov.columns:
+                media_calidad = df_prov['Calidad (1-5)'].mean()
+                st.metric("Calidad Media", f"{media_calidad:.1f}/5")
+        
+        st.markdown("---")
+        
+        # Filtros
+        col1, col2 = st.columns(2)
+        with col1:
+            filtro_tipo = st.multiselect(
+                "Filtrar por Tipo",
+                options=df_prov['Tipo'].unique() if 'Tipo' in df_prov.columns else [],
+                key="filtro_tipo_prov"
+            )
+        with col2:
+            filtro_activo = st.selectbox(
+                "Estado",
+                ["Todos", "Solo Activos", "Solo Inactivos"],
+                key="filtro_activo_prov"
+            )
+        
+        # Aplicar filtros
+        df_filtrado = df_prov.copy()
+        
+        if filtro_tipo:
+            df_filtrado = df_filtrado[df_filtrado['Tipo'].isin(filtro_tipo)]
+        
+        if filtro_activo == "Solo Activos":
+            df_filtrado = df_filtrado[df_filtrado['Activo'] == 'Sí']
+        elif filtro_activo == "Solo Inactivos":
+            df_filtrado = df_filtrado[df_filtrado['Activo'] == 'No']
+        
+        # Mostrar tabla
+        st.dataframe(df_filtrado, use_container_width=True, hide_index=True)
+        st.caption(f"Mostrando {len(df_filtrado)} de {len(df_prov)} proveedores")
+    else:
+        st.info("📝 No hay proveedores registrados. Ve al tab 'Agregar/Editar' para crear el primero.")
+
+def mostrar_formulario_proveedor():
+    """Formulario para agregar/editar proveedores"""
+    st.subheader("➕ Agregar Nuevo Proveedor")
+    
+    df_prov = utils.leer_excel(config.ARCHIVO_PROVEEDORES, "PROVEEDORES")
+    
+    # Selector: Nuevo o Editar existente
+    modo = st.radio(
+        "Modo",
+        ["Crear Nuevo", "Editar Existente"],
+        horizontal=True,
+        key="modo_proveedor"
+    )
+    
+    if modo == "Editar Existente":
+        if df_prov.empty:
+            st.warning("No hay proveedores para editar. Cambia a 'Crear Nuevo'.")
+            return
+        
+        opciones_prov = [f"{row['ID Proveedor']} - {row['Nombre Comercial']}" 
+                        for _, row in df_prov.iterrows()]
+        prov_seleccionado = st.selectbox(
+            "Selecciona Proveedor a Editar",
+            opciones_prov,
+            key="prov_editar_select"
+        )
+        
+        id_prov_editar = int(float(prov_seleccionado.split(" - ")[0]))
+        datos_existentes = df_prov[df_prov['ID Proveedor'] == id_prov_editar].iloc[0].to_dict()
+    else:
+        datos_existentes = {}
+    
+    st.markdown("---")
+    
+    # Formulario
+    with st.form("form_proveedor"):
+        st.write("### Datos del Proveedor")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            nombre = st.text_input(
+                "Nombre Comercial*",
+                value=datos_existentes.get('Nombre Comercial', ''),
+                placeholder="Ej: Distribuciones Alimentarias SA",
+                key="nombre_prov_form"
+            )
+            
+            cif = st.text_input(
+                "CIF*",
+                value=datos_existentes.get('CIF', ''),
+                placeholder="Ej: A12345678",
+                key="cif_prov_form"
+            )
+            
+            tipo = st.selectbox(
+                "Tipo*",
+                config.TIPOS_PROVEEDOR,
+                index=config.TIPOS_PROVEEDOR.index(datos_existentes.get('Tipo', config.TIPOS_PROVEEDOR[0])) if datos_existentes.get('Tipo') in config.TIPOS_PROVEEDOR else 0,
+                key="tipo_prov_form"
+            )
+            
+            especialidad = st.text_input(
+                "Especialidad",
+                value=datos_existentes.get('Especialidad', ''),
+                placeholder="Ej: Carnes, Pescados, General",
+                key="espec_prov_form"
+            )
+        
+        with col2:
+            telefono = st.text_input(
+                "Teléfono",
+                value=datos_existentes.get('Teléfono', ''),
+                placeholder="948123456",
+                key="tel_prov_form"
+            )
+            
+            email = st.text_input(
+                "Email",
+                value=datos_existentes.get('Email', ''),
+                placeholder="info@proveedor.com",
+                key="email_prov_form"
+            )
+            
+            contacto = st.text_input(
+                "Persona de Contacto",
+                value=datos_existentes.get('Contacto', ''),
+                placeholder="Nombre Apellidos",
+                key="contacto_prov_form"
+            )
+            
+            activo = st.selectbox(
+                "Estado",
+                ["Sí", "No"],
+                index=0 if datos_existentes.get('Activo', 'Sí') == 'Sí' else 1,
+                key="activo_prov_form"
+            )
+        
+        st.markdown("### Condiciones Comerciales")
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            condiciones_pago = st.text_input(
+                "Condiciones de Pago",
+                value=datos_existentes.get('Condiciones Pago', ''),
+                placeholder="Ej: 30 días",
+                key="pago_prov_form"
+            )
+            
+            pedido_min = st.number_input(
+                "Pedido Mínimo (€)",
+                min_value=0.0,
+                value=float(datos_existentes.get('Pedido Mínimo', 0)),
+                step=10.0,
+                key="pedmin_prov_form"
+            )
+        
+        with col2:
+            envio_gratis = st.selectbox(
+                "Envío Gratis",
+                ["Sí", "No"],
+                index=0 if datos_existentes.get('Envío Gratis', 'No') == 'Sí' else 1,
+                key="envio_prov_form"
+            )
+            
+            coste_envio = st.number_input(
+                "Coste Envío (€)",
+                min_value=0.0,
+                value=float(datos_existentes.get('Coste Envío', 0)),
+                step=5.0,
+                key="cenvio_prov_form"
+            )
+        
+        with col3:
+            dias_entrega = st.text_input(
+                "Días de Entrega",
+                value=datos_existentes.get('Días Entrega', ''),
+                placeholder="Ej: L,X,V",
+                key="dias_prov_form"
+            )
+        
+        st.markdown("### Valoración")
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            calidad = st.slider(
+                "Calidad (1-5)",
+                1.0, 5.0,
+                float(datos_existentes.get('Calidad (1-5)', 3.0)),
+                0.5,
+                key="cal_prov_form"
+            )
+        
+        with col2:
+            servicio = st.slider(
+                "Servicio (1-5)",
+                1.0, 5.0,
+                float(datos_existentes.get('Servicio (1-5)', 3.0)),
+                0.5,
+                key="serv_prov_form"
+            )
+        
+        with col3:
+            precio = st.slider(
+                "Precio (1-5)",
+                1.0, 5.0,
+                float(datos_existentes.get('Precio (1-5)', 3.0)),
+                0.5,
+                key="prec_prov_form"
+            )
+        
+        notas = st.text_area(
+            "Notas",
+            value=datos_existentes.get('Notas', ''),
+            placeholder="Información adicional sobre el proveedor",
+            key="notas_prov_form"
+        )
+        
+        # Botones
+        col1, col2 = st.columns(2)
+        with col1:
+            submitted = st.form_submit_button(
+                "💾 Guardar Proveedor" if modo == "Crear Nuevo" else "💾 Actualizar Proveedor",
+                use_container_width=True,
+                type="primary"
+            )
+        with col2:
+            cancelar = st.form_submit_button("❌ Cancelar", use_container_width=True)
+        
+        if submitted:
+            # Validaciones
+            if not nombre or not cif or not tipo:
+                st.error("❌ Rellena todos los campos obligatorios (*)")
+            else:
+                if modo == "Crear Nuevo":
+                    # Verificar que no exista CIF duplicado
+                    if not df_prov.empty and cif in df_prov['CIF'].values:
+                        st.error(f"❌ Ya existe un proveedor con el CIF {cif}")
+                    else:
+                        nuevo_id = utils.obtener_siguiente_id(config.ARCHIVO_PROVEEDORES, "PROVEEDORES")
+                        
+                        nuevo_proveedor = {
+                            'ID Proveedor': nuevo_id,
+                            'Nombre Comercial': nombre,
+                            'CIF': cif,
+                            'Tipo': tipo,
+                            'Especialidad': especialidad,
+                            'Teléfono': telefono,
+                            'Email': email,
+                            'Contacto': contacto,
+                            'Condiciones Pago': condiciones_pago,
+                            'Pedido Mínimo': pedido_min,
+                            'Envío Gratis': envio_gratis,
+                            'Coste Envío': coste_envio,
+                            'Días Entrega': dias_entrega,
+                            'Calidad (1-5)': calidad,
+                            'Servicio (1-5)': servicio,
+                            'Precio (1-5)': precio,
+                            'Activo': activo,
+                            'Notas': notas
+                        }
+                        
+                        if utils.agregar_fila(config.ARCHIVO_PROVEEDORES, "PROVEEDORES", nuevo_proveedor):
+                            st.success(f"✅ Proveedor '{nombre}' creado con ID {nuevo_id}")
+                            # Limpiar caché para que se actualice
+                            st.cache_data.clear()
+                            time.sleep(1)
+                            st.rerun()
+                else:
+                    # Modo editar
+                    df_actualizado = df_prov.copy()
+                    mascara = df_actualizado['ID Proveedor'] == id_prov_editar
+                    
+                    df_actualizado.loc[mascara, 'Nombre Comercial'] = nombre
+                    df_actualizado.loc[mascara, 'CIF'] = cif
+                    df_actualizado.loc[mascara, 'Tipo'] = tipo
+                    df_actualizado.loc[mascara, 'Especialidad'] = especialidad
+                    df_actualizado.loc[mascara, 'Teléfono'] = telefono
+                    df_actualizado.loc[mascara, 'Email'] = email
+                    df_actualizado.loc[mascara, 'Contacto'] = contacto
+                    df_actualizado.loc[mascara, 'Condiciones Pago'] = condiciones_pago
+                    df_actualizado.loc[mascara, 'Pedido Mínimo'] = pedido_min
+                    df_actualizado.loc[mascara, 'Envío Gratis'] = envio_gratis
+                    df_actualizado.loc[mascara, 'Coste Envío'] = coste_envio
+                    df_actualizado.loc[mascara, 'Días Entrega'] = dias_entrega
+                    df_actualizado.loc[mascara, 'Calidad (1-5)'] = calidad
+                    df_actualizado.loc[mascara, 'Servicio (1-5)'] = servicio
+                    df_actualizado.loc[mascara, 'Precio (1-5)'] = precio
+                    df_actualizado.loc[mascara, 'Activo'] = activo
+                    df_actualizado.loc[mascara, 'Notas'] = notas
+                    
+                    if utils.escribir_excel(config.ARCHIVO_PROVEEDORES, "PROVEEDORES", df_actualizado):
+                        st.success(f"✅ Proveedor '{nombre}' actualizado")
+                        # Limpiar caché
+                        st.cache_data.clear()
+                        time.sleep(1)
+                        st.rerun()
+
+def mostrar_comparativa_proveedores():
+    """Comparativa de precios entre proveedores"""
+    st.subheader("📊 Comparativa de Precios por Ingrediente")
+    st.info("🚧 Funcionalidad en desarrollo")
+    
+    st.write("**Próximamente podrás:**")
+    st.write("• Ver qué proveedores tienen cada ingrediente")
+    st.write("• Comparar precios entre proveedores")
+    st.write("• Identificar el mejor precio por ingrediente")
+    st.write("• Calcular ahorro potencial al cambiar de proveedor")
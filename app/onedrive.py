@@ -87,8 +87,13 @@ def _url_contenido(ruta_remota: str) -> str:
 
 
 def descargar_archivo(ruta_remota: str) -> bytes:
+    import utils
+
+    inicio = time.perf_counter()
     url = _url_contenido(ruta_remota)
     resp = requests.get(url, headers=_headers(), timeout=60)
+    utils.registrar_medicion("onedrive.descargar_archivo", ruta_remota, segundos=time.perf_counter() - inicio,
+                             bytes_leidos=len(resp.content) if resp.ok else 0, correcto=resp.ok)
     if resp.status_code == 404:
         raise FileNotFoundError(f"Archivo no encontrado en OneDrive: {ruta_remota}")
     if not resp.ok:
@@ -97,7 +102,29 @@ def descargar_archivo(ruta_remota: str) -> bytes:
 
 
 def subir_archivo(ruta_remota: str, contenido: bytes) -> None:
+    import utils
+
+    inicio = time.perf_counter()
     url = _url_contenido(ruta_remota)
     resp = requests.put(url, headers=_headers(), data=contenido, timeout=120)
+    utils.registrar_medicion("onedrive.subir_archivo", ruta_remota, segundos=time.perf_counter() - inicio,
+                             bytes_escritos=len(contenido) if resp.ok else 0, correcto=resp.ok)
     if not resp.ok:
         raise RuntimeError(f"Error al subir {ruta_remota}: {resp.status_code} {resp.text}")
+
+
+def listar_archivos(ruta_carpeta: str) -> list:
+    """Nombres de los archivos de una carpeta (lista vacía si no existe)"""
+    ruta = ruta_carpeta.strip("/")
+    url = f"https://graph.microsoft.com/v1.0/me/drive/root:/{ruta}:/children?$select=name,file&$top=999"
+    nombres = []
+    while url:
+        resp = requests.get(url, headers=_headers(), timeout=60)
+        if resp.status_code == 404:
+            return []
+        if not resp.ok:
+            raise RuntimeError(f"Error al listar {ruta_carpeta}: {resp.status_code} {resp.text}")
+        datos = resp.json()
+        nombres.extend(item["name"] for item in datos.get("value", []) if "file" in item)
+        url = datos.get("@odata.nextLink")
+    return nombres
@@ -0,0 +1,271 @@
+"""
+OPTIMIZADOR_PEDIDOS.PY - Reparto de la cesta de compra entre proveedores
+Asigna cada línea del pedido inteligente al proveedor que minimiza el
+coste total (producto + envío) respetando pedidos mínimos
+"""
+
+import numpy as np
+import pandas as pd
+import config
+import utils
+
+# ============================================================================
+# PARÁMETROS
+# ============================================================================
+
+# Penalización por cada € que falte para el pedido mínimo de un proveedor
+PENALIZACION_MINIMO = 1000.0
+
+MAX_ITERACIONES = 2000
+
+SIN_PROVEEDOR = "Sin proveedor"
+
+# ============================================================================
+# CARGA DE DATOS
+# ============================================================================
+
+def cargar_ofertas(id_cliente):
+    """
+    Ofertas (ingrediente, proveedor, precio) disponibles para un cliente
+
+    Se usa el precio pactado del cliente cuando existe; para el resto de
+    proveedores se toma la mediana de lo que pagan los demás clientes.
+
+    Returns:
+        DataFrame con 'ID Ingrediente', 'ID Proveedor', 'Precio', 'Precio Propio'
+    """
+    df_precios = utils.leer_excel(config.ARCHIVO_OPERACIONES, "PRECIOS_POR_CLIENTE")
+
+    columnas = ['ID Ingrediente', 'ID Proveedor', 'Precio', 'Precio Propio']
+    if df_precios.empty or not {'ID Ingrediente', 'ID Proveedor', 'Precio Cliente'} <= set(df_precios.columns):
+        return pd.DataFrame(columns=columnas)
+
+    df = df_precios[['ID Cliente', 'ID Ingrediente', 'ID Proveedor', 'Precio Cliente']].copy()
+    df['Precio Cliente'] = pd.to_numeric(df['Precio Cliente'], errors='coerce')
+    df = df.dropna(subset=['ID Ingrediente', 'ID Proveedor', 'Precio Cliente'])
+    df = df[df['Precio Cliente'] > 0]
+
+    propios = df[df['ID Cliente'] == id_cliente].groupby(
+        ['ID Ingrediente', 'ID Proveedor'])['Precio Cliente'].min()
+    mercado = df.groupby(['ID Ingrediente', 'ID Proveedor'])['Precio Cliente'].median()
+
+    ofertas = mercado.to_frame('Precio')
+    ofertas['Precio Propio'] = ofertas.index.isin(propios.index)
+    ofertas.loc[propios.index, 'Precio'] = propios
+
+    return ofertas.reset_index()[columnas]
+
+
+def cargar_proveedores():
+    """PROVEEDORES activos con sus condiciones comerciales normalizadas"""
+    df_prov = utils.leer_excel(config.ARCHIVO_PROVEEDORES, "PROVEEDORES")
+
+    if df_prov.empty:
+        return pd.DataFrame(columns=['ID Proveedor', 'Nombre Comercial', 'Pedido Mínimo',
+                                     'Envío Gratis', 'Coste Envío', 'Días Entrega'])
+
+    if 'Activo' in df_prov.columns:
+        df_prov = df_prov[df_prov['Activo'] == 'Sí']
+
+    return df_prov
+
+# ============================================================================
+# CONDICIONES DE PROVEEDOR
+# ============================================================================
+
+def _condiciones(df_proveedores, ids_proveedor):
+    """
+    Arrays (pedido_minimo, umbral_envio_gratis, coste_envio) alineados con ids_proveedor
+
+    'Envío Gratis' admite 'Sí'/'No' o un importe a partir del cual
+    el envío es gratis.
+    """
+    df = df_proveedores.drop_duplicates('ID Proveedor').set_index('ID Proveedor').reindex(ids_proveedor)
+
+    pedido_minimo = pd.to_numeric(df.get('Pedido Mínimo'), errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    coste_envio = pd.to_numeric(df.get('Coste Envío'), errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+    envio = df.get('Envío Gratis', pd.Series(index=df.index, dtype=object))
+    umbral = pd.to_numeric(envio, errors='coerce')
+    umbral = umbral.where(envio.astype(str).str.strip() != 'Sí', 0.0)
+    umbral = umbral.fillna(np.inf).to_numpy(dtype=np.float64)
+
+    return pedido_minimo, umbral, coste_envio
+
+
+def _coste_proveedor(totales, lineas, pedido_minimo, umbral, coste_envio):
+    """Envío + penalización por pedido mínimo de cada proveedor (vectorizado)"""
+    abierto = lineas > 0
+    envio = np.where(abierto & (totales < umbral), coste_envio, 0.0)
+    falta = np.where(abierto, np.maximum(pedido_minimo - totales, 0.0), 0.0)
+    return envio + falta * PENALIZACION_MINIMO
+
+# ============================================================================
+# OPTIMIZACIÓN
+# ============================================================================
+
+def optimizar_asignacion(costes, pedido_minimo, umbral, coste_envio, max_iter=MAX_ITERACIONES):
+    """
+    Heurística de búsqueda local sobre la matriz de costes líneas × proveedores
+
+    1. Cada línea va a su proveedor más barato.
+    2. Se repite el mejor movimiento que reduzca el coste total:
+       - mover una línea a otro proveedor (todas las parejas evaluadas
+         a la vez con NumPy), o
+       - cerrar un proveedor repartiendo sus líneas entre los demás.
+
+    Args:
+        costes: Array (n_lineas, n_proveedores) con cantidad × precio (inf = no disponible)
+        pedido_minimo, umbral, coste_envio: Arrays (n_proveedores,)
+
+    Returns:
+        Array (n_lineas,) con el índice de proveedor asignado
+    """
+    n_lineas, n_prov = costes.shape
+    asignacion = costes.argmin(axis=1)
+    filas = np.arange(n_lineas)
+
+    def _estado(asig):
+        totales = np.bincount(asig, weights=costes[filas, asig], minlength=n_prov)
+        lineas = np.bincount(asig, minlength=n_prov)
+        return totales, lineas
+
+    def _total(asig):
+        totales, lineas = _estado(asig)
+        return totales.sum() + _coste_proveedor(totales, lineas, pedido_minimo, umbral, coste_envio).sum()
+
+    totales, lineas = _estado(asignacion)
+    coste_actual = _total(asignacion)
+
+    for _ in range(max_iter):
+        extra = _coste_proveedor(totales, lineas, pedido_minimo, umbral, coste_envio)
+
+        # --- Movimiento de una línea: delta para todas las (línea, destino) ---
+        coste_origen = costes[filas, asignacion]
+        tot_origen = totales[asignacion] - coste_origen
+        extra_origen = _coste_proveedor(
+            tot_origen, lineas[asignacion] - 1,
+            pedido_minimo[asignacion], umbral[asignacion], coste_envio[asignacion]
+        ) - extra[asignacion]
+
+        with np.errstate(invalid='ignore'):
+            extra_destino = _coste_proveedor(
+                totales[None, :] + costes, (lineas + 1)[None, :],
+                pedido_minimo[None, :], umbral[None, :], coste_envio[None, :]
+            ) - extra[None, :]
+            delta = (costes - coste_origen[:, None]) + extra_origen[:, None] + extra_destino
+        delta[filas, asignacion] = np.inf
+        delta[~np.isfinite(costes)] = np.inf
+
+        idx = np.argmin(delta)
+        mejor_delta = delta.flat[idx]
+        mejor_asignacion = None
+        if mejor_delta < -1e-9:
+            linea, destino = divmod(idx, n_prov)
+            mejor_asignacion = asignacion.copy()
+            mejor_asignacion[linea] = destino
+
+        # --- Cierre de proveedor: sus líneas a la mejor alternativa ---
+        for prov in np.flatnonzero(lineas):
+            mask = asignacion == prov
+            alternativas = costes[mask].copy()
+            alternativas[:, prov] = np.inf
+            if not np.isfinite(alternativas.min(axis=1)).all():
+                continue
+            candidata = asignacion.copy()
+            candidata[mask] = alternativas.argmin(axis=1)
+            delta_cierre = _total(candidata) - coste_actual
+            if delta_cierre < -1e-9 and (mejor_asignacion is None or delta_cierre < mejor_delta):
+                mejor_delta = delta_cierre
+                mejor_asignacion = candidata
+
+        if mejor_asignacion is None:
+            break
+
+        asignacion = mejor_asignacion
+        totales, lineas = _estado(asignacion)
+        coste_actual = _total(asignacion)
+
+    return asignacion
+
+
+def optimizar_cesta(df_pedido, df_ofertas, df_proveedores):
+    """
+    Reparte el pedido sugerido entre proveedores minimizando el coste total
+
+    Args:
+        df_pedido: Líneas con 'ID Ingrediente', 'Nombre Ingrediente',
+                   'Pedido Sugerido', 'Unidad' y 'Precio Unitario'
+        df_ofertas: Resultado de cargar_ofertas()
+        df_proveedores: Resultado de cargar_proveedores()
+
+    Returns:
+        Dict con:
+          'lineas': DataFrame del pedido con 'ID Proveedor', 'Proveedor',
+                    'Precio' y 'Coste' asignados
+          'proveedores': DataFrame resumen por proveedor (subtotal, envío,
+                         total, pedido mínimo cumplido, días de entrega)
+    """
+    df_lineas = df_pedido[df_pedido['Pedido Sugerido'] > 0].reset_index(drop=True).copy()
+
+    ofertas = df_ofertas[df_ofertas['ID Proveedor'].isin(df_proveedores['ID Proveedor'])]
+    ofertas = ofertas[ofertas['ID Ingrediente'].isin(df_lineas['ID Ingrediente'])]
+    ids_proveedor = np.sort(ofertas['ID Proveedor'].unique())
+
+    # Matriz de precios ingrediente × proveedor → costes línea × proveedor
+    matriz = ofertas.pivot_table(index='ID Ingrediente', columns='ID Proveedor',
+                                 values='Precio', aggfunc='min').reindex(columns=ids_proveedor)
+    precios = matriz.reindex(df_lineas['ID Ingrediente']).to_numpy(dtype=np.float64)
+    cantidades = pd.to_numeric(df_lineas['Pedido Sugerido'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    costes = np.where(np.isnan(precios), np.inf, precios * cantidades[:, None]) if len(ids_proveedor) else np.empty((len(df_lineas), 0))
+
+    con_oferta = np.isfinite(costes).any(axis=1) if costes.size else np.zeros(len(df_lineas), dtype=bool)
+    pedido_minimo, umbral, coste_envio = _condiciones(df_proveedores, ids_proveedor)
+
+    df_lineas['ID Proveedor'] = None
+    df_lineas['Precio'] = pd.to_numeric(df_lineas.get('Precio Unitario'), errors='coerce').fillna(0).astype(float)
+
+    if con_oferta.any():
+        asignacion = optimizar_asignacion(costes[con_oferta], pedido_minimo, umbral, coste_envio)
+        idx_lineas = np.flatnonzero(con_oferta)
+        df_lineas.loc[idx_lineas, 'ID Proveedor'] = ids_proveedor[asignacion]
+        df_lineas.loc[idx_lineas, 'Precio'] = precios[idx_lineas, asignacion]
+
+    df_lineas['Coste'] = (df_lineas['Precio'] * cantidades).round(2)
+
+    nombres = df_proveedores.drop_duplicates('ID Proveedor').set_index('ID Proveedor')
+    df_lineas['Proveedor'] = df_lineas['ID Proveedor'].map(nombres['Nombre Comercial']).fillna(SIN_PROVEEDOR)
+
+    # Resumen por proveedor
+    df_resumen = df_lineas.groupby('Proveedor', sort=False).agg(
+        **{
+            'ID Proveedor': ('ID Proveedor', 'first'),
+            'Líneas': ('Coste', 'size'),
+            'Subtotal': ('Coste', 'sum'),
+        }
+    ).reset_index()
+
+    pos = pd.Index(ids_proveedor).get_indexer(df_resumen['ID Proveedor'])
+    valido = pos >= 0
+    subtotal = df_resumen['Subtotal'].to_numpy(dtype=np.float64)
+    if len(ids_proveedor):
+        # Las posiciones -1 (sin proveedor) se leen en 0 y se descartan con 'valido'
+        pos_segura = np.where(valido, pos, 0)
+        minimo = np.where(valido, pedido_minimo[pos_segura], 0.0)
+        envio = np.where(valido & (subtotal < umbral[pos_segura]), coste_envio[pos_segura], 0.0)
+    else:
+        minimo = np.zeros(len(df_resumen))
+        envio = np.zeros(len(df_resumen))
+
+    df_resumen['Envío'] = envio
+    df_resumen['Total'] = (subtotal + envio).round(2)
+    df_resumen['Pedido Mínimo'] = minimo
+    df_resumen['Cumple Mínimo'] = np.where(subtotal >= minimo, 'Sí', 'No')
+    df_resumen['Días Entrega'] = df_resumen['ID Proveedor'].map(
+        nombres['Días Entrega'] if 'Días Entrega' in nombres.columns else {}
+    ).fillna('')
+
+    return {
+        'lineas': df_lineas,
+        'proveedores': df_resumen.sort_values('Total', ascending=False).reset_index(drop=True),
+    }
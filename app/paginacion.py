@@ -0,0 +1,169 @@
+"""
+PAGINACION.PY - Listados paginados
+Filtro, orden y corte por páginas hechos sobre el DataFrame antes de pintar:
+las pantallas solo crean los widgets de la página visible
+"""
+
+import math
+
+import pandas as pd
+import streamlit as st
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+TAMANOS_PAGINA = [10, 25, 50, 100]
+TAMANO_PAGINA = 25
+
+SIN_ORDEN = "Orden original"
+ASCENDENTE = "↑"
+DESCENDENTE = "↓"
+
+# ============================================================================
+# OPERACIONES SOBRE EL DATAFRAME
+# ============================================================================
+
+def filtrar(df, texto, columnas):
+    """
+    Filas en las que alguna de 'columnas' contiene 'texto' (sin distinguir
+    mayúsculas). Texto vacío devuelve df sin tocar.
+    """
+    texto = (texto or "").strip()
+    columnas = [col for col in (columnas or []) if col in df.columns]
+    if not texto or not columnas or df.empty:
+        return df
+
+    mascara = pd.Series(False, index=df.index)
+    for col in columnas:
+        mascara |= df[col].astype(str).str.contains(texto, case=False, regex=False, na=False)
+    return df[mascara]
+
+
+def ordenar(df, columna, descendente=False):
+    """Orden estable por 'columna' (vacíos al final); columnas mixtas como texto"""
+    if not columna or columna not in df.columns or df.empty:
+        return df
+    try:
+        return df.sort_values(columna, ascending=not descendente, kind="stable", na_position="last")
+    except TypeError:
+        return df.sort_values(columna, ascending=not descendente, kind="stable", na_position="last",
+                              key=lambda serie: serie.astype(str).str.lower())
+
+
+def rebanar(df, pagina, tamano):
+    """
+    Corte de una página
+
+    Args:
+        df: DataFrame ya filtrado y ordenado
+        pagina: número de página (desde 1; se ajusta al rango válido)
+        tamano: filas por página
+
+    Returns:
+        (df_pagina, inicio, fin, total_paginas) con inicio/fin posicionales
+    """
+    total_paginas = max(1, math.ceil(len(df) / tamano))
+    pagina = min(max(1, int(pagina)), total_paginas)
+    inicio = (pagina - 1) * tamano
+    fin = min(inicio + tamano, len(df))
+    return df.iloc[inicio:fin], inicio, fin, total_paginas
+
+# ============================================================================
+# COMPONENTE
+# ============================================================================
+
+def paginar(df, clave, columnas_filtro=None, columnas_orden=None, tamano_pagina=TAMANO_PAGINA,
+            etiqueta="registros"):
+    """
+    Controles de filtro / orden / página y la página visible de 'df'
+
+    El estado (texto, orden, tamaño y página) vive en st.session_state con el
+    prefijo 'clave'; al cambiar filtro, orden o tamaño se vuelve a la página 1.
+
+    Args:
+        df: listado completo
+        clave: prefijo único de los widgets (p. ej. f"carta_{id_cliente}")
+        columnas_filtro: columnas donde busca el filtro de texto (None = sin filtro)
+        columnas_orden: columnas ofrecidas para ordenar (None = sin selector)
+        tamano_pagina: filas por página iniciales
+        etiqueta: nombre de los elementos para el contador ("platos", "leads"...)
+
+    Returns:
+        DataFrame con las filas de la página (índice original conservado)
+    """
+    if df is None or df.empty:
+        return df if df is not None else pd.DataFrame()
+
+    columnas_filtro = [col for col in (columnas_filtro or []) if col in df.columns]
+    columnas_orden = [col for col in (columnas_orden or []) if col in df.columns]
+
+    clave_pagina = f"{clave}_pagina"
+    clave_firma = f"{clave}_firma"
+    clave_tamano = f"{clave}_tamano"
+
+    if clave_tamano not in st.session_state:
+        st.session_state[clave_tamano] = tamano_pagina if tamano_pagina in TAMANOS_PAGINA else TAMANO_PAGINA
+
+    # ---- Filtro y orden ----
+    texto = ""
+    orden = SIN_ORDEN
+    if columnas_filtro or columnas_orden:
+        col_filtro, col_orden = st.columns([3, 2])
+        if columnas_filtro:
+            with col_filtro:
+                texto = st.text_input(
+                    "🔎 Filtrar",
+                    key=f"{clave}_filtro",
+                    placeholder=", ".join(columnas_filtro),
+                    label_visibility="collapsed"
+                )
+        if columnas_orden:
+            opciones = [SIN_ORDEN] + [f"{col} {sentido}" for col in columnas_orden for sentido in (ASCENDENTE, DESCENDENTE)]
+            with col_orden:
+                orden = st.selectbox("Ordenar por", opciones, key=f"{clave}_orden", label_visibility="collapsed")
+
+    df_vista = filtrar(df, texto, columnas_filtro)
+    if orden != SIN_ORDEN:
+        columna, sentido = orden.rsplit(" ", 1)
+        df_vista = ordenar(df_vista, columna, descendente=(sentido == DESCENDENTE))
+
+    # ---- Página (vuelve a la 1 si cambia filtro, orden o tamaño) ----
+    tamano = st.session_state[clave_tamano]
+    total_paginas = max(1, math.ceil(len(df_vista) / tamano))
+    firma = (texto.strip().lower(), orden, tamano)
+    if st.session_state.get(clave_firma) != firma:
+        st.session_state[clave_firma] = firma
+        st.session_state[clave_pagina] = 1
+    elif st.session_state.get(clave_pagina, 1) > total_paginas:
+        # Tras borrar filas la página guardada puede quedar fuera de rango
+        st.session_state[clave_pagina] = total_paginas
+
+    df_pagina, inicio, fin, total_paginas = rebanar(df_vista, st.session_state.get(clave_pagina, 1), tamano)
+
+    # ---- Navegación ----
+    col_info, col_pagina, col_tamano = st.columns([3, 1, 1])
+    with col_info:
+        if df_vista.empty:
+            st.caption(f"Ningún elemento coincide con el filtro ({len(df)} {etiqueta} en total)")
+        elif len(df_vista) < len(df):
+            st.caption(f"Mostrando {inicio + 1}–{fin} de {len(df_vista)} {etiqueta} (filtrados de {len(df)})")
+        else:
+            st.caption(f"Mostrando {inicio + 1}–{fin} de {len(df_vista)} {etiqueta}")
+    with col_pagina:
+        if total_paginas > 1:
+            st.number_input(
+                f"Página (de {total_paginas})",
+                min_value=1,
+                max_value=total_paginas,
+                step=1,
+                key=clave_pagina,
+                label_visibility="collapsed",
+                help=f"{total_paginas} páginas"
+            )
+    with col_tamano:
+        if len(df_vista) > TAMANOS_PAGINA[0]:
+            st.selectbox("Por página", TAMANOS_PAGINA, key=clave_tamano, label_visibility="collapsed",
+                         format_func=lambda n: f"{n} / página")
+
+    return df_pagina
@@ -14,6 +14,10 @@ from reportlab.platypus import (
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT, TA_JUSTIFY
 from reportlab.pdfgen import canvas as pdf_canvas
 from datetime import datetime
+from io import BytesIO
+import hashlib
+import os
+import tempfile
 import pandas as pd
 
 # Para gráficos de barras
@@ -21,6 +25,16 @@ from reportlab.graphics.shapes import Drawing
 from reportlab.graphics.charts.barcharts import HorizontalBarChart
 from reportlab.graphics import renderPDF
 
+# ============================================================================
+# CONFIGURACIÓN DE CACHÉ
+# ============================================================================
+
+# Cambiar al modificar el diseño de los informes (invalida la caché)
+VERSION_PLANTILLA = "2"
+
+CARPETA_CACHE = os.path.join(tempfile.gettempdir(), "kazo_pdf_cache")
+CACHE_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+
 # ============================================================================
 # ESTILOS PERSONALIZADOS
 # ============================================================================
@@ -65,16 +79,22 @@ def get_custom_styles():
 # ============================================================================
 
 class KazoPDFGenerator:
-    """Clase base para generar PDFs profesionales de KAZO"""
+    """
+    Clase base para generar PDFs profesionales de KAZO
+    
+    Si filename es None el PDF se renderiza en memoria (BytesIO)
+    y build() devuelve los bytes.
+    """
     
     def __init__(self, filename, cliente_nombre, title="Informe KAZO"):
         self.filename = filename
         self.cliente_nombre = cliente_nombre
         self.title = title
         self.styles = get_custom_styles()
+        self.buffer = BytesIO() if filename is None else None
         
         self.doc = SimpleDocTemplate(
-            filename,
+            filename if filename is not None else self.buffer,
             pagesize=A4,
             rightMargin=2*cm,
             leftMargin=2*cm,
@@ -262,16 +282,24 @@ class KazoPDFGenerator:
         canvas.restoreState()
     
     def build(self):
-        """Construye el PDF"""
+        """Construye el PDF. Devuelve los bytes si se renderiza en memoria"""
         self.doc.build(self.story, onFirstPage=self.add_footer_page, 
                       onLaterPages=self.add_footer_page)
+        if self.buffer is not None:
+            return self.buffer.getvalue()
+        return self.filename
 
 # ============================================================================
 # INFORME DE INGENIERÍA DE MENÚ MEJORADO
 # ============================================================================
 
 def generar_pdf_ingenieria_menu(filename, cliente_nombre, df_carta, grafico_path=None):
-    """Genera PDF VISUAL de Ingeniería de Menú"""
+    """
+    Genera PDF VISUAL de Ingeniería de Menú
+    
+    Con filename=None devuelve los bytes del PDF en lugar de la ruta.
+    grafico_path admite una ruta o un objeto tipo fichero (BytesIO).
+    """
     
     pdf = KazoPDFGenerator(filename, cliente_nombre, "Informe de Ingeniería de Menú")
     
@@ -295,6 +323,8 @@ def generar_pdf_ingenieria_menu(filename, cliente_nombre, df_carta, grafico_path
     
     if grafico_path:
         try:
+            if isinstance(grafico_path, (bytes, bytearray)):
+                grafico_path = BytesIO(grafico_path)
             img = Image(grafico_path, width=15*cm, height=10*cm)
             pdf.story.append(img)
             pdf.story.append(Spacer(1, 0.5*cm))
@@ -403,15 +433,14 @@ def generar_pdf_ingenieria_menu(filename, cliente_nombre, df_carta, grafico_path
     
     pdf.add_paragraph(plan, 'KazoNormal')
     
-    pdf.build()
-    return filename
+    return pdf.build()
 
 # ============================================================================
 # REPORTE MENSUAL
 # ============================================================================
 
 def generar_reporte_mensual(filename, cliente_nombre, mes, año, datos_mes):
-    """Genera reporte mensual"""
+    """Genera reporte mensual (con filename=None devuelve los bytes)"""
     meses = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
              'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
     
@@ -433,5 +462,126 @@ def generar_reporte_mensual(filename, cliente_nombre, mes, año, datos_mes):
         for alerta in datos_mes['alertas']:
             pdf.add_paragraph(f"• {alerta}")
     
-    pdf.build()
-    return filename
+    return pdf.build()
+
+# ============================================================================
+# CACHÉ DE INFORMES (POR HASH DE CONTENIDO)
+# ============================================================================
+
+def clave_informe(tipo, *datos):
+    """
+    Calcula la clave de caché de un informe a partir de sus datos
+    
+    Args:
+        tipo: Tipo de informe ('ingenieria', 'mensual', ...)
+        *datos: DataFrames, bytes o valores simples que definen el informe
+    
+    Returns:
+        Hash SHA-256 en hexadecimal
+    """
+    h = hashlib.sha256()
+    # La fecha del día aparece en la cabecera del PDF
+    h.update(f"{tipo}|{VERSION_PLANTILLA}|{datetime.now():%Y%m%d}".encode())
+    
+    for dato in datos:
+        if isinstance(dato, pd.DataFrame):
+            h.update("|".join(map(str, dato.columns)).encode())
+            h.update(pd.util.hash_pandas_object(dato, index=False).values.tobytes())
+        elif isinstance(dato, (bytes, bytearray)):
+            h.update(dato)
+        else:
+            h.update(repr(dato).encode())
+        h.update(b"\x00")
+    
+    return h.hexdigest()
+
+
+def _ruta_cache(clave):
+    return os.path.join(CARPETA_CACHE, f"{clave}.pdf")
+
+
+def leer_cache_pdf(clave):
+    """Devuelve los bytes del PDF cacheado o None si no existe"""
+    ruta = _ruta_cache(clave)
+    try:
+        with open(ruta, 'rb') as f:
+            contenido = f.read()
+        os.utime(ruta, None)  # Marca de uso para la política LRU
+        return contenido
+    except OSError:
+        return None
+
+
+def guardar_cache_pdf(clave, contenido):
+    """Guarda un PDF en la caché y aplica el límite de tamaño (LRU)"""
+    try:
+        os.makedirs(CARPETA_CACHE, exist_ok=True)
+        ruta_tmp = _ruta_cache(clave) + ".tmp"
+        with open(ruta_tmp, 'wb') as f:
+            f.write(contenido)
+        os.replace(ruta_tmp, _ruta_cache(clave))
+        limpiar_cache_pdf()
+    except OSError as e:
+        print(f"[DEBUG] No se pudo guardar PDF en caché: {e}")
+
+
+def limpiar_cache_pdf(max_bytes=None):
+    """Elimina los PDFs menos usados hasta quedar por debajo del límite"""
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    try:
+        entradas = [e for e in os.scandir(CARPETA_CACHE) if e.name.endswith(".pdf")]
+    except OSError:
+        return
+    
+    stats = [(e.path, e.stat()) for e in entradas]
+    total = sum(info.st_size for _, info in stats)
+    
+    for ruta, info in sorted(stats, key=lambda x: x[1].st_mtime):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(ruta)
+            total -= info.st_size
+        except OSError:
+            pass
+
+
+def obtener_pdf(clave, generador):
+    """
+    Devuelve el PDF de la caché o lo genera con generador() y lo guarda
+    
+    Args:
+        clave: Clave calculada con clave_informe()
+        generador: Función sin argumentos que devuelve los bytes del PDF
+    
+    Returns:
+        Tupla (bytes_pdf, desde_cache)
+    """
+    contenido = leer_cache_pdf(clave)
+    if contenido is not None:
+        return contenido, True
+    
+    contenido = generador()
+    guardar_cache_pdf(clave, contenido)
+    return contenido, False
+
+
+def pdf_ingenieria_menu(cliente_nombre, df_carta, grafico=None):
+    """Informe de Ingeniería de Menú en memoria, con caché por contenido"""
+    columnas = [c for c in ['Nombre Plato', 'Precio Venta', 'Coste Total', 'Ventas/Mes'] if c in df_carta.columns]
+    clave = clave_informe('ingenieria', cliente_nombre, df_carta[columnas], grafico)
+    return obtener_pdf(
+        clave,
+        lambda: generar_pdf_ingenieria_menu(None, cliente_nombre, df_carta.copy(), grafico)
+    )
+
+
+def pdf_reporte_mensual(cliente_nombre, mes, año, datos_mes, df_carta):
+    """Reporte mensual en memoria, con caché por (carta, mes, año)"""
+    columnas = [c for c in ['Nombre Plato', 'Precio Venta', 'Coste Total', 'Ventas/Mes'] if c in df_carta.columns]
+    clave = clave_informe('mensual', cliente_nombre, mes, año, df_carta[columnas],
+                          datos_mes.get('alertas', []))
+    return obtener_pdf(
+        clave,
+        lambda: generar_reporte_mensual(None, cliente_nombre, mes, año, datos_mes)
+    )
@@ -0,0 +1,278 @@
+"""
+PREVISION_CONSUMO.PY - Previsión de consumo semanal por cliente e ingrediente
+Suavizado exponencial con estacionalidad mensual, calculado para todas
+las series (cliente × ingrediente) a la vez con NumPy
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+import config
+import utils
+
+# ============================================================================
+# PARÁMETROS
+# ============================================================================
+
+# Peso de la última observación en el suavizado (0-1)
+ALPHA_DEFECTO = 0.4
+
+# Factor de consumo en los meses de temporada alta de 'Estacionalidad'
+FACTOR_TEMPORADA_ALTA = 1.3
+
+MESES = {
+    'ene': 1, 'feb': 2, 'mar': 3, 'abr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'ago': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dic': 12
+}
+
+ESTACIONES = {
+    'primavera': [3, 4, 5],
+    'verano': [6, 7, 8],
+    'otoño': [9, 10, 11],
+    'otono': [9, 10, 11],
+    'invierno': [12, 1, 2],
+}
+
+# ============================================================================
+# ESTACIONALIDAD
+# ============================================================================
+
+def factores_estacionalidad(texto):
+    """
+    Convierte el campo 'Estacionalidad' en 12 factores mensuales (media 1)
+
+    Formatos admitidos:
+      - 12 números separados por ',' o ';' (uno por mes)
+      - Meses o rangos: "Jun-Sep", "dic, ene"
+      - Estaciones: "verano", "invierno"
+    Vacío o no reconocido → sin estacionalidad (todo 1).
+
+    Returns:
+        Array (12,) con el factor de enero a diciembre
+    """
+    factores = np.ones(12)
+
+    if not isinstance(texto, str) or not texto.strip():
+        return factores
+
+    texto = texto.strip().lower()
+    numeros = re.split(r'[;,]\s*', texto)
+    if len(numeros) == 12:
+        try:
+            factores = np.array([float(n.replace(' ', '')) for n in numeros])
+            return factores / factores.mean() if factores.mean() > 0 else np.ones(12)
+        except ValueError:
+            pass
+
+    altos = set()
+    for estacion, meses in ESTACIONES.items():
+        if estacion in texto:
+            altos.update(meses)
+
+    for inicio, fin in re.findall(r'([a-zñ]{3})[a-zñ]*\s*-\s*([a-zñ]{3})', texto):
+        if inicio in MESES and fin in MESES:
+            m = MESES[inicio]
+            while True:
+                altos.add(m)
+                if m == MESES[fin]:
+                    break
+                m = m % 12 + 1
+
+    for palabra in re.findall(r'[a-zñ]+', texto):
+        if palabra[:3] in MESES and palabra not in ESTACIONES:
+            altos.add(MESES[palabra[:3]])
+
+    if altos and len(altos) < 12:
+        factores[[m - 1 for m in altos]] = FACTOR_TEMPORADA_ALTA
+        factores = factores / factores.mean()
+
+    return factores
+
+
+def matriz_estacionalidad(df_ingredientes):
+    """
+    Factores mensuales de todos los ingredientes
+
+    Returns:
+        DataFrame indexado por 'ID Ingrediente' con columnas 1..12
+    """
+    if df_ingredientes.empty or 'ID Ingrediente' not in df_ingredientes.columns:
+        return pd.DataFrame(columns=range(1, 13))
+
+    estacionalidad = df_ingredientes.get('Estacionalidad', pd.Series('', index=df_ingredientes.index))
+    factores = np.vstack([factores_estacionalidad(t) for t in estacionalidad]) if len(estacionalidad) else np.ones((0, 12))
+
+    return pd.DataFrame(
+        factores, columns=range(1, 13),
+        index=utils.clave_id(df_ingredientes['ID Ingrediente'])
+    ).groupby(level=0).first()
+
+# ============================================================================
+# OBSERVACIONES
+# ============================================================================
+
+def observaciones_desde_consumo_real(df_consumo):
+    """Consumo semanal real (conciliado con compras) como observaciones"""
+    columnas = ['ID Cliente', 'ID Ingrediente', 'Fecha', 'Consumo Semanal']
+    if df_consumo.empty:
+        return pd.DataFrame(columns=columnas)
+
+    df = df_consumo[(df_consumo['Estado'] == 'OK') & (df_consumo['Semanas'] > 0)]
+    return df.rename(columns={'Fecha Fin': 'Fecha', 'Consumo Semanal Real': 'Consumo Semanal'})[columnas]
+
+# ============================================================================
+# SUAVIZADO EXPONENCIAL VECTORIZADO
+# ============================================================================
+
+def suavizado_exponencial(valores, alpha=ALPHA_DEFECTO):
+    """
+    Nivel suavizado de muchas series a la vez
+
+    Args:
+        valores: Array (n_series, n_periodos) alineado a la derecha,
+                 NaN donde no hay observación
+        alpha: Peso de la observación más reciente
+
+    Returns:
+        Array (n_series,) con el último nivel (NaN si la serie está vacía)
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    nivel = np.full(valores.shape[0], np.nan)
+
+    # Un solo recorrido por el eje temporal; cada paso actualiza todas las series
+    for columna in valores.T:
+        hay_dato = ~np.isnan(columna)
+        sin_nivel = np.isnan(nivel)
+        nivel = np.where(
+            hay_dato & sin_nivel, columna,
+            np.where(hay_dato, alpha * columna + (1 - alpha) * nivel, nivel)
+        )
+
+    return nivel
+
+
+def prever_consumo(df_observaciones, df_ingredientes=None, fecha_objetivo=None, alpha=ALPHA_DEFECTO):
+    """
+    Previsión de consumo semanal de todas las series (cliente × ingrediente)
+
+    Las observaciones se desestacionalizan con el factor del mes en que se
+    midieron, se suavizan, y el nivel resultante se reestacionaliza con el
+    factor del mes objetivo.
+
+    Args:
+        df_observaciones: 'ID Cliente', 'ID Ingrediente', 'Fecha', 'Consumo Semanal'
+        df_ingredientes: INGREDIENTES_MAESTRO (para 'Estacionalidad'); opcional
+        fecha_objetivo: Fecha para la que se prevé (por defecto hoy)
+        alpha: Peso de la última observación
+
+    Returns:
+        DataFrame con 'ID Cliente', 'ID Ingrediente', 'Consumo Previsto Semanal',
+        'Observaciones' y 'Última Observación'
+    """
+    columnas = ['ID Cliente', 'ID Ingrediente', 'Consumo Previsto Semanal', 'Observaciones', 'Última Observación']
+    if df_observaciones.empty:
+        return pd.DataFrame(columns=columnas)
+
+    fecha_objetivo = pd.Timestamp(fecha_objetivo or datetime.now())
+
+    df = df_observaciones.copy()
+    df['ID Ingrediente'] = utils.clave_id(df['ID Ingrediente'])
+    df['Fecha'] = pd.to_datetime(df['Fecha'], errors='coerce')
+    df = df.dropna(subset=['Fecha', 'Consumo Semanal']).sort_values(['ID Cliente', 'ID Ingrediente', 'Fecha'])
+    if df.empty:
+        return pd.DataFrame(columns=columnas)
+
+    # Factores de estacionalidad: mes de cada observación y mes objetivo
+    if df_ingredientes is not None and not df_ingredientes.empty:
+        factores = matriz_estacionalidad(df_ingredientes).reindex(df['ID Ingrediente'].unique()).fillna(1.0)
+    else:
+        factores = pd.DataFrame(1.0, index=df['ID Ingrediente'].unique(), columns=range(1, 13))
+
+    pos_ing = factores.index.get_indexer(df['ID Ingrediente'])
+    matriz_f = factores.to_numpy(dtype=np.float64)
+    factor_obs = matriz_f[pos_ing, df['Fecha'].dt.month.to_numpy() - 1]
+    df['Desestacionalizado'] = df['Consumo Semanal'].to_numpy(dtype=np.float64) / factor_obs
+
+    # Series a matriz (n_series, n_periodos) alineada a la derecha
+    grupos = df.groupby(['ID Cliente', 'ID Ingrediente'], sort=False)
+    id_serie = grupos.ngroup().to_numpy()
+    n_obs = grupos['Fecha'].transform('size').to_numpy()
+    posicion = grupos.cumcount().to_numpy()
+    n_periodos = int(n_obs.max())
+
+    valores = np.full((id_serie.max() + 1, n_periodos), np.nan)
+    valores[id_serie, n_periodos - n_obs + posicion] = df['Desestacionalizado'].to_numpy()
+
+    nivel = suavizado_exponencial(valores, alpha)
+
+    df_prevision = grupos.agg(**{
+        'Observaciones': ('Fecha', 'size'),
+        'Última Observación': ('Fecha', 'max'),
+    }).reset_index()
+
+    pos_serie = factores.index.get_indexer(df_prevision['ID Ingrediente'])
+    factor_objetivo = matriz_f[pos_serie, fecha_objetivo.month - 1]
+    df_prevision['Consumo Previsto Semanal'] = np.round(nivel * factor_objetivo, 2)
+
+    return df_prevision[columnas]
+
+
+def prever_consumo_cliente(id_cliente, fecha_objetivo=None, df_consumo=None):
+    """
+    Previsión para un cliente a partir de su histórico de snapshots
+
+    Usa el consumo real conciliado con las compras (consumo_real.py);
+    los periodos sin conciliar (consumo negativo) se descartan.
+
+    Args:
+        id_cliente: Cliente
+        fecha_objetivo: Fecha de la previsión (por defecto hoy)
+        df_consumo: consumo_real.consumo_real_cliente(id_cliente) si ya se
+                    ha calculado (se calcula si no se pasa)
+
+    Returns:
+        DataFrame de prever_consumo() (vacío si no hay histórico suficiente)
+    """
+    if df_consumo is None:
+        import consumo_real
+        df_consumo = consumo_real.consumo_real_cliente(id_cliente)
+
+    df_obs = observaciones_desde_consumo_real(df_consumo)
+    if df_obs.empty:
+        return pd.DataFrame()
+
+    df_ingredientes = utils.leer_excel(config.ARCHIVO_OPERACIONES, "INGREDIENTES_MAESTRO")
+    return prever_consumo(df_obs, df_ingredientes, fecha_objetivo)
+
+
+def prever_consumo_cartera(fecha_objetivo=None):
+    """Previsión de todas las series de todos los clientes en una pasada"""
+    import consumo_real
+    import snapshots
+
+    df_obs = observaciones_desde_consumo_real(
+        consumo_real.calcular_consumo_real(snapshots.leer_todos_snapshots(), consumo_real.cargar_compras())
+    )
+    df_ingredientes = utils.leer_excel(config.ARCHIVO_OPERACIONES, "INGREDIENTES_MAESTRO")
+    return prever_consumo(df_obs, df_ingredientes, fecha_objetivo)
+
+
+def aplicar_prevision(df_inventario, df_prevision):
+    """
+    Sustituye 'Consumo Semanal' por la previsión donde exista
+
+    Returns:
+        Tupla (DataFrame, número de ingredientes actualizados)
+    """
+    if df_prevision.empty or df_inventario.empty:
+        return df_inventario, 0
+
+    df = df_inventario.copy()
+    prevision = df_prevision.set_index(utils.clave_id(df_prevision['ID Ingrediente']))['Consumo Previsto Semanal']
+    valores = utils.clave_id(df['ID Ingrediente']).map(prevision)
+
+    actualizados = int(valores.notna().sum())
+    df['Consumo Semanal'] = valores.fillna(pd.to_numeric(df['Consumo Semanal'], errors='coerce'))
+    return df, actualizados
@@ -0,0 +1,136 @@
+"""
+PROPUESTAS_PEDIDO.PY - Propuestas de pedido para toda la cartera
+Calcula consumo previsto, pedido sugerido y coste de todos los clientes
+sobre la vista conjunta de inventarios y con una sola escritura
+"""
+
+import pandas as pd
+from datetime import datetime
+import config
+import utils
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+HOJA_PROPUESTAS = "PROPUESTAS_PEDIDO"
+
+COLUMNAS_PROPUESTAS = [
+    'ID Propuesta', 'Fecha', 'ID Cliente', 'Nombre Cliente', 'ID Ingrediente',
+    'Nombre Ingrediente', 'Stock Actual', 'Consumo Semanal', 'Consumo Previsto',
+    'Pedido Sugerido', 'Unidad', 'Precio Unitario', 'Coste'
+]
+
+# Semanas que cubre cada periodo del pedido inteligente
+SEMANAS_PERIODO = {"1 Semana": 1, "2 Semanas": 2, "1 Mes": 4}
+
+# ============================================================================
+# CÁLCULO
+# ============================================================================
+
+def calcular_pedido(df_inventario, semanas=2, crecimiento=0, seguridad=15):
+    """
+    Calcula el pedido sugerido de un inventario (uno o varios clientes)
+
+    Args:
+        df_inventario: Filas con 'Stock Actual', 'Consumo Semanal' y 'Precio Unitario'
+        semanas: Semanas a cubrir
+        crecimiento: % más/menos de consumo respecto a lo normal
+        seguridad: % de stock extra
+
+    Returns:
+        Copia con 'Consumo Previsto', 'Pedido Sugerido' y 'Coste'
+    """
+    df = df_inventario.copy()
+
+    # Compatibilidad con inventarios antiguos ('Cantidad Stock')
+    if 'Stock Actual' not in df.columns and 'Cantidad Stock' in df.columns:
+        df['Stock Actual'] = df['Cantidad Stock']
+
+    for col in ['Stock Actual', 'Consumo Semanal', 'Precio Unitario']:
+        df[col] = pd.to_numeric(df.get(col), errors='coerce').fillna(0)
+
+    df['Consumo Previsto'] = (
+        df['Consumo Semanal'] *
+        semanas *
+        (1 + crecimiento / 100)
+    ).round(1)
+
+    df['Pedido Sugerido'] = (
+        df['Consumo Previsto'] *
+        (1 + seguridad / 100) -
+        df['Stock Actual']
+    ).clip(lower=0).round(1)
+
+    df['Coste'] = (
+        df['Pedido Sugerido'] *
+        df['Precio Unitario']
+    ).round(2)
+
+    return df
+
+
+def resumir_propuestas(df_propuestas):
+    """Totales por cliente: líneas a pedir y coste"""
+    if df_propuestas.empty:
+        return pd.DataFrame()
+
+    claves = [c for c in ['ID Cliente', 'Nombre Cliente'] if c in df_propuestas.columns]
+    return df_propuestas.groupby(claves, dropna=False).agg(
+        **{
+            'Líneas': ('Pedido Sugerido', 'size'),
+            'Coste Total': ('Coste', 'sum'),
+        }
+    ).reset_index().sort_values('Coste Total', ascending=False)
+
+# ============================================================================
+# PROCESO POR LOTES
+# ============================================================================
+
+def ejecutar_propuestas_cartera(semanas=2, crecimiento=0, seguridad=15, guardar=True):
+    """
+    Genera las propuestas de pedido de todos los clientes
+
+    Lee la vista conjunta de inventarios una vez, calcula con aritmética vectorizada
+    y escribe la hoja PROPUESTAS_PEDIDO en una sola escritura.
+
+    Returns:
+        DataFrame con las líneas a pedir (Pedido Sugerido > 0)
+    """
+    df_inventario = utils.leer_inventarios()
+
+    if df_inventario.empty or 'ID Cliente' not in df_inventario.columns:
+        print("[BATCH] Propuestas de pedido: sin inventarios")
+        return pd.DataFrame(columns=COLUMNAS_PROPUESTAS)
+
+    df = calcular_pedido(df_inventario, semanas, crecimiento, seguridad)
+    df = df[df['Pedido Sugerido'] > 0].copy()
+
+    # Un ID por línea; las líneas de una misma ejecución comparten 'Fecha'
+    df['ID Propuesta'] = [utils.generar_id() for _ in range(len(df))]
+    df['Fecha'] = datetime.now()
+    df_propuestas = df.reindex(columns=COLUMNAS_PROPUESTAS).sort_values(
+        ['ID Cliente', 'Coste'], ascending=[True, False]
+    )
+
+    if guardar:
+        if utils.escribir_excel(config.ARCHIVO_OPERACIONES, HOJA_PROPUESTAS, df_propuestas):
+            print(f"[BATCH] ✅ Propuestas guardadas: {len(df_propuestas)} líneas, "
+                  f"{df_propuestas['ID Cliente'].nunique()} clientes")
+        else:
+            print(f"[BATCH] ❌ Error al guardar {HOJA_PROPUESTAS}")
+
+    return df_propuestas
+
+
+if __name__ == "__main__":
+    print("="*70)
+    print(f"🛒 PROPUESTAS DE PEDIDO - CARTERA COMPLETA ({datetime.now():%d/%m/%Y %H:%M})")
+    print("="*70)
+
+    propuestas = ejecutar_propuestas_cartera()
+    resumen = resumir_propuestas(propuestas)
+
+    if not resumen.empty:
+        print(resumen.to_string(index=False))
+        print(f"\n💰 Total propuesto: {resumen['Coste Total'].sum():,.2f} €")
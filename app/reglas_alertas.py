@@ -0,0 +1,484 @@
+"""
+REGLAS_ALERTAS.PY - Registro declarativo de reglas de alerta
+Cada regla (fuente, condición, nivel, plantillas de texto) se declara una
+vez y se compila a una máscara de pandas evaluada sobre la hoja completa
+"""
+
+import operator
+import string
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import config
+import utils
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+COLUMNAS_ALERTAS = ["ID Cliente", "nivel", "categoria", "titulo", "detalle", "impacto", "origen"]
+
+CAMPOS_OBLIGATORIOS = ["Dirección", "Ciudad", "Teléfono", "Email"]
+
+DIAS_AVISO_VENCIMIENTO = 30
+SATISFACCION_MINIMA = 3
+DIAS_SIN_ACTUALIZAR = 30
+DIAS_CAMBIOS_RECIENTES = 7
+
+# ============================================================================
+# FUENTES: LECTURA Y COLUMNAS DERIVADAS (VECTORIZADAS)
+# ============================================================================
+
+def _columna(df, columna):
+    """Columna del DataFrame o serie vacía si la hoja no la tiene"""
+    if columna in df.columns:
+        return df[columna]
+    return pd.Series(np.nan, index=df.index, dtype=object)
+
+
+def _dias(delta):
+    """Días completos de un timedelta vectorizado (Int64, nulos incluidos)"""
+    return delta.dt.days.astype("Int64")
+
+
+def _leer_clientes(estricto=False):
+    return utils.leer_excel(config.ARCHIVO_CRM, "CLIENTES_ACTIVOS", estricto=estricto)
+
+
+def _preparar_clientes(df, ahora):
+    """Campos vacíos, días hasta Fecha Fin y días sin actualizar"""
+    df = df.copy()
+    df["ID Cliente"] = utils.clave_id(_columna(df, "ID"))
+
+    faltan = pd.Series("", index=df.index)
+    for campo in CAMPOS_OBLIGATORIOS:
+        valores = _columna(df, campo)
+        vacio = valores.isna() | (valores.astype(str).str.strip() == "")
+        faltan = faltan + np.where(vacio, campo + ", ", "")
+    df["Campos Vacíos"] = faltan.str[:-2]
+
+    df["Fecha Fin"] = pd.to_datetime(_columna(df, "Fecha Fin"), errors="coerce")
+    df["Días Restantes"] = _dias(df["Fecha Fin"] - ahora)
+    df["Días Vencido"] = -df["Días Restantes"]
+    df["Satisfacción (1-5)"] = pd.to_numeric(_columna(df, "Satisfacción (1-5)"), errors="coerce")
+    df["Días Sin Actualizar"] = _dias(ahora - pd.to_datetime(_columna(df, "Última Actualización"), errors="coerce"))
+    return df
+
+
+def _leer_cambios(estricto=False):
+    import tracking_cambios
+    return tracking_cambios.obtener_cambios_ultimos(dias=DIAS_CAMBIOS_RECIENTES, estricto=estricto)
+
+
+def _preparar_cambios(df, ahora):
+    """Valores anterior/nuevo numéricos y variación %"""
+    df = df.copy()
+    df["ID Cliente"] = utils.clave_id(_columna(df, "ID Cliente"))
+    df["Campo"] = _columna(df, "Campo").fillna("").astype(str)
+    df["Valor Anterior Num"] = pd.to_numeric(_columna(df, "Valor Anterior"), errors="coerce")
+    df["Valor Nuevo Num"] = pd.to_numeric(_columna(df, "Valor Nuevo"), errors="coerce")
+    anterior = df["Valor Anterior Num"]
+    df["Variación %"] = ((df["Valor Nuevo Num"] - anterior) / anterior * 100).where(anterior > 0, 0.0)
+    return df
+
+
+def _leer_carta(estricto=False):
+    return utils.leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES", estricto=estricto)
+
+
+def _preparar_carta(df, ahora):
+    df = df.copy()
+    df["ID Cliente"] = utils.clave_id(_columna(df, "ID Cliente"))
+    df["Margen %"] = pd.to_numeric(_columna(df, "Margen %"), errors="coerce")
+    return df
+
+
+def _leer_compras(estricto=False):
+    """LINEAS_COMPRA con cliente (COMPRAS_CLIENTE) y precio de mercado (INGREDIENTES_MAESTRO)"""
+    df = utils.leer_excel(config.ARCHIVO_OPERACIONES, "LINEAS_COMPRA", estricto=estricto)
+    if df.empty:
+        return df
+
+    df_ing = utils.leer_excel(config.ARCHIVO_OPERACIONES, "INGREDIENTES_MAESTRO", estricto=estricto)
+    if not df_ing.empty:
+        mercado = df_ing.set_index(utils.clave_id(df_ing["ID Ingrediente"]))["Precio Mercado Medio"]
+        mercado = mercado[~mercado.index.duplicated()]
+        df["Precio Mercado Medio"] = utils.clave_id(df["ID Ingrediente"]).map(mercado).to_numpy()
+
+    if "ID Cliente" not in df.columns and "ID Compra" in df.columns:
+        df_compras = utils.leer_excel(config.ARCHIVO_OPERACIONES, "COMPRAS_CLIENTE", estricto=estricto)
+        if not df_compras.empty:
+            clientes = df_compras.set_index(utils.clave_id(df_compras["ID Compra"]))["ID Cliente"]
+            clientes = clientes[~clientes.index.duplicated()]
+            df["ID Cliente"] = utils.clave_id(df["ID Compra"]).map(clientes).to_numpy()
+    return df
+
+
+def _preparar_compras(df, ahora):
+    """Desviación % del precio pagado frente al de mercado y ahorro potencial"""
+    df = df.copy()
+    df["ID Cliente"] = utils.clave_id(_columna(df, "ID Cliente"))
+    pagado = pd.to_numeric(_columna(df, "Precio Unitario"), errors="coerce")
+    mercado = pd.to_numeric(_columna(df, "Precio Mercado Medio"), errors="coerce")
+    df["Precio Unitario"] = pagado
+    df["Precio Mercado Medio"] = mercado
+    df["Desviación %"] = ((pagado - mercado) / mercado * 100).where(mercado > 0)
+    df["Ahorro Potencial"] = (pagado - mercado) * pd.to_numeric(_columna(df, "Cantidad"), errors="coerce")
+    return df
+
+
+# Nombre → lectura, preparación, hoja de origen (campo 'origen' de la alerta)
+# y columnas que identifican la fila (clave estable de la alerta)
+FUENTES = {
+    "clientes": {"leer": _leer_clientes, "preparar": _preparar_clientes, "origen": "CLIENTES_ACTIVOS",
+                 "clave": ["ID Cliente"]},
+    "cambios": {"leer": _leer_cambios, "preparar": _preparar_cambios, "origen": "CAMBIOS_REGISTRO",
+                "clave": ["ID Cliente", "Fecha", "Campo"]},
+    "carta": {"leer": _leer_carta, "preparar": _preparar_carta, "origen": "CARTA_CLIENTES",
+              "clave": ["ID Cliente", "ID Plato"]},
+    "compras": {"leer": _leer_compras, "preparar": _preparar_compras, "origen": "LINEAS_COMPRA",
+                "clave": ["ID Compra", "ID Ingrediente"]},
+}
+
+# ============================================================================
+# REGISTRO DE REGLAS
+# ============================================================================
+
+# condicion: lista de (columna, operador, valor) unidas con Y;
+# ("o", [cláusulas]) para alternativas. Textos: plantillas con {Columna:formato}
+REGLAS = [
+    {
+        "id": "datos_incompletos", "fuente": "clientes",
+        "condicion": [("Campos Vacíos", "no_vacio", None)],
+        "nivel": "advertencia", "categoria": "Cliente",
+        "titulo": "Datos incompletos",
+        "detalle": "Faltan: {Campos Vacíos}",
+        "impacto": "Completa los datos para mejorar comunicación",
+    },
+    {
+        "id": "servicio_proximo_vencer", "fuente": "clientes",
+        "condicion": [("Días Restantes", "entre", (0, DIAS_AVISO_VENCIMIENTO))],
+        "nivel": "critica", "categoria": "Cliente",
+        "titulo": "Servicio próximo a vencer",
+        "detalle": "Vence en {Días Restantes} días ({Fecha Fin:%d/%m/%Y})",
+        "impacto": "Contacta cliente para renovación",
+    },
+    {
+        "id": "servicio_vencido", "fuente": "clientes",
+        "condicion": [("Días Restantes", "<", 0)],
+        "nivel": "critica", "categoria": "Cliente",
+        "titulo": "Servicio vencido",
+        "detalle": "Vencido hace {Días Vencido} días",
+        "impacto": "Contacta inmediatamente para renovación",
+    },
+    {
+        "id": "baja_satisfaccion", "fuente": "clientes",
+        "condicion": [("Satisfacción (1-5)", "<", SATISFACCION_MINIMA)],
+        "nivel": "critica", "categoria": "Cliente",
+        "titulo": "Baja satisfacción del cliente",
+        "detalle": "Puntuación: {Satisfacción (1-5):.1f}/5",
+        "impacto": "Realiza seguimiento urgente para mejorar relación",
+    },
+    {
+        "id": "sin_actualizaciones", "fuente": "clientes",
+        "condicion": [("Días Sin Actualizar", ">", DIAS_SIN_ACTUALIZAR)],
+        "nivel": "advertencia", "categoria": "Cliente",
+        "titulo": "Sin actualizaciones recientes",
+        "detalle": "Última actualización hace {Días Sin Actualizar} días",
+        "impacto": "Realiza seguimiento y actualiza información",
+    },
+    {
+        "id": "cambio_precio", "fuente": "cambios",
+        "condicion": [("Tipo", "==", "precio"), ("Valor Anterior Num", "no_vacio", None),
+                      ("Valor Nuevo Num", "no_vacio", None)],
+        "nivel": "advertencia", "categoria": "Cambios",
+        "titulo": "Cambio de precio en {Campo}",
+        "detalle": "{Valor Anterior Num:.2f}€ → {Valor Nuevo Num:.2f}€ ({Variación %:+.1f}%)",
+        "impacto": "Cambio registrado el {Fecha}",
+    },
+    {
+        "id": "cambio_datos", "fuente": "cambios",
+        "condicion": [("Tipo", "==", "datos")],
+        "nivel": "advertencia", "categoria": "Cambios",
+        "titulo": "Actualización en {Campo}",
+        "detalle": "'{Valor Anterior}' → '{Valor Nuevo}'",
+        "impacto": "Cambio registrado el {Fecha}",
+    },
+    {
+        "id": "margen_bajo", "fuente": "carta",
+        "condicion": [("Activo", "==", "Sí"), ("Margen %", "<", config.UMBRAL_MARGEN_MINIMO)],
+        "nivel": "advertencia", "categoria": "Carta",
+        "titulo": "Margen bajo en {Nombre Plato}",
+        "detalle": "Margen {Margen %:.1f}% (mínimo " + str(config.UMBRAL_MARGEN_MINIMO) + "%)",
+        "impacto": "Revisa escandallo o PVP",
+    },
+    {
+        "id": "precio_alto", "fuente": "compras",
+        "condicion": [("Precio Mercado Medio", ">", 0),
+                      ("Desviación %", ">", config.UMBRAL_DESVIACION_PRECIO)],
+        "nivel": "advertencia", "categoria": "Compras",
+        "titulo": "Precio alto en {Nombre Ingrediente}",
+        "detalle": "{Precio Unitario:.2f}€ vs mercado {Precio Mercado Medio:.2f}€ ({Desviación %:+.1f}%)",
+        "impacto": "Ahorro potencial: {Ahorro Potencial:.2f}€",
+    },
+]
+
+# ============================================================================
+# COMPILACIÓN
+# ============================================================================
+
+def _vacio(serie):
+    return serie.isna() | (serie.astype(str).str.strip() == "")
+
+
+OPERADORES = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "entre": lambda s, v: s.between(v[0], v[1]),
+    "en": lambda s, v: s.isin(v),
+    "vacio": lambda s, v: _vacio(s),
+    "no_vacio": lambda s, v: ~_vacio(s),
+}
+
+
+def compilar_condicion(condicion):
+    """
+    Convierte una condición declarativa en una función df → máscara
+
+    Raises:
+        ValueError: operador desconocido
+    """
+    if isinstance(condicion, tuple) and condicion[0] == "o":
+        alternativas = [compilar_condicion(c) for c in condicion[1]]
+        return lambda df: np.logical_or.reduce([f(df) for f in alternativas])
+
+    if isinstance(condicion, list):
+        clausulas = [compilar_condicion(c) for c in condicion]
+        return lambda df: np.logical_and.reduce([f(df) for f in clausulas] + [np.ones(len(df), dtype=bool)])
+
+    columna, op, valor = condicion
+    if op not in OPERADORES:
+        raise ValueError(f"Operador de alerta desconocido: {op}")
+    funcion = OPERADORES[op]
+    return lambda df: funcion(_columna(df, columna), valor).fillna(False).to_numpy(dtype=bool)
+
+
+def _partes_plantilla(plantilla):
+    """[(literal, campo, formato)] de una plantilla '{Columna:formato}'"""
+    return [(literal, campo, formato) for literal, campo, formato, _ in string.Formatter().parse(plantilla)]
+
+
+def _formatear(partes, df):
+    """Aplica una plantilla a las filas de df (solo las que disparan)"""
+    texto = np.full(len(df), "", dtype=object)
+    for literal, campo, formato in partes:
+        texto = texto + literal
+        if campo is None:
+            continue
+        valores = _columna(df, campo)
+        if formato and pd.api.types.is_datetime64_any_dtype(valores):
+            valores = valores.dt.strftime(formato).fillna("")
+        elif formato:
+            valores = valores.map(lambda v: format(v, formato) if pd.notna(v) else "")
+        texto = texto + valores.astype(str).to_numpy(dtype=object)
+    return texto
+
+
+def _compilar(regla):
+    return {
+        "regla": regla,
+        "predicado": compilar_condicion(regla["condicion"]),
+        "plantillas": {c: _partes_plantilla(regla[c]) for c in ("titulo", "detalle", "impacto")},
+    }
+
+
+REGLAS_COMPILADAS = {regla["id"]: _compilar(regla) for regla in REGLAS}
+
+# ============================================================================
+# EVALUACIÓN
+# ============================================================================
+
+# Tiempos por regla: evaluaciones, filas evaluadas, disparos, segundos
+_estadisticas = {}
+
+# Estado incremental por fuente: huellas de fila y alertas vigentes
+_estado = {}
+
+
+def preparar_fuente(nombre, df=None, ahora=None, estricto=False):
+    """
+    Hoja de la fuente con sus columnas derivadas
+
+    Con estricto=True un error de lectura se propaga (en lugar de tratarse
+    como hoja vacía)
+    """
+    fuente = FUENTES[nombre]
+    df = fuente["leer"](estricto=estricto) if df is None else df
+    if df is None or df.empty:
+        return pd.DataFrame()
+    return fuente["preparar"](df.reset_index(drop=True), ahora or datetime.now())
+
+
+def _registrar(id_regla, filas, disparos, segundos):
+    stats = _estadisticas.setdefault(id_regla, {"Evaluaciones": 0, "Filas Evaluadas": 0, "Disparos": 0,
+                                                "Segundos": 0.0, "Última (ms)": 0.0})
+    stats["Evaluaciones"] += 1
+    stats["Filas Evaluadas"] += filas
+    stats["Disparos"] += disparos
+    stats["Segundos"] += segundos
+    stats["Última (ms)"] = round(segundos * 1000, 2)
+
+
+def evaluar_reglas(nombre, df):
+    """
+    Evalúa todas las reglas de una fuente sobre un DataFrame preparado
+
+    Returns:
+        DataFrame con COLUMNAS_ALERTAS + 'Regla', 'Clave' (regla + fila) y
+        'Fila' (posición en df)
+    """
+    partes = []
+    for orden, (id_regla, compilada) in enumerate(REGLAS_COMPILADAS.items()):
+        regla = compilada["regla"]
+        if regla["fuente"] != nombre:
+            continue
+
+        inicio = time.perf_counter()
+        mascara = compilada["predicado"](df) if not df.empty else np.zeros(0, dtype=bool)
+        disparadas = df[mascara]
+        textos = {c: _formatear(p, disparadas) for c, p in compilada["plantillas"].items()}
+        clave = np.full(len(disparadas), id_regla, dtype=object)
+        for columna in FUENTES[nombre]["clave"]:
+            clave = clave + "|" + _columna(disparadas, columna).astype(str).to_numpy(dtype=object)
+        partes.append(pd.DataFrame({
+            "ID Cliente": _columna(disparadas, "ID Cliente").to_numpy(),
+            "nivel": regla["nivel"],
+            "categoria": regla["categoria"],
+            "titulo": textos["titulo"],
+            "detalle": textos["detalle"],
+            "impacto": textos["impacto"],
+            "origen": FUENTES[nombre]["origen"],
+            "Regla": id_regla,
+            "Clave": clave,
+            "Orden": orden,
+            "Fila": disparadas.index.to_numpy(),
+        }))
+        _registrar(id_regla, len(df), len(disparadas), time.perf_counter() - inicio)
+
+    if not partes:
+        return pd.DataFrame(columns=COLUMNAS_ALERTAS + ["Regla", "Clave", "Orden", "Fila"])
+    return pd.concat(partes, ignore_index=True)
+
+
+def _huellas(df):
+    """Huella por fila (contenido + nº de repetición para filas idénticas)"""
+    try:
+        huellas = pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        huellas = pd.util.hash_pandas_object(df.astype(str), index=False)
+    repeticion = huellas.groupby(huellas.to_numpy()).cumcount().to_numpy(dtype=np.uint64)
+    return pd.Series(huellas.to_numpy() ^ (repeticion * np.uint64(0x9E3779B97F4A7C15)), index=df.index)
+
+
+def evaluar_fuente(nombre, df=None, ahora=None, incremental=True):
+    """
+    Alertas de una fuente, reevaluando solo las filas que han cambiado
+
+    Las huellas se calculan sobre la hoja ya preparada, así que una fila
+    cuyo dato derivado cambia (p. ej. días hasta Fecha Fin) también se
+    reevalúa. Las alertas de filas sin cambios se reutilizan.
+
+    Si la lectura falla se propaga el error y el estado incremental de la
+    fuente queda como estaba.
+
+    Returns:
+        DataFrame con COLUMNAS_ALERTAS + 'Regla' y 'Clave'
+    """
+    preparado = preparar_fuente(nombre, df, ahora, estricto=True)
+    if preparado.empty:
+        _estado.pop(nombre, None)
+        return pd.DataFrame(columns=COLUMNAS_ALERTAS + ["Regla", "Clave"])
+
+    huellas = _huellas(preparado)
+    previo = _estado.get(nombre) if incremental else None
+
+    if previo is None:
+        alertas = evaluar_reglas(nombre, preparado)
+        alertas["Huella"] = huellas.to_numpy()[alertas["Fila"].to_numpy(dtype=np.int64)]
+    else:
+        nuevas = ~huellas.isin(previo["huellas"])
+        vigentes = previo["alertas"][previo["alertas"]["Huella"].isin(huellas)]
+        recalculadas = evaluar_reglas(nombre, preparado[nuevas.to_numpy()])
+        recalculadas["Huella"] = huellas.to_numpy()[recalculadas["Fila"].to_numpy(dtype=np.int64)]
+        alertas = pd.concat([vigentes, recalculadas], ignore_index=True)
+
+    # Orden de la hoja (y de las reglas dentro de cada fila)
+    posicion = pd.Series(np.arange(len(huellas)), index=huellas.to_numpy())
+    alertas["Fila"] = alertas["Huella"].map(posicion).to_numpy()
+    alertas = alertas.sort_values(["Fila", "Orden"], kind="stable").reset_index(drop=True)
+
+    _estado[nombre] = {"huellas": huellas, "alertas": alertas}
+    return alertas[COLUMNAS_ALERTAS + ["Regla", "Clave"]]
+
+
+def evaluar_fuentes(incremental=True):
+    """
+    Alertas de todas las fuentes que se han podido leer
+
+    Returns:
+        (DataFrame de alertas, lista de 'origen' de las fuentes cuya lectura
+        falló; sus alertas no están en el DataFrame)
+    """
+    partes = []
+    fallidas = []
+    for nombre in FUENTES:
+        try:
+            partes.append(evaluar_fuente(nombre, incremental=incremental))
+        except Exception as e:
+            print(f"[BATCH] Lectura fallida de la fuente de alertas '{nombre}': {e}")
+            fallidas.append(FUENTES[nombre]["origen"])
+
+    if not partes:
+        return pd.DataFrame(columns=COLUMNAS_ALERTAS + ["Regla", "Clave"]), fallidas
+    return pd.concat(partes, ignore_index=True), fallidas
+
+
+def evaluar_todas(incremental=True):
+    """Alertas de todas las fuentes (una lectura por hoja)"""
+    return evaluar_fuentes(incremental)[0]
+
+
+def coincidencias(id_regla, df=None, ahora=None):
+    """Filas (preparadas) de la fuente que disparan una regla"""
+    compilada = REGLAS_COMPILADAS[id_regla]
+    preparado = preparar_fuente(compilada["regla"]["fuente"], df, ahora)
+    if preparado.empty:
+        return preparado
+
+    inicio = time.perf_counter()
+    mascara = compilada["predicado"](preparado)
+    _registrar(id_regla, len(preparado), int(mascara.sum()), time.perf_counter() - inicio)
+    return preparado[mascara]
+
+
+def estadisticas_reglas():
+    """Tiempos acumulados por regla"""
+    if not _estadisticas:
+        return pd.DataFrame()
+
+    df = pd.DataFrame.from_dict(_estadisticas, orient="index")
+    df.index.name = "Regla"
+    df["ms por 1000 filas"] = (df["Segundos"] * 1e6 / df["Filas Evaluadas"].where(df["Filas Evaluadas"] > 0)).round(3)
+    df["Segundos"] = df["Segundos"].round(4)
+    return df.reset_index().sort_values("Segundos", ascending=False)
+
+
+def reiniciar_estado():
+    """Olvida el estado incremental (la siguiente evaluación es completa)"""
+    _estado.clear()
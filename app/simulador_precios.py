@@ -0,0 +1,134 @@
+"""
+SIMULADOR_PRECIOS.PY - Motor vectorizado de simulación de precios
+Evalúa en una sola operación NumPy la rejilla
+platos × cambios de precio × supuestos de elasticidad
+"""
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# PARÁMETROS POR DEFECTO
+# ============================================================================
+
+# Cambios de precio evaluados: de -30% a +30% en pasos de 1%
+CAMBIOS_PRECIO_DEFECTO = np.round(np.arange(-0.30, 0.3001, 0.01), 2)
+
+# Elasticidad precio-demanda: -0.5 = poco sensible, -2 = muy sensible
+ELASTICIDADES_DEFECTO = np.array([-0.5, -1.0, -1.5, -2.0])
+
+# ============================================================================
+# MOTOR DE CÁLCULO
+# ============================================================================
+
+def simular_rejilla(precio, coste, ventas, cambios_pct, elasticidades):
+    """
+    Calcula precio, volumen y beneficio de todos los escenarios a la vez
+
+    Modelo de elasticidad constante: Q = Q0 · (P / P0) ^ ε
+
+    Args:
+        precio, coste, ventas: Arrays (n_platos,)
+        cambios_pct: Array (n_cambios,) con cambios relativos (0.05 = +5%)
+        elasticidades: Array (n_elasticidades,) con valores negativos
+
+    Returns:
+        Dict con arrays 'precio', 'volumen', 'beneficio' de forma
+        (n_platos, n_cambios, n_elasticidades)
+    """
+    precio = np.asarray(precio, dtype=np.float64)[:, None, None]
+    coste = np.asarray(coste, dtype=np.float64)[:, None, None]
+    ventas = np.asarray(ventas, dtype=np.float64)[:, None, None]
+    factor = 1.0 + np.asarray(cambios_pct, dtype=np.float64)[None, :, None]
+    elasticidades = np.asarray(elasticidades, dtype=np.float64)[None, None, :]
+
+    factor = np.clip(factor, 1e-6, None)
+    precio_nuevo = precio * factor
+    volumen = ventas * np.power(factor, elasticidades)
+    beneficio = (precio_nuevo - coste) * volumen
+
+    return {
+        'precio': np.broadcast_to(precio_nuevo, beneficio.shape),
+        'volumen': volumen,
+        'beneficio': beneficio,
+    }
+
+
+def optimizar_carta(df_carta, cambios_pct=None, elasticidades=None):
+    """
+    Precio que maximiza el beneficio de cada plato y curva de la carta
+
+    Args:
+        df_carta: Platos con 'Nombre Plato', 'Precio Venta', 'Coste Total', 'Ventas/Mes'
+        cambios_pct: Cambios relativos a evaluar (por defecto ±30%)
+        elasticidades: Supuestos de elasticidad (por defecto -0.5 a -2)
+
+    Returns:
+        Dict con:
+          'platos': DataFrame (plato × elasticidad) con precio óptimo,
+                    cambio %, volumen y beneficio actual/óptimo
+          'curva': DataFrame (cambio × elasticidad) con el beneficio total
+                   de la carta si se aplica el mismo cambio a todos los platos
+          'rejilla': Resultado crudo de simular_rejilla()
+    """
+    cambios_pct = CAMBIOS_PRECIO_DEFECTO if cambios_pct is None else np.asarray(cambios_pct, dtype=np.float64)
+    elasticidades = ELASTICIDADES_DEFECTO if elasticidades is None else np.asarray(elasticidades, dtype=np.float64)
+
+    precio = pd.to_numeric(df_carta['Precio Venta'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    coste = pd.to_numeric(df_carta['Coste Total'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    ventas = pd.to_numeric(df_carta['Ventas/Mes'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+    rejilla = simular_rejilla(precio, coste, ventas, cambios_pct, elasticidades)
+    beneficio = rejilla['beneficio']
+
+    n_platos, _, n_elast = beneficio.shape
+
+    # Mejor cambio por plato y elasticidad: argmax sobre el eje de cambios
+    idx_optimo = beneficio.argmax(axis=1)                       # (n_platos, n_elast)
+    filas = np.arange(n_platos)[:, None]
+    columnas = np.arange(n_elast)[None, :]
+
+    beneficio_optimo = beneficio[filas, idx_optimo, columnas]
+    precio_optimo = rejilla['precio'][filas, idx_optimo, columnas]
+    volumen_optimo = rejilla['volumen'][filas, idx_optimo, columnas]
+
+    df_platos = pd.DataFrame({
+        'ID Plato': np.repeat(df_carta['ID Plato'].to_numpy() if 'ID Plato' in df_carta.columns else np.arange(n_platos), n_elast),
+        'Nombre Plato': np.repeat(df_carta['Nombre Plato'].astype(str).to_numpy(), n_elast),
+        'Elasticidad': np.tile(elasticidades, n_platos),
+        'Precio Actual': np.repeat(precio, n_elast),
+        'Precio Óptimo': precio_optimo.ravel().round(2),
+        'Cambio %': (cambios_pct[idx_optimo].ravel() * 100).round(0),
+        'Ventas Actuales': np.repeat(ventas, n_elast),
+        'Ventas Óptimas': volumen_optimo.ravel().round(0),
+        'Beneficio Actual': np.repeat((precio - coste) * ventas, n_elast).round(2),
+        'Beneficio Óptimo': beneficio_optimo.ravel().round(2),
+    })
+    df_platos['Mejora €/mes'] = (df_platos['Beneficio Óptimo'] - df_platos['Beneficio Actual']).round(2)
+
+    curva = beneficio.sum(axis=0)                               # (n_cambios, n_elast)
+    df_curva = pd.DataFrame(curva, columns=elasticidades)
+    df_curva.insert(0, 'Cambio %', (cambios_pct * 100).round(0))
+
+    return {'platos': df_platos, 'curva': df_curva, 'rejilla': rejilla}
+
+
+def resumen_optimizacion(df_platos):
+    """
+    Beneficio total actual vs óptimo (cada plato a su mejor precio)
+
+    Returns:
+        DataFrame con una fila por elasticidad
+    """
+    if df_platos.empty:
+        return pd.DataFrame()
+
+    return df_platos.groupby('Elasticidad', sort=False).agg(
+        **{
+            'Beneficio Actual': ('Beneficio Actual', 'sum'),
+            'Beneficio Óptimo': ('Beneficio Óptimo', 'sum'),
+            'Mejora €/mes': ('Mejora €/mes', 'sum'),
+            'Platos a Subir': ('Cambio %', lambda x: int((x > 0).sum())),
+            'Platos a Bajar': ('Cambio %', lambda x: int((x < 0).sum())),
+        }
+    ).reset_index()
@@ -45,7 +45,7 @@ ESTRUCTURA_ESPERADA = {
         ],
         "ESCANDALLOS": [
             'ID Escandallo', 'ID Plato', 'Nombre Plato', 'ID Ingrediente',
-            'Nombre Ingrediente', 'Cantidad', 'Unidad', 'Coste Unitario',
+            'Nombre Ingrediente', 'Cantidad', 'Unidad', 'Coste Unitario', 'Unidad Precio',
             'Coste Total', '% del Plato', 'ID Proveedor', 'Última Actualización'
         ],
         "INGREDIENTES_MAESTRO": [
@@ -71,6 +71,17 @@ ESTRUCTURA_ESPERADA = {
         "SNAPSHOTS_PEDIDOS": [
             'ID', 'ID Cliente', 'Nombre Cliente', 'Fecha', 'ID Ingrediente',
             'Nombre Ingrediente', 'Stock', 'Consumo', 'Observaciones'
+        ],
+        "PROPUESTAS_PEDIDO": [
+            'ID Propuesta', 'Fecha', 'ID Cliente', 'Nombre Cliente', 'ID Ingrediente',
+            'Nombre Ingrediente', 'Stock Actual', 'Consumo Semanal', 'Consumo Previsto',
+            'Pedido Sugerido', 'Unidad', 'Precio Unitario', 'Coste'
+        ],
+        "CONSUMO_REAL": [
+            'ID Cliente', 'Nombre Cliente', 'ID Ingrediente', 'Nombre Ingrediente', 'Unidad',
+            'Fecha Inicio', 'Fecha Fin', 'Semanas', 'Stock Inicial', 'Comprado', 'Stock Final',
+            'Consumo Real', 'Consumo Semanal Real', 'Consumo Semanal Estimado', 'Desviación %',
+            'Estado', 'Fecha Cálculo'
         ]
     },
     config.ARCHIVO_PROVEEDORES: {
@@ -0,0 +1,244 @@
+"""
+SNAPSHOTS.PY - Histórico de inventario por visita
+Tabla larga (una fila por snapshot × ingrediente) particionada por
+cliente en archivos CSV de solo-anexado
+"""
+
+import os
+from io import BytesIO, StringIO
+
+import pandas as pd
+from datetime import datetime
+import config
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+if config.USE_ONEDRIVE_API:
+    RUTA_SNAPSHOTS = f"{config.RUTA_DATOS}/snapshots"
+else:
+    RUTA_SNAPSHOTS = os.path.join(config.RUTA_DATOS, "snapshots")
+
+PREFIJO_SNAPSHOTS = "SNAPSHOTS_"
+
+COLUMNAS_SNAPSHOT = [
+    'ID Snapshot', 'ID Cliente', 'Nombre Cliente', 'Fecha', 'Motivo',
+    'ID Ingrediente', 'Nombre Ingrediente', 'Stock', 'Consumo', 'Unidad', 'Precio Unitario'
+]
+
+# Columnas del pedido → columnas del histórico
+MAPEO_COLUMNAS = {
+    'Stock Actual': 'Stock',
+    'Cantidad Stock': 'Stock',
+    'Consumo Semanal': 'Consumo',
+}
+
+HOJA_LEGACY = "SNAPSHOTS_PEDIDOS"
+
+FORMATO_FECHA = '%Y-%m-%d %H:%M:%S'
+
+# ============================================================================
+# ALMACENAMIENTO
+# ============================================================================
+
+def archivo_snapshots_cliente(id_cliente):
+    """Ruta del CSV de snapshots de un cliente"""
+    nombre = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(id_cliente))
+    if config.USE_ONEDRIVE_API:
+        return f"{RUTA_SNAPSHOTS}/{PREFIJO_SNAPSHOTS}{nombre}.csv"
+    return os.path.join(RUTA_SNAPSHOTS, f"{PREFIJO_SNAPSHOTS}{nombre}.csv")
+
+
+def _anexar_csv(archivo, df):
+    """Añade filas al final del CSV (cabecera solo al crearlo)"""
+    if config.USE_ONEDRIVE_API:
+        import onedrive
+        try:
+            contenido = onedrive.descargar_archivo(archivo)
+        except FileNotFoundError:
+            contenido = b""
+        nuevo = df.to_csv(index=False, header=not contenido, date_format=FORMATO_FECHA).encode('utf-8')
+        onedrive.subir_archivo(archivo, contenido + nuevo)
+        return
+
+    os.makedirs(os.path.dirname(archivo), exist_ok=True)
+    existe = os.path.exists(archivo) and os.path.getsize(archivo) > 0
+    df.to_csv(archivo, mode='a', index=False, header=not existe,
+              encoding='utf-8', date_format=FORMATO_FECHA)
+
+
+def _leer_csv(archivo):
+    """Lee el CSV de snapshots (DataFrame vacío si no existe)"""
+    try:
+        if config.USE_ONEDRIVE_API:
+            import onedrive
+            fuente = BytesIO(onedrive.descargar_archivo(archivo))
+        elif os.path.exists(archivo):
+            fuente = archivo
+        else:
+            return pd.DataFrame(columns=COLUMNAS_SNAPSHOT)
+
+        df = pd.read_csv(fuente, encoding='utf-8')
+        df['Fecha'] = pd.to_datetime(df['Fecha'], format=FORMATO_FECHA, errors='coerce')
+        return df
+    except FileNotFoundError:
+        return pd.DataFrame(columns=COLUMNAS_SNAPSHOT)
+    except Exception as e:
+        print(f"[DEBUG] Error al leer snapshots {archivo}: {e}")
+        return pd.DataFrame(columns=COLUMNAS_SNAPSHOT)
+
+
+def filas_snapshot(id_snapshot, id_cliente, nombre_cliente, df_pedido, fecha, motivo=""):
+    """Convierte un pedido/inventario en filas largas (una por ingrediente)"""
+    df = df_pedido.rename(columns=MAPEO_COLUMNAS)
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    filas = pd.DataFrame({
+        col: df[col].to_numpy() if col in df.columns else None
+        for col in ['ID Ingrediente', 'Nombre Ingrediente', 'Stock', 'Consumo', 'Unidad', 'Precio Unitario']
+    })
+    filas.insert(0, 'ID Snapshot', id_snapshot)
+    filas.insert(1, 'ID Cliente', id_cliente)
+    filas.insert(2, 'Nombre Cliente', nombre_cliente)
+    filas.insert(3, 'Fecha', pd.Timestamp(fecha))
+    filas.insert(4, 'Motivo', motivo)
+
+    return filas[COLUMNAS_SNAPSHOT]
+
+# ============================================================================
+# API
+# ============================================================================
+
+def guardar_snapshot(id_snapshot, id_cliente, nombre_cliente, df_pedido, motivo=""):
+    """
+    Anexa un snapshot al histórico del cliente
+
+    Solo se escriben las filas nuevas; el histórico existente no se reescribe.
+
+    Returns:
+        True si se guardó correctamente
+    """
+    try:
+        filas = filas_snapshot(id_snapshot, id_cliente, nombre_cliente, df_pedido,
+                               datetime.now().replace(microsecond=0), motivo)
+        _anexar_csv(archivo_snapshots_cliente(id_cliente), filas)
+        print(f"[DEBUG] ✅ Snapshot {id_snapshot} guardado ({len(filas)} ingredientes)")
+        return True
+    except Exception as e:
+        print(f"[DEBUG] Error al guardar snapshot: {e}")
+        return False
+
+
+def obtener_snapshots(id_cliente, limite=None):
+    """
+    Histórico en formato largo de un cliente, más reciente primero
+
+    Args:
+        id_cliente: ID del cliente
+        limite: Número máximo de snapshots (visitas) a devolver
+
+    Returns:
+        DataFrame con COLUMNAS_SNAPSHOT
+    """
+    df = _leer_csv(archivo_snapshots_cliente(id_cliente))
+
+    if df.empty:
+        df = snapshots_legacy(id_cliente)
+        if df.empty:
+            return df
+
+    df = df.sort_values('Fecha', ascending=False, kind='stable')
+
+    if limite:
+        ultimos = df['ID Snapshot'].drop_duplicates().head(limite)
+        df = df[df['ID Snapshot'].isin(ultimos)]
+
+    return df.reset_index(drop=True)
+
+
+def historico_ingrediente(id_cliente, id_ingrediente):
+    """
+    Evolución de stock y consumo de un ingrediente de un cliente
+
+    Returns:
+        DataFrame ordenado por fecha ascendente
+    """
+    df = obtener_snapshots(id_cliente)
+    if df.empty:
+        return df
+
+    df = df[df['ID Ingrediente'].astype(str) == str(id_ingrediente)]
+    return df.sort_values('Fecha').reset_index(drop=True)
+
+def leer_todos_snapshots():
+    """Histórico de todos los clientes (para cálculos de cartera)"""
+    try:
+        if config.USE_ONEDRIVE_API:
+            import onedrive
+            archivos = [f"{RUTA_SNAPSHOTS}/{n}" for n in onedrive.listar_archivos(RUTA_SNAPSHOTS)
+                        if n.startswith(PREFIJO_SNAPSHOTS) and n.endswith(".csv")]
+        else:
+            import glob
+            archivos = glob.glob(os.path.join(RUTA_SNAPSHOTS, f"{PREFIJO_SNAPSHOTS}*.csv"))
+    except Exception as e:
+        print(f"[DEBUG] Error al listar snapshots: {e}")
+        archivos = []
+
+    partes = [df for df in (_leer_csv(a) for a in sorted(archivos)) if not df.empty]
+    if not partes:
+        return pd.DataFrame(columns=COLUMNAS_SNAPSHOT)
+    return pd.concat(partes, ignore_index=True)
+
+# ============================================================================
+# FORMATO ANTERIOR (Datos JSON en SNAPSHOTS_PEDIDOS)
+# ============================================================================
+
+def snapshots_legacy(id_cliente=None):
+    """Expande los snapshots guardados como JSON en la hoja SNAPSHOTS_PEDIDOS"""
+    import utils
+
+    df = utils.leer_excel(config.ARCHIVO_OPERACIONES, HOJA_LEGACY)
+    if df.empty or 'Datos JSON' not in df.columns:
+        return pd.DataFrame(columns=COLUMNAS_SNAPSHOT)
+
+    if id_cliente is not None:
+        df = df[df['ID Cliente'] == id_cliente]
+
+    partes = []
+    for _, fila in df.iterrows():
+        try:
+            df_pedido = pd.read_json(StringIO(fila['Datos JSON']), orient='records')
+        except Exception:
+            continue
+        partes.append(filas_snapshot(
+            fila.get('ID Snapshot'), fila['ID Cliente'], fila.get('Nombre Cliente'),
+            df_pedido, pd.to_datetime(fila.get('Fecha'), errors='coerce'), fila.get('Motivo', "")
+        ))
+
+    if not partes:
+        return pd.DataFrame(columns=COLUMNAS_SNAPSHOT)
+    return pd.concat(partes, ignore_index=True)
+
+
+def migrar_snapshots_legacy():
+    """
+    Pasa los snapshots JSON de SNAPSHOTS_PEDIDOS al histórico por cliente
+
+    Solo migra clientes que aún no tienen archivo de snapshots.
+
+    Returns:
+        Número de clientes migrados
+    """
+    df_legacy = snapshots_legacy()
+    migrados = 0
+
+    for id_cliente, df_cliente in df_legacy.groupby('ID Cliente', sort=False):
+        archivo = archivo_snapshots_cliente(id_cliente)
+        if not _leer_csv(archivo).empty:
+            continue
+        _anexar_csv(archivo, df_cliente.sort_values('Fecha'))
+        migrados += 1
+
+    print(f"[DEBUG] Snapshots migrados: {migrados} clientes")
+    return migrados
@@ -0,0 +1,268 @@
+"""
+TABLA_ALERTAS.PY - Tabla materializada de alertas
+Un hilo en segundo plano evalúa las reglas (reglas_alertas) cada pocos
+minutos y tras cada escritura de datos, y guarda el resultado en ALERTAS.csv
+con primera/última detección y estado de reconocimiento. Las pantallas
+solo leen esta tabla.
+"""
+
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+import config
+import utils
+import reglas_alertas
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+ARCHIVO_ALERTAS = os.path.join(config.RUTA_DATOS, "ALERTAS.csv")
+
+COLUMNAS_TABLA = reglas_alertas.COLUMNAS_ALERTAS + [
+    "Regla", "Clave", "Estado", "Primera Vez", "Última Vez", "Fecha Resolución",
+    "Reconocida", "Fecha Reconocimiento"
+]
+
+FORMATO_FECHA = "%d/%m/%Y %H:%M:%S"
+
+# Segundos entre recálculos programados
+INTERVALO_REFRESCO = 300
+
+# Segundos de espera tras una escritura (agrupa escrituras seguidas)
+ESPERA_TRAS_ESCRITURA = 2
+
+# Hojas cuya escritura obliga a recalcular
+HOJAS_ALERTAS = {"CLIENTES_ACTIVOS", "CARTA_CLIENTES", "LINEAS_COMPRA", "COMPRAS_CLIENTE",
+                 "INGREDIENTES_MAESTRO", "CAMBIOS_REGISTRO"}
+
+# Un solo recálculo a la vez (el estado incremental de las reglas es compartido)
+_bloqueo = threading.Lock()
+
+# Hilo programador y aviso de datos modificados
+_programador = {"hilo": None, "pendiente": threading.Event(), "parar": threading.Event(), "ultimo": None}
+
+# Tabla en memoria y consultas por cliente (se recargan si cambia el archivo)
+_lectura = {"mtime": None, "tabla": None, "por_cliente": {}}
+
+# ============================================================================
+# PERSISTENCIA
+# ============================================================================
+
+def leer_tabla():
+    """ALERTAS.csv completo (vacío si aún no existe)"""
+    try:
+        if not os.path.exists(ARCHIVO_ALERTAS):
+            return pd.DataFrame(columns=COLUMNAS_TABLA)
+        df = pd.read_csv(ARCHIVO_ALERTAS, dtype=str, keep_default_na=False)
+        return df.reindex(columns=COLUMNAS_TABLA, fill_value="")
+    except Exception as e:
+        print(f"[DEBUG] Error leyendo {ARCHIVO_ALERTAS}: {e}")
+        return pd.DataFrame(columns=COLUMNAS_TABLA)
+
+
+def _guardar_tabla(df):
+    """Escritura atómica (archivo temporal + reemplazo) para no leer a medias"""
+    temporal = ARCHIVO_ALERTAS + ".tmp"
+    df[COLUMNAS_TABLA].to_csv(temporal, index=False, encoding="utf-8")
+    os.replace(temporal, ARCHIVO_ALERTAS)
+
+# ============================================================================
+# RECÁLCULO
+# ============================================================================
+
+def fusionar(df_tabla, df_actuales, ahora=None, origenes_omitidos=()):
+    """
+    Funde las alertas recién evaluadas con la tabla guardada
+
+    - Alerta nueva: 'Primera Vez' = ahora, sin reconocer
+    - Sigue activa: se actualizan textos y 'Última Vez'
+    - Ya no se cumple: pasa a 'Resuelta' con 'Fecha Resolución'
+    - Reaparece tras resolverse: vuelve a 'Activa' y sin reconocer
+
+    Las filas de 'origenes_omitidos' (fuentes cuya lectura falló) se
+    conservan tal cual: una lectura fallida no resuelve alertas ni, al
+    volver a leerse, borra su reconocimiento.
+
+    Returns:
+        DataFrame con COLUMNAS_TABLA
+    """
+    ahora = (ahora or datetime.now()).strftime(FORMATO_FECHA)
+    omitidas = df_tabla["origen"].isin(origenes_omitidos)
+    congeladas = df_tabla[omitidas].drop_duplicates("Clave").set_index("Clave")
+    actuales = df_actuales[~df_actuales["origen"].isin(origenes_omitidos)].drop_duplicates("Clave").set_index("Clave")
+    tabla = df_tabla[~omitidas].drop_duplicates("Clave").set_index("Clave")
+
+    vistas = tabla.index.isin(actuales.index)
+    activas_antes = tabla["Estado"] == "Activa"
+
+    # Resueltas: estaban activas y ya no aparecen
+    resueltas = activas_antes & ~vistas
+    tabla.loc[resueltas, "Estado"] = "Resuelta"
+    tabla.loc[resueltas, "Fecha Resolución"] = ahora
+
+    # Reaparecidas: vuelven a estar activas, sin reconocer
+    reaparecidas = vistas & ~activas_antes
+    tabla.loc[reaparecidas, "Reconocida"] = "No"
+    tabla.loc[reaparecidas, "Fecha Reconocimiento"] = ""
+    tabla.loc[reaparecidas, "Fecha Resolución"] = ""
+
+    # Siguen (o vuelven): textos y última detección actuales
+    comunes = tabla.index[vistas]
+    tabla.loc[comunes, reglas_alertas.COLUMNAS_ALERTAS + ["Regla"]] = actuales.loc[comunes, reglas_alertas.COLUMNAS_ALERTAS + ["Regla"]].astype(str).to_numpy()
+    tabla.loc[comunes, "Estado"] = "Activa"
+    tabla.loc[comunes, "Última Vez"] = ahora
+
+    # Nuevas
+    nuevas = actuales[~actuales.index.isin(tabla.index)].copy()
+    nuevas["Estado"] = "Activa"
+    nuevas["Primera Vez"] = ahora
+    nuevas["Última Vez"] = ahora
+    nuevas["Fecha Resolución"] = ""
+    nuevas["Reconocida"] = "No"
+    nuevas["Fecha Reconocimiento"] = ""
+
+    # Orden: activas en el orden de evaluación (hoja y regla), luego historial
+    orden = pd.Series(range(len(actuales)), index=actuales.index)
+    resultado = pd.concat([tabla, nuevas.astype(str), congeladas]).reset_index()
+    resultado["Orden"] = resultado["Clave"].map(orden)
+    resultado = resultado.sort_values("Orden", kind="stable", na_position="last")
+    return resultado.reindex(columns=COLUMNAS_TABLA).fillna("").reset_index(drop=True)
+
+
+def refrescar(completo=False):
+    """
+    Evalúa todas las reglas y actualiza ALERTAS.csv
+
+    Args:
+        completo: True para olvidar el estado incremental de las reglas
+
+    Returns:
+        True si la tabla se actualizó
+    """
+    with _bloqueo:
+        try:
+            inicio = datetime.now()
+            if completo:
+                reglas_alertas.reiniciar_estado()
+
+            actuales, fallidas = reglas_alertas.evaluar_fuentes()
+            tabla = fusionar(leer_tabla(), actuales, inicio, origenes_omitidos=fallidas)
+            _guardar_tabla(tabla)
+
+            _programador["ultimo"] = datetime.now()
+            segundos = (_programador["ultimo"] - inicio).total_seconds()
+            print(f"[BATCH] Alertas recalculadas: {(tabla['Estado'] == 'Activa').sum()} activas ({segundos:.2f}s)")
+            return True
+        except Exception as e:
+            print(f"[BATCH] Error recalculando alertas: {e}")
+            return False
+
+# ============================================================================
+# PROGRAMADOR EN SEGUNDO PLANO
+# ============================================================================
+
+def _bucle():
+    """Recalcula cada INTERVALO_REFRESCO o al avisar de una escritura"""
+    while not _programador["parar"].is_set():
+        refrescar()
+        if _programador["pendiente"].wait(INTERVALO_REFRESCO):
+            # Agrupa varias escrituras seguidas en un solo recálculo
+            _programador["parar"].wait(ESPERA_TRAS_ESCRITURA)
+            _programador["pendiente"].clear()
+
+
+def iniciar_programador():
+    """Arranca el hilo de recálculo (una vez por proceso)"""
+    hilo = _programador["hilo"]
+    if hilo is not None and hilo.is_alive():
+        return hilo
+
+    _programador["parar"].clear()
+    hilo = threading.Thread(target=_bucle, name="programador_alertas", daemon=True)
+    hilo.start()
+    _programador["hilo"] = hilo
+    print("[BATCH] Programador de alertas iniciado")
+    return hilo
+
+
+def detener_programador():
+    _programador["parar"].set()
+    _programador["pendiente"].set()
+
+
+def notificar_escritura(hoja):
+    """Avisa al programador de que una hoja con reglas ha cambiado"""
+    if hoja in HOJAS_ALERTAS:
+        _programador["pendiente"].set()
+
+
+def ultimo_refresco():
+    return _programador["ultimo"]
+
+# ============================================================================
+# CONSULTAS (SOLO LECTURA DE LA TABLA)
+# ============================================================================
+
+def obtener_tabla():
+    """
+    Tabla materializada y alertas activas agrupadas por cliente
+
+    Solo se relee ALERTAS.csv cuando cambia en disco; las consultas por
+    cliente son búsquedas en un dict.
+
+    Returns:
+        Dict con 'tabla' (DataFrame con COLUMNAS_TABLA), 'por_cliente'
+        (clave → lista de alertas activas) y 'fecha' (modificación del archivo)
+    """
+    mtime = os.path.getmtime(ARCHIVO_ALERTAS) if os.path.exists(ARCHIVO_ALERTAS) else None
+    acierto = _lectura["tabla"] is not None and mtime == _lectura["mtime"]
+    utils.registrar_cache("tabla_alertas", acierto)
+    if not acierto:
+        tabla = leer_tabla()
+        activas = tabla[tabla["Estado"] == "Activa"]
+        _lectura.update({
+            "mtime": mtime,
+            "tabla": tabla,
+            "por_cliente": {
+                clave: grupo.drop(columns="ID Cliente").to_dict("records")
+                for clave, grupo in activas.groupby("ID Cliente", sort=False)
+            },
+        })
+
+    return {
+        "tabla": _lectura["tabla"],
+        "por_cliente": _lectura["por_cliente"],
+        "fecha": datetime.fromtimestamp(mtime) if mtime else None,
+    }
+
+
+def alertas_activas_cliente(id_cliente):
+    """Lista de alertas activas de un cliente"""
+    clave = utils.clave_id(pd.Series([id_cliente])).iloc[0]
+    return obtener_tabla()["por_cliente"].get(clave, [])
+
+
+def reconocer_alerta(clave, reconocida=True):
+    """
+    Marca (o desmarca) una alerta como reconocida
+
+    Returns:
+        True si se guardó
+    """
+    with _bloqueo:
+        try:
+            tabla = leer_tabla()
+            fila = tabla["Clave"] == clave
+            if not fila.any():
+                return False
+
+            tabla.loc[fila, "Reconocida"] = "Sí" if reconocida else "No"
+            tabla.loc[fila, "Fecha Reconocimiento"] = datetime.now().strftime(FORMATO_FECHA) if reconocida else ""
+            _guardar_tabla(tabla)
+            return True
+        except Exception as e:
+            print(f"[DEBUG] Error reconociendo alerta {clave}: {e}")
+            return False
@@ -55,6 +55,10 @@ def registrar_cambio(tipo_cambio, id_cliente, nombre_cliente, campo, valor_anter
         # Guardar
         df_cambios.to_csv(ARCHIVO_CAMBIOS, index=False, encoding='utf-8')
         
+        # Avisar al programador de alertas (recalcula en segundo plano)
+        import tabla_alertas
+        tabla_alertas.notificar_escritura("CAMBIOS_REGISTRO")
+        
         return True
         
     except Exception as e:
@@ -90,9 +94,11 @@ def obtener_cambios_cliente(id_cliente, dias=30):
         return pd.DataFrame()
 
 
-def obtener_cambios_ultimos(dias=7):
+def obtener_cambios_ultimos(dias=7, estricto=False):
     """
     Obtiene los cambios de los últimos X días (todos los clientes)
+    
+    Con estricto=True el error de lectura se propaga en vez de devolver vacío
     """
     try:
         if not os.path.exists(ARCHIVO_CAMBIOS):
@@ -112,4 +118,6 @@ def obtener_cambios_ultimos(dias=7):
         
     except Exception as e:
         print(f"Error obteniendo cambios recientes: {e}")
+        if estricto:
+            raise
         return pd.DataFrame()
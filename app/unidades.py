@@ -0,0 +1,209 @@
+"""
+UNIDADES.PY - Conversión de unidades y rendimiento para escandallos
+Registro de unidades (kg/g, l/ml/cl, ud/docena) con densidades por
+ingrediente y costeo vectorizado de todas las líneas de ESCANDALLOS
+"""
+
+import numpy as np
+import pandas as pd
+import utils
+
+# ============================================================================
+# REGISTRO DE UNIDADES
+# ============================================================================
+
+# Unidad → (magnitud, factor a la unidad base de la magnitud: kg, l, ud)
+UNIDADES = {
+    'kg': ('masa', 1.0),
+    'g': ('masa', 0.001),
+    'mg': ('masa', 0.000001),
+    'l': ('volumen', 1.0),
+    'dl': ('volumen', 0.1),
+    'cl': ('volumen', 0.01),
+    'ml': ('volumen', 0.001),
+    'ud': ('unidad', 1.0),
+    'docena': ('unidad', 12.0),
+}
+
+# Formas de escribir cada unidad en las hojas (INGREDIENTES_MAESTRO usa
+# "KG", "Litro", "Unidad", "Docena", "Gramos", "ML")
+ALIAS_UNIDADES = {
+    'kilo': 'kg', 'kilos': 'kg', 'kgs': 'kg', 'kilogramo': 'kg', 'kilogramos': 'kg',
+    'gr': 'g', 'grs': 'g', 'gramo': 'g', 'gramos': 'g',
+    'litro': 'l', 'litros': 'l', 'lt': 'l', 'lts': 'l',
+    'mililitro': 'ml', 'mililitros': 'ml', 'centilitro': 'cl', 'centilitros': 'cl',
+    'u': 'ud', 'ud.': 'ud', 'uds': 'ud', 'uds.': 'ud', 'unidad': 'ud', 'unidades': 'ud',
+    'pieza': 'ud', 'piezas': 'ud', 'racion': 'ud', 'ración': 'ud', 'raciones': 'ud',
+    'docenas': 'docena', 'dz': 'docena',
+}
+
+# kg por litro cuando el ingrediente no tiene densidad propia (agua)
+DENSIDAD_POR_DEFECTO = 1.0
+
+# Columna opcional de INGREDIENTES_MAESTRO con la densidad (kg/l)
+COLUMNA_DENSIDAD = 'Densidad (kg/l)'
+
+# Columna opcional de ESCANDALLOS con la unidad del 'Coste Unitario'
+# (guardada al añadir la línea: unidad de PRECIOS_POR_CLIENTE)
+COLUMNA_UNIDAD_PRECIO = 'Unidad Precio'
+
+# ============================================================================
+# CONVERSIÓN
+# ============================================================================
+
+def normalizar_unidad(unidades):
+    """
+    Unidad canónica del registro ('KG' → 'kg', 'Gramos' → 'g', ...)
+
+    Las unidades desconocidas o vacías se devuelven como ''.
+    """
+    serie = pd.Series(unidades, dtype=object)
+
+    # Pocas unidades distintas: se normalizan una vez y se mapean
+    distintas = pd.Series(pd.unique(serie), dtype=object)
+    texto = distintas.fillna('').astype(str).str.strip().str.lower().replace(ALIAS_UNIDADES)
+    texto = texto.where(texto.isin(list(UNIDADES)), '')
+    return pd.Series(texto.to_numpy()[pd.Index(distintas).get_indexer(serie)], index=serie.index, dtype=object)
+
+
+def _magnitud_y_factor(unidades):
+    """Arrays (magnitud, factor a base) de unidades ya normalizadas"""
+    magnitud = unidades.map({u: m for u, (m, _) in UNIDADES.items()}).fillna('').to_numpy(dtype=object)
+    factor = unidades.map({u: f for u, (_, f) in UNIDADES.items()}).to_numpy(dtype=np.float64)
+    return magnitud, factor
+
+
+def factores_conversion(unidades_origen, unidades_destino, densidades=None):
+    """
+    Factor por el que multiplicar una cantidad para pasarla de unidad
+
+    masa ↔ volumen usa la densidad (kg/l) de cada línea. Las conversiones
+    imposibles (ud ↔ kg) o con unidades desconocidas dan NaN.
+
+    Args:
+        unidades_origen, unidades_destino: Secuencias de unidades (cualquier alias)
+        densidades: Array de kg/l por línea (por defecto DENSIDAD_POR_DEFECTO)
+
+    Returns:
+        Array de factores
+    """
+    origen = normalizar_unidad(unidades_origen)
+    destino = normalizar_unidad(unidades_destino)
+    mag_o, fac_o = _magnitud_y_factor(origen)
+    mag_d, fac_d = _magnitud_y_factor(destino)
+
+    if densidades is None:
+        densidad = np.full(len(origen), DENSIDAD_POR_DEFECTO)
+    else:
+        densidad = np.asarray(pd.to_numeric(pd.Series(densidades), errors='coerce'), dtype=np.float64)
+        densidad = np.where(densidad > 0, densidad, DENSIDAD_POR_DEFECTO)
+
+    # Magnitud de origen → base de la magnitud de destino
+    puente = np.where(mag_o == mag_d, 1.0, np.nan)
+    puente = np.where((mag_o == 'volumen') & (mag_d == 'masa'), densidad, puente)
+    puente = np.where((mag_o == 'masa') & (mag_d == 'volumen'), 1.0 / densidad, puente)
+
+    return fac_o * puente / fac_d
+
+
+def densidades_ingredientes(df_ingredientes):
+    """Serie clave de ingrediente → densidad (kg/l) de INGREDIENTES_MAESTRO"""
+    if df_ingredientes is None or df_ingredientes.empty or COLUMNA_DENSIDAD not in df_ingredientes.columns:
+        return pd.Series(dtype=np.float64)
+
+    densidades = pd.to_numeric(df_ingredientes[COLUMNA_DENSIDAD], errors='coerce')
+    densidades.index = utils.clave_id(df_ingredientes['ID Ingrediente']).to_numpy()
+    return densidades[densidades > 0]
+
+
+def unidades_precio(df_esc):
+    """
+    Unidad en la que está el precio de cada línea de escandallo
+
+    'Unidad Precio' si la línea la guarda (receta en gramos, precio por kg)
+    y si no la propia 'Unidad' de la línea: el 'Coste Unitario' se copia de
+    PRECIOS_POR_CLIENTE junto con su unidad, así que sin 'Unidad Precio' no
+    hay conversión.
+    """
+    unidad = df_esc['Unidad'] if 'Unidad' in df_esc.columns else pd.Series('', index=df_esc.index)
+    if COLUMNA_UNIDAD_PRECIO not in df_esc.columns:
+        return unidad
+
+    guardada = df_esc[COLUMNA_UNIDAD_PRECIO]
+    return guardada.where(guardada.notna() & (guardada.astype(str).str.strip() != ''), unidad)
+
+
+def _mascara_subrecetas(df_esc):
+    """Líneas de sub-receta ('ID Ingrediente' es un ID de plato, no de ingrediente)"""
+    import matriz_recetas
+
+    if 'Nombre Ingrediente' not in df_esc.columns:
+        return np.zeros(len(df_esc), dtype=bool)
+    return matriz_recetas.es_subreceta(df_esc).to_numpy(dtype=bool)
+
+# ============================================================================
+# COSTEO
+# ============================================================================
+
+def rendimientos(df_esc):
+    """Rendimiento % de cada línea (vacío, 0 o inválido → 100)"""
+    if 'Rendimiento %' not in df_esc.columns:
+        return np.full(len(df_esc), 100.0)
+
+    rendimiento = pd.to_numeric(df_esc['Rendimiento %'], errors='coerce').to_numpy(dtype=np.float64)
+    return np.where((rendimiento > 0) & np.isfinite(rendimiento), rendimiento, 100.0)
+
+
+def costear_lineas(df_esc, df_ingredientes=None, precios=None):
+    """
+    Coste de todas las líneas de escandallo en una operación
+
+    Coste = Cantidad neta / (Rendimiento % / 100) × factor(Unidad → Unidad Precio)
+            × Coste Unitario
+
+    La unidad del precio sale de unidades_precio. Las sub-recetas (su 'ID
+    Ingrediente' es un ID de plato) no se convierten: factor 1.
+
+    Args:
+        df_esc: Líneas de ESCANDALLOS
+        df_ingredientes: INGREDIENTES_MAESTRO (densidades); opcional
+        precios: Array de precios por línea que sustituye a 'Coste Unitario'
+
+    Returns:
+        DataFrame (mismo índice) con 'Cantidad Neta', 'Rendimiento %',
+        'Cantidad Bruta', 'Factor Unidad', 'Coste Unitario', 'Coste Total'
+        y 'Unidad Compatible'
+    """
+    neta = pd.to_numeric(df_esc['Cantidad'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    rendimiento = rendimientos(df_esc)
+    bruta = neta / (rendimiento / 100.0)
+
+    unidad = df_esc['Unidad'] if 'Unidad' in df_esc.columns else pd.Series('', index=df_esc.index)
+    unidad_precio = unidades_precio(df_esc)
+    subreceta = _mascara_subrecetas(df_esc)
+
+    densidades = None
+    tabla_densidades = densidades_ingredientes(df_ingredientes)
+    if not tabla_densidades.empty:
+        densidades = utils.clave_id(df_esc['ID Ingrediente']).map(tabla_densidades).to_numpy(dtype=np.float64)
+        densidades = np.where(subreceta, np.nan, densidades)
+
+    factor = factores_conversion(unidad.to_numpy(), unidad_precio.to_numpy(), densidades)
+    # Misma unidad escrita igual (aunque no esté en el registro) → sin conversión
+    misma = unidad.fillna('').to_numpy(dtype=object) == unidad_precio.fillna('').to_numpy(dtype=object)
+    compatible = np.isfinite(factor) | misma | subreceta
+    factor = np.where(np.isfinite(factor) & ~subreceta, factor, 1.0)
+
+    if precios is None:
+        precios = pd.to_numeric(df_esc['Coste Unitario'], errors='coerce') if 'Coste Unitario' in df_esc.columns else 0.0
+    precio = np.nan_to_num(np.asarray(precios, dtype=np.float64) * np.ones(len(df_esc)))
+
+    return pd.DataFrame({
+        'Cantidad Neta': neta,
+        'Rendimiento %': rendimiento,
+        'Cantidad Bruta': bruta,
+        'Factor Unidad': factor,
+        'Coste Unitario': precio,
+        'Coste Total': bruta * factor * precio,
+        'Unidad Compatible': compatible,
+    }, index=df_esc.index)
@@ -3,36 +3,205 @@ UTILS.PY - Funciones Utilitarias
 Lectura/Escritura de Excel y funciones comunes
 """
 
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
 import pandas as pd
 import streamlit as st
 from datetime import datetime, date
 import config
 from io import BytesIO
 
+# ============================================================================
+# INSTRUMENTACIÓN DE LA CAPA DE DATOS
+# ============================================================================
+
+# Mediciones guardadas en memoria (las más antiguas se descartan)
+MAX_MEDICIONES = 5000
+
+COLUMNAS_MEDICIONES = [
+    "Fecha", "Ejecución", "Página", "Operación", "Archivo", "Hoja",
+    "Segundos", "Bytes Leídos", "Bytes Escritos", "Filas", "Caché", "Reintentos", "Correcto", "Anidada"
+]
+
+# Operaciones que parsean un Excel completo
+OPERACIONES_PARSEO = {"leer_excel", "leer_excel_forzado"}
+
+# Página de las mediciones hechas fuera de un rerun (hilos en segundo plano)
+PAGINA_SEGUNDO_PLANO = "(segundo plano)"
+
+_mediciones = deque(maxlen=MAX_MEDICIONES)
+_bloqueo_mediciones = threading.Lock()
+_ejecuciones = {"ultima": 0}
+
+# Rerun y página en curso de cada hilo de Streamlit
+_contexto = threading.local()
+
+
+def iniciar_ejecucion(pagina):
+    """
+    Marca el inicio de un rerun: las mediciones de este hilo se atribuyen
+    a un nuevo número de ejecución y a 'pagina'
+
+    Returns:
+        Número de ejecución
+    """
+    with _bloqueo_mediciones:
+        _ejecuciones["ultima"] += 1
+        _contexto.ejecucion = _ejecuciones["ultima"]
+    _contexto.pagina = pagina
+    return _contexto.ejecucion
+
+
+@contextmanager
+def _medicion_anidada():
+    """
+    Las mediciones hechas dentro (descargas/subidas de OneDrive de
+    leer_excel o escribir_excel) se marcan como 'Anidada': su tiempo y sus
+    bytes ya cuentan en la operación que las contiene
+    """
+    _contexto.anidadas = getattr(_contexto, "anidadas", 0) + 1
+    try:
+        yield
+    finally:
+        _contexto.anidadas -= 1
+
+
+def registrar_medicion(operacion, archivo="", hoja="", segundos=0.0, bytes_leidos=0, bytes_escritos=0,
+                       filas=None, cache="", reintentos=0, correcto=True):
+    """Añade una medición de lectura/escritura/caché al registro en memoria"""
+    with _bloqueo_mediciones:
+        _mediciones.append({
+            "Fecha": datetime.now(),
+            "Ejecución": getattr(_contexto, "ejecucion", 0),
+            "Página": getattr(_contexto, "pagina", PAGINA_SEGUNDO_PLANO),
+            "Operación": operacion,
+            "Archivo": os.path.basename(str(archivo)),
+            "Hoja": hoja,
+            "Segundos": segundos,
+            "Bytes Leídos": bytes_leidos,
+            "Bytes Escritos": bytes_escritos,
+            "Filas": filas,
+            "Caché": cache,
+            "Reintentos": reintentos,
+            "Correcto": correcto,
+            "Anidada": getattr(_contexto, "anidadas", 0) > 0,
+        })
+
+
+def registrar_cache(nombre, acierto):
+    """Acierto o fallo de una caché en memoria (índices, tabla de alertas...)"""
+    registrar_medicion(f"caché {nombre}", cache="acierto" if acierto else "fallo")
+
+
+def _tamano_archivo(archivo):
+    try:
+        return os.path.getsize(archivo)
+    except OSError:
+        return 0
+
+
+def obtener_mediciones():
+    """Mediciones registradas como DataFrame (COLUMNAS_MEDICIONES)"""
+    with _bloqueo_mediciones:
+        filas = list(_mediciones)
+    return pd.DataFrame(filas, columns=COLUMNAS_MEDICIONES)
+
+
+def reiniciar_mediciones():
+    with _bloqueo_mediciones:
+        _mediciones.clear()
+
+
+def resumen_mediciones(df=None, por="Página"):
+    """
+    Mediciones agregadas
+
+    Args:
+        df: mediciones (None = obtener_mediciones())
+        por: columna o lista de columnas de agrupación ('Página', 'Ejecución',
+            ['Operación', 'Hoja']...)
+
+    Returns:
+        DataFrame con llamadas, Excel parseados, tiempos, MB leídos/escritos,
+        filas, aciertos/fallos de caché y reintentos, ordenado por tiempo total.
+        Salvo que se agrupe por 'Operación', las mediciones anidadas no se
+        suman (ya están incluidas en la operación que las contiene).
+    """
+    if df is None:
+        df = obtener_mediciones()
+    if "Operación" not in ([por] if isinstance(por, str) else por):
+        df = df[~df["Anidada"].fillna(False).astype(bool)]
+    if df.empty:
+        return pd.DataFrame()
+
+    df = df.assign(
+        _parseo=df["Operación"].isin(OPERACIONES_PARSEO),
+        _acierto=df["Caché"] == "acierto",
+        _fallo=df["Caché"] == "fallo",
+        _error=~df["Correcto"].astype(bool),
+    )
+    resumen = df.groupby(por, sort=False).agg(
+        **{
+            "Llamadas": ("Operación", "size"),
+            "Excel Parseados": ("_parseo", "sum"),
+            "Tiempo Total (s)": ("Segundos", "sum"),
+            "Tiempo Medio (ms)": ("Segundos", "mean"),
+            "Tiempo Máximo (ms)": ("Segundos", "max"),
+            "MB Leídos": ("Bytes Leídos", "sum"),
+            "MB Escritos": ("Bytes Escritos", "sum"),
+            "Filas": ("Filas", "sum"),
+            "Aciertos Caché": ("_acierto", "sum"),
+            "Fallos Caché": ("_fallo", "sum"),
+            "Reintentos": ("Reintentos", "sum"),
+            "Errores": ("_error", "sum"),
+        }
+    )
+    resumen["Tiempo Medio (ms)"] *= 1000
+    resumen["Tiempo Máximo (ms)"] *= 1000
+    resumen["MB Leídos"] /= 1024 ** 2
+    resumen["MB Escritos"] /= 1024 ** 2
+    return resumen.sort_values("Tiempo Total (s)", ascending=False).round(3).reset_index()
+
 # ============================================================================
 # FUNCIONES DE LECTURA DE EXCEL
 # ============================================================================
 
-def leer_excel(archivo, hoja):
+def leer_excel(archivo, hoja, estricto=False):
     """
     Lee una hoja de Excel y la devuelve como DataFrame
     
     Args:
         archivo: Ruta del archivo Excel
         hoja: Nombre de la hoja a leer
+        estricto: True para propagar el error de lectura en vez de devolver
+                  un DataFrame vacío (distingue hoja vacía de lectura fallida)
     
     Returns:
         DataFrame con los datos
     """
+    inicio = time.perf_counter()
     try:
         if config.USE_ONEDRIVE_API:
             import onedrive
-            contenido = onedrive.descargar_archivo(archivo)
+            with _medicion_anidada():
+                contenido = onedrive.descargar_archivo(archivo)
+            tamano = len(contenido)
             df = pd.read_excel(BytesIO(contenido), sheet_name=hoja)
         else:
+            tamano = _tamano_archivo(archivo)
             df = pd.read_excel(archivo, sheet_name=hoja)
+        registrar_medicion("leer_excel", archivo, hoja, time.perf_counter() - inicio,
+                           bytes_leidos=tamano, filas=len(df))
         return df
     except Exception:
+        registrar_medicion("leer_excel", archivo, hoja, time.perf_counter() - inicio, correcto=False)
+        if estricto:
+            raise
         # Retornar DataFrame vacío sin mostrar error (para hojas opcionales)
         return pd.DataFrame()
 
@@ -71,20 +240,26 @@ def leer_excel_forzado(archivo, hoja):
     from openpyxl import load_workbook
     import time
     
+    inicio = time.perf_counter()
     st.cache_data.clear()
     time.sleep(0.3)  # Pequeña pausa para asegurar limpieza
     
     try:
         if config.USE_ONEDRIVE_API:
             import onedrive
-            contenido = onedrive.descargar_archivo(archivo)
+            with _medicion_anidada():
+                contenido = onedrive.descargar_archivo(archivo)
+            tamano = len(contenido)
             wb = load_workbook(BytesIO(contenido), data_only=True)
         else:
             # Cargar workbook con openpyxl (no usa caché de Streamlit)
+            tamano = _tamano_archivo(archivo)
             wb = load_workbook(archivo, data_only=True)
         
         if hoja not in wb.sheetnames:
             st.error(f"Hoja '{hoja}' no encontrada en {archivo}")
+            registrar_medicion("leer_excel_forzado", archivo, hoja, time.perf_counter() - inicio,
+                               bytes_leidos=tamano, cache="vaciada", correcto=False)
             return pd.DataFrame()
         
         ws = wb[hoja]
@@ -106,10 +281,14 @@ def leer_excel_forzado(archivo, hoja):
             df = pd.DataFrame()
         
         wb.close()
+        registrar_medicion("leer_excel_forzado", archivo, hoja, time.perf_counter() - inicio,
+                           bytes_leidos=tamano, filas=len(df), cache="vaciada")
         return df
         
     except Exception as e:
         st.error(f"Error al leer {archivo} - {hoja}: {str(e)}")
+        registrar_medicion("leer_excel_forzado", archivo, hoja, time.perf_counter() - inicio,
+                           cache="vaciada", correcto=False)
         return pd.DataFrame()
 
 # ============================================================================
@@ -130,6 +309,16 @@ def escribir_excel(archivo, hoja, df):
     Returns:
         True si fue exitoso, False si no
     """
+    inicio = time.perf_counter()
+    medicion = {"reintentos": 0, "bytes": 0, "bytes_leidos": 0}
+    resultado = _escribir_excel(archivo, hoja, df, medicion)
+    registrar_medicion("escribir_excel", archivo, hoja, time.perf_counter() - inicio,
+                       bytes_leidos=medicion["bytes_leidos"], bytes_escritos=medicion["bytes"], filas=len(df),
+                       reintentos=medicion["reintentos"], correcto=resultado)
+    return resultado
+
+def _escribir_excel(archivo, hoja, df, medicion):
+    """Escritura con reintentos; anota en 'medicion' reintentos y bytes leídos y guardados"""
     import time
     import openpyxl
     from openpyxl.utils.dataframe import dataframe_to_rows
@@ -138,13 +327,16 @@ def escribir_excel(archivo, hoja, df):
     intento = 0
     
     while intento < max_intentos:
+        medicion["reintentos"] = intento
         try:
             # Opción 1: Usar openpyxl directamente para mayor control
             # Cargar el libro existente
             if config.USE_ONEDRIVE_API:
                 import onedrive
                 try:
-                    contenido = onedrive.descargar_archivo(archivo)
+                    with _medicion_anidada():
+                        contenido = onedrive.descargar_archivo(archivo)
+                    medicion["bytes_leidos"] += len(contenido)
                     libro = openpyxl.load_workbook(BytesIO(contenido))
                 except FileNotFoundError:
                     libro = openpyxl.Workbook()
@@ -153,6 +345,7 @@ def escribir_excel(archivo, hoja, df):
             else:
                 try:
                     libro = openpyxl.load_workbook(archivo)
+                    medicion["bytes_leidos"] += _tamano_archivo(archivo)
                 except:
                     # Si no existe, crear uno nuevo
                     libro = openpyxl.Workbook()
@@ -193,22 +386,36 @@ def escribir_excel(archivo, hoja, df):
                 buffer = BytesIO()
                 libro.save(buffer)
                 libro.close()
-                onedrive.subir_archivo(archivo, buffer.getvalue())
+                medicion["bytes"] = buffer.tell()
+                with _medicion_anidada():
+                    onedrive.subir_archivo(archivo, buffer.getvalue())
             else:
                 libro.save(archivo)
                 libro.close()
+                medicion["bytes"] = _tamano_archivo(archivo)
             
             # Verificar que se escribió correctamente
             time.sleep(0.5)
             if config.USE_ONEDRIVE_API:
                 import onedrive
-                contenido_verif = onedrive.descargar_archivo(archivo)
+                with _medicion_anidada():
+                    contenido_verif = onedrive.descargar_archivo(archivo)
+                medicion["bytes_leidos"] += len(contenido_verif)
                 df_verificacion = pd.read_excel(BytesIO(contenido_verif), sheet_name=hoja)
             else:
                 df_verificacion = pd.read_excel(archivo, sheet_name=hoja)
+                medicion["bytes_leidos"] += medicion["bytes"]
             
             if len(df_verificacion) == len(df):
                 print(f"[DEBUG] ✅ Excel guardado: {hoja} ({len(df)} filas)")
+                
+                # Avisar al programador de alertas (recalcula en segundo plano)
+                import tabla_alertas
+                tabla_alertas.notificar_escritura(hoja)
+                
+                # Índice de búsqueda: reconstruir solo esta hoja
+                import buscador
+                buscador.notificar_escritura(hoja, archivo)
                 return True
             else:
                 print(f"[DEBUG] ⚠️ Verificación fallida: esperadas {len(df)} filas, se guardaron {len(df_verificacion)}")
@@ -354,35 +561,39 @@ def recalcular_costes_platos(df_escandallos):
     """
     Recalcula el coste total de todos los platos
     basándose en sus escandallos
+    
+    Coste de cada línea con unidades.costear_lineas (rendimiento y
+    conversión de unidades en una sola operación sobre todas las líneas)
     """
+    import unidades
+    
     try:
-        # Agrupar por plato y sumar costes
-        costes_por_plato = df_escandallos.groupby('ID Plato').agg({
-            'Coste Total': 'sum'
-        }).reset_index()
+        # Coste de todas las líneas y suma por plato
+        df_ing = leer_excel(config.ARCHIVO_OPERACIONES, "INGREDIENTES_MAESTRO")
+        costes_lineas = unidades.costear_lineas(df_escandallos, df_ing)['Coste Total']
+        costes_por_plato = costes_lineas.groupby(clave_id(df_escandallos['ID Plato'])).sum()
         
         # Actualizar en CARTA_CLIENTES
         df_carta = leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
         
-        for _, row in costes_por_plato.iterrows():
-            id_plato = row['ID Plato']
-            nuevo_coste = row['Coste Total']
-            
-            mascara = df_carta['ID Plato'] == id_plato
-            df_carta.loc[mascara, 'Coste Total'] = nuevo_coste
-            
-            # Recalcular márgenes
-            precio_venta = df_carta.loc[mascara, 'Precio Venta'].values[0]
-            if precio_venta > 0:
-                margen_euros = precio_venta - nuevo_coste
-                margen_pct = (margen_euros / precio_venta) * 100
-                food_cost = (nuevo_coste / precio_venta) * 100
-                
-                df_carta.loc[mascara, 'Margen €'] = margen_euros
-                df_carta.loc[mascara, 'Margen %'] = margen_pct
-                df_carta.loc[mascara, 'Food Cost %'] = food_cost
+        nuevo_coste = clave_id(df_carta['ID Plato']).map(costes_por_plato)
+        mascara = nuevo_coste.notna()
+        df_carta['Coste Total'] = nuevo_coste.where(mascara, df_carta['Coste Total'])
+        
+        # Recalcular márgenes
+        precio_venta = pd.to_numeric(df_carta['Precio Venta'], errors='coerce')
+        mascara = mascara & (precio_venta > 0)
+        margen_euros = precio_venta - nuevo_coste
+        
+        df_carta['Margen €'] = margen_euros.where(mascara, df_carta.get('Margen €'))
+        df_carta['Margen %'] = (margen_euros / precio_venta * 100).where(mascara, df_carta.get('Margen %'))
+        df_carta['Food Cost %'] = (nuevo_coste / precio_venta * 100).where(mascara, df_carta.get('Food Cost %'))
         
         escribir_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES", df_carta)
+        
+        # Explosión de sub-recetas: re-explotar solo los platos tocados
+        import explosion_recetas
+        explosion_recetas.aplanar_escandallos(df_escandallos)
         return True
     except Exception as e:
         st.error(f"Error al recalcular costes: {str(e)}")
@@ -391,37 +602,23 @@ def recalcular_costes_platos(df_escandallos):
 def detectar_alertas_precios():
     """
     Detecta si hay ingredientes comprados muy por encima del precio de mercado
+    (regla 'precio_alto' de reglas_alertas)
     Retorna lista de alertas
     """
-    alertas = []
-    
     try:
-        df_lineas = leer_excel(config.ARCHIVO_OPERACIONES, "LINEAS_COMPRA")
-        df_ingredientes = leer_excel(config.ARCHIVO_OPERACIONES, "INGREDIENTES_MAESTRO")
-        
-        for _, linea in df_lineas.iterrows():
-            id_ing = linea['ID Ingrediente']
-            precio_pagado = linea['Precio Unitario']
-            
-            # Buscar precio de mercado
-            ing = df_ingredientes[df_ingredientes['ID Ingrediente'] == id_ing]
-            if not ing.empty:
-                precio_mercado = ing['Precio Mercado Medio'].values[0]
-                
-                if precio_mercado > 0:
-                    desviacion = ((precio_pagado - precio_mercado) / precio_mercado) * 100
-                    
-                    if desviacion > config.UMBRAL_DESVIACION_PRECIO:
-                        alertas.append({
-                            'tipo': 'PRECIO_ALTO',
-                            'ingrediente': linea['Nombre Ingrediente'],
-                            'precio_pagado': precio_pagado,
-                            'precio_mercado': precio_mercado,
-                            'desviacion': round(desviacion, 1),
-                            'ahorro_potencial': (precio_pagado - precio_mercado) * linea['Cantidad']
-                        })
-        
-        return alertas
+        import reglas_alertas
+        df = reglas_alertas.coincidencias('precio_alto')
+        if df.empty:
+            return []
+
+        return pd.DataFrame({
+            'tipo': 'PRECIO_ALTO',
+            'ingrediente': df['Nombre Ingrediente'].to_numpy(),
+            'precio_pagado': df['Precio Unitario'].to_numpy(),
+            'precio_mercado': df['Precio Mercado Medio'].to_numpy(),
+            'desviacion': df['Desviación %'].round(1).to_numpy(),
+            'ahorro_potencial': df['Ahorro Potencial'].to_numpy(),
+        }).to_dict('records')
     except Exception as e:
         st.error(f"Error al detectar alertas: {str(e)}")
         return []
@@ -429,27 +626,22 @@ def detectar_alertas_precios():
 def detectar_alertas_margenes():
     """
     Detecta platos con márgenes peligrosamente bajos
+    (regla 'margen_bajo' de reglas_alertas)
     """
-    alertas = []
-    
     try:
-        df_carta = leer_excel(config.ARCHIVO_OPERACIONES, "CARTA_CLIENTES")
-        
-        for _, plato in df_carta.iterrows():
-            if plato['Activo'] == 'Sí':
-                margen = plato['Margen %']
-                
-                if margen < config.UMBRAL_MARGEN_MINIMO:
-                    alertas.append({
-                        'tipo': 'MARGEN_BAJO',
-                        'cliente': plato['Nombre Cliente'],
-                        'plato': plato['Nombre Plato'],
-                        'margen_actual': round(margen, 1),
-                        'precio_venta': plato['Precio Venta'],
-                        'coste': plato['Coste Total']
-                    })
-        
-        return alertas
+        import reglas_alertas
+        df = reglas_alertas.coincidencias('margen_bajo')
+        if df.empty:
+            return []
+
+        return pd.DataFrame({
+            'tipo': 'MARGEN_BAJO',
+            'cliente': df['Nombre Cliente'].to_numpy(),
+            'plato': df['Nombre Plato'].to_numpy(),
+            'margen_actual': df['Margen %'].round(1).to_numpy(),
+            'precio_venta': df['Precio Venta'].to_numpy(),
+            'coste': df['Coste Total'].to_numpy(),
+        }).to_dict('records')
     except Exception as e:
         st.error(f"Error al detectar alertas de margen: {str(e)}")
         return []
@@ -620,14 +812,79 @@ def generar_id():
     import uuid
     return str(uuid.uuid4())[:8]
 
+def clave_id(serie):
+    """IDs como texto comparable ('12', 12 y 12.0 → '12')"""
+    numeros = pd.to_numeric(serie, errors='coerce')
+    enteros = numeros.notna() & (numeros == numeros.round())
+    texto = serie.astype(str).str.strip()
+    return texto.where(~enteros, numeros.round().astype('Int64').astype(str))
+
+def hash_datos(df, *extras):
+    """
+    Hash del contenido de un DataFrame (y parámetros extra)
+
+    Si hay columnas con tipos no hashables (listas, dicts) se hashea su texto.
+    """
+    h = hashlib.sha256()
+    h.update("|".join(map(str, df.columns)).encode())
+    try:
+        filas = pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        filas = pd.util.hash_pandas_object(df.astype(str), index=False)
+    h.update(filas.values.tobytes())
+    for extra in extras:
+        h.update(repr(extra).encode())
+    return h.hexdigest()
+
 # ============================================================================
 # FUNCIONES DE INVENTARIO Y SNAPSHOTS
 # ============================================================================
 
+COLUMNAS_INVENTARIO = ['ID Cliente', 'ID Ingrediente', 'Nombre Ingrediente', 'Stock Actual',
+                       'Consumo Semanal', 'Unidad', 'Precio Unitario', 'Última Actualización']
+
+HOJA_INVENTARIO = "INVENTARIO"
+HOJA_INVENTARIO_LEGACY = "INVENTARIO_CLIENTES"
+PREFIJO_INVENTARIO = "INVENTARIO_"
+
+def archivo_inventario_cliente(id_cliente):
+    """Ruta de la partición de inventario de un cliente"""
+    nombre = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(id_cliente))
+    if config.USE_ONEDRIVE_API:
+        return f"{config.RUTA_INVENTARIOS}/{PREFIJO_INVENTARIO}{nombre}.xlsx"
+    import os
+    return os.path.join(config.RUTA_INVENTARIOS, f"{PREFIJO_INVENTARIO}{nombre}.xlsx")
+
+def _inventario_legacy(id_cliente=None):
+    """Filas de la hoja única INVENTARIO_CLIENTES (formato anterior)"""
+    df = leer_excel(config.ARCHIVO_OPERACIONES, HOJA_INVENTARIO_LEGACY)
+    if df.empty or 'ID Cliente' not in df.columns:
+        return pd.DataFrame(columns=COLUMNAS_INVENTARIO)
+    
+    # Inventarios antiguos guardaban 'Cantidad Stock'
+    if 'Stock Actual' not in df.columns and 'Cantidad Stock' in df.columns:
+        df = df.rename(columns={'Cantidad Stock': 'Stock Actual'})
+    
+    if id_cliente is not None:
+        df = df[clave_id(df['ID Cliente']) == clave_id(pd.Series([id_cliente])).iloc[0]]
+    return df.copy()
+
+def existe_inventario_cliente(id_cliente):
+    """True si el cliente ya tiene partición de inventario (aunque esté vacía)"""
+    archivo = archivo_inventario_cliente(id_cliente)
+    if config.USE_ONEDRIVE_API:
+        return archivo in listar_inventarios_particionados()
+    import os
+    return os.path.exists(archivo)
+
 def obtener_inventario_cliente(id_cliente):
     """
     Obtiene el inventario actual de un cliente
     
+    Lee solo la partición del cliente; si aún no existe, recurre
+    a la hoja INVENTARIO_CLIENTES del formato anterior. Una partición
+    guardada sin filas es un inventario vacío (no se usa la hoja antigua).
+    
     Args:
         id_cliente: ID del cliente
     
@@ -635,22 +892,15 @@ def obtener_inventario_cliente(id_cliente):
         DataFrame con el inventario del cliente
     """
     try:
-        # Intentar leer la hoja INVENTARIO_CLIENTES
-        try:
-            df_inventario = leer_excel(config.ARCHIVO_OPERACIONES, "INVENTARIO_CLIENTES")
-        except:
-            # Si la hoja no existe, retornar DataFrame vacío
-            return pd.DataFrame(columns=['ID Cliente', 'ID Ingrediente', 'Nombre Ingrediente', 
-                                        'Cantidad Stock', 'Unidad', 'Última Actualización'])
+        if existe_inventario_cliente(id_cliente):
+            df_inventario = leer_excel(archivo_inventario_cliente(id_cliente), HOJA_INVENTARIO)
+        else:
+            df_inventario = _inventario_legacy(id_cliente)
         
         if df_inventario.empty:
-            return pd.DataFrame(columns=['ID Cliente', 'ID Ingrediente', 'Nombre Ingrediente', 
-                                        'Cantidad Stock', 'Unidad', 'Última Actualización'])
-        
-        # Filtrar por cliente
-        inventario_cliente = df_inventario[df_inventario['ID Cliente'] == id_cliente].copy()
+            return pd.DataFrame(columns=COLUMNAS_INVENTARIO)
         
-        return inventario_cliente
+        return df_inventario.reset_index(drop=True)
         
     except Exception as e:
         return pd.DataFrame()
@@ -659,6 +909,9 @@ def guardar_inventario_cliente(id_cliente, df_inventario):
     """
     Guarda o actualiza el inventario de un cliente
     
+    Escribe únicamente la partición del cliente; el resto de
+    inventarios no se leen ni se reescriben.
+    
     Args:
         id_cliente: ID del cliente
         df_inventario: DataFrame con el inventario actualizado
@@ -667,34 +920,97 @@ def guardar_inventario_cliente(id_cliente, df_inventario):
         True si se guardó correctamente, False en caso contrario
     """
     try:
-        # Leer todo el inventario (si existe la hoja)
-        try:
-            df_inventario_completo = leer_excel(config.ARCHIVO_OPERACIONES, "INVENTARIO_CLIENTES")
-        except:
-            # Si la hoja no existe, comenzar con un DataFrame vacío
-            df_inventario_completo = pd.DataFrame(columns=['ID Cliente', 'ID Ingrediente', 'Nombre Ingrediente', 
-                                                          'Cantidad Stock', 'Unidad', 'Última Actualización'])
-        
-        # Eliminar registros antiguos del cliente
-        if not df_inventario_completo.empty:
-            df_inventario_completo = df_inventario_completo[df_inventario_completo['ID Cliente'] != id_cliente]
-        
-        # Añadir el nuevo inventario
+        df_inventario = df_inventario.copy()
         df_inventario['ID Cliente'] = id_cliente
         df_inventario['Última Actualización'] = datetime.now()
         
-        df_nuevo = pd.concat([df_inventario_completo, df_inventario], ignore_index=True)
+        if not config.USE_ONEDRIVE_API:
+            from pathlib import Path
+            Path(config.RUTA_INVENTARIOS).mkdir(parents=True, exist_ok=True)
         
-        # Guardar
-        return escribir_excel(config.ARCHIVO_OPERACIONES, "INVENTARIO_CLIENTES", df_nuevo)
+        return escribir_excel(archivo_inventario_cliente(id_cliente), HOJA_INVENTARIO, df_inventario)
         
     except Exception as e:
         return False
 
+def listar_inventarios_particionados():
+    """Rutas de todas las particiones de inventario existentes"""
+    try:
+        if config.USE_ONEDRIVE_API:
+            import onedrive
+            nombres = onedrive.listar_archivos(config.RUTA_INVENTARIOS)
+            return [f"{config.RUTA_INVENTARIOS}/{n}" for n in sorted(nombres)
+                    if n.startswith(PREFIJO_INVENTARIO) and n.endswith(".xlsx")]
+        
+        import glob
+        import os
+        return sorted(glob.glob(os.path.join(config.RUTA_INVENTARIOS, f"{PREFIJO_INVENTARIO}*.xlsx")))
+    except Exception as e:
+        print(f"[DEBUG] Error al listar inventarios: {e}")
+        return []
+
+def leer_inventarios():
+    """
+    Vista de compatibilidad: inventario de todos los clientes en una tabla
+    
+    Une las particiones por cliente y, para los clientes que aún no
+    tienen partición, las filas de la hoja INVENTARIO_CLIENTES. Un
+    cliente con partición (aunque esté vacía) ya no usa la hoja antigua.
+    
+    Returns:
+        DataFrame con el mismo formato que la antigua hoja única
+    """
+    archivos = listar_inventarios_particionados()
+    particiones = [leer_excel(archivo, HOJA_INVENTARIO) for archivo in archivos]
+    particiones = [df for df in particiones if not df.empty]
+    
+    df_legacy = _inventario_legacy()
+    if archivos and not df_legacy.empty:
+        existentes = set(archivos)
+        con_particion = df_legacy['ID Cliente'].map(lambda id_cliente: archivo_inventario_cliente(id_cliente) in existentes)
+        claves_migradas = set().union(*(set(clave_id(df['ID Cliente'])) for df in particiones if 'ID Cliente' in df.columns))
+        migrados = con_particion.astype(bool) | clave_id(df_legacy['ID Cliente']).isin(claves_migradas)
+        df_legacy = df_legacy[~migrados]
+    
+    partes = particiones + ([df_legacy] if not df_legacy.empty else [])
+    if not partes:
+        return pd.DataFrame(columns=COLUMNAS_INVENTARIO)
+    return pd.concat(partes, ignore_index=True)
+
+def migrar_inventario_particionado():
+    """
+    Reparte la hoja INVENTARIO_CLIENTES en una partición por cliente
+    
+    Los clientes que ya tienen partición no se tocan (sus datos son
+    más recientes que los de la hoja única).
+    
+    Returns:
+        Número de clientes migrados
+    """
+    df_legacy = _inventario_legacy()
+    existentes = set(listar_inventarios_particionados())
+    migrados = 0
+    
+    if not config.USE_ONEDRIVE_API:
+        from pathlib import Path
+        Path(config.RUTA_INVENTARIOS).mkdir(parents=True, exist_ok=True)
+    
+    for id_cliente, df_cliente in df_legacy.groupby('ID Cliente', sort=False):
+        if archivo_inventario_cliente(id_cliente) in existentes:
+            continue
+        if escribir_excel(archivo_inventario_cliente(id_cliente), HOJA_INVENTARIO, df_cliente):
+            migrados += 1
+    
+    print(f"[DEBUG] Inventarios migrados a particiones: {migrados}")
+    return migrados
+
 def guardar_snapshot(id_cliente, nombre_cliente, df_pedido, motivo=""):
     """
     Guarda un snapshot (instantánea) de un pedido
     
+    Se anexa una fila por ingrediente al histórico del cliente
+    (ver snapshots.py), sin reescribir los snapshots anteriores.
+    
     Args:
         id_cliente: ID del cliente
         nombre_cliente: Nombre del cliente
@@ -704,69 +1020,30 @@ def guardar_snapshot(id_cliente, nombre_cliente, df_pedido, motivo=""):
     Returns:
         True si se guardó correctamente
     """
-    try:
-        # Leer snapshots existentes
-        try:
-            df_snapshots = leer_excel(config.ARCHIVO_OPERACIONES, "SNAPSHOTS_PEDIDOS")
-        except:
-            df_snapshots = pd.DataFrame(columns=['ID Snapshot', 'ID Cliente', 'Nombre Cliente', 
-                                                 'Fecha', 'Motivo', 'Total Productos', 
-                                                 'Coste Total', 'Datos JSON'])
-        
-        # Crear nuevo snapshot
-        snapshot_id = generar_id()
-        fecha_actual = datetime.now()
-        
-        # Convertir pedido a JSON para guardar
-        import json
-        datos_json = df_pedido.to_json(orient='records')
-        
-        nuevo_snapshot = {
-            'ID Snapshot': snapshot_id,
-            'ID Cliente': id_cliente,
-            'Nombre Cliente': nombre_cliente,
-            'Fecha': fecha_actual,
-            'Motivo': motivo,
-            'Total Productos': len(df_pedido),
-            'Coste Total': df_pedido['Coste Total'].sum() if 'Coste Total' in df_pedido.columns else 0,
-            'Datos JSON': datos_json
-        }
-        
-        # Agregar
-        df_snapshots = pd.concat([df_snapshots, pd.DataFrame([nuevo_snapshot])], ignore_index=True)
-        
-        # Guardar
-        return escribir_excel(config.ARCHIVO_OPERACIONES, "SNAPSHOTS_PEDIDOS", df_snapshots)
-        
-    except Exception as e:
-        st.error(f"Error al guardar snapshot: {str(e)}")
-        return False
+    import snapshots
+    
+    if snapshots.guardar_snapshot(generar_id(), id_cliente, nombre_cliente, df_pedido, motivo):
+        return True
+    
+    st.error("Error al guardar snapshot")
+    return False
 
-def obtener_snapshots_cliente(id_cliente):
+def obtener_snapshots_cliente(id_cliente, limite=None):
     """
-    Obtiene todos los snapshots de un cliente
+    Obtiene los snapshots de un cliente
     
     Args:
         id_cliente: ID del cliente
+        limite: Número máximo de snapshots a devolver (los más recientes)
     
     Returns:
-        DataFrame con los snapshots del cliente
+        DataFrame en formato largo (una fila por snapshot e ingrediente),
+        ordenado por fecha descendente
     """
     try:
-        df_snapshots = leer_excel(config.ARCHIVO_OPERACIONES, "SNAPSHOTS_PEDIDOS")
-        
-        if df_snapshots.empty:
-            return pd.DataFrame()
-        
-        # Filtrar por cliente
-        snapshots_cliente = df_snapshots[df_snapshots['ID Cliente'] == id_cliente].copy()
-        
-        # Ordenar por fecha descendente
-        if not snapshots_cliente.empty and 'Fecha' in snapshots_cliente.columns:
-            snapshots_cliente = snapshots_cliente.sort_values('Fecha', ascending=False)
-        
-        return snapshots_cliente
+        import snapshots
+        return snapshots.obtener_snapshots(id_cliente, limite)
         
     except Exception as e:
         st.error(f"Error al obtener snapshots: {str(e)}")
-        return pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame()